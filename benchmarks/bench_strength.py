@@ -0,0 +1,91 @@
+"""
+Strength Benchmark - Native pattern analyzer vs zxcvbn.
+
+Times both engines on realistic candidates of growing length and reports how
+closely the native guess estimates track zxcvbn's. Run from the repository
+root:
+
+    python benchmarks/bench_strength.py [--repeat N]
+"""
+
+import argparse
+import os
+import secrets
+import statistics
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.security.pattern_analyzer import get_analyzer
+from src.security.strength_checker import ZXCVBN_MAX_LENGTH, is_available
+
+WORDS = ["correct", "horse", "battery", "staple", "dragon", "qwerty", "1987", "summer", "P@ssw0rd"]
+SAMPLES = [
+    "password", "P@ssw0rd1987", "qwerty123", "Jennifer1990", "correcthorsebatterystaple",
+    "zxcvbnm,./", "abcabcabc", "12/05/1987", "iloveyou2020", "x7#Kq9!mZp2$",
+]
+
+
+def make_candidate(length: int) -> str:
+    """Mix dictionary words with random characters up to ``length``."""
+    parts = []
+    while sum(map(len, parts)) < length:
+        if secrets.randbelow(2):
+            parts.append(secrets.choice(WORDS))
+        else:
+            parts.append("".join(secrets.choice(string.ascii_letters + string.digits + "!@#$") for _ in range(3)))
+    return "".join(parts)[:length]
+
+
+def best_time(func, password: str, repeat: int) -> float:
+    """Best wall time of ``repeat`` runs, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(password)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (default: 5)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    analyzer = get_analyzer()
+    print(f"Native dictionaries: {len(analyzer.trie)} words (built in {1000 * (time.perf_counter() - start):.0f} ms)")
+
+    zxcvbn = None
+    if is_available():
+        from zxcvbn import zxcvbn
+    else:
+        print("zxcvbn not installed: timing the native analyzer only")
+
+    print(f"\n{'length':>8} {'native ms':>10} {'zxcvbn ms':>10} {'speed-up':>9}")
+    for length in (8, 16, 32, 64, 72, 256, 1024, 4096):
+        password = make_candidate(length)
+        native_ms = best_time(analyzer.analyze, password, args.repeat)
+        if zxcvbn is not None and length <= ZXCVBN_MAX_LENGTH:
+            zxcvbn_ms = best_time(zxcvbn, password, args.repeat)
+            print(f"{length:>8} {native_ms:>10.2f} {zxcvbn_ms:>10.2f} {zxcvbn_ms / native_ms:>8.1f}x")
+        else:
+            print(f"{length:>8} {native_ms:>10.2f} {'-':>10} {'-':>9}")
+
+    if zxcvbn is not None:
+        print(f"\n{'password':<28} {'native log10':>12} {'zxcvbn log10':>12} {'scores':>7}")
+        deltas = []
+        for password in SAMPLES:
+            native = analyzer.analyze(password)
+            reference = zxcvbn(password)
+            deltas.append(abs(native.guesses_log10 - reference["guesses_log10"]))
+            print(f"{password:<28} {native.guesses_log10:>12.2f} {reference['guesses_log10']:>12.2f} "
+                  f"{native.score:>3}/{reference['score']}")
+        print(f"\nMean |delta log10 guesses|: {statistics.mean(deltas):.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
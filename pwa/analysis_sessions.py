@@ -0,0 +1,96 @@
+"""
+Analysis Sessions - Per-client incremental strength analyzers for the PWA server.
+
+Each live-typing client gets an opaque session token bound to its own
+IncrementalStrengthAnalyzer, so consecutive keystrokes only pay for the
+characters that changed. Sessions are bounded in number and expire when
+idle; an expired or evicted session drops the prefixes it was holding.
+Passwords the analyzer cannot handle (zxcvbn missing, or input longer than
+zxcvbn accepts) are analyzed by check_strength(engine="auto") instead;
+anything longer than max_length is refused outright.
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from src.security.strength_checker import IncrementalStrengthAnalyzer, StrengthResult, check_strength
+
+# Longest password accepted for analysis (far beyond any real password)
+MAX_PASSWORD_LENGTH = 1024
+
+
+class AnalysisSessions:
+    """Bounded, expiring registry of incremental analyzers."""
+
+    def __init__(self, max_sessions: int = 256, ttl: float = 300.0, max_length: int = MAX_PASSWORD_LENGTH):
+        """
+        Initialize the registry.
+
+        Args:
+            max_sessions: Maximum concurrent sessions (least recently used are evicted)
+            ttl: Seconds a session may stay idle before it expires
+            max_length: Longest password a session will analyze
+        """
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_length = max_length
+        self._sessions: "OrderedDict[str, Tuple[float, threading.Lock, IncrementalStrengthAnalyzer]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, user_inputs: Optional[List[str]] = None) -> str:
+        """Open a new session and return its token."""
+        token = secrets.token_urlsafe(24)
+        with self._lock:
+            self._purge()
+            self._sessions[token] = (time.monotonic(), threading.Lock(), IncrementalStrengthAnalyzer(user_inputs))
+            while len(self._sessions) > self.max_sessions:
+                _, (_, _, analyzer) = self._sessions.popitem(last=False)
+                analyzer.reset()
+        return token
+
+    def analyze(self, token: str, password: str) -> Optional[StrengthResult]:
+        """
+        Analyze the session's current password.
+
+        Raises:
+            ValueError: If the password is longer than max_length
+            KeyError: If the session does not exist or has expired
+        """
+        if len(password) > self.max_length:
+            raise ValueError(f"Password longer than {self.max_length} characters")
+        with self._lock:
+            self._purge()
+            _, session_lock, analyzer = self._sessions[token]
+            self._sessions[token] = (time.monotonic(), session_lock, analyzer)
+            self._sessions.move_to_end(token)
+        with session_lock:
+            result = analyzer.update(password)
+        if result is None and password:
+            # Keystroke prefixes of one password would only churn the shared cache
+            result = check_strength(password, analyzer.user_inputs, use_cache=False, engine="auto")
+        return result
+
+    def close(self, token: str) -> bool:
+        """Discard a session; returns False if it did not exist."""
+        with self._lock:
+            session = self._sessions.pop(token, None)
+        if session is None:
+            return False
+        session[2].reset()
+        return True
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _purge(self) -> None:
+        """Drop idle sessions (caller holds the registry lock)."""
+        deadline = time.monotonic() - self.ttl
+        while self._sessions:
+            token, (last_used, _, analyzer) = next(iter(self._sessions.items()))
+            if last_used > deadline:
+                break
+            del self._sessions[token]
+            analyzer.reset()
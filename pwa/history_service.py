@@ -0,0 +1,389 @@
+"""
+History Service - Non-blocking access to password history for the PWA server.
+
+All writes go through a single writer task fed by an asyncio.Queue, so
+concurrent generate+log requests never block the event loop and never
+interleave partial lines. Reads run in the default executor, and the most
+recent entries are kept in a warm in-memory tail cache (stored form, i.e.
+still encrypted, together with their store positions) so the common
+"latest N" request - including its pagination cursors - never touches the disk.
+
+New entries are also fanned out to live subscribers (Server-Sent Events) as
+redacted metadata. Each subscriber has its own bounded queue; a client that
+falls behind gets a single "resync" event instead of an unbounded backlog.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from src.output.logger import PasswordLogger
+
+logger = logging.getLogger(__name__)
+
+# Queue operations understood by the writer task
+_OP_LOG = "log"
+_OP_CLEAR = "clear"
+
+# Entry fields that are safe to broadcast (never the password or parameters)
+_EVENT_FIELDS = ("timestamp", "generator_type", "entropy_bits")
+
+
+class HistoryService:
+    """Single-writer, off-loop history access with a tail cache."""
+
+    def __init__(
+        self,
+        logger_factory: Callable[[], PasswordLogger] = PasswordLogger,
+        cache_size: int = 50,
+        queue_size: int = 1000,
+        subscriber_queue_size: int = 100,
+        poll_interval: float = 1.0
+    ):
+        """
+        Initialize the service (call start() from a running event loop).
+
+        Args:
+            logger_factory: Callable returning the PasswordLogger to use
+            cache_size: Number of most recent entries kept in memory
+            queue_size: Pending writes allowed before submit() applies backpressure
+            subscriber_queue_size: Events buffered per live subscriber
+            poll_interval: Seconds between checks for writes by other processes
+                           (only while someone is subscribed)
+        """
+        self.cache_size = cache_size
+        self.subscriber_queue_size = subscriber_queue_size
+        self.poll_interval = poll_interval
+        self._logger_factory = logger_factory
+        self._queue_size = queue_size
+        self._pwd_logger: Optional[PasswordLogger] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        # One dedicated thread keeps disk writes strictly ordered
+        self._write_executor: Optional[ThreadPoolExecutor] = None
+        # Newest entry first as (store position, stored/encrypted entry)
+        self._tail: Deque[Tuple[int, Dict[str, Any]]] = deque(maxlen=cache_size)
+        self._tail_warm = False
+        # Whether the store holds entries older than the oldest cached one
+        self._tail_truncated = False
+        # Store change token as last seen by this service
+        self._file_state: Optional[Tuple[int, ...]] = None
+        # Generation of the store the tail positions belong to
+        self._epoch = ""
+        # Live subscribers and the last (epoch, seq) they were told about
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._published: Tuple[str, int] = ("", 0)
+        self._watcher: Optional[asyncio.Task] = None
+
+    @property
+    def pwd_logger(self) -> PasswordLogger:
+        """Lazily constructed PasswordLogger shared by reads and writes."""
+        if self._pwd_logger is None:
+            self._pwd_logger = self._logger_factory()
+        return self._pwd_logger
+
+    async def start(self) -> None:
+        """Start the writer task and warm the tail cache."""
+        if self._writer is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self._queue_size)
+        self._write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history-writer")
+        self._writer = asyncio.create_task(self._writer_loop())
+        await self._refresh_tail()
+        self._published = self._current_version()
+
+    async def stop(self) -> None:
+        """Drain pending writes and stop the writer and watcher tasks."""
+        if self._writer is None:
+            return
+        if self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
+        await self._queue.join()
+        self._writer.cancel()
+        try:
+            await self._writer
+        except asyncio.CancelledError:
+            pass
+        self._writer = None
+        self._write_executor.shutdown(wait=True)
+        self._write_executor = None
+
+    async def flush(self) -> None:
+        """Wait until every queued write has reached the disk."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def submit(self, result: Any) -> None:
+        """
+        Queue a generator result for logging.
+
+        Returns immediately unless the queue is full, in which case the
+        caller waits for the writer to catch up (backpressure).
+        """
+        if self._queue is None:
+            raise RuntimeError("HistoryService.start() has not been called")
+        await self._queue.put((_OP_LOG, result))
+
+    async def clear(self) -> None:
+        """Clear history after all previously queued writes have landed."""
+        if self._queue is None:
+            raise RuntimeError("HistoryService.start() has not been called")
+        await self._queue.put((_OP_CLEAR, None))
+        await self._queue.join()
+
+    async def get_history(
+        self,
+        limit: Optional[int] = 10,
+        search: Optional[str] = None,
+        **filters: Any
+    ) -> List[Dict[str, Any]]:
+        """
+        Return decrypted history entries, most recent first.
+
+        Unfiltered requests that fit in the tail cache are answered from
+        memory; everything else is read from disk in the default executor.
+        Extra keyword filters (generator_type, since, until, min_entropy)
+        are passed through to PasswordLogger.get_history.
+        """
+        filters = {k: v for k, v in filters.items() if v is not None}
+        if not search and not filters and self._cacheable(limit):
+            await self._ensure_fresh_tail()
+            pwd_logger = self.pwd_logger
+            return [pwd_logger.decrypt_entry(e) for _, e in list(self._tail)[:limit]]
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, lambda: self.pwd_logger.get_history(limit=limit, search=search, **filters)
+        )
+
+    async def get_page(
+        self,
+        limit: int = 50,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        search: Optional[str] = None,
+        **filters: Any
+    ) -> Dict[str, Any]:
+        """
+        Return one cursor-paginated page (see PasswordLogger.get_history_page).
+
+        The first unfiltered page is served from the tail cache; deeper pages
+        are read from their cursor position in the default executor.
+
+        Raises:
+            ValueError: If a cursor is malformed
+        """
+        filters = {k: v for k, v in filters.items() if v is not None}
+        if not (before or after or search or filters) and self._cacheable(limit):
+            await self._ensure_fresh_tail()
+            pwd_logger = self.pwd_logger
+            rows = list(self._tail)
+            page = rows[:limit]
+            has_more = len(rows) > limit or self._tail_truncated
+            return {
+                "entries": [pwd_logger.decrypt_entry(e) for _, e in page],
+                "next_cursor": pwd_logger.make_cursor(page[-1][0]) if page and has_more else None,
+                "prev_cursor": pwd_logger.make_cursor(page[0][0]) if page else None
+            }
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            lambda: self.pwd_logger.get_history_page(
+                limit=limit, before=before, after=after, search=search, **filters
+            )
+        )
+
+    async def version(self) -> Tuple[str, int]:
+        """
+        Return the current (epoch, seq), normally straight from memory.
+
+        See PasswordLogger.history_version() for the meaning of both values.
+        """
+        await self._ensure_fresh_tail()
+        return self._current_version()
+
+    def subscribe(self) -> asyncio.Queue:
+        """
+        Register a live subscriber and return its bounded event queue.
+
+        Events are dicts with an "event" name ("entry", "reset" or "resync")
+        and a "data" payload; entries carry only redacted metadata.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.subscriber_queue_size)
+        self._subscribers.add(queue)
+        if self._watcher is None and self._writer is not None:
+            self._watcher = asyncio.create_task(self._watch_loop())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Remove a subscriber (the watcher stops with the last one)."""
+        self._subscribers.discard(queue)
+
+    async def get_since(self, seq: int, epoch: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
+        """
+        Return entries added after (epoch, seq) (see PasswordLogger.get_history_since).
+
+        A client that is already up to date is answered from memory.
+        """
+        current_epoch, current_seq = await self.version()
+        if seq == current_seq and epoch in (None, current_epoch):
+            return {"entries": [], "seq": seq, "epoch": current_epoch, "has_more": False, "reset": False}
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, lambda: self.pwd_logger.get_history_since(seq, epoch=epoch, limit=limit)
+        )
+
+    def _current_version(self) -> Tuple[str, int]:
+        """(epoch, seq) of the tail cache."""
+        return self._epoch, (self._tail[0][0] + 1 if self._tail else 0)
+
+    def _offer(self, queue: asyncio.Queue, event: Dict[str, Any]) -> None:
+        """Queue an event without blocking; a full queue collapses into one resync."""
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait({"event": "resync", "data": self._version_payload()})
+
+    def _version_payload(self) -> Dict[str, Any]:
+        epoch, seq = self._current_version()
+        return {"epoch": epoch, "seq": seq}
+
+    def _publish_pending(self) -> None:
+        """Broadcast whatever the tail holds beyond what subscribers have seen."""
+        if not self._tail_warm:
+            return
+        published_epoch, published_seq = self._published
+        current = self._current_version()
+        if current == self._published:
+            return
+        self._published = current
+        if not self._subscribers:
+            return
+
+        # Going from empty to non-empty is a plain extension, not a reset
+        if (published_epoch and current[0] != published_epoch) or current[1] < published_seq:
+            events = [{"event": "reset", "data": self._version_payload()}]
+        else:
+            new_rows = [row for row in self._tail if row[0] + 1 > published_seq]
+            if len(new_rows) == len(self._tail) and len(self._tail) >= self.cache_size:
+                # More arrived than the cache holds: let clients catch up via /since
+                events = [{"event": "resync", "data": self._version_payload()}]
+            else:
+                events = [
+                    {"event": "entry", "data": self._redact(position, entry)}
+                    for position, entry in reversed(new_rows)
+                ]
+        for queue in list(self._subscribers):
+            for event in events:
+                self._offer(queue, event)
+
+    def _redact(self, position: int, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Metadata for a broadcast entry; never includes the secret."""
+        data = {field: entry.get(field) for field in _EVENT_FIELDS}
+        data["seq"] = position + 1
+        data["epoch"] = self._epoch
+        return data
+
+    async def _watch_loop(self) -> None:
+        """While anyone is subscribed, pick up writes made by other processes."""
+        try:
+            while self._subscribers:
+                await asyncio.sleep(self.poll_interval)
+                try:
+                    await self._ensure_fresh_tail()
+                    self._publish_pending()
+                except Exception:
+                    logger.exception("History watcher failed to check for changes")
+        finally:
+            self._watcher = None
+
+    def _cacheable(self, limit: Optional[int]) -> bool:
+        """Whether a request for the newest `limit` entries fits the tail cache."""
+        return limit is not None and 0 <= limit <= self.cache_size
+
+    async def _ensure_fresh_tail(self) -> None:
+        """Reload the tail if it is cold or another process touched the store."""
+        if not self._tail_warm or self._file_state != self._stat_log_file():
+            await self._refresh_tail()
+
+    def _stat_log_file(self) -> Optional[Tuple[int, ...]]:
+        """Cheap change detection for writes made outside this service."""
+        return self.pwd_logger.store.change_token()
+
+    async def _refresh_tail(self) -> None:
+        """Reload the tail cache from disk without blocking the loop."""
+        loop = asyncio.get_running_loop()
+
+        def _load():
+            state = self._stat_log_file()
+            store = self.pwd_logger.store
+            # One row past the cache tells whether anything older exists
+            rows = list(islice(store.iter_reverse(), self.cache_size + 1))
+            return state, rows, store.epoch()
+
+        state, rows, epoch = await loop.run_in_executor(None, _load)
+        self._tail_truncated = len(rows) > self.cache_size
+        self._tail = deque(rows[:self.cache_size], maxlen=self.cache_size)
+        self._epoch = epoch
+        self._file_state = state
+        self._tail_warm = True
+
+    def _log_and_read_new(self, result: Any, newest: Optional[int], expected_state: Any) -> Optional[List[Any]]:
+        """
+        Write one entry and read back every row appended since `newest`.
+
+        Returns None when the tail can no longer be extended incrementally
+        (cold cache, or the store was changed unexpectedly, e.g. cleared).
+        """
+        trusted = self._tail_warm and self._stat_log_file() == expected_state
+        if self.pwd_logger.log(result) is None:
+            return []
+        if not trusted:
+            return None
+        rows = list(self.pwd_logger.store.iter_forward(after=newest))
+        return rows or None
+
+    async def _writer_loop(self) -> None:
+        """Consume queued operations one at a time, in order."""
+        loop = asyncio.get_running_loop()
+        while True:
+            op, payload = await self._queue.get()
+            try:
+                if op == _OP_LOG:
+                    newest = self._tail[0][0] if self._tail else None
+                    rows = await loop.run_in_executor(
+                        self._write_executor, self._log_and_read_new, payload, newest, self._file_state
+                    )
+                    if rows is None:
+                        self._tail_warm = False
+                    else:
+                        if rows and not self._tail:
+                            # First entry of a new generation
+                            self._epoch = await loop.run_in_executor(
+                                self._write_executor, self.pwd_logger.store.epoch
+                            )
+                        for row in rows:
+                            if len(self._tail) == self.cache_size:
+                                self._tail_truncated = True
+                            self._tail.appendleft(row)
+                elif op == _OP_CLEAR:
+                    await loop.run_in_executor(self._write_executor, self.pwd_logger.clear_history)
+                    self._tail.clear()
+                    self._tail_truncated = False
+                    self._epoch = ""
+                    self._tail_warm = True
+                self._file_state = self._stat_log_file()
+                self._publish_pending()
+            except Exception:
+                # Never let one bad entry kill the writer
+                logger.exception("History writer failed to process %s operation", op)
+            finally:
+                self._queue.task_done()
@@ -6,7 +6,7 @@ const AUTH_CONFIG = {
 const state = {
     currentType: 'random',
     config: {
-        random: { length: 16, uppercase: true, lowercase: true, digits: true, symbols: true, easy_read: false, easy_say: false, balanced: false, no_repeats: false, min_upper: 0, min_lower: 0, min_digits: 0, min_symbols: 0, include: '', exclude: '' },
+        random: { length: 16, uppercase: true, lowercase: true, digits: true, symbols: true, easy_read: false, easy_say: false, balanced: false, no_repeats: false, min_upper: 0, min_lower: 0, min_digits: 0, min_symbols: 0, include: '', exclude: '', preset: '' },
         phrase: { words: 4, separator: '-', capitalize: false, easy_read: false },
         pin: { length: 6 },
         wifi: { length: 16, simple: false },
@@ -24,6 +24,11 @@ const state = {
     },
     presets: {},
     history: [],
+    historyCursor: null,   // Opaque cursor for the next (older) page, null when exhausted
+    historyLoading: false,
+    historyEtag: null,     // ETag of the unfiltered first page, sent back as If-None-Match
+    historySeq: null,      // Server sequence number the local list is synced to
+    historyEpoch: null,
     searchQuery: ''
 };
 
@@ -160,6 +165,17 @@ async function init() {
     renderControls();
     generate();
     fetchHistory();
+    connectHistoryStream();
+
+    // History Infinite Scroll
+    if (elements.historyList) {
+        elements.historyList.addEventListener('scroll', () => {
+            const list = elements.historyList;
+            if (list.scrollTop + list.clientHeight >= list.scrollHeight - 200) {
+                fetchMoreHistory();
+            }
+        }, { passive: true });
+    }
 
     // History Copy Event Delegation
     if (elements.historyList) {
@@ -193,6 +209,7 @@ async function init() {
             AUTH_CONFIG.apiKey = newKey || 'default_secret_key';
             showToast("Security key updated!");
             updateKeyStatus();
+            connectHistoryStream();
             if (state.currentType === 'history') fetchHistory();
         });
     }
@@ -255,7 +272,7 @@ function switchTab(type) {
     if (type === 'history') {
         generatorSection.classList.add('hidden');
         historySection.classList.remove('hidden');
-        fetchHistory(); // Ensure fresh data
+        syncHistory(); // Ensure fresh data (only new rows are downloaded)
 
         // Setup search listener if not already attached (simple check)
         if (searchInput && !searchInput.dataset.listening) {
@@ -350,6 +367,7 @@ function renderControls() {
             input.value = val; // Programmatic assignment to avoid XSS
             input.addEventListener('input', (e) => {
                 state.config[state.currentType][ctrl.id] = e.target.value;
+                if (state.currentType === 'analyze') scheduleLiveAnalysis(e.target.value);
             });
         } else if (ctrl.type === 'preset') {
             item.innerHTML = `
@@ -367,33 +385,48 @@ function renderControls() {
                 const opt = document.createElement('option');
                 opt.value = name;
                 opt.textContent = name.charAt(0).toUpperCase() + name.slice(1);
+                opt.title = state.presets[name].description || '';
                 select.appendChild(opt);
             });
+            select.value = state.config[state.currentType].preset || '';
 
             select.addEventListener('change', (e) => {
                 const presetName = e.target.value;
+                // Sent as the 'preset' query param: the server runs its compiled plan
+                state.config[state.currentType].preset = presetName;
                 if (!presetName) return;
                 const preset = state.presets[presetName];
 
-                // Update config from preset
-                Object.keys(preset).forEach(key => {
-                    if (key !== 'command') {
-                        let configKey = key;
-                        if (key.startsWith('min_')) {
-                            configKey = key.replace('min_uppercase', 'min_upper').replace('min_lowercase', 'min_lower');
-                        }
-                        state.config[state.currentType][configKey] = preset[key];
-                    }
-                });
+                // Mirror random presets in the controls
+                if (preset.generator === state.currentType) {
+                    Object.keys(preset.options).forEach(key => {
+                        const configKey = key.replace('min_uppercase', 'min_upper').replace('min_lowercase', 'min_lower');
+                        state.config[state.currentType][configKey] = preset.options[key];
+                    });
+                }
                 renderControls();
                 generate();
             });
         }
 
+        if (ctrl.type !== 'preset') {
+            // Editing any setting switches back to manual mode
+            item.addEventListener('input', clearPreset);
+            item.addEventListener('change', clearPreset);
+        }
+
         elements.controlsContainer.appendChild(item);
     });
 }
 
+function clearPreset() {
+    const config = state.config[state.currentType];
+    if (!config || !config.preset) return;
+    config.preset = '';
+    const select = document.getElementById('input-preset');
+    if (select) select.value = '';
+}
+
 async function generate() {
     if (elements.generateBtn) {
         elements.generateBtn.disabled = true;
@@ -414,18 +447,7 @@ async function generate() {
             });
             const data = await response.json();
             if (response.ok) {
-                elements.passwordDisplay.innerHTML = colorizePassword(password || "No input");
-                elements.entropyValue.textContent = data.entropy || 0;
-
-                let detailsHtml = `Score: ${data.strength?.score}/4<br>`;
-                if (data.strength?.warning) {
-                    detailsHtml += `Warning: ${escapeHtml(data.strength.warning)}<br>`;
-                }
-                if (data.strength?.suggestions?.length) {
-                    detailsHtml += `Tip: ${escapeHtml(data.strength.suggestions[0])}`;
-                }
-
-                elements.qrContainer.innerHTML = `<div style="text-align:left; font-size:0.85rem; padding:1rem; color:var(--text-primary); line-height:1.5;">${detailsHtml}</div>`;
+                renderAnalysis(password, data);
             } else {
                 showToast(data.detail, "danger");
             }
@@ -473,8 +495,10 @@ async function generate() {
                 generator_type: data.type,
                 timestamp: new Date().toISOString()
             };
+            // No cap: older pages are appended by infinite scroll
+            // Marked pending until the next delta sync delivers the stored entry
+            historyEntry.pending = true;
             state.history.unshift(historyEntry);
-            if (state.history.length > 50) state.history.pop();
             renderHistory();
         } else {
             const msg = typeof data.detail === 'object' ? JSON.stringify(data.detail) : data.detail;
@@ -519,20 +543,91 @@ async function copyToClipboard() {
     }
 }
 
+function renderAnalysis(password, data) {
+    elements.passwordDisplay.innerHTML = colorizePassword(password || "No input");
+    elements.entropyValue.textContent = data.entropy || 0;
+
+    let detailsHtml = `Score: ${data.strength?.score}/4<br>`;
+    if (data.strength?.warning) {
+        detailsHtml += `Warning: ${escapeHtml(data.strength.warning)}<br>`;
+    }
+    if (data.strength?.suggestions?.length) {
+        detailsHtml += `Tip: ${escapeHtml(data.strength.suggestions[0])}<br>`;
+    }
+    if (data.breached) {
+        detailsHtml += `<strong>Found in known breaches - do not use.</strong>`;
+    }
+
+    elements.qrContainer.innerHTML = `<div style="text-align:left; font-size:0.85rem; padding:1rem; color:var(--text-primary); line-height:1.5;">${detailsHtml}</div>`;
+}
+
+// Live analysis: a server-side session keeps the matches for the previous
+// prefix, so each keystroke only re-matches what changed
+let analysisSession = null;
+let liveAnalysisTimeout;
+
+function scheduleLiveAnalysis(password) {
+    clearTimeout(liveAnalysisTimeout);
+    if (!password) return;
+    liveAnalysisTimeout = setTimeout(() => liveAnalyze(password), 120);
+}
+
+async function liveAnalyze(password, retried = false) {
+    try {
+        if (!analysisSession) {
+            const res = await fetch('/api/analyze/session', { method: 'POST' });
+            if (!res.ok) return;
+            analysisSession = (await res.json()).session;
+        }
+        const res = await fetch(`/api/analyze/session/${encodeURIComponent(analysisSession)}`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ password })
+        });
+        if (res.status === 404 && !retried) {
+            // Session expired while idle: open a new one
+            analysisSession = null;
+            return liveAnalyze(password, true);
+        }
+        // Ignore stale responses once the user has typed further
+        if (res.ok && state.config.analyze.password === password) {
+            renderAnalysis(password, await res.json());
+        }
+    } catch (err) {
+        // Live feedback is best effort; the Analyze button still works
+    }
+}
+
 // History
+const HISTORY_PAGE_SIZE = 50;
+
+function historyUrl(before) {
+    const query = state.searchQuery;
+
+    let url = `/api/history?limit=${HISTORY_PAGE_SIZE}`;
+    if (query) url += `&search=${encodeURIComponent(query)}`;
+    if (before) url += `&before=${encodeURIComponent(before)}`;
+    return url;
+}
+
 async function fetchHistory() {
     try {
-        // Search
-        const searchInput = document.getElementById('history-search');
-        const query = searchInput ? searchInput.value : '';
-
-        const url = `/api/history?limit=50${query ? `&search=${encodeURIComponent(query)}` : ''}`;
-        const res = await fetch(url, {
-            headers: { 'X-API-Key': AUTH_CONFIG.apiKey }
-        });
+        const query = state.searchQuery;
+        const headers = { 'X-API-Key': AUTH_CONFIG.apiKey };
+        // Unchanged history answers 304 without the server reading anything
+        if (!query && state.historyEtag) headers['If-None-Match'] = state.historyEtag;
+
+        const res = await fetch(historyUrl(null), { headers });
+        if (res.status === 304) {
+            return;
+        }
         if (res.ok) {
             const data = await res.json();
             state.history = data;
+            state.historyCursor = res.headers.get('X-Next-Cursor');
+            state.historyEtag = query ? null : res.headers.get('ETag');
+            state.historySeq = res.headers.get('X-History-Seq');
+            state.historyEpoch = res.headers.get('X-History-Epoch');
             renderHistory();
         } else if (res.status === 401) {
             showToast("History access denied. Please enter your API Key.", "danger");
@@ -543,6 +638,120 @@ async function fetchHistory() {
     }
 }
 
+// Delta sync: download only the rows added since the last known sequence number
+async function syncHistory() {
+    if (state.historySeq === null || state.searchQuery) return fetchHistory();
+    try {
+        const url = `/api/history/since?seq=${encodeURIComponent(state.historySeq)}&epoch=${encodeURIComponent(state.historyEpoch || '')}`;
+        const res = await fetch(url, {
+            headers: { 'X-API-Key': AUTH_CONFIG.apiKey }
+        });
+        if (!res.ok) {
+            if (res.status === 401) updateKeyStatus();
+            return;
+        }
+        const delta = await res.json();
+        if (delta.reset || delta.has_more) {
+            state.historySeq = null;
+            state.historyEtag = null;
+            return fetchHistory();
+        }
+        const confirmed = state.history.filter(item => !item.pending);
+        state.history = delta.entries.concat(confirmed);
+        state.historySeq = delta.seq;
+        state.historyEpoch = delta.epoch;
+        // The first page changed, so the stored ETag no longer applies
+        if (delta.entries.length) state.historyEtag = null;
+        renderHistory();
+    } catch (err) {
+        showToast("Failed to sync history", "danger");
+    }
+}
+
+// Infinite scroll: each page resumes from the server cursor, so deep pages cost the same as the first
+async function fetchMoreHistory() {
+    if (!state.historyCursor || state.historyLoading) return;
+    state.historyLoading = true;
+    try {
+        const res = await fetch(historyUrl(state.historyCursor), {
+            headers: { 'X-API-Key': AUTH_CONFIG.apiKey }
+        });
+        if (res.ok) {
+            const data = await res.json();
+            state.history = state.history.concat(data);
+            state.historyCursor = res.headers.get('X-Next-Cursor');
+            renderHistory();
+        } else if (res.status === 400) {
+            // Stale cursor (e.g. history cleared elsewhere): start over
+            state.historyEtag = null;
+            fetchHistory();
+        }
+    } catch (err) {
+        showToast("Failed to load more history", "danger");
+    } finally {
+        state.historyLoading = false;
+    }
+}
+
+// Live updates: the server pushes redacted metadata for new entries (SSE over fetch,
+// since EventSource cannot send the X-API-Key header)
+let historyStream = null;
+let historySyncTimeout;
+
+async function connectHistoryStream(retryDelay = 1000) {
+    if (historyStream) historyStream.abort();
+    const controller = new AbortController();
+    historyStream = controller;
+
+    try {
+        const res = await fetch('/api/history/stream', {
+            headers: { 'X-API-Key': AUTH_CONFIG.apiKey },
+            signal: controller.signal
+        });
+        // Locked: wait for a new key instead of retrying
+        if (!res.ok || !res.body) return;
+
+        const reader = res.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        retryDelay = 1000;
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            let split;
+            while ((split = buffer.indexOf('\n\n')) !== -1) {
+                handleHistoryEvent(buffer.slice(0, split));
+                buffer = buffer.slice(split + 2);
+            }
+        }
+    } catch (err) {
+        if (controller.signal.aborted) return;
+    }
+    if (historyStream === controller) {
+        setTimeout(() => connectHistoryStream(Math.min(retryDelay * 2, 30000)), retryDelay);
+    }
+}
+
+function handleHistoryEvent(raw) {
+    let event = 'message';
+    let data = '';
+    raw.split('\n').forEach(line => {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) data += line.slice(5).trim();
+    });
+    if (event === 'hello' || !data) return;
+
+    if (event === 'reset' || event === 'resync') {
+        state.historySeq = null;
+        state.historyEtag = null;
+    }
+    // Coalesce bursts into one delta request, and only while history is visible
+    if (state.currentType !== 'history') return;
+    clearTimeout(historySyncTimeout);
+    historySyncTimeout = setTimeout(syncHistory, 100);
+}
+
 function renderHistory() {
     if (!elements.historyList) return;
     elements.historyList.innerHTML = state.history.map((item, index) => `
@@ -630,7 +839,8 @@ async function updateKeyStatus() {
     if (!elements.keyStatusBadge) return;
 
     try {
-        const url = `/api/history?limit=1`;
+        // limit=0 delta: authenticates without transferring any history
+        const url = `/api/history/since?seq=0&limit=0`;
         const res = await fetch(url, {
             headers: { 'X-API-Key': AUTH_CONFIG.apiKey }
         });
@@ -1,16 +1,21 @@
 import sys
 import os
 import io
+import asyncio
 import base64
+import hashlib
+import json
 import logging
 import tempfile
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 
 from fastapi import FastAPI, HTTPException, Query, Header, Depends, Response, Request
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
 # Initialize logger
@@ -42,13 +47,35 @@ from src.generators.recovery_codes import RecoveryCodesGenerator
 from src.generators.pattern import PatternGenerator
 from src.generators.otp import OtpGenerator
 from src.generators.phonetic import PhoneticGenerator
-from src.output.logger import PasswordLogger
 from src.output.qrcode_gen import generate_qr_image, QRCODE_AVAILABLE
-from src.config.presets import PRESETS
+from src.config.presets import get_preset, get_presets, preset_names
 from src.security.entropy import EntropyCalculator
-from src.security.strength_checker import check_strength as zxcvbn_check, is_available as zxcvbn_available
+from src.security.strength_checker import check_strength as zxcvbn_check
+from src.security.breach import check_breached
+from pwa.analysis_sessions import MAX_PASSWORD_LENGTH, AnalysisSessions
+from pwa.history_service import HistoryService
 
-app = FastAPI(title="PassForge API")
+# Single-writer history access shared by all requests in this worker
+history_service = HistoryService()
+
+# Live-typing strength analyzers, one per open analyze session
+analysis_sessions = AnalysisSessions()
+
+# Strength analyses allowed to run at once; further requests wait for a slot
+# without holding a worker thread
+ANALYZE_CONCURRENCY = 4
+analysis_slots: Optional[asyncio.Semaphore] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global analysis_slots
+    # Created here so it belongs to the server's event loop
+    analysis_slots = asyncio.Semaphore(ANALYZE_CONCURRENCY)
+    await history_service.start()
+    yield
+    await history_service.stop()
+
+app = FastAPI(title="PassForge API", lifespan=lifespan)
 
 # Security: Restricted CORS Setup
 # Read from ALLOWED_ORIGINS env var (comma-separated), default to localhost/wildcard for dev
@@ -63,6 +90,7 @@ app.add_middleware(
     allow_origins=allowed_origins,
     allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Prev-Cursor", "ETag", "X-History-Seq", "X-History-Epoch"],
 )
 
 # Security: Basic API Key Authentication
@@ -123,12 +151,16 @@ class GeneratorParams(BaseModel):
     uuid_short: bool = False
 
 
+# Longest password accepted for analysis, by either route
+MAX_ANALYZE_LENGTH = MAX_PASSWORD_LENGTH
+
+
 class PasswordAnalysisRequest(BaseModel):
-    password: str = ""
+    password: str = Field("", max_length=MAX_ANALYZE_LENGTH)
 
 @app.get("/api/presets")
-async def get_presets():
-    return PRESETS
+async def list_presets():
+    return {name: plan.to_dict() for name, plan in get_presets().items()}
 
 @app.get("/api/auth-status")
 async def get_auth_status():
@@ -195,6 +227,7 @@ async def generate(
     use_words: bool = False,
     rec_digits: int = Query(8, ge=4, le=32),
     rec_words_per_code: int = Query(3, ge=2, le=12),
+    preset: str = Query("", max_length=64),
     log: bool = False,
     response: Response = None
 ):
@@ -203,9 +236,23 @@ async def generate(
         response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate"
         response.headers["Pragma"] = "no-cache"
 
+    # Presets are looked up by name only, never by path; only the requested file is compiled
+    plan = None
+    if preset:
+        if preset not in preset_names():
+            raise HTTPException(status_code=404, detail="Unknown preset")
+        try:
+            plan = get_preset(preset)
+        except ValueError as e:
+            logger.warning(f"Invalid preset '{preset}': {e}")
+            raise HTTPException(status_code=400, detail=f"Invalid preset '{preset}'")
+        type = plan.generator
+
     try:
         result = None
-        if type == "random":
+        if plan is not None:
+            result = plan.run(easy_read=easy_read, easy_say=easy_say)
+        elif type == "random":
             gen = RandomPasswordGenerator(easy_read=easy_read, easy_say=easy_say)
             result = gen.generate(
                 length=length, 
@@ -274,8 +321,8 @@ async def generate(
             # Password history is stored in a local JSON Lines file (~/.passforge/pass_history.log).
             # By default, passwords are encrypted using Fernet (AES-128) if the 'cryptography' 
             # package is installed. Ensure the .vault.key file is protected.
-            pwd_logger = PasswordLogger()
-            pwd_logger.log(result)
+            # The write is queued to the history service so it never blocks the event loop.
+            await history_service.submit(result)
 
         # Generate QR if possible using a unique temporary file to avoid race conditions
         qr_base64 = None
@@ -305,6 +352,26 @@ async def generate(
         logger.exception("Internal error in generate route")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+def analysis_response(password: str, res: Any) -> Dict[str, Any]:
+    """Build the /api/analyze response body from a StrengthResult (or None)."""
+    calc = EntropyCalculator()
+    entropy, pool_size = calc.calculate_from_password(password)
+    
+    strength = None
+    if res:
+        strength = {
+            "score": res.score,
+            "warning": res.feedback_warning,
+            "suggestions": res.feedback_suggestions
+        }
+    
+    return {
+        "entropy": round(entropy, 2),
+        "strength": strength,
+        # None when no breach filter has been built
+        "breached": check_breached(password)
+    }
+
 @app.post("/api/analyze")
 async def analyze(request: PasswordAnalysisRequest, response: Response):
     """
@@ -319,43 +386,210 @@ async def analyze(request: PasswordAnalysisRequest, response: Response):
     response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate"
     response.headers["Pragma"] = "no-cache"
 
+    loop = asyncio.get_running_loop()
     try:
-        calc = EntropyCalculator()
-        entropy, pool_size = calc.calculate_from_password(password)
-        
-        strength = None
-        if zxcvbn_available():
-            res = zxcvbn_check(password)
-            if res:
-                strength = {
-                    "score": res.score,
-                    "warning": res.feedback_warning,
-                    "suggestions": res.feedback_suggestions
-                }
-        
-        return {
-            "entropy": round(entropy, 2),
-            "strength": strength
-        }
+        # Falls back to the native analyzer without zxcvbn or for long inputs;
+        # both are CPU-bound, so they run off the event loop
+        async with analysis_slots:
+            return await loop.run_in_executor(
+                None, lambda: analysis_response(password, zxcvbn_check(password, engine="auto"))
+            )
     except Exception:
         logger.exception("Internal error in analyze route")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@app.get("/api/history")
-async def get_history(response: Response, limit: int = 10, search: str = None, _ = Depends(verify_api_key)):
-    """Retrieve password history. Requires X-API-Key authentication."""
-    # Security: Disable caching for history logs
+@app.post("/api/analyze/session")
+async def open_analysis_session(response: Response):
+    """
+    Open a live-typing analysis session.
+    Post each new version of the password to /api/analyze/session/{session}; only
+    the characters that changed since the previous request are re-matched.
+    """
+    response.headers["Cache-Control"] = "no-store"
+    return {"session": analysis_sessions.create(), "ttl": analysis_sessions.ttl}
+
+@app.post("/api/analyze/session/{session}")
+async def analyze_in_session(session: str, request: PasswordAnalysisRequest, response: Response):
+    """Incrementally analyze the session's current password (404 once the session expired)."""
+    password = request.password
+    if not password:
+        raise HTTPException(status_code=400, detail="Password required")
+    
     response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate"
     response.headers["Pragma"] = "no-cache"
+
+    loop = asyncio.get_running_loop()
+    try:
+        async with analysis_slots:
+            res = await loop.run_in_executor(None, analysis_sessions.analyze, session, password)
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Unknown or expired analysis session")
+    
+    try:
+        return analysis_response(password, res)
+    except Exception:
+        logger.exception("Internal error in session analyze route")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@app.delete("/api/analyze/session/{session}")
+async def close_analysis_session(session: str):
+    """Discard a live-typing session and the prefixes it holds."""
+    analysis_sessions.close(session)
+    return {"status": "closed"}
+
+def history_etag(epoch: str, seq: int, variant: str = "") -> str:
+    """Build the history ETag from the store generation, sequence number and query."""
+    digest = hashlib.sha256(f"{epoch}|{variant}".encode("utf-8")).hexdigest()[:12]
+    return f'"{seq}-{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+@app.get("/api/history")
+async def get_history(
+    request: Request,
+    response: Response,
+    limit: int = Query(10, ge=0, le=1000),
+    search: str = None,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    type: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    min_entropy: Optional[float] = None,
+    if_none_match: Optional[str] = Header(None),
+    _ = Depends(verify_api_key)
+):
+    """
+    Retrieve password history. Requires X-API-Key authentication.
+    Optional filters: generator type, ISO date range (since/until) and minimum entropy.
+    
+    Pagination uses opaque cursors: pass the `X-Next-Cursor` response header as
+    `before` to load older entries, or `X-Prev-Cursor` as `after` to load newer ones.
+    
+    Responses carry an ETag derived from the history sequence number; sending it
+    back in `If-None-Match` returns 304 without reading the history.
+    """
+    # Security: Disable caching for history logs (clients keep the ETag themselves)
+    no_cache = {"Cache-Control": "no-store, no-cache, must-revalidate", "Pragma": "no-cache"}
+    response.headers.update(no_cache)
+    
+    epoch, seq = await history_service.version()
+    etag = history_etag(epoch, seq, str(request.query_params))
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, **no_cache})
+    
+    try:
+        page = await history_service.get_page(
+            limit=limit,
+            before=before,
+            after=after,
+            search=search,
+            generator_type=type,
+            since=since,
+            until=until,
+            min_entropy=min_entropy
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    response.headers["ETag"] = etag
+    response.headers["X-History-Seq"] = str(seq)
+    response.headers["X-History-Epoch"] = epoch
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    if page["prev_cursor"]:
+        response.headers["X-Prev-Cursor"] = page["prev_cursor"]
+    return page["entries"]
+
+@app.get("/api/history/since")
+async def get_history_since(
+    request: Request,
+    response: Response,
+    seq: int = Query(..., ge=0),
+    epoch: Optional[str] = None,
+    limit: int = Query(100, ge=0, le=1000),
+    if_none_match: Optional[str] = Header(None),
+    _ = Depends(verify_api_key)
+):
+    """
+    Return only the entries added after `seq` (delta sync). Requires X-API-Key authentication.
+    
+    When the client's copy is stale (history cleared, unknown epoch) the response
+    has `reset: true` and carries the newest entries instead.
+    """
+    no_cache = {"Cache-Control": "no-store, no-cache, must-revalidate", "Pragma": "no-cache"}
+    response.headers.update(no_cache)
+    
+    # The query is part of the tag: the same version answers each `seq` differently
+    variant = str(request.query_params)
+    current_epoch, current_seq = await history_service.version()
+    etag = history_etag(current_epoch, current_seq, variant)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, **no_cache})
+    
+    delta = await history_service.get_since(seq, epoch=epoch, limit=limit)
+    response.headers["ETag"] = history_etag(delta["epoch"], delta["seq"], variant)
+    return delta
+
+# Seconds between keep-alive comments on idle event streams
+SSE_KEEPALIVE_SECONDS = 15
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Serialize one Server-Sent Event."""
+    lines = [f"event: {event}"]
+    if "seq" in data:
+        lines.append(f"id: {data['seq']}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+@app.get("/api/history/stream")
+async def stream_history(request: Request, _ = Depends(verify_api_key)):
+    """
+    Push redacted metadata (timestamp, type, entropy, seq) for each new history entry
+    as a Server-Sent Events stream. Requires X-API-Key authentication.
+    
+    Every client has a bounded queue; a client that falls behind receives a single
+    `resync` event and should catch up through `/api/history/since`.
+    """
+    queue = history_service.subscribe()
+    
+    async def events():
+        try:
+            epoch, seq = await history_service.version()
+            yield format_sse("hello", {"epoch": epoch, "seq": seq})
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event["event"], event["data"])
+        finally:
+            history_service.unsubscribe(queue)
     
-    pwd_logger = PasswordLogger()
-    return pwd_logger.get_history(limit=limit, search=search)
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"}
+    )
 
 @app.delete("/api/history")
 async def clear_history(_ = Depends(verify_api_key)):
     """Clear all history. Requires X-API-Key authentication."""
-    pwd_logger = PasswordLogger()
-    pwd_logger.clear_history()
+    await history_service.clear()
     return {"status": "success"}
 
 # Serve Frontend
@@ -47,6 +47,8 @@ self.addEventListener('activate', (event) => {
 self.addEventListener('fetch', (event) => {
     // Only handle GET requests
     if (event.request.method !== 'GET') return;
+    // Let long-lived event streams go straight to the network
+    if (new URL(event.request.url).pathname === '/api/history/stream') return;
 
     event.respondWith(
         caches.match(event.request).then((cachedResponse) => {
@@ -46,6 +46,22 @@ def create_parser() -> argparse.ArgumentParser:
         help="Enable Paranoid Mode: augment entropy with manual jitter (timing-based)"
     )
     
+    parser.add_argument(
+        "--drbg-key",
+        metavar="KEY",
+        help="Deterministic mode: derive each result from KEY with HMAC-DRBG, so the same key, "
+             "index and settings reproduce the same output ('-' prompts for the key)"
+    )
+    
+    parser.add_argument(
+        "--drbg-index",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Index of the first result in deterministic mode (default: 0); "
+             "jobs can split work by index range"
+    )
+    
     parser.add_argument(
         "--json",
         action="store_true",
@@ -81,7 +97,7 @@ def create_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--check-strength",
         action="store_true",
-        help="Run zxcvbn pattern analysis (requires zxcvbn package)"
+        help="Run pattern analysis (zxcvbn if installed, else the built-in analyzer)"
     )
     
     # Global modifiers
@@ -109,10 +125,23 @@ def create_parser() -> argparse.ArgumentParser:
         help="Ask to copy to clipboard after displaying"
     )
     
+    parser.add_argument(
+        "--reject-breached",
+        action="store_true",
+        help="Regenerate passwords found in the breach filter (see 'breach --build')"
+    )
+    
     parser.add_argument(
         "--preset",
-        choices=["strong", "memorable", "dev", "pin", "web", "wifi", "key"],
-        help="Use a predefined security profile"
+        metavar="NAME",
+        help="Generate from a preset: a built-in profile (strong, memorable, dev, pin, web, "
+             "wifi, key, corporate), a file in ~/.passforge/presets, or a JSON/YAML preset file path"
+    )
+    
+    parser.add_argument(
+        "--list-presets",
+        action="store_true",
+        help="List available presets and exit"
     )
     
     # Subcommands for each generator
@@ -207,6 +236,173 @@ def create_parser() -> argparse.ArgumentParser:
         help="Number of passwords to generate"
     )
     
+    # Derived (stateless) site passwords
+    derive_parser = subparsers.add_parser(
+        "derive",
+        help="Derive site passwords from a master secret (nothing stored)"
+    )
+    derive_parser.add_argument(
+        "sites",
+        nargs="+",
+        metavar="SITE",
+        help="Site names or URLs (the master secret is stretched once for all)"
+    )
+    derive_parser.add_argument(
+        "-u", "--login",
+        type=str,
+        default="",
+        help="Account name on the site"
+    )
+    derive_parser.add_argument(
+        "--counter",
+        type=int,
+        default=1,
+        help="Rotation counter: bump to change a site's password (default: 1)"
+    )
+    derive_parser.add_argument(
+        "--master-stdin",
+        action="store_true",
+        help="Read the master secret from the first line of stdin instead of prompting"
+    )
+    derive_parser.add_argument(
+        "-l", "--length",
+        type=int,
+        default=16,
+        help="Password length (4-1024, default: 16)"
+    )
+    derive_parser.add_argument(
+        "--no-uppercase",
+        action="store_true",
+        help="Exclude uppercase letters"
+    )
+    derive_parser.add_argument(
+        "--no-lowercase",
+        action="store_true",
+        help="Exclude lowercase letters"
+    )
+    derive_parser.add_argument(
+        "--no-digits",
+        action="store_true",
+        help="Exclude digits"
+    )
+    derive_parser.add_argument(
+        "--no-symbols",
+        action="store_true",
+        help="Exclude symbols"
+    )
+    derive_parser.add_argument(
+        "--exclude",
+        type=str,
+        default="",
+        help="Characters to exclude"
+    )
+    derive_parser.add_argument(
+        "--min-upper",
+        type=int,
+        default=0,
+        help="Minimum uppercase characters"
+    )
+    derive_parser.add_argument(
+        "--min-lower",
+        type=int,
+        default=0,
+        help="Minimum lowercase characters"
+    )
+    derive_parser.add_argument(
+        "--min-digits",
+        type=int,
+        default=0,
+        help="Minimum digit characters"
+    )
+    derive_parser.add_argument(
+        "--min-symbols",
+        type=int,
+        default=0,
+        help="Minimum symbol characters"
+    )
+    
+    # Policy-compliant password generator
+    policy_parser = subparsers.add_parser(
+        "policy",
+        help="Generate a password that satisfies a password policy"
+    )
+    policy_parser.add_argument(
+        "-l", "--length",
+        type=int,
+        default=16,
+        help="Password length (1-256, default: 16)"
+    )
+    policy_parser.add_argument(
+        "--symbol-set",
+        type=str,
+        default=None,
+        help="Allowed symbols (default: all; empty string disables symbols)"
+    )
+    policy_parser.add_argument(
+        "--exclude",
+        type=str,
+        default="",
+        help="Characters to exclude"
+    )
+    for flag, name in (("--min-upper", "uppercase"), ("--min-lower", "lowercase"),
+                       ("--min-digits", "digit"), ("--min-symbols", "symbol")):
+        policy_parser.add_argument(
+            flag,
+            type=int,
+            default=0,
+            help=f"Minimum {name} characters"
+        )
+    policy_parser.add_argument(
+        "--min-classes",
+        type=int,
+        default=0,
+        help="Minimum number of distinct character classes (e.g. 3 of 4)"
+    )
+    policy_parser.add_argument(
+        "--max-repeat",
+        type=int,
+        default=0,
+        help="Longest run of one identical character (0 = unlimited)"
+    )
+    policy_parser.add_argument(
+        "--max-class-run",
+        type=int,
+        default=0,
+        help="Longest run of characters from one class (0 = unlimited)"
+    )
+    policy_parser.add_argument(
+        "--first-not",
+        action="append",
+        default=[],
+        choices=["lowercase", "uppercase", "digits", "symbols"],
+        help="Class not allowed as the first character (repeatable)"
+    )
+    policy_parser.add_argument(
+        "--last-not",
+        action="append",
+        default=[],
+        choices=["lowercase", "uppercase", "digits", "symbols"],
+        help="Class not allowed as the last character (repeatable)"
+    )
+    policy_parser.add_argument(
+        "--forbid",
+        action="append",
+        default=[],
+        metavar="SUBSTRING",
+        help="Substring that must not appear (repeatable)"
+    )
+    policy_parser.add_argument(
+        "--case-sensitive",
+        action="store_true",
+        help="Match forbidden substrings case-sensitively"
+    )
+    policy_parser.add_argument(
+        "-n", "--count",
+        type=int,
+        default=1,
+        help="Number of passwords to generate"
+    )
+    
     # Passphrase generator
     phrase_parser = subparsers.add_parser(
         "phrase",
@@ -269,6 +465,17 @@ def create_parser() -> argparse.ArgumentParser:
         default=1,
         help="Number of PINs to generate"
     )
+    pin_parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Print the PINs as one batch with no repeats, one per line"
+    )
+    pin_parser.add_argument(
+        "--issued",
+        type=str,
+        metavar="FILE",
+        help="Issued-set file: never repeat a PIN from earlier batches (implies --batch)"
+    )
     
     # OTP generator
     otp_parser = subparsers.add_parser(
@@ -293,6 +500,63 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Generate QR code for the secret"
     )
+    otp_actions = otp_parser.add_subparsers(dest="otp_action", metavar="ACTION")
+    otp_verify_parser = otp_actions.add_parser(
+        "verify",
+        help="Check a TOTP/HOTP code against a secret (exit code 2 if invalid)"
+    )
+    otp_verify_parser.add_argument(
+        "code",
+        nargs="?",
+        help="Code to check"
+    )
+    otp_verify_parser.add_argument(
+        "--secret",
+        type=str,
+        help="Base32 secret ('-' to prompt without echo)"
+    )
+    otp_verify_parser.add_argument(
+        "--window",
+        type=int,
+        default=1,
+        help="Time steps of clock skew accepted either way, or HOTP look-ahead with --counter (default: 1)"
+    )
+    otp_verify_parser.add_argument(
+        "--counter",
+        type=int,
+        help="Verify an HOTP code against this counter instead of the time"
+    )
+    otp_verify_parser.add_argument(
+        "--time",
+        type=int,
+        metavar="UNIX",
+        help="Verify at this Unix time instead of now"
+    )
+    otp_verify_parser.add_argument(
+        "--digits",
+        type=int,
+        default=6,
+        choices=[6, 7, 8],
+        help="OTP digit length (default: 6)"
+    )
+    otp_verify_parser.add_argument(
+        "--period",
+        type=int,
+        default=30,
+        help="TOTP time period in seconds (default: 30)"
+    )
+    otp_verify_parser.add_argument(
+        "--algorithm",
+        choices=["SHA1", "SHA256", "SHA512"],
+        default="SHA1",
+        help="HMAC algorithm (default: SHA1)"
+    )
+    otp_verify_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read 'SECRET CODE' lines from stdin and answer each with 'OK STEP' or 'FAIL' "
+             "(replays within the stream are refused)"
+    )
     
     # UUID generator
     uuid_parser = subparsers.add_parser(
@@ -460,6 +724,95 @@ def create_parser() -> argparse.ArgumentParser:
         default=4,
         help="Characters per segment (2-32, default: 4)"
     )
+    license_parser.add_argument(
+        "--checksum",
+        action="store_true",
+        help="Append a Damm check character (catches typos and swapped characters)"
+    )
+    license_parser.add_argument(
+        "--issue",
+        type=int,
+        metavar="N",
+        help="Issue N keys guaranteed unique against the license index (checksummed)"
+    )
+    license_parser.add_argument(
+        "--verify",
+        type=str,
+        metavar="KEY",
+        help="Check whether KEY was issued (exit code 2 if not)"
+    )
+    license_parser.add_argument(
+        "--index",
+        type=str,
+        metavar="PATH",
+        help="License index file (default: ~/.passforge/licenses.idx)"
+    )
+    license_parser.add_argument(
+        "-o", "--output",
+        type=str,
+        metavar="FILE",
+        help="Write issued keys to FILE instead of stdout"
+    )
+    
+    # Voucher codes
+    voucher_parser = subparsers.add_parser(
+        "voucher",
+        help="Issue numbered voucher codes, unique by construction"
+    )
+    voucher_parser.add_argument(
+        "-n", "--count",
+        type=int,
+        default=1,
+        help="Number of codes to issue (default: 1)"
+    )
+    voucher_parser.add_argument(
+        "--start",
+        type=int,
+        default=0,
+        metavar="I",
+        help="First voucher number; give processes or machines disjoint ranges (default: 0)"
+    )
+    voucher_parser.add_argument(
+        "--campaign",
+        type=str,
+        metavar="PATH",
+        help="Campaign file with the key and code format, created if missing "
+             "(default: ~/.passforge/voucher-campaign.json)"
+    )
+    voucher_parser.add_argument(
+        "--segments",
+        type=int,
+        default=4,
+        help="Segments per code, for a new campaign (1-64, default: 4)"
+    )
+    voucher_parser.add_argument(
+        "--segment-length",
+        type=int,
+        default=4,
+        help="Characters per segment, for a new campaign (1-32, default: 4)"
+    )
+    voucher_parser.add_argument(
+        "--alphabet",
+        type=str,
+        help="Code characters, for a new campaign (default: the license key alphabet)"
+    )
+    voucher_parser.add_argument(
+        "--checksum",
+        action="store_true",
+        help="Append a Damm check character, for a new campaign (license key alphabet only)"
+    )
+    voucher_parser.add_argument(
+        "--lookup",
+        type=str,
+        metavar="CODE",
+        help="Print the voucher number of CODE (exit code 2 if it is not a code of the campaign)"
+    )
+    voucher_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes (default: 1)"
+    )
     
     # Recovery codes
     recovery_parser = subparsers.add_parser(
@@ -483,6 +836,17 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Use word-based codes instead of numeric"
     )
+    recovery_parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Stream any number of distinct codes, one per line (no 100-code limit)"
+    )
+    recovery_parser.add_argument(
+        "--issued",
+        type=str,
+        metavar="FILE",
+        help="Issued-set file: never repeat a code from earlier batches (implies --batch)"
+    )
     
     # Pattern generator
     pattern_parser = subparsers.add_parser(
@@ -526,6 +890,107 @@ def create_parser() -> argparse.ArgumentParser:
         nargs="?",
         help="The password to analyze (will be prompted if not provided)"
     )
+    analyze_parser.add_argument(
+        "--engine",
+        choices=["auto", "zxcvbn", "native"],
+        default="auto",
+        help="Pattern analyzer: zxcvbn, the built-in linear-time analyzer, or auto (default: auto)"
+    )
+    
+    # Batch audit
+    audit_parser = subparsers.add_parser(
+        "audit",
+        help="Audit a file of passwords (entropy, pattern and breach checks)"
+    )
+    audit_parser.add_argument(
+        "file",
+        help="File with one password per line, or '-' for stdin"
+    )
+    audit_parser.add_argument(
+        "--format",
+        choices=["jsonl", "csv"],
+        default="jsonl",
+        help="Per-password output format (default: jsonl)"
+    )
+    audit_parser.add_argument(
+        "--output", "-o",
+        type=str,
+        help="Write per-password rows to this file (default: stdout)"
+    )
+    audit_parser.add_argument(
+        "--summary",
+        type=str,
+        help="Also write the aggregate summary as JSON to this file"
+    )
+    audit_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes (default: CPU count)"
+    )
+    audit_parser.add_argument(
+        "--engine",
+        choices=["auto", "zxcvbn", "native"],
+        default="auto",
+        help="Pattern analyzer (default: auto)"
+    )
+    audit_parser.add_argument(
+        "--column",
+        type=str,
+        help="Read CSV input and take passwords from this column (name or 0-based index)"
+    )
+    audit_parser.add_argument(
+        "--weakest",
+        type=int,
+        default=10,
+        help="Number of weakest passwords to list in the summary (default: 10)"
+    )
+    audit_parser.add_argument(
+        "--no-breach",
+        action="store_true",
+        help="Skip breach-filter screening"
+    )
+    audit_parser.add_argument(
+        "--show-passwords",
+        action="store_true",
+        help="Include plaintext passwords in rows and the summary (Caution!)"
+    )
+    
+    # Breach screening
+    breach_parser = subparsers.add_parser(
+        "breach",
+        help="Screen passwords against an offline breach corpus (Bloom filter)"
+    )
+    breach_parser.add_argument(
+        "password",
+        nargs="?",
+        help="Password to screen (omit to show filter details)"
+    )
+    breach_parser.add_argument(
+        "--build",
+        type=str,
+        metavar="CORPUS",
+        help="Build the filter from a SHA-1 dump (HIBP 'HEX:COUNT' lines)"
+    )
+    breach_parser.add_argument(
+        "--plaintext",
+        action="store_true",
+        help="The corpus lists passwords rather than SHA-1 hashes"
+    )
+    breach_parser.add_argument(
+        "--fp-rate",
+        type=float,
+        help="Target false-positive rate when building (default: 0.001)"
+    )
+    breach_parser.add_argument(
+        "--expected",
+        type=int,
+        help="Number of corpus entries (counted if omitted)"
+    )
+    breach_parser.add_argument(
+        "--filter",
+        type=str,
+        help="Filter file (default: config 'breach.filter' or ~/.passforge/breach.bloom)"
+    )
     
     # History viewer
     history_parser = subparsers.add_parser(
@@ -549,6 +1014,33 @@ def create_parser() -> argparse.ArgumentParser:
         type=str,
         help="Search in history"
     )
+    history_parser.add_argument(
+        "--type",
+        type=str,
+        dest="gen_type",
+        help="Only show entries from this generator type (e.g. random, pin)"
+    )
+    history_parser.add_argument(
+        "--since",
+        type=str,
+        help="Only show entries on/after this ISO date (e.g. 2026-01-31)"
+    )
+    history_parser.add_argument(
+        "--until",
+        type=str,
+        help="Only show entries before this ISO date"
+    )
+    history_parser.add_argument(
+        "--min-entropy",
+        type=float,
+        help="Only show entries with at least this many bits of entropy"
+    )
+    history_parser.add_argument(
+        "--backend",
+        type=str,
+        choices=["jsonl", "sqlite"],
+        help="History storage backend (default: config 'history.backend')"
+    )
     history_parser.add_argument(
         "--redact",
         action="store_true",
@@ -600,7 +1092,7 @@ def main(args: Optional[List[str]] = None):
     parsed = parser.parse_args(args)
     
     # No command, no interactive flag, and no preset = show help
-    if not parsed.command and not parsed.interactive and not parsed.preset:
+    if not parsed.command and not parsed.interactive and not parsed.preset and not parsed.list_presets:
         print_banner()
         parser.print_help()
         return 0
@@ -5,7 +5,7 @@ Command Handler - Routes CLI commands to appropriate generators.
 import json
 import sys
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterator, Optional
 from colorama import Fore, Style
 
 from .generators.random_password import RandomPasswordGenerator
@@ -14,6 +14,31 @@ from .output.formatter import colorize_password
 from .security.vault import Vault
 
 
+# Commands that check, list or report but never generate
+CHECK_COMMANDS = {"analyze", "check", "audit", "breach", "history", "h"}
+
+# Commands whose output is a pure function of their inputs
+DETERMINISTIC_COMMANDS = {"derive"}
+
+# Options that pick or screen random draws: (flag, args attribute)
+RANDOM_SOURCE_OPTIONS = (
+    ("--reject-breached", "reject_breached"),
+    ("--paranoid", "paranoid"),
+    ("--drbg-key", "drbg_key"),
+)
+
+
+def generates(args: Any) -> bool:
+    """Whether the command draws randomness (and so needs --drbg-key/--paranoid streams)."""
+    if args.command in CHECK_COMMANDS or args.command in DETERMINISTIC_COMMANDS:
+        return False
+    if getattr(args, 'list_presets', False):
+        return False
+    if args.command == "otp" and getattr(args, 'otp_action', None) == "verify":
+        return False
+    # license --verify, voucher --lookup
+    return not (getattr(args, 'verify', None) or getattr(args, 'lookup', None))
+
 
 def handle_command(args: Any) -> int:
     """
@@ -26,12 +51,22 @@ def handle_command(args: Any) -> int:
         Exit code (0 for success, 1 for error)
     """
     try:
-        # Apply preset if provided
-        if hasattr(args, 'preset') and args.preset:
-            args = apply_preset(args)
+        # Deterministic (--drbg-key) or paranoid random sources, one per result;
+        # commands that only check or list never prompt for a key or jitter
+        args.rng_streams = random_streams(args) if generates(args) else None
+        
+        # A preset replaces the subcommand's settings
+        if getattr(args, 'list_presets', False):
+            return handle_list_presets(args)
+        if getattr(args, 'preset', None):
+            return handle_preset(args)
             
         if args.command in ["random", "r"]:
             return handle_random(args)
+        elif args.command == "policy":
+            return handle_policy(args)
+        elif args.command == "derive":
+            return handle_derive(args)
         elif args.command in ["phrase", "p"]:
             return handle_phrase(args)
         elif args.command == "pin":
@@ -50,6 +85,8 @@ def handle_command(args: Any) -> int:
             return handle_wifi(args)
         elif args.command == "license":
             return handle_license(args)
+        elif args.command == "voucher":
+            return handle_voucher(args)
         elif args.command == "recovery":
             return handle_recovery(args)
         elif args.command == "pattern":
@@ -62,6 +99,10 @@ def handle_command(args: Any) -> int:
             return handle_history(args)
         elif args.command in ["analyze", "check"]:
             return handle_analyze(args)
+        elif args.command == "audit":
+            return handle_audit(args)
+        elif args.command == "breach":
+            return handle_breach(args)
         else:
             print(f"{Fore.RED}Unknown command: {args.command}{Style.RESET_ALL}")
             return 1
@@ -77,94 +118,87 @@ def handle_command(args: Any) -> int:
         return 1
 
 
-def apply_preset(args: Any) -> Any:
-    """Apply preset profile settings to args."""
-    from .config.presets import PRESETS
+def handle_preset(args: Any) -> int:
+    """Handle generation from a compiled preset plan."""
+    from .config.presets import resolve_preset
     
-    preset_name = args.preset
-    if preset_name not in PRESETS:
-        return args
-        
-    preset_data = PRESETS[preset_name]
-    
-    # Set command if not already set
-    if not args.command:
-        args.command = preset_data.get("command")
-
-    # Define all possible attributes and their default values
-    # to avoid AttributeError when a preset is used without a subcommand
-    defaults = {
-        "length": 16,
-        "no_uppercase": False,
-        "no_lowercase": False,
-        "no_digits": False,
-        "no_symbols": False,
-        "include": "",
-        "exclude": "",
-        "no_repeats": False,
-        "min_upper": 0,
-        "min_lower": 0,
-        "min_digits": 0,
-        "min_symbols": 0,
-        "words": 4,
-        "separator": "-",
-        "capitalize": False,
-        "uppercase": False,
-        "alternate": False,
-        "wordlist": None,
-        "bytes": 32,
-        "url_safe": False,
-        "bits": 256,
-        "hex": False,
-        "simple": False,
-        "segments": 4,
-        "segment_length": 4,
-        "digits": 6,
-        "period": 30,
-        "qr": False,
-        "upper": False,
-        "grid": 3,
-        "balanced": False,
-        "count": 1
-    }
+    plan = resolve_preset(args.preset)
+    if args.rng_streams is None:
+        generator = plan.generator_for(
+            easy_read=args.easy_read,
+            easy_say=args.easy_say
+        )
+    else:
+        # A private instance: its random source is swapped per result
+        generator = plan.generator_class(
+            easy_read=args.easy_read,
+            easy_say=args.easy_say
+        )
+    
+    for i in range(getattr(args, 'count', 1)):
+        result = generate_result(generator, args, **plan.kwargs)
+        output_result(result, args)
+    
+    return 0
 
-    # Set defaults if attribute doesn't exist
-    for attr, default_val in defaults.items():
-        if not hasattr(args, attr):
-            setattr(args, attr, default_val)
-        
-    # Map of preset keys to arg attributes
-    mapping = {
-        "length": "length",
-        "words": "words",
-        "uppercase": "no_uppercase", # Inverted logic in args: no_uppercase
-        "lowercase": "no_lowercase",
-        "digits": "no_digits",
-        "symbols": "no_symbols",
-        "min_uppercase": "min_upper",
-        "min_lowercase": "min_lower",
-        "min_digits": "min_digits",
-        "min_symbols": "min_symbols",
-        "no_repeats": "no_repeats",
-        "simple": "simple",
-        "segments": "segments",
-        "segment_length": "segment_length",
-        "capitalize": "capitalize",
-        "bits": "bits",
-        "bytes": "bytes"
-    }
+
+def handle_list_presets(args: Any) -> int:
+    """List available presets."""
+    from .config.presets import get_presets
     
-    for preset_key, arg_attr in mapping.items():
-        if preset_key in preset_data:
-            val = preset_data[preset_key]
-            
-            # Handle inverted flags
-            if preset_key in ["uppercase", "lowercase", "digits", "symbols"]:
-                setattr(args, arg_attr, not val)
-            else:
-                setattr(args, arg_attr, val)
-                
-    return args
+    presets = get_presets()
+    if args.json:
+        print(json.dumps({name: plan.to_dict() for name, plan in presets.items()}, indent=2))
+        return 0
+    
+    width = max((len(name) for name in presets), default=0)
+    for name, plan in presets.items():
+        print(f"{Fore.CYAN}{name:<{width}}{Style.RESET_ALL}  {plan.generator:<13}  {plan.description}")
+    return 0
+
+
+def random_streams(args: Any) -> Optional[Iterator[Any]]:
+    """
+    Random sources for successive results, or None for the system CSPRNG.
+    
+    --drbg-key yields HMAC-DRBG stream --drbg-index, then the next index for
+    each further result. --paranoid draws every result from the session's
+    entropy accumulator, with keyboard jitter collected once (or restored
+    from a recent seed file).
+    """
+    key_text = getattr(args, 'drbg_key', None)
+    paranoid = getattr(args, 'paranoid', False)
+    if key_text:
+        if paranoid:
+            raise ValueError("--paranoid cannot be combined with --drbg-key")
+        if key_text == "-":
+            import getpass
+            key_text = getpass.getpass("DRBG key: ")
+            if not key_text:
+                raise ValueError("DRBG key must not be empty")
+        from .generators.drbg import KeyedRandom, derive_key
+        return KeyedRandom(derive_key(key_text)).streams(getattr(args, 'drbg_index', 0))
+    if paranoid:
+        import itertools
+        from .security.jitter import paranoid_random
+        return itertools.repeat(paranoid_random())
+    return None
+
+
+def generate_result(generator: Any, args: Any, **kwargs) -> Any:
+    """Generate once, or until the candidate passes breach screening (--reject-breached)."""
+    streams = getattr(args, 'rng_streams', None)
+    if streams is not None:
+        generator.rng = next(streams)
+    
+    if not getattr(args, 'reject_breached', False):
+        return generator.generate(**kwargs)
+    
+    from .security.breach import get_breach_filter
+    breach_filter = get_breach_filter()
+    if breach_filter is None:
+        raise ValueError("--reject-breached needs a breach filter; build one with 'passforge breach --build CORPUS'")
+    return generator.generate_screened(breach_filter.is_breached, **kwargs)
 
 
 def handle_random(args: Any) -> int:
@@ -176,13 +210,8 @@ def handle_random(args: Any) -> int:
     
     count = getattr(args, 'count', 1)
     
-    custom_seed = None
-    if getattr(args, 'paranoid', False):
-        from .security.jitter import collect_jitter
-        custom_seed = collect_jitter()
-    
     for i in range(count):
-        result = generator.generate(
+        result = generate_result(generator, args,
             length=args.length,
             uppercase=not args.no_uppercase,
             lowercase=not args.no_lowercase,
@@ -195,8 +224,7 @@ def handle_random(args: Any) -> int:
             min_lowercase=args.min_lower,
             min_digits=args.min_digits,
             min_symbols=args.min_symbols,
-            balanced=args.balanced,
-            custom_seed=custom_seed
+            balanced=args.balanced
         )
         
         output_result(result, args)
@@ -204,6 +232,86 @@ def handle_random(args: Any) -> int:
     return 0
 
 
+def handle_policy(args: Any) -> int:
+    """Handle policy-compliant password generation."""
+    from .generators.policy import PasswordPolicy, PolicyGenerator
+    
+    generator = PolicyGenerator(
+        easy_read=args.easy_read,
+        easy_say=args.easy_say
+    )
+    
+    rules = {
+        "length": args.length,
+        "exclude": args.exclude,
+        "min_uppercase": args.min_upper,
+        "min_lowercase": args.min_lower,
+        "min_digits": args.min_digits,
+        "min_symbols": args.min_symbols,
+        "min_classes": args.min_classes,
+        "max_repeat": args.max_repeat,
+        "max_class_run": args.max_class_run,
+        "first_not": args.first_not,
+        "last_not": args.last_not,
+        "forbidden": args.forbid,
+        "case_insensitive": not args.case_sensitive,
+    }
+    if args.symbol_set is not None:
+        rules["symbols"] = args.symbol_set
+    policy = PasswordPolicy.from_dict(rules)
+    
+    for i in range(getattr(args, 'count', 1)):
+        result = generate_result(generator, args, policy=policy)
+        output_result(result, args)
+    
+    return 0
+
+
+def handle_derive(args: Any) -> int:
+    """Handle derived (stateless) site passwords."""
+    from .generators.derive import DerivedPasswordGenerator
+    
+    # Checked before the master prompt: none of these can change a derived password
+    unsupported = [flag for flag, name in RANDOM_SOURCE_OPTIONS if getattr(args, name, None)]
+    if unsupported:
+        raise ValueError(f"derive does not support {', '.join(unsupported)}: "
+                         "its passwords depend only on the master secret and site")
+    
+    if getattr(args, 'master_stdin', False):
+        master = sys.stdin.readline().rstrip("\r\n")
+    else:
+        import getpass
+        master = getpass.getpass("Master secret: ")
+    
+    generator = DerivedPasswordGenerator(
+        easy_read=args.easy_read,
+        easy_say=args.easy_say
+    )
+    
+    for site in args.sites:
+        result = generate_result(generator, args,
+            master=master,
+            site=site,
+            login=args.login,
+            counter=args.counter,
+            length=args.length,
+            uppercase=not args.no_uppercase,
+            lowercase=not args.no_lowercase,
+            digits=not args.no_digits,
+            symbols=not args.no_symbols,
+            exclude_chars=args.exclude,
+            min_uppercase=args.min_upper,
+            min_lowercase=args.min_lower,
+            min_digits=args.min_digits,
+            min_symbols=args.min_symbols
+        )
+        if not args.json:
+            print(f"{Fore.CYAN}{result.parameters['site']}{Style.RESET_ALL}", end="")
+        output_result(result, args)
+    
+    return 0
+
+
 def handle_phrase(args: Any) -> int:
     """Handle passphrase generation."""
     from .generators.passphrase import PassphraseGenerator
@@ -217,7 +325,7 @@ def handle_phrase(args: Any) -> int:
     wordlist_path = getattr(args, 'wordlist', None)
     
     for i in range(count):
-        result = generator.generate(
+        result = generate_result(generator, args,
             word_count=args.words,
             separator=args.separator,
             capitalize=args.capitalize,
@@ -238,8 +346,12 @@ def handle_pin(args: Any) -> int:
     generator = PinGenerator()
     count = getattr(args, 'count', 1)
     
+    if getattr(args, 'batch', False) or getattr(args, 'issued', None):
+        generator.rng = next(args.rng_streams) if args.rng_streams is not None else generator.rng
+        return output_batch(generator.generate_batch(count, args.length, issued_path(args)), args)
+    
     for i in range(count):
-        result = generator.generate(length=args.length)
+        result = generate_result(generator, args, length=args.length)
         output_result(result, args)
     
     return 0
@@ -253,7 +365,7 @@ def handle_pronounce(args: Any) -> int:
     count = getattr(args, 'count', 1)
     
     for i in range(count):
-        result = generator.generate(length=args.length)
+        result = generate_result(generator, args, length=args.length)
         output_result(result, args)
     
     return 0
@@ -267,7 +379,7 @@ def handle_leet(args: Any) -> int:
     count = getattr(args, 'count', 1)
     
     for i in range(count):
-        result = generator.generate(
+        result = generate_result(generator, args,
             word_count=args.words,
             separator=args.separator
         )
@@ -286,7 +398,7 @@ def handle_uuid(args: Any) -> int:
     short = getattr(args, 'short', False)
     
     for i in range(count):
-        result = generator.generate(
+        result = generate_result(generator, args,
             version=version,
             short=short,
             uppercase=args.upper
@@ -303,7 +415,7 @@ def handle_base64(args: Any) -> int:
     generator = Base64SecretGenerator()
     url_safe = getattr(args, 'url_safe', False)
     
-    result = generator.generate(
+    result = generate_result(generator, args,
         byte_length=args.bytes,
         url_safe=url_safe
     )
@@ -319,7 +431,7 @@ def handle_jwt(args: Any) -> int:
     generator = JwtSecretGenerator()
     use_hex = getattr(args, 'hex', False)
     
-    result = generator.generate(
+    result = generate_result(generator, args,
         bits=args.bits,
         output_hex=use_hex
     )
@@ -335,7 +447,7 @@ def handle_wifi(args: Any) -> int:
     generator = WifiKeyGenerator()
     simple = getattr(args, 'simple', False)
     
-    result = generator.generate(
+    result = generate_result(generator, args,
         length=args.length,
         simple=simple
     )
@@ -348,17 +460,98 @@ def handle_license(args: Any) -> int:
     """Handle license key generation."""
     from .generators.license_key import LicenseKeyGenerator
     
+    if getattr(args, 'issue', None) is not None or getattr(args, 'verify', None):
+        return handle_license_index(args)
+    
     generator = LicenseKeyGenerator()
     
-    result = generator.generate(
+    result = generate_result(generator, args,
         segments=args.segments,
-        segment_length=args.segment_length
+        segment_length=args.segment_length,
+        add_checksum=getattr(args, 'checksum', False)
     )
     output_result(result, args)
     
     return 0
 
 
+def handle_license_index(args: Any) -> int:
+    """Issue unique license keys in bulk, or verify a key against the license index."""
+    from .generators.drbg import SYSTEM_RANDOM
+    from .generators.license_index import LicenseIndex, default_index_path
+    from pathlib import Path
+    
+    index_path = Path(args.index).expanduser() if getattr(args, 'index', None) else default_index_path()
+    key = getattr(args, 'verify', None)
+    
+    if key:
+        if not index_path.exists():
+            print(f"{Fore.YELLOW}No license index at {index_path}. Issue keys with: passforge license --issue N{Style.RESET_ALL}")
+            return 1
+        with LicenseIndex(index_path) as index:
+            if index.verify(key):
+                print(f"{Fore.GREEN}[OK] Issued license key.{Style.RESET_ALL}")
+                return 0
+        print(f"{Fore.RED}[!] Not an issued license key.{Style.RESET_ALL}")
+        return 2
+    
+    streams = getattr(args, 'rng_streams', None)
+    rng = next(streams) if streams is not None else SYSTEM_RANDOM
+    output_path = getattr(args, 'output', None)
+    out = open(output_path, "w", encoding="utf-8") if output_path else sys.stdout
+    try:
+        index = LicenseIndex.issue(
+            index_path,
+            args.issue,
+            lambda issued: out.write(issued + "\n"),
+            segments=args.segments,
+            segment_length=args.segment_length,
+            rng=rng,
+            progress=lambda n: print(f"  {n:,} keys...", file=sys.stderr, flush=True)
+        )
+    finally:
+        if output_path:
+            out.close()
+    with index:
+        print(f"{Fore.GREEN}Issued {args.issue:,} keys; {index.count:,} in {index.path}.{Style.RESET_ALL}", file=sys.stderr)
+    return 0
+
+
+def handle_voucher(args: Any) -> int:
+    """Issue a range of voucher codes from a campaign, or look up a code's number."""
+    from .generators.drbg import SYSTEM_RANDOM
+    from .generators.license_key import LICENSE_CHARS
+    from .generators.voucher import VoucherCampaign, default_campaign_path
+    from pathlib import Path
+    
+    path = Path(args.campaign).expanduser() if getattr(args, 'campaign', None) else default_campaign_path()
+    code = getattr(args, 'lookup', None)
+    
+    if code:
+        if not path.exists():
+            print(f"{Fore.YELLOW}No voucher campaign at {path}. Issue codes with: passforge voucher -n N{Style.RESET_ALL}")
+            return 1
+        index = VoucherCampaign.load(path).index_of(code)
+        if args.json:
+            print(json.dumps({"code": code, "index": index}, indent=2))
+        elif index is not None:
+            print(f"{Fore.GREEN}[OK] Voucher #{index:,}.{Style.RESET_ALL}")
+        else:
+            print(f"{Fore.RED}[!] Not a code of this campaign.{Style.RESET_ALL}")
+        return 0 if index is not None else 2
+    
+    streams = getattr(args, 'rng_streams', None)
+    campaign = VoucherCampaign.open(
+        path,
+        segments=args.segments,
+        segment_length=args.segment_length,
+        alphabet=getattr(args, 'alphabet', None) or LICENSE_CHARS,
+        add_checksum=getattr(args, 'checksum', False),
+        rng=next(streams) if streams is not None else SYSTEM_RANDOM
+    )
+    return output_batch(campaign.issue(args.start, args.count, getattr(args, 'workers', 1)), args)
+
+
 def handle_recovery(args: Any) -> int:
     """Handle recovery codes generation."""
     from .generators.recovery_codes import RecoveryCodesGenerator
@@ -369,8 +562,19 @@ def handle_recovery(args: Any) -> int:
     length = args.length
     if use_words and length == 10:
         length = 3
+    
+    if getattr(args, 'batch', False) or getattr(args, 'issued', None):
+        generator.rng = next(args.rng_streams) if args.rng_streams is not None else generator.rng
+        codes = generator.generate_batch(
+            args.count,
+            use_words=use_words,
+            digits=length if not use_words else 8,
+            words_per_code=length if use_words else 3,
+            issued_path=issued_path(args)
+        )
+        return output_batch(codes, args)
         
-    result = generator.generate(
+    result = generate_result(generator, args,
         count=args.count,
         use_words=use_words,
         digits=length if not use_words else 8,
@@ -381,13 +585,31 @@ def handle_recovery(args: Any) -> int:
     return 0
 
 
+def issued_path(args: Any) -> Optional[Any]:
+    """The --issued file, if given."""
+    from pathlib import Path
+    path = getattr(args, 'issued', None)
+    return Path(path).expanduser() if path else None
+
+
+def output_batch(codes: Iterator[str], args: Any) -> int:
+    """Print a batch of codes, one per line (or as a JSON list with --json)."""
+    if args.json:
+        print(json.dumps(list(codes), indent=2))
+        return 0
+    write = sys.stdout.write
+    for code in codes:
+        write(code + "\n")
+    return 0
+
+
 def handle_pattern(args: Any) -> int:
     """Handle pattern generation."""
     from .generators.pattern import PatternGenerator
     
     generator = PatternGenerator()
     
-    result = generator.generate(grid_size=args.grid)
+    result = generate_result(generator, args, grid_size=args.grid)
     output_result(result, args)
     
     return 0
@@ -397,10 +619,13 @@ def handle_otp(args: Any) -> int:
     """Handle OTP secret and code generation."""
     from .generators.otp import OtpGenerator
     
+    if getattr(args, 'otp_action', None) == "verify":
+        return handle_otp_verify(args)
+    
     generator = OtpGenerator()
     generate_qr = getattr(args, 'qr', False)
     
-    result = generator.generate(
+    result = generate_result(generator, args,
         digits=args.digits,
         period=args.period
     )
@@ -431,6 +656,66 @@ def handle_otp(args: Any) -> int:
     return 0
 
 
+def handle_otp_verify(args: Any) -> int:
+    """Verify a TOTP/HOTP code, or a stream of 'SECRET CODE' lines from stdin."""
+    from .generators.otp import OtpKey
+    
+    options = {"digits": args.digits, "period": args.period, "algorithm": args.algorithm}
+    if args.stream:
+        return verify_otp_stream(sys.stdin, sys.stdout, args.window, args.time, options)
+    
+    if not args.code:
+        raise ValueError("Give the code to verify (or --stream)")
+    secret = args.secret
+    if not secret or secret == "-":
+        import getpass
+        secret = getpass.getpass("OTP secret (Base32): ")
+    key = OtpKey.from_base32(secret, **options)
+    
+    if args.counter is not None:
+        expected = args.counter
+        match = key.verify_hotp(args.code, args.counter, look_ahead=args.window)
+    else:
+        expected = key.counter_at(args.time)
+        match = key.verify(args.code, timestamp=args.time, window=args.window)
+    
+    if args.json:
+        print(json.dumps({
+            "valid": match is not None,
+            "counter": match,
+            "drift": None if match is None else match - expected
+        }, indent=2))
+    elif match is not None:
+        print(f"{Fore.GREEN}[OK] Valid code (counter {match}, drift {match - expected:+d}).{Style.RESET_ALL}")
+    else:
+        print(f"{Fore.RED}[!] Invalid code.{Style.RESET_ALL}")
+    return 0 if match is not None else 2
+
+
+def verify_otp_stream(source: Any, sink: Any, window: int, timestamp: Optional[int], options: dict) -> int:
+    """
+    Answer 'SECRET CODE' lines with 'OK STEP' or 'FAIL', one line each.
+    
+    Keys come from the otp_key cache, and a ReplayGuard refuses a code
+    already accepted for the same secret, however the secret is spelled.
+    """
+    from .generators.otp import ReplayGuard, otp_key
+    
+    guard = ReplayGuard()
+    for line in source:
+        fields = line.split()
+        match = None
+        if len(fields) == 2:
+            secret, code = fields
+            try:
+                match = guard.verify(otp_key(secret, **options), code, timestamp, window)
+            except ValueError:
+                match = None
+        sink.write(f"OK {match}\n" if match is not None else "FAIL\n")
+        sink.flush()
+    return 0
+
+
 def handle_phonetic(args: Any) -> int:
     """Handle phonetic alphabet generation."""
     from .generators.phonetic import PhoneticGenerator
@@ -439,7 +724,7 @@ def handle_phonetic(args: Any) -> int:
     length = getattr(args, 'length', 8)
     
     generator = PhoneticGenerator()
-    result = generator.generate(text=text, length=length)
+    result = generate_result(generator, args, text=text, length=length)
     
     return output_result(result, args)
 
@@ -472,18 +757,125 @@ def handle_analyze(args: Any) -> int:
     )
     print(report)
     
-    # zxcvbn Report
+    # Pattern Report
     from .security.strength_checker import check_strength as zxcvbn_check, format_strength_report, is_available
-    if is_available():
-        strength_result = zxcvbn_check(password)
+    engine = getattr(args, 'engine', 'auto')
+    if engine == "zxcvbn" and not is_available():
+        print(f"\n{Fore.YELLOW}Note: Install 'zxcvbn' for deep pattern analysis, or use --engine native.{Style.RESET_ALL}")
+    else:
+        strength_result = zxcvbn_check(password, engine=engine)
         if strength_result:
             print(format_strength_report(strength_result, no_color))
-    else:
-        print(f"\n{Fore.YELLOW}Note: Install 'zxcvbn' for deep pattern analysis.{Style.RESET_ALL}")
+    
+    # Breach screening (only when a filter has been built)
+    from .security.breach import check_breached
+    breached = check_breached(password)
+    if breached:
+        print(f"\n{Fore.RED}[!] Found in the breached-password corpus. Do not use this password.{Style.RESET_ALL}")
+    elif breached is False:
+        print(f"\n{Fore.GREEN}[OK] Not found in the breached-password corpus.{Style.RESET_ALL}")
         
     return 0
 
 
+def handle_audit(args: Any) -> int:
+    """Audit a file (or stdin) of passwords and print aggregate results."""
+    import time
+    from .security.audit import AuditSummary, AuditWriter, audit_passwords, read_candidates
+    
+    show_passwords = getattr(args, 'show_passwords', False)
+    source = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8", errors="replace", newline="")
+    output_path = getattr(args, 'output', None)
+    out = open(output_path, "w", encoding="utf-8", newline="") if output_path else sys.stdout
+    
+    summary = AuditSummary(weakest=getattr(args, 'weakest', 10))
+    writer = AuditWriter(out, format=getattr(args, 'format', 'jsonl'), include_passwords=show_passwords)
+    started = time.monotonic()
+    try:
+        records = audit_passwords(
+            read_candidates(source, getattr(args, 'column', None)),
+            workers=getattr(args, 'workers', None),
+            engine=getattr(args, 'engine', 'auto'),
+            breach=not getattr(args, 'no_breach', False)
+        )
+        for record in records:
+            writer.write(record)
+            summary.add(record)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.monotonic() - started
+    
+    report = summary.to_dict(include_passwords=show_passwords)
+    summary_path = getattr(args, 'summary', None)
+    if summary_path:
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    
+    # Aggregates go to stderr so stdout stays machine-readable
+    err = sys.stderr
+    rate = summary.total / elapsed if elapsed > 0 else 0
+    print(f"\n{Fore.CYAN}Audited {summary.total:,} passwords in {elapsed:.1f}s ({rate:,.0f}/s){Style.RESET_ALL}", file=err)
+    print(f"Mean entropy: {report['mean_entropy_bits']} bits", file=err)
+    if summary.breached:
+        print(f"{Fore.RED}Breached: {summary.breached:,}{Style.RESET_ALL}", file=err)
+    print("Score histogram:", file=err)
+    for score, count in summary.score_histogram.items():
+        share = count / summary.total if summary.total else 0
+        print(f"  {score}: {count:>9,}  {'#' * round(share * 40)}", file=err)
+    if summary.unscored:
+        print(f"  unscored: {summary.unscored:,} (no strength engine available)", file=err)
+    weakest = summary.weakest()
+    if weakest:
+        print(f"Weakest {len(weakest)}:", file=err)
+        for record in weakest:
+            label = record.password if show_passwords else f"line {record.line}"
+            flag = " [breached]" if record.breached else ""
+            print(f"  {label}: score {record.score}, {record.crack_time or 'n/a'}{flag}", file=err)
+    return 0
+
+
+def handle_breach(args: Any) -> int:
+    """Build the breach filter, show its details, or screen a password."""
+    from .security.breach import BreachFilter, DEFAULT_FP_RATE, default_filter_path, get_breach_filter
+    
+    filter_path = getattr(args, 'filter', None) or default_filter_path()
+    corpus = getattr(args, 'build', None)
+    
+    if corpus:
+        fp_rate = getattr(args, 'fp_rate', None) or DEFAULT_FP_RATE
+        print(f"{Fore.CYAN}Building breach filter from {corpus} (false-positive rate {fp_rate:g})...{Style.RESET_ALL}")
+        breach_filter = BreachFilter.build(
+            corpus,
+            filter_path,
+            fp_rate=fp_rate,
+            expected=getattr(args, 'expected', None),
+            plaintext=getattr(args, 'plaintext', False),
+            progress=lambda n: print(f"  {n:,} entries...", flush=True)
+        )
+    else:
+        breach_filter = get_breach_filter(filter_path)
+        if breach_filter is None:
+            print(f"{Fore.YELLOW}No usable breach filter at {filter_path}. Build one with: passforge breach --build CORPUS{Style.RESET_ALL}")
+            return 1
+    
+    password = getattr(args, 'password', None)
+    if password is None or corpus:
+        print(f"Filter:       {breach_filter.path}")
+        print(f"Entries:      {breach_filter.count:,}")
+        print(f"Size:         {breach_filter.size_bytes / 2**20:,.1f} MiB ({breach_filter.num_hashes} probes)")
+        print(f"FP rate:      {breach_filter.estimated_fp_rate():.4%} (target {breach_filter.fp_rate:.4%})")
+        return 0
+    
+    if breach_filter.is_breached(password):
+        print(f"{Fore.RED}[!] Found in the breached-password corpus.{Style.RESET_ALL}")
+        return 2
+    print(f"{Fore.GREEN}[OK] Not found in the breached-password corpus.{Style.RESET_ALL}")
+    return 0
+
+
 def handle_history(args: Any) -> int:
     """Handle history viewing and export."""
     from .output.logger import PasswordLogger
@@ -491,7 +883,7 @@ def handle_history(args: Any) -> int:
     if not Vault.ensure_secure_mode():
         return 1
         
-    logger = PasswordLogger()
+    logger = PasswordLogger(backend=getattr(args, 'backend', None))
     
     if args.clear:
         logger.clear_history()
@@ -520,7 +912,11 @@ def handle_history(args: Any) -> int:
     
     entries = logger.get_history(
         limit=limit,
-        search=search_term
+        search=search_term,
+        generator_type=getattr(args, 'gen_type', None),
+        since=getattr(args, 'since', None),
+        until=getattr(args, 'until', None),
+        min_entropy=getattr(args, 'min_entropy', None)
     )
     
     if not entries:
@@ -579,13 +975,10 @@ def output_result(result: Any, args: Any) -> None:
     # zxcvbn strength analysis
     check_strength = getattr(args, 'check_strength', False)
     if check_strength:
-        from .security.strength_checker import check_strength as zxcvbn_check, format_strength_report, is_available
-        if is_available():
-            strength_result = zxcvbn_check(result.password)
-            if strength_result:
-                print(format_strength_report(strength_result, no_color))
-        else:
-            print(f"{Fore.YELLOW}Pattern analysis requires 'zxcvbn' package: pip install zxcvbn{Style.RESET_ALL}")
+        from .security.strength_checker import check_strength as zxcvbn_check, format_strength_report
+        strength_result = zxcvbn_check(result.password, engine="auto")
+        if strength_result:
+            print(format_strength_report(strength_result, no_color))
     
     # Clipboard with timeout
     if args.clipboard:
@@ -55,7 +55,11 @@ class ConfigLoader:
         },
         "license": {
             "segments": 4,
-            "segment_length": 4
+            "segment_length": 4,
+            "index": ""
+        },
+        "voucher": {
+            "campaign": ""
         },
         "recovery": {
             "count": 10,
@@ -77,7 +81,23 @@ class ConfigLoader:
         },
         "history": {
             "enabled": True,
-            "max_entries": 1000
+            "max_entries": 1000,
+            "backend": "jsonl"
+        },
+        "breach": {
+            "filter": ""
+        },
+        "presets": {
+            "paths": []
+        },
+        "policy": {
+            "disk_cache": True,
+            "cache_dir": ""
+        },
+        "paranoid": {
+            "reuse_seed": True,
+            "seed_file": "",
+            "seed_max_age_hours": 24
         }
     }
     
@@ -122,23 +142,52 @@ class ConfigLoader:
             return
         
         try:
-            content = config_file.read_text(encoding='utf-8')
-            
-            if config_file.suffix in ['.yaml', '.yml']:
-                try:
-                    import yaml
-                    loaded = yaml.safe_load(content)
-                except ImportError:
-                    print("Warning: PyYAML not installed, skipping YAML config")
-                    return
-            else:
-                loaded = json.loads(content)
-            
-            if loaded:
-                self._merge_config(loaded)
-                
+            loaded = self.read_file(config_file)
+        except ImportError:
+            print("Warning: PyYAML not installed, skipping YAML config")
+            return
         except Exception as e:
             print(f"Warning: Failed to load config from {config_file}: {e}")
+            return
+        
+        if loaded:
+            self._merge_config(loaded)
+    
+    @staticmethod
+    def read_file(path: Path) -> Dict[str, Any]:
+        """
+        Parse a YAML or JSON file (chosen by extension).
+        
+        Args:
+            path: File to read
+            
+        Returns:
+            The parsed mapping (empty for an empty file)
+            
+        Raises:
+            ImportError: If the file is YAML and PyYAML is not installed
+            ValueError: If the file is malformed or does not hold a mapping
+        """
+        path = Path(path)
+        content = path.read_text(encoding='utf-8')
+        
+        if path.suffix in ['.yaml', '.yml']:
+            import yaml
+            try:
+                loaded = yaml.safe_load(content)
+            except yaml.YAMLError as e:
+                raise ValueError(f"Invalid YAML in {path}: {e}") from e
+        else:
+            try:
+                loaded = json.loads(content)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON in {path}: {e}") from e
+        
+        if loaded is None:
+            return {}
+        if not isinstance(loaded, dict):
+            raise ValueError(f"Expected a mapping at the top of {path}")
+        return loaded
     
     def _merge_config(self, loaded: Dict[str, Any]) -> None:
         """Merge loaded config with defaults."""
@@ -1,50 +1,273 @@
 """
-Preset Profiles - Predefined security configurations for PassForge.
+Preset Profiles - Policy files compiled into ready-to-run generation plans.
+
+A preset is a JSON or YAML file that names a generator and its options:
+
+    {"description": "...", "generator": "random", "options": {"length": 32}}
+
+Built-in presets ship in ``data/presets``. Files in ``~/.passforge/presets``
+and in the folders listed under ``presets.paths`` in the config file add to or
+override them; the file name is the preset name. Each file is read through
+ConfigLoader, checked against the generator's ``generate()`` signature and
+compiled once into a PresetPlan: the generator class plus its keyword
+arguments. Policy presets (``"generator": "policy"``) also compile their
+automaton up front, and it is cached on disk by content hash. Plans are reused
+until their file changes, so ``--preset`` and the PWA pay only one
+``generate()`` call per password: nothing is parsed or mapped onto argparse
+attributes per call.
 """
 
-PRESETS = {
-    "strong": {
-        "command": "random",
-        "length": 32,
-        "uppercase": True,
-        "lowercase": True,
-        "digits": True,
-        "symbols": True,
-        "min_uppercase": 4,
-        "min_lowercase": 4,
-        "min_digits": 4,
-        "min_symbols": 4
-    },
-    "memorable": {
-        "command": "pronounce",
-        "length": 12
-    },
-    "dev": {
-        "command": "random",
-        "length": 40,
-        "symbols": False,
-        "no_repeats": True
-    },
-    "pin": {
-        "command": "pin",
-        "length": 6
-    },
-    "web": {
-        "command": "random",
-        "length": 16,
-        "min_uppercase": 1,
-        "min_lowercase": 1,
-        "min_digits": 1,
-        "min_symbols": 1
-    },
-    "wifi": {
-        "command": "wifi",
-        "length": 20,
-        "simple": False
-    },
-    "key": {
-        "command": "license",
-        "segments": 5,
-        "segment_length": 5
-    }
+import importlib
+import inspect
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .loader import ConfigLoader, get_config
+
+logger = logging.getLogger(__name__)
+
+# Built-in presets, shipped with PassForge
+BUILTIN_PRESET_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "presets"
+
+# Per-user presets
+USER_PRESET_DIR = Path.home() / ".passforge" / "presets"
+
+# Extensions recognized as preset files
+PRESET_SUFFIXES = (".json", ".yaml", ".yml")
+
+# Generator type -> (module in src.generators, class name)
+GENERATORS = {
+    "random": ("random_password", "RandomPasswordGenerator"),
+    "policy": ("policy", "PolicyGenerator"),
+    "passphrase": ("passphrase", "PassphraseGenerator"),
+    "pin": ("pin", "PinGenerator"),
+    "pronounceable": ("pronounceable", "PronounceableGenerator"),
+    "leetspeak": ("leetspeak", "LeetspeakGenerator"),
+    "uuid": ("uuid_token", "UuidGenerator"),
+    "base64": ("base64_secret", "Base64SecretGenerator"),
+    "jwt": ("jwt_secret", "JwtSecretGenerator"),
+    "wifi": ("wifi_key", "WifiKeyGenerator"),
+    "license": ("license_key", "LicenseKeyGenerator"),
+    "recovery": ("recovery_codes", "RecoveryCodesGenerator"),
+    "pattern": ("pattern", "PatternGenerator"),
+    "otp": ("otp", "OtpGenerator"),
+    "phonetic": ("phonetic", "PhoneticGenerator"),
 }
+
+# Keys allowed at the top of a preset file
+PRESET_KEYS = {"description", "generator", "options"}
+
+
+def _check_type(value: Any, default: Any) -> bool:
+    """Whether an option value has the type of the parameter's default."""
+    if isinstance(default, bool):
+        return isinstance(value, bool)
+    if isinstance(default, int):
+        return isinstance(value, int) and not isinstance(value, bool)
+    if isinstance(default, float):
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    return isinstance(value, type(default))
+
+
+class PresetPlan:
+    """A validated preset, compiled into a generator and its arguments."""
+
+    def __init__(
+        self,
+        name: str,
+        generator: str,
+        options: Optional[Dict[str, Any]] = None,
+        description: str = "",
+        source: str = "<preset>"
+    ):
+        """
+        Validate and compile a preset.
+
+        Args:
+            name: Preset name
+            generator: Generator type (a key of GENERATORS)
+            options: Keyword arguments for the generator's generate(), or the
+                PasswordPolicy fields for the "policy" generator
+            description: One-line summary shown in listings
+            source: Where the preset came from (for error messages)
+
+        Raises:
+            ValueError: On an unknown generator, unknown or mistyped options,
+                or a policy that no password satisfies
+        """
+        if generator not in GENERATORS:
+            raise ValueError(f"{source}: unknown generator '{generator}' (expected one of: {', '.join(GENERATORS)})")
+        self.name = name
+        self.generator = generator
+        self.options = dict(options or {})
+        self.description = description
+        self.source = source
+        module, class_name = GENERATORS[generator]
+        self.generator_class = getattr(importlib.import_module(f"..generators.{module}", __package__), class_name)
+        self.kwargs = self._compile()
+        self._instances: Dict[Tuple[bool, bool], Any] = {}
+
+    @classmethod
+    def from_dict(cls, name: str, data: Dict[str, Any], source: str = "<preset>") -> "PresetPlan":
+        """
+        Build a plan from the contents of a preset file.
+
+        Raises:
+            ValueError: On unknown keys or an invalid preset
+        """
+        unknown = set(data) - PRESET_KEYS
+        if unknown:
+            raise ValueError(f"{source}: unknown preset keys: {', '.join(sorted(unknown))}")
+        if "generator" not in data:
+            raise ValueError(f"{source}: missing 'generator'")
+        options = data.get("options") or {}
+        if not isinstance(options, dict):
+            raise ValueError(f"{source}: 'options' must be a mapping")
+        return cls(name, data["generator"], options, str(data.get("description", "")), source)
+
+    def _compile(self) -> Dict[str, Any]:
+        """Validate the options and return the keyword arguments for generate()."""
+        if self.generator == "policy":
+            from ..generators.policy import PasswordPolicy, compile_policy
+            try:
+                policy = PasswordPolicy.from_dict(self.options)
+                # Compiling proves the policy is satisfiable and warms the caches
+                compile_policy(policy)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"{self.source}: {e}") from e
+            return {"policy": policy}
+
+        parameters = inspect.signature(self.generator_class.generate).parameters
+        for key, value in self.options.items():
+            parameter = parameters.get(key)
+            if key == "self" or parameter is None or parameter.kind is parameter.VAR_KEYWORD:
+                raise ValueError(f"{self.source}: unknown option '{key}' for generator '{self.generator}'")
+            default = parameter.default
+            if default is not parameter.empty and default is not None and not _check_type(value, default):
+                raise ValueError(
+                    f"{self.source}: option '{key}' must be {type(default).__name__}, got {type(value).__name__}"
+                )
+        return dict(self.options)
+
+    def generator_for(self, easy_read: bool = False, easy_say: bool = False) -> Any:
+        """The generator instance for these global modifiers (created once)."""
+        key = (easy_read, easy_say)
+        instance = self._instances.get(key)
+        if instance is None:
+            instance = self._instances[key] = self.generator_class(easy_read=easy_read, easy_say=easy_say)
+        return instance
+
+    def run(self, easy_read: bool = False, easy_say: bool = False) -> Any:
+        """Generate one result."""
+        return self.generator_for(easy_read, easy_say).generate(**self.kwargs)
+
+    def run_batch(self, count: int, easy_read: bool = False, easy_say: bool = False) -> List[Any]:
+        """Generate ``count`` results with the same plan."""
+        generator = self.generator_for(easy_read, easy_say)
+        return [generator.generate(**self.kwargs) for _ in range(count)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "description": self.description,
+            "generator": self.generator,
+            "options": self.options,
+        }
+
+
+def preset_dirs() -> List[Path]:
+    """Folders searched for presets, lowest precedence first."""
+    dirs = [BUILTIN_PRESET_DIR, USER_PRESET_DIR]
+    dirs.extend(Path(path).expanduser() for path in get_config().get("presets", "paths", []) or [])
+    return dirs
+
+
+# Compiled plans, reused until their file changes
+_plans: Dict[Path, Tuple[int, PresetPlan]] = {}
+_plans_lock = threading.Lock()
+
+
+def load_preset(path: Any) -> PresetPlan:
+    """
+    Load and compile a preset file, reusing the plan while the file is unchanged.
+
+    Args:
+        path: JSON or YAML preset file
+
+    Returns:
+        PresetPlan named after the file
+
+    Raises:
+        ValueError: If the file is missing, malformed or invalid
+    """
+    path = Path(path).expanduser().resolve()
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError as e:
+        raise ValueError(f"Cannot read preset {path}: {e.strerror}") from e
+    with _plans_lock:
+        cached = _plans.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    try:
+        data = ConfigLoader.read_file(path)
+    except ImportError as e:
+        raise ValueError(f"{path}: PyYAML is required for YAML presets") from e
+    except OSError as e:
+        raise ValueError(f"Cannot read preset {path}: {e.strerror}") from e
+    plan = PresetPlan.from_dict(path.stem, data, source=str(path))
+    with _plans_lock:
+        _plans[path] = (mtime, plan)
+    return plan
+
+
+def _preset_files() -> Dict[str, Path]:
+    """Preset name -> file, later folders overriding earlier ones."""
+    files: Dict[str, Path] = {}
+    for directory in preset_dirs():
+        if not directory.is_dir():
+            continue
+        for path in sorted(directory.iterdir()):
+            if path.suffix in PRESET_SUFFIXES and path.is_file():
+                files[path.stem] = path
+    return files
+
+
+def preset_names() -> List[str]:
+    """Names of all available presets (without compiling them)."""
+    return sorted(_preset_files())
+
+
+def get_presets() -> Dict[str, PresetPlan]:
+    """All valid presets, compiled; invalid files are logged and left out."""
+    plans = {}
+    for name, path in sorted(_preset_files().items()):
+        try:
+            plans[name] = load_preset(path)
+        except ValueError as e:
+            logger.warning("Skipping invalid preset %s: %s", path, e)
+    return plans
+
+
+def get_preset(name: str) -> PresetPlan:
+    """
+    Look up a preset by name.
+
+    Raises:
+        ValueError: If no preset has this name
+    """
+    path = _preset_files().get(name)
+    if path is None:
+        raise ValueError(f"Unknown preset '{name}' (available: {', '.join(preset_names())})")
+    return load_preset(path)
+
+
+def resolve_preset(name_or_path: str) -> PresetPlan:
+    """Preset by name, or from a file when given a path to a preset file."""
+    path = Path(name_or_path).expanduser()
+    if path.suffix in PRESET_SUFFIXES and path.is_file():
+        return load_preset(path)
+    return get_preset(name_or_path)
@@ -0,0 +1,203 @@
+"""
+Entropy Accumulator - Fortuna-style pools feeding one reseedable generator.
+
+Entropy events (keystroke timings from Paranoid Mode, or any other source)
+are spread round-robin over 32 SHA-256 pools. Once pool 0 holds enough data,
+and at most every 100 ms, the generator is reseeded from pool 0, pool 1 every
+second reseed, pool 2 every fourth, and so on, so an attacker who can predict
+some events still cannot predict the later, larger reseeds. Every reseed also
+mixes in fresh OS CSPRNG output, and the generator starts from it, so the
+accumulator is never weaker than SYSTEM_RANDOM.
+
+The generator is an HmacDrbg (Fortuna's AES-CTR generator swapped for the
+DRBG the generators already share). One accumulator lives for the whole
+process: ``get_accumulator()`` returns it, and ``set_default_random()`` makes
+every generator created afterwards draw from it. A seed file written from its
+output lets later runs start from the collected entropy instead of asking for
+keystrokes again.
+"""
+
+import hashlib
+import os
+import secrets
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from .drbg import HmacDrbg, RandomSource
+
+# Fortuna parameters
+NUM_POOLS = 32
+MIN_POOL_SIZE = 64
+RESEED_SPACING = 0.1
+
+# Event sources
+SOURCE_JITTER = 0
+SOURCE_SEED_FILE = 1
+
+# Seed file: magic, format, credited bits, creation time, seed
+SEED_MAGIC = b"PFSEED"
+SEED_FORMAT = 1
+SEED_SIZE = 64
+_SEED_HEADER = struct.Struct(">6sBxId")
+
+DEFAULT_SEED_FILE = Path.home() / ".passforge" / "entropy.seed"
+
+_PERSONALIZATION = b"passforge-accumulator"
+
+
+class EntropyAccumulator(RandomSource):
+    """Fortuna-style accumulator: 32 entropy pools and a reseedable HMAC-DRBG."""
+
+    def __init__(self):
+        self._pools = [hashlib.sha256() for _ in range(NUM_POOLS)]
+        self._pool0_size = 0
+        self._next_pool: Dict[int, int] = {}
+        self._generator = HmacDrbg(secrets.token_bytes(48), personalization=_PERSONALIZATION)
+        self._lock = threading.RLock()
+        self._last_reseed = float("-inf")
+        self.reseeds = 0
+        self.credited_bits = 0.0
+
+    def add_event(self, source: int, data: bytes) -> None:
+        """
+        Add one entropy event to the next pool of its source.
+
+        Args:
+            source: Source number (0-255), e.g. SOURCE_JITTER
+            data: Event data (longer than 32 bytes is hashed first)
+        """
+        if not 0 <= source <= 255:
+            raise ValueError("Source must be between 0 and 255")
+        if not data:
+            raise ValueError("Event data must not be empty")
+        if len(data) > 32:
+            data = hashlib.sha256(data).digest()
+        with self._lock:
+            index = self._next_pool.get(source, 0)
+            self._next_pool[source] = (index + 1) % NUM_POOLS
+            self._pools[index].update(bytes((source, len(data))) + data)
+            if index == 0:
+                self._pool0_size += 2 + len(data)
+
+    def credit(self, bits: float) -> None:
+        """Record entropy estimated for events already added (e.g. by health-tested jitter)."""
+        with self._lock:
+            self.credited_bits += max(0.0, bits)
+
+    def _reseed(self) -> None:
+        self.reseeds += 1
+        seed = b""
+        for i, pool in enumerate(self._pools):
+            if self.reseeds % (1 << i):
+                break
+            seed += pool.digest()
+            self._pools[i] = hashlib.sha256()
+        self._pool0_size = 0
+        self._last_reseed = time.monotonic()
+        self._generator.reseed(hashlib.sha256(seed).digest(), secrets.token_bytes(32))
+
+    def reseed_now(self) -> None:
+        """Fold pool 0 into the generator without waiting for it to fill (e.g. after a collection)."""
+        with self._lock:
+            self._reseed()
+
+    def token_bytes(self, n: int) -> bytes:
+        with self._lock:
+            if self._pool0_size >= MIN_POOL_SIZE and time.monotonic() - self._last_reseed >= RESEED_SPACING:
+                self._reseed()
+            return self._generator.token_bytes(n)
+
+    def load_seed_file(self, path: Path, max_age: Optional[float] = None) -> bool:
+        """
+        Mix a seed file into the generator and replace it with a fresh one.
+
+        Args:
+            path: Seed file written by write_seed_file()
+            max_age: Seconds after which its entropy is no longer credited
+
+        Returns:
+            True if the file was read (its credit restored when recent enough)
+        """
+        try:
+            data = Path(path).read_bytes()
+        except OSError:
+            return False
+        if len(data) != _SEED_HEADER.size + SEED_SIZE:
+            return False
+        magic, version, bits, created = _SEED_HEADER.unpack_from(data)
+        if magic != SEED_MAGIC or version != SEED_FORMAT:
+            return False
+        with self._lock:
+            self._generator.reseed(data[_SEED_HEADER.size:], secrets.token_bytes(32))
+            if max_age is None or 0 <= time.time() - created <= max_age:
+                self.credited_bits = max(self.credited_bits, float(bits))
+        # A seed is never used twice
+        self.write_seed_file(path, created)
+        return True
+
+    def write_seed_file(self, path: Path, created: Optional[float] = None) -> bool:
+        """
+        Save 64 bytes of generator output and the credited entropy (atomically, mode 0600).
+
+        Args:
+            path: Seed file
+            created: When the credited entropy was collected (default: now)
+
+        Returns:
+            True if the file was written
+        """
+        path = Path(path)
+        with self._lock:
+            bits = int(min(self.credited_bits, 0xFFFFFFFF))
+            seed = self._generator.generate(SEED_SIZE)
+        header = _SEED_HEADER.pack(SEED_MAGIC, SEED_FORMAT, bits, time.time() if created is None else created)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(header + seed)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            return False
+        return True
+
+
+_accumulator: Optional[EntropyAccumulator] = None
+_accumulator_lock = threading.Lock()
+
+
+def get_accumulator() -> EntropyAccumulator:
+    """The accumulator shared by the whole session (created on first use)."""
+    global _accumulator
+    with _accumulator_lock:
+        if _accumulator is None:
+            _accumulator = EntropyAccumulator()
+        return _accumulator
+
+
+def get_seed_file() -> Optional[Path]:
+    """
+    Resolve the seed file from PASSFORGE_SEED_FILE, the config file, or ~/.passforge.
+
+    Returns:
+        Path, or None if disabled (``paranoid.reuse_seed`` false or the
+        environment variable set to "off")
+    """
+    path = os.getenv("PASSFORGE_SEED_FILE")
+    if path is None:
+        from ..config.loader import get_config
+        config = get_config()
+        if not config.get("paranoid", "reuse_seed", True):
+            return None
+        path = config.get("paranoid", "seed_file")
+    elif path.lower() == "off":
+        return None
+    return Path(path).expanduser() if path else DEFAULT_SEED_FILE
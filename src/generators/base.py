@@ -5,9 +5,11 @@ All generators must implement the generate() method.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Callable, Optional, Dict, Any
 import math
 
+from .drbg import RandomSource, default_random
+
 
 @dataclass
 class GeneratorResult:
@@ -42,16 +44,25 @@ class BaseGenerator(ABC):
     # Hard to pronounce (for --easy-say mode)
     HARD_TO_SAY = "0O1lI|!@#$%^&*()_+-=[]{}|;:',.<>?/`~"
     
-    def __init__(self, easy_read: bool = False, easy_say: bool = False):
+    def __init__(
+        self,
+        easy_read: bool = False,
+        easy_say: bool = False,
+        rng: Optional[RandomSource] = None
+    ):
         """
         Initialize base generator with global modifiers.
         
         Args:
             easy_read: Remove ambiguous characters (0/O, 1/l/I)
             easy_say: Only pronounceable characters
+            rng: Random source for every draw (default: default_random(),
+                the system CSPRNG unless Paranoid Mode replaced it); pass an
+                HmacDrbg for reproducible output
         """
         self.easy_read = easy_read
         self.easy_say = easy_say
+        self.rng = rng or default_random()
     
     @property
     @abstractmethod
@@ -69,6 +80,40 @@ class BaseGenerator(ABC):
         """
         pass
     
+    def generate_screened(
+        self,
+        reject: Callable[[str], bool],
+        max_attempts: int = 10,
+        **kwargs
+    ) -> GeneratorResult:
+        """
+        Generate until ``reject`` accepts the password (e.g. breach screening).
+        
+        Rejection removes a vanishing fraction of the output space, so the
+        reported entropy is unchanged.
+        
+        Args:
+            reject: Returns True for passwords that must be regenerated
+            max_attempts: Give up after this many rejected candidates
+            **kwargs: Passed to generate()
+            
+        Returns:
+            GeneratorResult (parameters record how many candidates were rejected)
+            
+        Raises:
+            ValueError: If every attempt was rejected
+        """
+        for attempt in range(max_attempts):
+            result = self.generate(**kwargs)
+            if not reject(result.password):
+                if attempt:
+                    result.parameters["rejected"] = attempt
+                return result
+        raise ValueError(
+            f"All {max_attempts} generated candidates were rejected; "
+            "increase the length or complexity"
+        )
+    
     def filter_charset(self, charset: str) -> str:
         """Apply easy_read and easy_say filters to a character set."""
         if self.easy_say:
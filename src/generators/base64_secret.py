@@ -2,9 +2,9 @@
 Base64 Secret Generator - URL-safe base64-encoded random secrets.
 """
 
-import secrets
 import base64
 from .base import BaseGenerator, GeneratorResult
+from .entropy_model import entropy_for
 
 
 class Base64SecretGenerator(BaseGenerator):
@@ -34,7 +34,7 @@ class Base64SecretGenerator(BaseGenerator):
         if byte_length > 1024:
             raise ValueError("Byte length must be at most 1024")
         
-        random_bytes = secrets.token_bytes(byte_length)
+        random_bytes = self.rng.token_bytes(byte_length)
         
         if url_safe:
             # URL-safe base64 (replaces + with - and / with _)
@@ -43,7 +43,7 @@ class Base64SecretGenerator(BaseGenerator):
             secret = base64.b64encode(random_bytes).decode('ascii')
         
         # Entropy is simply byte_length * 8 bits
-        entropy_bits = byte_length * 8.0
+        entropy_bits = entropy_for(self.generator_type, byte_length=byte_length)
         
         parameters = {
             "byte_length": byte_length,
@@ -0,0 +1,290 @@
+"""
+Code Batches - Collision-free batches of PINs and recovery codes.
+
+A code is a number in a code space of ``radix ** length`` values (10^8 for
+an 8-digit code, 7776^3 for a three-word code). A batch never repeats a
+code:
+
+* Small batches draw uniformly and reject repeats with a hash set.
+* Large batches walk a keyed Feistel permutation of the code space: code
+  ``i`` is ``permute(i)``, distinct for distinct ``i`` by construction, so
+  nothing is remembered and memory stays constant however many codes are
+  drawn.
+
+The permutation splits a code into two halves of ``length // 2`` and
+``length - length // 2`` digits and runs 10 alternating Feistel rounds with
+keyed BLAKE2b as the round function (a PRF, and a third of the cost of
+HMAC-SHA256 here), adding modulo the half's range (the FF1 construction, so
+every code stays in the space and no cycle walking is needed).
+
+A CodeSequence persists the permutation key and the next index in a small
+file, which makes it an issued-set for every batch drawn from it: later
+batches continue where the last one stopped and never repeat a code, and
+whether a code was issued is one inverse permutation away. Reading and
+advancing the file happens under an exclusive lock (``<file>.lock``), so
+concurrent runs get disjoint ranges. The file is as sensitive as the codes
+themselves (its key reproduces them) and is written with owner-only
+permissions.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+from ..output.history_store import file_lock
+from .drbg import SYSTEM_RANDOM, RandomSource
+
+# Feistel rounds (FF1 uses 10)
+ROUNDS = 10
+
+# Batches up to this size use a hash set (if at most a quarter of the space)
+HASH_SET_LIMIT = 1 << 16
+
+# Extra round-function bits beyond the half's range, so the reduction has no measurable bias
+_BIAS_MARGIN = 128
+
+# Longest BLAKE2b output, which bounds the size of a half
+_MAX_DIGEST = 64
+
+SEQUENCE_FORMAT = 1
+
+
+class FeistelPermutation:
+    """Keyed permutation of the integers ``[0, radix ** length)``."""
+
+    def __init__(self, key: bytes, radix: int = 10, length: int = 8, rounds: int = ROUNDS):
+        """
+        Args:
+            key: Secret key (32 bytes recommended, at most 64)
+            radix: Symbols per digit (10 for numeric codes, the word count for words)
+            length: Digits per code (at least 2)
+            rounds: Feistel rounds (even, at least 8)
+
+        Raises:
+            ValueError: On an empty or oversized key, radix below 2, length
+                below 2, too few / an odd number of rounds, or a code space
+                too large for the round function
+        """
+        if not 0 < len(key) <= 64:
+            raise ValueError("Feistel key must be 1 to 64 bytes")
+        if radix < 2:
+            raise ValueError("Radix must be at least 2")
+        if length < 2:
+            raise ValueError("Codes must have at least 2 digits")
+        if rounds < 8 or rounds % 2:
+            raise ValueError("Rounds must be even and at least 8")
+        self.key = key
+        self.radix = radix
+        self.length = length
+        self.rounds = rounds
+        self.size = radix ** length
+        u = length // 2
+        self._moduli = (radix ** u, radix ** (length - u))
+        self._width = (self._moduli[1].bit_length() + 7) // 8
+        sizes = [(modulus.bit_length() + _BIAS_MARGIN + 7) // 8 for modulus in self._moduli]
+        if max(sizes) > _MAX_DIGEST:
+            raise ValueError("Code space too large for the Feistel permutation")
+        # One keyed hash state per round, already fed the round's domain tag
+        tag = b"passforge-feistel" + radix.to_bytes(8, "big") + length.to_bytes(2, "big")
+        self._macs = []
+        for i in range(rounds):
+            mac = hashlib.blake2b(key=key, digest_size=sizes[i % 2])
+            mac.update(tag + i.to_bytes(1, "big"))
+            self._macs.append(mac)
+
+    def _round(self, i: int, value: int) -> int:
+        """Round function: keyed BLAKE2b of the round number and one half, reduced mod the other half's range."""
+        mac = self._macs[i].copy()
+        mac.update(value.to_bytes(self._width, "big"))
+        return int.from_bytes(mac.digest(), "big") % self._moduli[i % 2]
+
+    def permute(self, x: int) -> int:
+        """The image of ``x``."""
+        if not 0 <= x < self.size:
+            raise ValueError(f"Value out of range [0, {self.size})")
+        moduli, macs, width = self._moduli, self._macs, self._width
+        a, b = divmod(x, moduli[1])
+        for i in range(self.rounds):
+            # Even rounds produce a u-digit half, odd rounds a v-digit half (the round function, inlined)
+            mac = macs[i].copy()
+            mac.update(b.to_bytes(width, "big"))
+            a, b = b, (a + int.from_bytes(mac.digest(), "big")) % moduli[i & 1]
+        return a * moduli[1] + b
+
+    def invert(self, y: int) -> int:
+        """The preimage of ``y``."""
+        if not 0 <= y < self.size:
+            raise ValueError(f"Value out of range [0, {self.size})")
+        v_mod = self._moduli[1]
+        a, b = divmod(y, v_mod)
+        for i in reversed(range(self.rounds)):
+            a, b = (b - self._round(i, a)) % self._moduli[i % 2], a
+        return a * v_mod + b
+
+
+def unique_values(radix: int, length: int, count: int, rng: RandomSource = SYSTEM_RANDOM) -> Iterator[int]:
+    """
+    ``count`` distinct codes from ``[0, radix ** length)``, in random order.
+
+    Small batches are uniform draws with repeats rejected through a set;
+    larger ones walk a Feistel permutation under a fresh key from a random
+    starting point, so memory does not grow with ``count``.
+
+    Raises:
+        ValueError: If ``count`` exceeds the code space
+    """
+    size = radix ** length
+    if count < 0:
+        raise ValueError("Count must not be negative")
+    if count > size:
+        raise ValueError(f"Cannot draw {count:,} distinct codes from a space of {size:,}")
+    if count <= HASH_SET_LIMIT and count <= size // 4:
+        return _rejection_sample(size, count, rng)
+    permutation = FeistelPermutation(rng.token_bytes(32), radix, length)
+    offset = rng.randbelow(size)
+    return (permutation.permute((offset + i) % size) for i in range(count))
+
+
+def _rejection_sample(size: int, count: int, rng: RandomSource) -> Iterator[int]:
+    """Uniform draws, repeats rejected through a set."""
+    seen = set()
+    while len(seen) < count:
+        value = rng.randbelow(size)
+        if value not in seen:
+            seen.add(value)
+            yield value
+
+
+class CodeSequence:
+    """Persisted, never-repeating walk through a code space (an issued-set in constant space)."""
+
+    def __init__(self, path: Path, radix: int, length: int, rng: RandomSource = SYSTEM_RANDOM):
+        """
+        Open a sequence file, or create it with a fresh key.
+
+        Args:
+            path: Sequence file
+            radix: Symbols per digit of the codes
+            length: Digits per code
+            rng: Source of the key for a new sequence
+
+        Raises:
+            ValueError: If the file is unreadable or describes another code space
+        """
+        self.path = Path(path)
+        self.radix = radix
+        self.length = length
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Creating under the lock, so concurrent first runs agree on one key
+        with file_lock(self.lock_path):
+            if self.path.exists():
+                key, issued = self._load()
+            else:
+                key, issued = rng.token_bytes(32), 0
+            self.permutation = FeistelPermutation(key, radix, length)
+            self.issued = issued
+            if not self.path.exists():
+                self.save()
+
+    @property
+    def lock_path(self) -> Path:
+        """Lock file held while the sequence is read and advanced."""
+        return self.path.with_name(self.path.name + ".lock")
+
+    def _load(self) -> Tuple[bytes, int]:
+        """Key and next index from the file (call with the lock held)."""
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            key = bytes.fromhex(data["key"])
+            issued = int(data["next"])
+            shape = (int(data["radix"]), int(data["length"]))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Not a code sequence file: {self.path}") from e
+        if data.get("format") != SEQUENCE_FORMAT:
+            raise ValueError(f"Unsupported code sequence format: {self.path}")
+        if shape != (self.radix, self.length):
+            raise ValueError(
+                f"{self.path} issues codes of {shape[1]} digits in radix {shape[0]}, "
+                f"not {self.length} digits in radix {self.radix}"
+            )
+        return key, issued
+
+    @property
+    def remaining(self) -> int:
+        """Codes left before the space is exhausted."""
+        return self.permutation.size - self.issued
+
+    def take(self, count: int) -> Iterator[int]:
+        """
+        Reserve and yield the next ``count`` codes.
+
+        The file is re-read and advanced under an exclusive lock before any
+        code is produced, so concurrent runs get disjoint ranges and an
+        interrupted batch leaves a gap rather than codes handed out twice.
+
+        Raises:
+            ValueError: If fewer than ``count`` codes are left
+        """
+        if count < 0:
+            raise ValueError("Count must not be negative")
+        # Another process may have advanced the file since it was opened
+        with file_lock(self.lock_path):
+            key, self.issued = self._load()
+            if key != self.permutation.key:
+                raise ValueError(f"{self.path} was replaced by a different sequence")
+            if count > self.remaining:
+                raise ValueError(f"Only {self.remaining:,} codes left in {self.path}")
+            start = self.issued
+            self.issued += count
+            self.save()
+        permute = self.permutation.permute
+        return (permute(i) for i in range(start, start + count))
+
+    def was_issued(self, value: int) -> bool:
+        """Whether a code has been handed out by this sequence (O(1))."""
+        return 0 <= value < self.permutation.size and self.permutation.invert(value) < self.issued
+
+    def save(self) -> None:
+        """Write the sequence atomically, readable by the owner only (call with the lock held)."""
+        data = {
+            "format": SEQUENCE_FORMAT,
+            "radix": self.permutation.radix,
+            "length": self.permutation.length,
+            "key": self.permutation.key.hex(),
+            "next": self.issued,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def draw_codes(
+    radix: int,
+    length: int,
+    count: int,
+    rng: RandomSource = SYSTEM_RANDOM,
+    sequence_path: Optional[Path] = None
+) -> Iterator[int]:
+    """
+    ``count`` distinct codes of ``length`` digits in ``radix``, unique across
+    every batch drawn from ``sequence_path`` when given.
+    """
+    if sequence_path is not None:
+        return CodeSequence(sequence_path, radix, length, rng).take(count)
+    return unique_values(radix, length, count, rng)
+
+
+def digits_of(value: int, radix: int, length: int) -> list:
+    """The ``length`` base-``radix`` digits of ``value``, most significant first."""
+    digits = [0] * length
+    for i in range(length - 1, -1, -1):
+        value, digits[i] = divmod(value, radix)
+    return digits
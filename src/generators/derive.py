@@ -0,0 +1,161 @@
+"""
+Derived Password Generator - Stateless site passwords (LessPass-style).
+
+A derived password is recomputed from (master secret, site, login, counter,
+rules) whenever it is needed, so nothing has to be stored or synced. The
+master secret is stretched once with scrypt, a memory-hard KDF, and the
+stretched key is kept for the rest of the session. Each site then costs one
+HMAC-SHA256: the HMAC of the site, login and counter seeds an HMAC-DRBG, and
+RandomPasswordGenerator draws the password from that stream with its usual
+rejection sampling, so the charset rules (classes, minimums, exclusions) are
+honored without modulo bias.
+
+Changing the KDF parameters, the derivation labels or the random generator's
+draw order changes every derived password; DERIVE_VERSION names the scheme.
+"""
+
+import hashlib
+import hmac
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+from .base import BaseGenerator, GeneratorResult
+from .drbg import HmacDrbg
+from .random_password import RandomPasswordGenerator
+
+# Derivation scheme (part of every label, so versions never collide)
+DERIVE_VERSION = 1
+
+# scrypt parameters for the master stretch: 128 MiB, about half a second
+KDF_N = 1 << 17
+KDF_R = 8
+KDF_P = 1
+KDF_MAXMEM = 256 * 1024 * 1024
+
+_MASTER_SALT = b"passforge-derive-v%d-master" % DERIVE_VERSION
+_SITE_LABEL = b"passforge-derive-v%d-site" % DERIVE_VERSION
+
+# Stretched master keys kept per session (most recently used last)
+SESSION_SIZE = 4
+_session: "OrderedDict[bytes, bytes]" = OrderedDict()
+_session_lock = threading.Lock()
+
+
+def normalize_site(site: str) -> str:
+    """
+    Reduce a site or URL to its lower-case host.
+
+    "https://GitHub.com/x", "github.com/login" and "github.com:443" all give
+    "github.com", so one site never yields two passwords.
+    """
+    site = site.strip().lower()
+    # Without a scheme, "//" makes urlsplit read the text as a host, not a path
+    site = urlsplit(site if "://" in site else "//" + site).hostname or ""
+    if not site:
+        raise ValueError("Site must not be empty")
+    return site
+
+
+def _encode(*parts: str) -> bytes:
+    """Length-prefixed encoding, so no two field combinations collide."""
+    out = b""
+    for part in parts:
+        data = unicodedata.normalize("NFC", part).encode("utf-8")
+        out += len(data).to_bytes(4, "big") + data
+    return out
+
+
+def stretch_master(master: str) -> bytes:
+    """
+    Stretch a master secret with scrypt, once per session.
+
+    Args:
+        master: Master secret
+
+    Returns:
+        32-byte stretched key
+    """
+    if not master:
+        raise ValueError("Master secret must not be empty")
+    secret = unicodedata.normalize("NFC", master).encode("utf-8")
+    # Session entries are looked up by a digest, not the secret itself
+    tag = hashlib.sha256(_MASTER_SALT + secret).digest()
+    with _session_lock:
+        key = _session.get(tag)
+        if key is not None:
+            _session.move_to_end(tag)
+            return key
+    key = hashlib.scrypt(secret, salt=_MASTER_SALT, n=KDF_N, r=KDF_R, p=KDF_P, maxmem=KDF_MAXMEM, dklen=32)
+    with _session_lock:
+        _session[tag] = key
+        while len(_session) > SESSION_SIZE:
+            _session.popitem(last=False)
+    return key
+
+
+def clear_session() -> None:
+    """Forget all stretched master keys."""
+    with _session_lock:
+        _session.clear()
+
+
+def site_key(master: str, site: str, login: str = "", counter: int = 1) -> bytes:
+    """The 32-byte key of one (site, login, counter) entry."""
+    if counter < 1:
+        raise ValueError("Counter must be at least 1")
+    message = _encode(normalize_site(site), login, str(counter))
+    return hmac.digest(stretch_master(master), _SITE_LABEL + message, "sha256")
+
+
+class DerivedPasswordGenerator(BaseGenerator):
+    """Recompute site passwords from a master secret instead of storing them."""
+
+    @property
+    def generator_type(self) -> str:
+        return "derive"
+
+    def generate(
+        self,
+        master: str = "",
+        site: str = "",
+        login: str = "",
+        counter: int = 1,
+        **rules: Any
+    ) -> GeneratorResult:
+        """
+        Derive the password of a site.
+
+        Args:
+            master: Master secret
+            site: Site name or URL (reduced to its host)
+            login: Account name on the site (optional)
+            counter: Bump to rotate the password (default: 1)
+            **rules: RandomPasswordGenerator.generate() rules (length,
+                digits, min_symbols, exclude_chars, ...)
+
+        Returns:
+            GeneratorResult; parameters record the site, login, counter and
+            rules, never the master secret
+        """
+        if "custom_seed" in rules:
+            raise ValueError("Derived passwords cannot use a custom seed")
+        rng = HmacDrbg(site_key(master, site, login, counter), personalization=_SITE_LABEL)
+        result = RandomPasswordGenerator(self.easy_read, self.easy_say, rng=rng).generate(**rules)
+
+        parameters: Dict[str, Any] = {
+            "site": normalize_site(site),
+            "login": login,
+            "counter": counter,
+            "version": DERIVE_VERSION,
+        }
+        parameters.update(result.parameters)
+        parameters.pop("paranoid", None)
+        return GeneratorResult(
+            password=result.password,
+            entropy_bits=result.entropy_bits,
+            generator_type=self.generator_type,
+            parameters=parameters
+        )
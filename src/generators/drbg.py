@@ -0,0 +1,226 @@
+"""
+Random Sources - The randomness interface shared by every generator.
+
+Generators draw all their randomness through a RandomSource
+(``token_bytes``, ``randbelow``, ``choice``). The default, SYSTEM_RANDOM,
+is the ``secrets`` module. HmacDrbg is the NIST SP 800-90A HMAC_DRBG with
+SHA-256: a deterministic, cryptographically strong stream that can stand in
+for it.
+
+KeyedRandom turns one key into an indexed family of HmacDrbg streams, one per
+output. Stream ``k`` is instantiated directly from the key and ``k``, so it is
+possible to jump straight to the k-th output, and separate workers can
+generate disjoint index ranges with no coordination. The same key, index and
+settings always reproduce the same password.
+"""
+
+import hashlib
+import hmac
+import secrets
+import unicodedata
+from typing import Iterator, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+# HMAC_DRBG output block (SHA-256)
+_OUTLEN = 32
+
+# Bytes generated per refill of the HmacDrbg read buffer
+_BUFFER_SIZE = 512
+
+# SP 800-90A limit on generate requests between reseeds
+RESEED_INTERVAL = 1 << 48
+
+# Domain separation (scrypt salt) for keys given as text
+_KEY_LABEL = b"passforge-drbg-key"
+
+# scrypt parameters for keys given as text: 128 MiB, about half a second
+KDF_N = 1 << 17
+KDF_R = 8
+KDF_P = 1
+KDF_MAXMEM = 256 * 1024 * 1024
+
+
+class RandomSource:
+    """Source of random bytes and uniform choices."""
+
+    def token_bytes(self, n: int) -> bytes:
+        """Return ``n`` random bytes."""
+        raise NotImplementedError
+
+    def getrandbits(self, k: int) -> int:
+        """Return a uniform integer with ``k`` random bits."""
+        if k <= 0:
+            return 0
+        value = int.from_bytes(self.token_bytes((k + 7) // 8), "big")
+        return value >> (-k % 8)
+
+    def randbelow(self, n: int) -> int:
+        """Return a uniform integer in ``[0, n)`` (rejection sampling, no modulo bias)."""
+        if n <= 0:
+            raise ValueError("Upper bound must be positive")
+        k = n.bit_length()
+        value = self.getrandbits(k)
+        while value >= n:
+            value = self.getrandbits(k)
+        return value
+
+    def choice(self, seq: Sequence[T]) -> T:
+        """Return a uniformly chosen element of a non-empty sequence."""
+        if not seq:
+            raise IndexError("Cannot choose from an empty sequence")
+        return seq[self.randbelow(len(seq))]
+
+
+class SystemRandom(RandomSource):
+    """The operating system CSPRNG, through the ``secrets`` module."""
+
+    def token_bytes(self, n: int) -> bytes:
+        return secrets.token_bytes(n)
+
+    def getrandbits(self, k: int) -> int:
+        return secrets.randbits(k) if k > 0 else 0
+
+    def randbelow(self, n: int) -> int:
+        return secrets.randbelow(n)
+
+    def choice(self, seq: Sequence[T]) -> T:
+        return secrets.choice(seq)
+
+
+# Shared default source
+SYSTEM_RANDOM = SystemRandom()
+
+# Source given to generators created without an explicit rng
+_default_random: RandomSource = SYSTEM_RANDOM
+
+
+def default_random() -> RandomSource:
+    """The source new generators draw from by default (SYSTEM_RANDOM unless replaced)."""
+    return _default_random
+
+
+def set_default_random(source: Optional[RandomSource] = None) -> None:
+    """Make every generator created from now on draw from ``source`` (None restores SYSTEM_RANDOM)."""
+    global _default_random
+    _default_random = source or SYSTEM_RANDOM
+
+
+class HmacDrbg(RandomSource):
+    """HMAC_DRBG (NIST SP 800-90A) with SHA-256."""
+
+    def __init__(self, entropy: bytes, nonce: bytes = b"", personalization: bytes = b""):
+        """
+        Instantiate the generator.
+
+        Args:
+            entropy: Seed material (at least 32 bytes for full strength)
+            nonce: Value that makes this instantiation unique
+            personalization: Optional domain-separation string
+        """
+        self._key = b"\x00" * _OUTLEN
+        self._value = b"\x01" * _OUTLEN
+        self._update(entropy + nonce + personalization)
+        self._reseed_counter = 1
+        self._buffer = b""
+
+    @classmethod
+    def from_system(cls, personalization: bytes = b"") -> "HmacDrbg":
+        """Instantiate from fresh system entropy, mixed with ``personalization``."""
+        return cls(secrets.token_bytes(_OUTLEN), secrets.token_bytes(_OUTLEN // 2), personalization)
+
+    def _update(self, data: bytes = b"") -> None:
+        self._key = hmac.digest(self._key, self._value + b"\x00" + data, "sha256")
+        self._value = hmac.digest(self._key, self._value, "sha256")
+        if data:
+            self._key = hmac.digest(self._key, self._value + b"\x01" + data, "sha256")
+            self._value = hmac.digest(self._key, self._value, "sha256")
+
+    def reseed(self, entropy: bytes, additional: bytes = b"") -> None:
+        """Mix fresh entropy into the state."""
+        self._update(entropy + additional)
+        self._reseed_counter = 1
+        self._buffer = b""
+
+    def generate(self, n: int, additional: bytes = b"") -> bytes:
+        """
+        One SP 800-90A generate request.
+
+        Args:
+            n: Number of bytes
+            additional: Optional additional input
+
+        Raises:
+            RuntimeError: If the reseed interval is exhausted
+        """
+        if self._reseed_counter > RESEED_INTERVAL:
+            raise RuntimeError("HMAC_DRBG reseed required")
+        if additional:
+            self._update(additional)
+        key = self._key
+        value = self._value
+        blocks = []
+        for _ in range((n + _OUTLEN - 1) // _OUTLEN):
+            value = hmac.digest(key, value, "sha256")
+            blocks.append(value)
+        self._value = value
+        self._update(additional)
+        self._reseed_counter += 1
+        return b"".join(blocks)[:n]
+
+    def token_bytes(self, n: int) -> bytes:
+        """
+        Random bytes, served from a buffer refilled by fixed-size generate()
+        requests, so the byte stream does not depend on how it is read.
+        """
+        if n > len(self._buffer):
+            refills = (n - len(self._buffer) + _BUFFER_SIZE - 1) // _BUFFER_SIZE
+            self._buffer += b"".join(self.generate(_BUFFER_SIZE) for _ in range(refills))
+        out, self._buffer = self._buffer[:n], self._buffer[n:]
+        return out
+
+
+def derive_key(material: str) -> bytes:
+    """
+    Turn key text (e.g. from --drbg-key) into a 32-byte DRBG key.
+
+    The text is typed by a person, so it is stretched with scrypt (as derived
+    passwords stretch their master secret): every output of a deterministic
+    batch would otherwise let the key be brute-forced offline at hash speed.
+    """
+    if not material:
+        raise ValueError("DRBG key must not be empty")
+    return hashlib.scrypt(
+        unicodedata.normalize("NFC", material).encode("utf-8"),
+        salt=_KEY_LABEL, n=KDF_N, r=KDF_R, p=KDF_P, maxmem=KDF_MAXMEM, dklen=32
+    )
+
+
+class KeyedRandom:
+    """Indexed family of deterministic streams derived from one key."""
+
+    def __init__(self, key: bytes, personalization: bytes = b"passforge"):
+        """
+        Initialize the family.
+
+        Args:
+            key: Secret key (at least 32 bytes recommended; see derive_key())
+            personalization: Domain-separation string for this use of the key
+        """
+        if not key:
+            raise ValueError("DRBG key must not be empty")
+        self.key = key
+        self.personalization = personalization
+
+    def stream(self, index: int) -> HmacDrbg:
+        """The stream of output ``index``, instantiated directly (O(1) fast-forward)."""
+        if index < 0:
+            raise ValueError("Stream index must not be negative")
+        return HmacDrbg(self.key, index.to_bytes(8, "big"), self.personalization)
+
+    def streams(self, start: int = 0, stop: Optional[int] = None) -> Iterator[HmacDrbg]:
+        """Streams ``start``, ``start + 1``, ... (up to ``stop``, exclusive)."""
+        index = start
+        while stop is None or index < stop:
+            yield self.stream(index)
+            index += 1
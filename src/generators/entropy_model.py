@@ -0,0 +1,180 @@
+"""
+Entropy Models - Exact entropy of each generator configuration.
+
+Every generator registers a model that maps its configuration (lengths,
+counts, pool sizes) to the Shannon entropy of its output in bits. Uniform
+outputs are counted exactly with big integers (``math.perm``, powers of two)
+before taking log2, so large pools never go through float powers or
+``lgamma`` approximations. Results are memoized per configuration: a bulk run
+of a thousand passwords computes the entropy once and looks it up afterwards.
+"""
+
+import math
+from fractions import Fraction
+from functools import lru_cache
+from typing import Callable, Dict
+
+# Registered models: generator type -> function(**config) -> bits
+ENTROPY_MODELS: Dict[str, Callable[..., float]] = {}
+
+
+def register_model(generator_type: str) -> Callable[[Callable[..., float]], Callable[..., float]]:
+    """Decorator registering the entropy model of a generator type."""
+    def decorator(model: Callable[..., float]) -> Callable[..., float]:
+        ENTROPY_MODELS[generator_type] = model
+        return model
+    return decorator
+
+
+@lru_cache(maxsize=1024)
+def entropy_for(generator_type: str, **config) -> float:
+    """
+    Entropy of a generator configuration, memoized.
+
+    Args:
+        generator_type: Registered generator type (e.g. "random", "pin")
+        **config: Model parameters (hashable values)
+
+    Returns:
+        Entropy in bits
+
+    Raises:
+        ValueError: If no model is registered for the generator type
+    """
+    model = ENTROPY_MODELS.get(generator_type)
+    if model is None:
+        raise ValueError(f"No entropy model for generator: {generator_type}")
+    return model(**config)
+
+
+def log2_count(count: int) -> float:
+    """log2 of an exact (possibly huge) integer count of equally likely outputs."""
+    if count <= 1:
+        return 0.0
+    return math.log2(count)
+
+
+def uniform_bits(pool_size: int, length: int) -> float:
+    """Entropy of ``length`` independent uniform picks from ``pool_size`` symbols."""
+    if pool_size <= 0 or length <= 0:
+        return 0.0
+    return log2_count(pool_size ** length)
+
+
+@register_model("random")
+def _random(pool_size: int, length: int, no_repeats: bool = False) -> float:
+    if no_repeats:
+        # Sampling without replacement: P(pool_size, length) arrangements
+        return log2_count(math.perm(pool_size, length))
+    return uniform_bits(pool_size, length)
+
+
+@register_model("passphrase")
+def _passphrase(wordlist_size: int, word_count: int) -> float:
+    return uniform_bits(wordlist_size, word_count)
+
+
+@register_model("pin")
+def _pin(length: int) -> float:
+    return uniform_bits(10, length)
+
+
+@register_model("wifi")
+def _wifi(pool_size: int, length: int) -> float:
+    return uniform_bits(pool_size, length)
+
+
+@register_model("license")
+def _license(pool_size: int, length: int) -> float:
+    return uniform_bits(pool_size, length)
+
+
+@register_model("phonetic")
+def _phonetic(length: int) -> float:
+    return uniform_bits(36, length)
+
+
+@register_model("pattern")
+def _pattern(grid_size: int, path_length: int) -> float:
+    # Ordered paths without revisits: P(points, path_length)
+    return log2_count(math.perm(grid_size * grid_size, path_length))
+
+
+@register_model("base64")
+def _base64(byte_length: int) -> float:
+    return float(byte_length * 8)
+
+
+@register_model("jwt")
+def _jwt(bits: int) -> float:
+    return float(bits)
+
+
+@register_model("otp")
+def _otp(byte_length: int) -> float:
+    return float(byte_length * 8)
+
+
+# Random bits per UUID version (the rest is timestamp, version and variant)
+UUID_RANDOM_BITS = {1: 60, 4: 122, 7: 74}
+
+
+@register_model("uuid")
+def _uuid(version: int) -> float:
+    return float(UUID_RANDOM_BITS[version])
+
+
+@register_model("recovery")
+def _recovery(count: int, use_words: bool = False, digits: int = 8, words_per_code: int = 3) -> float:
+    # The codes of a set are distinct: P(space, count) ordered sets
+    return log2_count(math.perm(_recovery_space(use_words, digits, words_per_code), count))
+
+
+def _recovery_space(use_words: bool, digits: int, words_per_code: int) -> int:
+    """Number of possible single recovery codes."""
+    if use_words:
+        from .recovery_codes import recovery_wordlist
+        return len(recovery_wordlist()) ** words_per_code
+    return 10 ** digits
+
+
+@register_model("leetspeak")
+def _leetspeak(word_count: int) -> float:
+    # Each substitutable letter is flipped with probability 1/2 (one bit).
+    # Leet digits map back to a single letter, so the output determines both
+    # the words and the flips: entropy = words + expected flips per word.
+    from .leetspeak import LEET_MAP, leet_wordlist
+    wordlist = leet_wordlist()
+    flips = sum(char in LEET_MAP for word in wordlist for char in word)
+    return word_count * (math.log2(len(wordlist)) + flips / len(wordlist))
+
+
+@register_model("pronounceable")
+def _pronounceable(length: int, add_number: bool = False) -> float:
+    from .pronounceable import CONSONANTS, SYLLABLE_PATTERNS, VOWELS
+    consonant_bits = math.log2(len(CONSONANTS))
+    vowel_bits = math.log2(len(VOWELS))
+    share = Fraction(1, len(SYLLABLE_PATTERNS))
+
+    # Probability that a syllable starts at each position, and that each
+    # position of the (truncated) password holds a consonant
+    starts = [Fraction(0)] * (length + 3)
+    starts[0] = Fraction(1)
+    consonant = [Fraction(0)] * length
+    for start in range(length):
+        if not starts[start]:
+            continue
+        weight = starts[start] * share
+        for pattern in SYLLABLE_PATTERNS:
+            for offset, kind in enumerate(pattern):
+                if kind == "c" and start + offset < length:
+                    consonant[start + offset] += weight
+            starts[start + len(pattern)] += weight
+
+    # Letters are uniform given the consonant/vowel layout, and the layout is
+    # readable from the output, so this is exact for the letters. The layout
+    # itself is not credited: different syllable splits spell the same layout.
+    bits = [float(p) * consonant_bits + float(1 - p) * vowel_bits for p in consonant]
+    if add_number:
+        bits[-1] = math.log2(10)
+    return sum(bits)
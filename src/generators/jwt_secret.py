@@ -2,9 +2,9 @@
 JWT Secret Generator - High-entropy secrets for JWT signing.
 """
 
-import secrets
 import base64
 from .base import BaseGenerator, GeneratorResult
+from .entropy_model import entropy_for
 
 
 class JwtSecretGenerator(BaseGenerator):
@@ -33,7 +33,7 @@ class JwtSecretGenerator(BaseGenerator):
             raise ValueError("Bits must be 256, 384, or 512")
         
         byte_length = bits // 8
-        random_bytes = secrets.token_bytes(byte_length)
+        random_bytes = self.rng.token_bytes(byte_length)
         
         if output_hex:
             secret = random_bytes.hex()
@@ -53,7 +53,7 @@ class JwtSecretGenerator(BaseGenerator):
         
         return GeneratorResult(
             password=secret,
-            entropy_bits=float(bits),
+            entropy_bits=entropy_for(self.generator_type, bits=bits),
             generator_type=self.generator_type,
             parameters=parameters
         )
@@ -3,9 +3,10 @@ Leetspeak Passphrase Generator - Word-based with character substitution.
 Example: C0nju64t3d-Int3r8r3d-dAmm1t5
 """
 
-import secrets
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Tuple
 from .base import BaseGenerator, GeneratorResult
+from .entropy_model import entropy_for
 from .passphrase import DEFAULT_WORDLIST
 
 
@@ -22,6 +23,12 @@ LEET_MAP: Dict[str, str] = {
 }
 
 
+@lru_cache(maxsize=None)
+def leet_wordlist() -> Tuple[str, ...]:
+    """Words used for leetspeak (5-10 letters, for readability)."""
+    return tuple(w for w in DEFAULT_WORDLIST if 5 <= len(w) <= 10)
+
+
 class LeetspeakGenerator(BaseGenerator):
     """Generate leetspeak passphrases with character substitution."""
     
@@ -34,7 +41,7 @@ class LeetspeakGenerator(BaseGenerator):
         result = []
         for char in word:
             # Only substitute with a 50% probability for better readability
-            if char in LEET_MAP and secrets.randbelow(100) < 50:
+            if char in LEET_MAP and self.rng.randbelow(100) < 50:
                 result.append(LEET_MAP[char])
             else:
                 result.append(char)
@@ -64,11 +71,10 @@ class LeetspeakGenerator(BaseGenerator):
         if separator not in ["-", "_", ".", ","]:
             raise ValueError("Separator must be one of: - _ . ,")
         
-        # Filter longer words for better readability
-        wordlist = [w for w in DEFAULT_WORDLIST if 5 <= len(w) <= 10]
+        wordlist = leet_wordlist()
         
         # Select random words
-        words = [secrets.choice(wordlist) for _ in range(word_count)]
+        words = [self.rng.choice(wordlist) for _ in range(word_count)]
         
         # Capitalize if requested
         if capitalize:
@@ -79,9 +85,9 @@ class LeetspeakGenerator(BaseGenerator):
         
         passphrase = separator.join(leet_words)
         
-        # Entropy calculation (still based on wordlist size)
+        # Word choice plus the substitution coin flips
         pool_size = len(wordlist)
-        entropy_bits = self.calculate_entropy(pool_size, word_count)
+        entropy_bits = entropy_for(self.generator_type, word_count=word_count)
         
         parameters = {
             "word_count": word_count,
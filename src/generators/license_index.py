@@ -0,0 +1,311 @@
+"""
+License Index - Bulk issuing of unique license keys, with an on-disk index.
+
+The index is a flat file: a fixed header recording the key format, then one
+fixed-width record per issued key, sorted. A record is the key's characters
+packed at 5 bits each (10 bytes for a 4x4 key; the check symbol is derived,
+not stored), so 10 million keys take about 100 MB. Lookups memory-map the
+file and binary-search it, O(log n) reads with no parsing, after the check
+symbol has already rejected mistyped keys.
+
+Issuing draws each batch of records from one bulk random read, sorts it,
+spills it to a run file, and merges the runs with the existing index in one
+sequential pass. Duplicates (within the batch or against keys already
+issued) are dropped during the merge and replaced in a further round, so
+every key handed out is unique. Memory stays at one batch, whatever the
+count.
+"""
+
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, List, Optional
+
+from ..output.history_store import file_lock
+from .drbg import SYSTEM_RANDOM, RandomSource
+from .license_key import LicenseKeyGenerator, bytes_from_symbols, damm_valid, record_size, symbols_from_bytes
+
+# File layout: fixed header, then the sorted records
+MAGIC = b"PFLICIDX"
+VERSION = 1
+HEADER_SIZE = 32
+_HEADER = struct.Struct("<8sHHH?xQ")  # magic, version, segments, segment length, checksum, count
+
+# Default location of the index
+DEFAULT_INDEX_PATH = Path.home() / ".passforge" / "licenses.idx"
+
+# Keys generated, sorted and spilled per batch
+BATCH_SIZE = 1 << 20
+
+# Refuse to fill more than this fraction of the key space
+MAX_FILL = 0.5
+
+# Bytes read per block when streaming records
+_READ_BLOCK = 1 << 20
+
+
+def _format_record(record: bytes, segments: int, segment_length: int, add_checksum: bool) -> str:
+    """The key a record stands for."""
+    symbols = symbols_from_bytes(record, segments * segment_length)
+    return LicenseKeyGenerator.format_key(symbols, segment_length, add_checksum)
+
+
+def _iter_records(f: BinaryIO, width: int, offset: int = 0) -> Iterator[bytes]:
+    """Fixed-width records from a file, read in large blocks."""
+    f.seek(offset)
+    block = max(width, _READ_BLOCK // width * width)
+    while True:
+        data = f.read(block)
+        if not data:
+            return
+        for i in range(0, len(data) - width + 1, width):
+            yield data[i:i + width]
+
+
+class LicenseIndex:
+    """Sorted, memory-mapped set of issued license keys of one format."""
+
+    def __init__(self, path: Path):
+        """
+        Open an existing index.
+
+        Args:
+            path: Index file written by LicenseIndex.issue()
+
+        Raises:
+            ValueError: If the file is not a PassForge license index
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+            if len(header) < HEADER_SIZE:
+                raise ValueError(f"Not a license index: {self.path}")
+            magic, version, segments, segment_length, checksum, count = _HEADER.unpack_from(header)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Not a license index: {self.path}")
+            self.segments = segments
+            self.segment_length = segment_length
+            self.add_checksum = checksum
+            self.count = count
+            if os.fstat(f.fileno()).st_size != HEADER_SIZE + count * self.record_size:
+                raise ValueError(f"Truncated license index: {self.path}")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if count else None
+
+    @property
+    def key_length(self) -> int:
+        """Random characters per key (without dashes or check symbol)."""
+        return self.segments * self.segment_length
+
+    @property
+    def record_size(self) -> int:
+        return record_size(self.key_length)
+
+    def _record(self, key: str) -> Optional[bytes]:
+        """The record of a well-formed key, or None if the key does not fit the format."""
+        key = key.strip().upper()
+        parts = key.split("-")
+        expected = self.segments + (1 if self.add_checksum else 0)
+        if len(parts) != expected or any(len(p) != self.segment_length for p in parts[:self.segments]):
+            return None
+        if self.add_checksum and (len(parts[-1]) != 1 or not damm_valid(key)):
+            return None
+        try:
+            return bytes_from_symbols("".join(parts[:self.segments]))
+        except ValueError:
+            return None
+
+    def _contains_record(self, record: bytes) -> bool:
+        """Binary search of the memory-mapped records."""
+        mm = self._mmap
+        if mm is None:
+            return False
+        width = self.record_size
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = HEADER_SIZE + mid * width
+            value = mm[start:start + width]
+            if value < record:
+                lo = mid + 1
+            elif value > record:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def verify(self, key: str) -> bool:
+        """Whether a key has this index's format, a valid check symbol, and was issued (O(log n))."""
+        record = self._record(key)
+        return record is not None and self._contains_record(record)
+
+    def __contains__(self, key: str) -> bool:
+        return self.verify(key)
+
+    def format_record(self, record: bytes) -> str:
+        """The key a record stands for."""
+        return _format_record(record, self.segments, self.segment_length, self.add_checksum)
+
+    def __iter__(self) -> Iterator[str]:
+        """All issued keys, in index order."""
+        with open(self.path, "rb") as f:
+            for record in _iter_records(f, self.record_size, HEADER_SIZE):
+                yield self.format_record(record)
+
+    def close(self) -> None:
+        """Unmap the index."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "LicenseIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @classmethod
+    def issue(
+        cls,
+        path: Path,
+        count: int,
+        emit: Callable[[str], None],
+        segments: int = 4,
+        segment_length: int = 4,
+        add_checksum: bool = True,
+        rng: RandomSource = SYSTEM_RANDOM,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> "LicenseIndex":
+        """
+        Issue ``count`` new keys, unique among themselves and against the index.
+
+        The merged index is written next to ``path`` and renamed into place
+        when complete, all under ``path`` + ``.lock`` so that concurrent
+        issues queue rather than overwrite each other. New keys are passed to ``emit`` in index order as
+        they are merged.
+
+        Args:
+            path: Index file (created if missing; its format wins over the
+                segment arguments)
+            count: Number of new keys
+            emit: Called with each new key
+            segments: Segments per key, for a new index
+            segment_length: Characters per segment, for a new index
+            add_checksum: Append a Damm check segment, for a new index
+            rng: Random source
+            progress: Called with the number of keys issued so far
+
+        Returns:
+            The opened, updated index
+
+        Raises:
+            ValueError: On an invalid format or count, or when the key space
+                is too small for the requested keys
+        """
+        path = Path(path)
+        if count < 1:
+            raise ValueError("Count must be at least 1")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Held from the read to the rename, so concurrent issues never drop each other's keys
+        with file_lock(path.with_name(path.name + ".lock")):
+            if path.exists():
+                with cls(path) as index:
+                    segments, segment_length, add_checksum = index.segments, index.segment_length, index.add_checksum
+                    existing = index.count
+            else:
+                # Validates the format
+                LicenseKeyGenerator().generate(segments=segments, segment_length=segment_length)
+                existing = 0
+            length = segments * segment_length
+            if existing + count > 32 ** length * MAX_FILL:
+                raise ValueError(
+                    f"Key space too small: {segments}x{segment_length} keys cannot hold {existing + count:,} unique keys"
+                )
+
+            issued = 0
+            while issued < count:
+                issued += cls._merge_round(path, count - issued, emit, segments, segment_length, add_checksum, rng,
+                                           progress, issued)
+            return cls(path)
+
+    @classmethod
+    def _merge_round(
+        cls,
+        path: Path,
+        count: int,
+        emit: Callable[[str], None],
+        segments: int,
+        segment_length: int,
+        add_checksum: bool,
+        rng: RandomSource,
+        progress: Optional[Callable[[int], None]],
+        done: int
+    ) -> int:
+        """Generate ``count`` candidates, merge them into the index, and return how many were new."""
+        length = segments * segment_length
+        width = record_size(length)
+        # Bits past the last character are zeroed so each key has one record
+        mask = (0xFF << (width * 8 - length * 5)) & 0xFF
+
+        with tempfile.TemporaryDirectory(dir=path.parent, prefix=".license-") as tmp:
+            runs: List[Path] = []
+            remaining = count
+            while remaining:
+                batch = min(remaining, BATCH_SIZE)
+                data = rng.token_bytes(batch * width)
+                records = [data[i:i + width] for i in range(0, batch * width, width)]
+                if mask != 0xFF:
+                    records = [r[:-1] + bytes((r[-1] & mask,)) for r in records]
+                records.sort()
+                run = Path(tmp) / f"run{len(runs)}"
+                run.write_bytes(b"".join(records))
+                runs.append(run)
+                remaining -= batch
+
+            files = [open(run, "rb") for run in runs]
+            try:
+                sources = [((record, 1) for record in _iter_records(f, width)) for f in files]
+                if path.exists():
+                    files.append(open(path, "rb"))
+                    sources.append(((record, 0) for record in _iter_records(files[-1], width, HEADER_SIZE)))
+
+                total = new = 0
+                previous = None
+                out_path = Path(tmp) / "index"
+                with open(out_path, "wb") as out:
+                    out.write(bytes(HEADER_SIZE))
+                    pending: List[bytes] = []
+                    # Existing keys (tag 0) sort before equal new ones and win
+                    for record, fresh in heapq.merge(*sources):
+                        if record == previous:
+                            continue
+                        previous = record
+                        pending.append(record)
+                        total += 1
+                        if fresh:
+                            emit(_format_record(record, segments, segment_length, add_checksum))
+                            new += 1
+                            if progress is not None and (done + new) % BATCH_SIZE == 0:
+                                progress(done + new)
+                        if len(pending) >= BATCH_SIZE:
+                            out.write(b"".join(pending))
+                            pending.clear()
+                    out.write(b"".join(pending))
+                    out.seek(0)
+                    out.write(_HEADER.pack(MAGIC, VERSION, segments, segment_length, add_checksum, total))
+            finally:
+                for f in files:
+                    f.close()
+            os.replace(out_path, path)
+        return new
+
+
+def default_index_path() -> Path:
+    """Resolve the index from PASSFORGE_LICENSE_INDEX, the config file, or ~/.passforge."""
+    path = os.getenv("PASSFORGE_LICENSE_INDEX")
+    if not path:
+        from ..config.loader import get_config
+        path = get_config().get("license", "index")
+    return Path(path).expanduser() if path else DEFAULT_INDEX_PATH
@@ -1,27 +1,113 @@
 """
 License Key Generator - Software license keys with optional checksums.
 Format: XXXX-XXXX-XXXX-XXXX
+
+The 32-character alphabet is base 32, so each character carries exactly 5
+random bits: keys are cut from bulk random bytes, two characters per table
+lookup, with no per-character draws and no bias. The check
+symbol is a Damm check over GF(32), which catches every single-character
+error and every swap of adjacent characters.
 """
 
-import secrets
 from .base import BaseGenerator, GeneratorResult
+from .entropy_model import entropy_for
+
+# Key alphabet (no 0/O, 1/I), one character per 5-bit value
+LICENSE_CHARS = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+
+_VALUES = {c: i for i, c in enumerate(LICENSE_CHARS)}
+
+# Every 10-bit value as its two characters
+_PAIRS = [a + b for a in LICENSE_CHARS for b in LICENSE_CHARS]
+
+# Multiplication by x in GF(2^5) modulo the primitive polynomial x^5 + x^2 + 1.
+# The Damm operation a * b = x*a + b is then a totally anti-symmetric quasigroup.
+_TIMES_X = bytes((a << 1) ^ 0x25 if a & 0x10 else a << 1 for a in range(32))
+
+
+def record_size(length: int) -> int:
+    """Bytes holding ``length`` key characters (5 bits each)."""
+    return (length * 5 + 7) // 8
+
+
+def symbols_from_bytes(data: bytes, length: int) -> str:
+    """The ``length`` key characters encoded by the leading bits of ``data`` (5 bits per character)."""
+    width = record_size(length)
+    if len(data) < width:
+        raise ValueError(f"{length} characters need {width} bytes")
+    value = int.from_bytes(data[:width], "big") >> (width * 8 - length * 5)
+    pairs = _PAIRS
+    text = "".join([pairs[(value >> shift) & 0x3FF] for shift in range(10 * ((length - 1) // 2), -1, -10)])
+    return text[len(text) - length:]
+
+
+def bytes_from_symbols(symbols: str) -> bytes:
+    """
+    Pack key characters into record_size(len(symbols)) bytes (the inverse of symbols_from_bytes).
+
+    Raises:
+        ValueError: On characters outside LICENSE_CHARS
+    """
+    value = 0
+    try:
+        for c in symbols:
+            value = value << 5 | _VALUES[c]
+    except KeyError:
+        raise ValueError("License keys only use the characters " + LICENSE_CHARS) from None
+    width = record_size(len(symbols))
+    return (value << (width * 8 - len(symbols) * 5)).to_bytes(width, "big")
+
+
+def damm_check(symbols: str) -> str:
+    """
+    Damm check symbol over GF(32).
+
+    Dashes are skipped; appending the result makes damm_valid() true.
+
+    Raises:
+        ValueError: On characters outside LICENSE_CHARS
+    """
+    interim = 0
+    times_x = _TIMES_X
+    try:
+        for c in symbols:
+            if c != "-":
+                interim = times_x[interim] ^ _VALUES[c]
+    except KeyError as e:
+        raise ValueError(f"Invalid license key character: {e.args[0]!r}") from None
+    return LICENSE_CHARS[times_x[interim]]
+
+
+def damm_valid(key: str) -> bool:
+    """Whether a key ends with its correct Damm check symbol."""
+    body = key.rstrip("-")
+    if len(body.replace("-", "")) < 2:
+        return False
+    try:
+        return damm_check(body[:-1]) == body[-1]
+    except ValueError:
+        return False
 
 
 class LicenseKeyGenerator(BaseGenerator):
     """Generate software license keys in standard format."""
     
     # License keys typically use these characters (avoiding ambiguous ones)
-    LICENSE_CHARS = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+    LICENSE_CHARS = LICENSE_CHARS
     
     @property
     def generator_type(self) -> str:
         return "license"
     
     def calculate_checksum(self, key_without_checksum: str) -> str:
-        """Calculate a simple checksum character for validation."""
-        total = sum(ord(c) for c in key_without_checksum if c.isalnum())
-        index = total % len(self.LICENSE_CHARS)
-        return self.LICENSE_CHARS[index]
+        """Calculate the Damm check character for validation."""
+        return damm_check(key_without_checksum)
+
+    @staticmethod
+    def format_key(symbols: str, segment_length: int, add_checksum: bool = False) -> str:
+        """Split key characters into dash-separated segments, plus the check segment."""
+        key = "-".join(symbols[i:i + segment_length] for i in range(0, len(symbols), segment_length))
+        return f"{key}-{damm_check(symbols)}" if add_checksum else key
     
     def generate(
         self,
@@ -49,25 +135,14 @@ class LicenseKeyGenerator(BaseGenerator):
         if segment_length > 32:
             raise ValueError("Segment length must be at most 32")
         
-        # Generate segments
-        key_segments = []
-        for _ in range(segments):
-            segment = "".join(
-                secrets.choice(self.LICENSE_CHARS) 
-                for _ in range(segment_length)
-            )
-            key_segments.append(segment)
-        
-        key = "-".join(key_segments)
-        
-        if add_checksum:
-            checksum = self.calculate_checksum(key)
-            key = f"{key}-{checksum}"
+        # 5 random bits per character, all from one read
+        total_chars = segments * segment_length
+        symbols = symbols_from_bytes(self.rng.token_bytes(record_size(total_chars)), total_chars)
+        key = self.format_key(symbols, segment_length, add_checksum)
         
         # Calculate entropy
-        total_chars = segments * segment_length
         pool_size = len(self.LICENSE_CHARS)
-        entropy_bits = self.calculate_entropy(pool_size, total_chars)
+        entropy_bits = entropy_for(self.generator_type, pool_size=pool_size, length=total_chars)
         
         parameters = {
             "segments": segments,
@@ -1,14 +1,254 @@
 """
-OTP Generator - TOTP/HOTP secret generation.
+OTP Generator - TOTP/HOTP secret generation, code computation and verification.
+
+OtpKey computes and verifies HOTP (RFC 4226) and TOTP (RFC 6238) codes for
+one secret. The HMAC key schedule is done once per secret: the inner and
+outer padded-key hash states are kept and copied for each code, so a code
+costs two short hash updates. Verification checks a window of time steps
+(or a look-ahead of HOTP counters) around the expected one and returns the
+matching counter, which callers keep to refuse replays; the codes of the
+last window are kept, so repeated checks in one time step do not recompute
+them. otp_key() caches OtpKeys per secret for long-running verifiers, and
+a ReplayGuard remembers the last accepted step of each secret (by a hash of
+the decoded secret, in a bounded LRU) so a code is accepted only once.
 """
 
-import secrets
 import base64
+import binascii
 import hmac
 import hashlib
 import time
 import struct
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Iterable, List, Optional
 from .base import BaseGenerator, GeneratorResult
+from .entropy_model import entropy_for
+
+# Supported HMAC hash algorithms
+HASHES = {
+    "SHA1": hashlib.sha1,
+    "SHA256": hashlib.sha256,
+    "SHA512": hashlib.sha512
+}
+
+# OtpKeys kept by otp_key()
+KEY_CACHE_SIZE = 4096
+
+# Secrets whose last accepted step a ReplayGuard remembers
+REPLAY_CACHE_SIZE = 65536
+
+# Largest verification window (time steps or counters either side)
+MAX_WINDOW = 100
+
+_COUNTER = struct.Struct(">Q")
+_TRUNCATED = struct.Struct(">I")
+
+
+def decode_secret(secret: str) -> bytes:
+    """
+    Decode a Base32 OTP secret as shown by authenticator apps.
+
+    Spaces and dashes are ignored, case does not matter and padding is optional.
+
+    Raises:
+        ValueError: If the secret is empty or not Base32
+    """
+    text = secret.replace(" ", "").replace("-", "").upper().rstrip("=")
+    if not text:
+        raise ValueError("OTP secret must not be empty")
+    try:
+        return base64.b32decode(text + "=" * (-len(text) % 8))
+    except binascii.Error:
+        raise ValueError("OTP secret must be Base32 (A-Z, 2-7)") from None
+
+
+class OtpKey:
+    """HOTP/TOTP code computation and verification for one secret."""
+
+    def __init__(
+        self,
+        secret: bytes,
+        digits: int = 6,
+        period: int = 30,
+        algorithm: str = "SHA1",
+        t0: int = 0
+    ):
+        """
+        Args:
+            secret: Raw secret bytes
+            digits: Code length (6-8)
+            period: TOTP time step in seconds
+            algorithm: HMAC hash (SHA1, SHA256, SHA512)
+            t0: Unix time at which TOTP counting starts
+
+        Raises:
+            ValueError: On an empty secret or invalid parameters
+        """
+        if not secret:
+            raise ValueError("OTP secret must not be empty")
+        if digits < 6 or digits > 8:
+            raise ValueError("Digits must be between 6 and 8")
+        if period < 1:
+            raise ValueError("Period must be at least 1 second")
+        if algorithm not in HASHES:
+            raise ValueError("Algorithm must be SHA1, SHA256, or SHA512")
+        self.digits = digits
+        self.period = period
+        self.algorithm = algorithm
+        self.t0 = t0
+        self._modulus = 10 ** digits
+        # Identifies the secret (however it was spelled) without keeping it
+        self.fingerprint = hashlib.sha256(secret).digest()
+
+        # HMAC key schedule (RFC 2104), done once
+        hash_func = HASHES[algorithm]
+        block_size = hash_func().block_size
+        if len(secret) > block_size:
+            secret = hash_func(secret).digest()
+        secret = secret.ljust(block_size, b"\0")
+        self._inner = hash_func(bytes(b ^ 0x36 for b in secret))
+        self._outer = hash_func(bytes(b ^ 0x5C for b in secret))
+        # (first counter, codes) of the last verification window
+        self._window = (0, [])
+
+    @classmethod
+    def from_base32(cls, secret: str, **kwargs) -> "OtpKey":
+        """An OtpKey for a Base32 secret (see decode_secret)."""
+        return cls(decode_secret(secret), **kwargs)
+
+    def hotp(self, counter: int) -> str:
+        """The code for an HOTP counter (RFC 4226)."""
+        inner = self._inner.copy()
+        inner.update(_COUNTER.pack(counter))
+        outer = self._outer.copy()
+        outer.update(inner.digest())
+        mac = outer.digest()
+        # Dynamic truncation: the last nibble picks 4 bytes
+        offset = mac[-1] & 0x0F
+        code = (_TRUNCATED.unpack_from(mac, offset)[0] & 0x7FFFFFFF) % self._modulus
+        return str(code).zfill(self.digits)
+
+    def counter_at(self, timestamp: Optional[float] = None) -> int:
+        """The TOTP time step at a Unix time (default: now)."""
+        if timestamp is None:
+            timestamp = time.time()
+        return int((timestamp - self.t0) // self.period)
+
+    def totp(self, timestamp: Optional[float] = None) -> str:
+        """The TOTP code at a Unix time (default: now)."""
+        return self.hotp(self.counter_at(timestamp))
+
+    def codes(self, counter: int, count: int) -> List[str]:
+        """Codes for ``count`` consecutive counters (or time steps) from ``counter``."""
+        if counter < 0 or count < 0:
+            raise ValueError("Counters must not be negative")
+        hotp = self.hotp
+        return [hotp(c) for c in range(counter, counter + count)]
+
+    def _match(self, code: str, first: int, count: int) -> Optional[int]:
+        """The counter in ``[first, first + count)`` whose code is ``code``, or None."""
+        code = code.replace(" ", "")
+        # compare_digest() refuses non-ASCII text; such a code is simply wrong
+        if len(code) != self.digits or not (code.isascii() and code.isdigit()):
+            return None
+        cached_first, cached = self._window
+        if cached_first != first or len(cached) != count:
+            cached = self.codes(first, count)
+            self._window = (first, cached)
+        match = None
+        # Every candidate is compared, in constant time
+        for i, candidate in enumerate(cached):
+            if hmac.compare_digest(candidate, code) and match is None:
+                match = first + i
+        return match
+
+    def verify(
+        self,
+        code: str,
+        timestamp: Optional[float] = None,
+        window: int = 1,
+        after: Optional[int] = None
+    ) -> Optional[int]:
+        """
+        Check a TOTP code, allowing ``window`` time steps of clock skew either way.
+
+        Args:
+            code: Code to check (spaces are ignored)
+            timestamp: Unix time of the check (default: now)
+            window: Time steps accepted before and after the current one
+            after: Last accepted time step; it and earlier steps are refused
+                so a code cannot be replayed
+
+        Returns:
+            The matching time step, or None if the code is not valid
+        """
+        if not 0 <= window <= MAX_WINDOW:
+            raise ValueError(f"Window must be between 0 and {MAX_WINDOW}")
+        # One clock read, so the window cannot straddle a step boundary
+        current = self.counter_at(timestamp)
+        first = max(0, current - window)
+        if after is not None:
+            first = max(first, after + 1)
+        last = current + window
+        if first > last:
+            return None
+        return self._match(code, first, last - first + 1)
+
+    def verify_hotp(self, code: str, counter: int, look_ahead: int = 10) -> Optional[int]:
+        """
+        Check an HOTP code against the expected counter and the next ``look_ahead``.
+
+        Returns:
+            The matching counter (store it + 1 as the next expected counter),
+            or None if the code is not valid
+        """
+        if not 0 <= look_ahead <= MAX_WINDOW:
+            raise ValueError(f"Look-ahead must be between 0 and {MAX_WINDOW}")
+        if counter < 0:
+            raise ValueError("Counters must not be negative")
+        return self._match(code, counter, look_ahead + 1)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def otp_key(secret: str, digits: int = 6, period: int = 30, algorithm: str = "SHA1") -> OtpKey:
+    """A cached OtpKey for a Base32 secret, so repeat verifications skip the key schedule."""
+    return OtpKey.from_base32(secret, digits=digits, period=period, algorithm=algorithm)
+
+
+class ReplayGuard:
+    """Accept each TOTP code once: remembers the last accepted step per secret."""
+
+    def __init__(self, size: int = REPLAY_CACHE_SIZE):
+        """
+        Args:
+            size: Secrets remembered; the least recently used are forgotten
+                first (a forgotten secret's codes are safe again once its
+                last step has left the window)
+        """
+        self.size = size
+        self._steps: "OrderedDict[bytes, int]" = OrderedDict()
+
+    def verify(self, key: OtpKey, code: str, timestamp: Optional[float] = None, window: int = 1) -> Optional[int]:
+        """Like OtpKey.verify(), refusing steps at or before the last one accepted for the secret."""
+        fingerprint = key.fingerprint
+        match = key.verify(code, timestamp, window, after=self._steps.get(fingerprint))
+        if match is not None:
+            self._steps[fingerprint] = match
+            self._steps.move_to_end(fingerprint)
+            if len(self._steps) > self.size:
+                self._steps.popitem(last=False)
+        return match
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+
+def totp_codes(keys: Iterable[OtpKey], timestamp: Optional[float] = None) -> List[str]:
+    """The current TOTP codes of many secrets, all at the same time."""
+    if timestamp is None:
+        timestamp = time.time()
+    return [key.totp(timestamp) for key in keys]
 
 
 class OtpGenerator(BaseGenerator):
@@ -37,34 +277,7 @@ class OtpGenerator(BaseGenerator):
         Returns:
             Current OTP code as a string
         """
-        # Calculate counter (number of periods since Unix epoch)
-        counter = int(time.time() / period)
-        
-        # Pack counter into 8 bytes (big-endian)
-        msg = struct.pack(">Q", counter)
-        
-        # Select hash algorithm
-        hash_map = {
-            "SHA1": hashlib.sha1,
-            "SHA256": hashlib.sha256,
-            "SHA512": hashlib.sha512
-        }
-        hash_func = hash_map.get(algorithm, hashlib.sha1)
-        
-        # Calculate HMAC
-        hmac_hash = hmac.new(secret_bytes, msg, hash_func).digest()
-        
-        # Dynamic truncation
-        # The last nibble of the hash is the offset
-        offset = hmac_hash[-1] & 0x0F
-        # Extract 4 bytes starting at offset
-        truncated_hash = struct.unpack(">I", hmac_hash[offset:offset+4])[0] & 0x7FFFFFFF
-        
-        # Convert to digits
-        code = truncated_hash % (10 ** digits)
-        
-        # Pad with leading zeros
-        return str(code).zfill(digits)
+        return OtpKey(secret_bytes, digits, period, algorithm).totp()
 
     def generate(
         self,
@@ -93,7 +306,7 @@ class OtpGenerator(BaseGenerator):
         # Generate raw bytes
         byte_lengths = {"SHA1": 20, "SHA256": 32, "SHA512": 64}
         byte_length = byte_lengths[algorithm]
-        secret_bytes = secrets.token_bytes(byte_length)
+        secret_bytes = self.rng.token_bytes(byte_length)
         
         # Base32 encode the secret for authenticator apps
         secret_b32 = base64.b32encode(secret_bytes).decode('ascii').rstrip('=')
@@ -113,7 +326,7 @@ class OtpGenerator(BaseGenerator):
             f"&period={period}"
         )
         
-        entropy_bits = byte_length * 8.0
+        entropy_bits = entropy_for(self.generator_type, byte_length=byte_length)
         
         parameters = {
             "digits": digits,
@@ -2,10 +2,10 @@
 Passphrase Generator - Word-based passphrase generation using wordlists.
 """
 
-import secrets
 import os
 from typing import Optional, List
 from .base import BaseGenerator, GeneratorResult
+from .entropy_model import entropy_for
 
 
 # Default EFF large wordlist (embedded subset for offline use)
@@ -301,7 +301,7 @@ class PassphraseGenerator(BaseGenerator):
             raise ValueError("Not enough words in wordlist meeting length requirements")
         
         # Select random words
-        words = [secrets.choice(filtered) for _ in range(word_count)]
+        words = [self.rng.choice(filtered) for _ in range(word_count)]
         
         if uppercase:
             words = [w.upper() for w in words]
@@ -314,7 +314,7 @@ class PassphraseGenerator(BaseGenerator):
         
         # Calculate entropy: log2(wordlist_size ^ word_count)
         pool_size = len(filtered)
-        entropy_bits = self.calculate_entropy(pool_size, word_count)
+        entropy_bits = entropy_for(self.generator_type, wordlist_size=pool_size, word_count=word_count)
         
         parameters = {
             "word_count": word_count,
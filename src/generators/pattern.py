@@ -2,9 +2,9 @@
 Pattern Generator - Visual grid-based pattern passwords.
 """
 
-import secrets
 from typing import List, Tuple
 from .base import BaseGenerator, GeneratorResult
+from .entropy_model import entropy_for
 
 
 class PatternGenerator(BaseGenerator):
@@ -43,7 +43,7 @@ class PatternGenerator(BaseGenerator):
         # Generate random path (no repeats)
         path: List[int] = []
         for _ in range(path_length):
-            point = secrets.choice(available)
+            point = self.rng.choice(available)
             path.append(point)
             available.remove(point)
         
@@ -72,7 +72,7 @@ class PatternGenerator(BaseGenerator):
         # P(n, r) = n! / (n-r)!
         import math
         permutations = math.perm(total_points, path_length)
-        entropy_bits = math.log2(permutations)
+        entropy_bits = entropy_for(self.generator_type, grid_size=grid_size, path_length=path_length)
         
         parameters = {
             "grid_size": grid_size,
@@ -4,6 +4,7 @@ Phonetic Generator - NATO phonetic alphabet conversion for passwords.
 
 from typing import Dict
 from .base import BaseGenerator, GeneratorResult
+from .entropy_model import entropy_for
 
 NATO_MAP: Dict[str, str] = {
     'a': 'Alpha', 'b': 'Bravo', 'c': 'Charlie', 'd': 'Delta', 'e': 'Echo',
@@ -52,7 +53,6 @@ class PhoneticGenerator(BaseGenerator):
             raise ValueError("Sequence length must be at least 4")
         if length > 128:
             raise ValueError("Sequence length must be at most 128")
-        import secrets
         import string
         
         is_generated = False
@@ -60,7 +60,7 @@ class PhoneticGenerator(BaseGenerator):
             is_generated = True
             # Generate random alphanumeric string first
             chars = string.ascii_lowercase + string.digits
-            text = "".join(secrets.choice(chars) for _ in range(length))
+            text = "".join(self.rng.choice(chars) for _ in range(length))
             original = text
         else:
             original = text
@@ -69,9 +69,7 @@ class PhoneticGenerator(BaseGenerator):
         
         # Entropy is based on the original string length
         # Assuming only alphanumeric for random generation
-        pool_size = 36 # 26 letters + 10 digits
-        import math
-        entropy_bits = length * math.log2(pool_size) if is_generated else 0
+        entropy_bits = entropy_for(self.generator_type, length=length) if is_generated else 0
         
         parameters = {
             "original": original,
@@ -2,8 +2,12 @@
 PIN Generator - Numeric PIN generation.
 """
 
-import secrets
+from pathlib import Path
+from typing import Iterator, Optional
+
 from .base import BaseGenerator, GeneratorResult
+from .code_batch import draw_codes
+from .entropy_model import entropy_for
 
 
 class PinGenerator(BaseGenerator):
@@ -13,6 +17,37 @@ class PinGenerator(BaseGenerator):
     def generator_type(self) -> str:
         return "pin"
     
+    @staticmethod
+    def _validate(length: int) -> None:
+        if length < 4:
+            raise ValueError("PIN length must be at least 4")
+        if length > 64:
+            raise ValueError("PIN length must be at most 64")
+    
+    def generate_batch(
+        self,
+        count: int,
+        length: int = 6,
+        issued_path: Optional[Path] = None
+    ) -> Iterator[str]:
+        """
+        Stream ``count`` distinct PINs in constant memory.
+        
+        Args:
+            count: Number of PINs (at most 10^length)
+            length: PIN length (4-64)
+            issued_path: Issued-set file; PINs are then also distinct from
+                every earlier batch drawn from it
+            
+        Raises:
+            ValueError: On an invalid length, or more PINs than the space
+                (or the issued-set) has left
+        """
+        if count < 1:
+            raise ValueError("Must generate at least 1 PIN")
+        self._validate(length)
+        return (f"{v:0{length}d}" for v in draw_codes(10, length, count, self.rng, issued_path))
+    
     def generate(
         self,
         length: int = 6
@@ -26,14 +61,11 @@ class PinGenerator(BaseGenerator):
         Returns:
             GeneratorResult with PIN and metadata
         """
-        if length < 4:
-            raise ValueError("PIN length must be at least 4")
-        if length > 64:
-            raise ValueError("PIN length must be at most 64")
+        self._validate(length)
         
-        pin = "".join(secrets.choice(self.DIGITS) for _ in range(length))
+        pin = "".join(self.rng.choice(self.DIGITS) for _ in range(length))
         
-        entropy_bits = self.calculate_entropy(10, length)
+        entropy_bits = entropy_for(self.generator_type, length=length)
         
         parameters = {
             "length": length,
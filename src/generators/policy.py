@@ -0,0 +1,586 @@
+"""
+Policy Generator - Passwords that satisfy a declarative password policy.
+
+A PasswordPolicy describes a target system's rules: allowed character
+classes, minimum counts, a minimum number of distinct classes, the longest
+run of one character or of one class, classes banned from the first or last
+position, and forbidden substrings. It is compiled once into a counted
+automaton. The compiler tracks the forbidden substrings with an Aho-Corasick
+automaton, along with the current runs and the per-class progress, and counts
+the compliant completions from every reachable state. Sampling walks the
+automaton, choosing each character with probability proportional to the
+number of completions it leaves. Every compliant password is therefore
+equally likely, the entropy is exactly log2(number of compliant passwords),
+and no candidate is ever rejected, however strict the policy.
+
+Compiling a strict policy can take seconds, so compiled automata that were
+slow to build are also stored on disk (``~/.passforge/cache/policies``), one
+file per content hash of the policy. Later processes load them instead of
+compiling again.
+"""
+
+import hashlib
+import json
+import logging
+import marshal
+import os
+import tempfile
+import time
+import zlib
+from bisect import bisect_right
+from collections import deque
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .drbg import SYSTEM_RANDOM, RandomSource
+from .base import BaseGenerator, GeneratorResult
+from .entropy_model import entropy_for, log2_count, register_model
+
+logger = logging.getLogger(__name__)
+
+# Character classes, in the order used by the compiled automaton
+CLASS_NAMES = ("lowercase", "uppercase", "digits", "symbols")
+
+# Upper bound on policy lengths (the automaton is built per position)
+MAX_POLICY_LENGTH = 256
+
+# Compiled-policy cache files: magic and format version, then zlib-compressed
+# marshal data. Bump the version whenever the automaton layout changes.
+CACHE_MAGIC = b"PFPOLICY"
+CACHE_FORMAT = 2
+
+# Default location of the compiled-policy cache
+DEFAULT_CACHE_DIR = Path.home() / ".passforge" / "cache" / "policies"
+
+# Compiles faster than this are not worth a cache file
+MIN_PERSIST_SECONDS = 0.05
+
+# Counting steps (one big-integer product each, about 1 µs) past which a
+# compile logs a warning before it starts counting
+SLOW_COMPILE_STEPS = 2_000_000
+
+
+@dataclass(frozen=True)
+class PasswordPolicy:
+    """Declarative password rules (immutable and hashable, so it can be cached)."""
+    length: int = 16
+    lowercase: str = BaseGenerator.LOWERCASE
+    uppercase: str = BaseGenerator.UPPERCASE
+    digits: str = BaseGenerator.DIGITS
+    symbols: str = BaseGenerator.SYMBOLS
+    exclude: str = ""
+    min_lowercase: int = 0
+    min_uppercase: int = 0
+    min_digits: int = 0
+    min_symbols: int = 0
+    min_classes: int = 0
+    max_repeat: int = 0
+    max_class_run: int = 0
+    first_not: Tuple[str, ...] = ()
+    last_not: Tuple[str, ...] = ()
+    forbidden: Tuple[str, ...] = ()
+    case_insensitive: bool = True
+
+    def __post_init__(self):
+        if not 1 <= self.length <= MAX_POLICY_LENGTH:
+            raise ValueError(f"Policy length must be between 1 and {MAX_POLICY_LENGTH}")
+        for name in ("min_lowercase", "min_uppercase", "min_digits", "min_symbols",
+                     "min_classes", "max_repeat", "max_class_run"):
+            if getattr(self, name) < 0:
+                raise ValueError(f"{name} must not be negative")
+        if self.min_classes > len(CLASS_NAMES):
+            raise ValueError(f"min_classes must be at most {len(CLASS_NAMES)}")
+        for name in ("first_not", "last_not"):
+            unknown = set(getattr(self, name)) - set(CLASS_NAMES)
+            if unknown:
+                raise ValueError(f"Unknown character class in {name}: {', '.join(sorted(unknown))}")
+        if any(not pattern for pattern in self.forbidden):
+            raise ValueError("Forbidden substrings must not be empty")
+        if self.minimums()[-1] > self.length:
+            raise ValueError("Minimum class counts exceed the policy length")
+
+    def minimums(self) -> Tuple[int, ...]:
+        """Minimum count per class (CLASS_NAMES order), then their total."""
+        counts = tuple(getattr(self, f"min_{name}") for name in CLASS_NAMES)
+        return counts + (sum(counts),)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PasswordPolicy":
+        """
+        Build a policy from a JSON/YAML-style dictionary.
+
+        Raises:
+            ValueError: On unknown keys or invalid values
+        """
+        known = {f.name for f in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Unknown policy keys: {', '.join(sorted(unknown))}")
+        values = dict(data)
+        for name in ("first_not", "last_not", "forbidden"):
+            if name in values:
+                value = values[name]
+                values[name] = (value,) if isinstance(value, str) else tuple(value)
+        return cls(**values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return {f.name: list(v) if isinstance(v, tuple) else v
+                for f in fields(self) for v in [getattr(self, f.name)]}
+
+
+@dataclass(frozen=True)
+class _Group:
+    """Characters that drive the automaton identically."""
+    cls: int
+    chars: str
+    symbol: Optional[str]  # Aho-Corasick input symbol, None if in no pattern
+
+
+# Automaton state: (pattern state, last group, identical run, last class, class run, progress)
+_State = Tuple[int, int, int, int, int, Tuple[int, ...]]
+
+
+class CompiledPolicy:
+    """A policy compiled into a counted automaton, ready to sample."""
+
+    def __init__(self, policy: PasswordPolicy, groups: List[_Group]):
+        self.policy = policy
+        self.groups = groups
+        self.count = 0
+        self.entropy_bits = 0.0
+        # Progress is only tracked up to what the minimums need
+        self._minimums = policy.minimums()[:-1]
+        self._caps = tuple(max(m, 1 if policy.min_classes else 0) for m in self._minimums)
+        self._delta: Dict[Tuple[int, Optional[str]], int] = {}
+        self._dead: Set[int] = set()
+        self._edges: Dict[int, List[Tuple[int, int, int, int]]] = {}
+        self._first_banned = {CLASS_NAMES.index(name) for name in policy.first_not}
+        self._last_banned = {CLASS_NAMES.index(name) for name in policy.last_not}
+        # Progress after adding a character of a class, with every accepting
+        # progress folded into one (the minimums can no longer fail)
+        self._advance: Dict[Tuple[Tuple[int, ...], int], Tuple[int, ...]] = {}
+        # Transitions per (state, first position, last position); only the two
+        # ends of the password have their own banned classes
+        self._transition_cache: Dict[Tuple[_State, bool, bool], list] = {}
+        self._successor_cache: Dict[Tuple[_State, bool, bool], List[Tuple[int, _State]]] = {}
+        self._counts: List[Dict[_State, int]] = []
+        self._choices: Dict[Tuple[int, _State], Tuple[List[int], list]] = {}
+
+    @classmethod
+    def compile(cls, policy: PasswordPolicy, charsets: Optional[Dict[str, str]] = None) -> "CompiledPolicy":
+        """
+        Compile a policy.
+
+        Args:
+            policy: Rules to compile
+            charsets: Per-class characters overriding the policy's (e.g. after
+                easy-read filtering)
+
+        Raises:
+            ValueError: If no password satisfies the policy
+        """
+        charsets = charsets or {name: getattr(policy, name) for name in CLASS_NAMES}
+        fold = str.lower if policy.case_insensitive else (lambda c: c)
+        patterns = [fold(p) for p in policy.forbidden]
+        alphabet = set("".join(patterns))
+
+        # Group characters by (class, pattern symbol); duplicates and excluded
+        # characters are dropped, and a character keeps its first class
+        keyed: Dict[Tuple[int, Optional[str]], List[str]] = {}
+        seen: Set[str] = set()
+        for index, name in enumerate(CLASS_NAMES):
+            for char in charsets.get(name, ""):
+                if char in seen or char in policy.exclude:
+                    continue
+                seen.add(char)
+                symbol = fold(char) if fold(char) in alphabet else None
+                keyed.setdefault((index, symbol), []).append(char)
+        groups = [_Group(index, "".join(chars), symbol) for (index, symbol), chars in keyed.items()]
+        compiled = cls(policy, groups)
+        compiled._build_pattern_automaton(patterns)
+        compiled._count()
+        if not compiled.count:
+            raise ValueError("No password satisfies this policy")
+        compiled.entropy_bits = log2_count(compiled.count)
+        return compiled
+
+    def _build_pattern_automaton(self, patterns: List[str]) -> None:
+        """Aho-Corasick automaton with a full transition function."""
+        goto: List[Dict[str, int]] = [{}]
+        terminal = [False]
+        for pattern in patterns:
+            state = 0
+            for char in pattern:
+                if char not in goto[state]:
+                    goto.append({})
+                    terminal.append(False)
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            terminal[state] = True
+
+        symbols = sorted({g.symbol for g in self.groups if g.symbol is not None})
+        fail = [0] * len(goto)
+        queue = deque()
+        for symbol in symbols:
+            target = goto[0].get(symbol, 0)
+            self._delta[(0, symbol)] = target
+            if target:
+                queue.append(target)
+        while queue:
+            state = queue.popleft()
+            terminal[state] = terminal[state] or terminal[fail[state]]
+            for symbol in symbols:
+                target = goto[state].get(symbol)
+                if target is None:
+                    self._delta[(state, symbol)] = self._delta[(fail[state], symbol)]
+                else:
+                    fail[target] = self._delta[(fail[state], symbol)]
+                    self._delta[(state, symbol)] = target
+                    queue.append(target)
+        self._dead = {state for state, is_terminal in enumerate(terminal) if is_terminal}
+
+    def _start(self) -> _State:
+        return (0, -1, 0, -1, 0, (0,) * len(CLASS_NAMES))
+
+    def _accepts(self, state: _State) -> bool:
+        return self._satisfied(state[5])
+
+    def _satisfied(self, progress: Tuple[int, ...]) -> bool:
+        if any(have < need for have, need in zip(progress, self._minimums)):
+            return False
+        return sum(have > 0 for have in progress) >= self.policy.min_classes
+
+    def _next_progress(self, progress: Tuple[int, ...], cls: int) -> Tuple[int, ...]:
+        key = (progress, cls)
+        result = self._advance.get(key)
+        if result is None:
+            result = progress
+            if progress[cls] < self._caps[cls]:
+                result = progress[:cls] + (progress[cls] + 1,) + progress[cls + 1:]
+            if self._satisfied(result):
+                result = self._caps
+            self._advance[key] = result
+        return result
+
+    def _pattern_edges(self, pattern_state: int) -> List[Tuple[int, int, int, int]]:
+        """(group, class, size, next pattern state) for groups that complete no forbidden substring."""
+        edges = self._edges.get(pattern_state)
+        if edges is None:
+            edges = []
+            for index, group in enumerate(self.groups):
+                next_pattern = self._delta.get((pattern_state, group.symbol), 0)
+                if next_pattern not in self._dead:
+                    edges.append((index, group.cls, len(group.chars), next_pattern))
+            self._edges[pattern_state] = edges
+        return edges
+
+    def _transitions(self, state: _State, position: int) -> List[Tuple[int, int, Optional[bool], _State]]:
+        """
+        List (ways, group, repeat, next state) for every allowed next character.
+
+        ``repeat`` is True for repeating the previous character, False for any
+        other character of the group, and None when repeats are not tracked
+        (any character of the group).
+        """
+        key = (state, position == 0, position == self.policy.length - 1)
+        transitions = self._transition_cache.get(key)
+        if transitions is None:
+            transitions = self._transition_cache[key] = self._build_transitions(state, *key[1:])
+        return transitions
+
+    def _successors(self, state: _State, position: int) -> List[Tuple[int, _State]]:
+        """(ways, next state) for each distinct next state, for counting."""
+        key = (state, position == 0, position == self.policy.length - 1)
+        successors = self._successor_cache.get(key)
+        if successors is None:
+            merged: Dict[_State, int] = {}
+            for ways, _, _, nxt in self._transitions(state, position):
+                merged[nxt] = merged.get(nxt, 0) + ways
+            successors = self._successor_cache[key] = [(ways, nxt) for nxt, ways in merged.items()]
+        return successors
+
+    def _build_transitions(
+        self,
+        state: _State,
+        first: bool,
+        last_position: bool
+    ) -> List[Tuple[int, int, Optional[bool], _State]]:
+        policy = self.policy
+        max_repeat = policy.max_repeat
+        max_class_run = policy.max_class_run
+        pattern_state, last, same_run, last_class, class_run, progress = state
+        banned = self._first_banned if first else set()
+        if last_position:
+            banned = banned | self._last_banned
+        transitions = []
+        for index, cls, size, next_pattern in self._pattern_edges(pattern_state):
+            if cls in banned:
+                continue
+            next_class, next_class_run = -1, 0
+            if max_class_run:
+                next_class = cls
+                next_class_run = class_run + 1 if cls == last_class else 1
+                if next_class_run > max_class_run:
+                    continue
+            next_progress = self._next_progress(progress, cls)
+            if not max_repeat:
+                transitions.append((size, index, None, (next_pattern, -1, 0, next_class, next_class_run, next_progress)))
+            elif index != last:
+                transitions.append((size, index, False, (next_pattern, index, 1, next_class, next_class_run, next_progress)))
+            else:
+                if same_run < max_repeat:
+                    transitions.append((1, index, True, (next_pattern, index, same_run + 1, next_class, next_class_run, next_progress)))
+                if size > 1:
+                    transitions.append((size - 1, index, False, (next_pattern, index, 1, next_class, next_class_run, next_progress)))
+        return transitions
+
+    def _count(self) -> None:
+        """
+        Count compliant completions from every state reachable from the start.
+
+        A forward pass collects the states reachable at each position, then a
+        backward pass sums the completions layer by layer. The cost is about
+        (reachable states) x (character groups) big-integer products: each
+        rule that is set multiplies the states (by the forbidden-substring
+        automaton size, groups x max_repeat, 4 x max_class_run, and the
+        combinations of class progress), so a long policy with every rule
+        takes seconds. Slow compiles are stored in the disk cache.
+        """
+        length = self.policy.length
+        layers: List[List[_State]] = [[self._start()]]
+        steps = 0
+        for position in range(length):
+            following: Dict[_State, None] = {}
+            for state in layers[position]:
+                successors = self._successors(state, position)
+                steps += len(successors)
+                for _, nxt in successors:
+                    following[nxt] = None
+            layers.append(list(following))
+        if steps > SLOW_COMPILE_STEPS:
+            logger.warning("Compiling this policy takes a few seconds (%d states, %d counting steps); "
+                           "the result is cached", sum(map(len, layers)), steps)
+
+        counts: List[Dict[_State, int]] = [{} for _ in range(length + 1)]
+        counts[length] = {state: int(self._accepts(state)) for state in layers[length]}
+        for position in range(length - 1, -1, -1):
+            following = counts[position + 1]
+            counts[position] = {
+                state: sum(ways * following[nxt] for ways, nxt in self._successors(state, position))
+                for state in layers[position]
+            }
+        self.count = counts[0][self._start()]
+        self._counts = counts
+        self._successor_cache.clear()
+
+    def _options(self, position: int, state: _State) -> Tuple[List[int], list]:
+        """Cumulative completion counts of the choices from a state (cached)."""
+        key = (position, state)
+        cached = self._choices.get(key)
+        if cached is None:
+            following = self._counts[position + 1]
+            cumulative, options = [], []
+            total = 0
+            for ways, group, repeat, nxt in self._transitions(state, position):
+                weight = ways * following.get(nxt, 0)
+                if weight:
+                    total += weight
+                    cumulative.append(total)
+                    options.append((group, repeat, nxt))
+            cached = self._choices[key] = (cumulative, options)
+        return cached
+
+    def dumps(self) -> bytes:
+        """Serialize the compiled automaton (states with no completions are dropped)."""
+        state = (
+            CACHE_FORMAT,
+            [(g.cls, g.chars, g.symbol) for g in self.groups],
+            self._delta,
+            sorted(self._dead),
+            self.count,
+            [{key: total for key, total in layer.items() if total} for layer in self._counts],
+        )
+        return CACHE_MAGIC + zlib.compress(marshal.dumps(state), 1)
+
+    @classmethod
+    def loads(cls, policy: PasswordPolicy, data: bytes) -> "CompiledPolicy":
+        """
+        Restore an automaton written by dumps().
+
+        Raises:
+            ValueError: If the data is not a compiled policy of this format
+        """
+        if not data.startswith(CACHE_MAGIC):
+            raise ValueError("Not a compiled policy")
+        try:
+            version, groups, delta, dead, count, counts = marshal.loads(zlib.decompress(data[len(CACHE_MAGIC):]))
+        except (EOFError, TypeError, ValueError, zlib.error) as e:
+            raise ValueError(f"Corrupt compiled policy: {e}") from e
+        if version != CACHE_FORMAT or len(counts) != policy.length + 1:
+            raise ValueError("Compiled policy does not match this format")
+        compiled = cls(policy, [_Group(*group) for group in groups])
+        compiled._delta = delta
+        compiled._dead = set(dead)
+        compiled._counts = counts
+        compiled.count = count
+        compiled.entropy_bits = log2_count(count)
+        return compiled
+
+    def sample(self, rng: RandomSource = SYSTEM_RANDOM) -> str:
+        """Draw a uniformly random compliant password."""
+        state = self._start()
+        chars: List[str] = []
+        for position in range(self.policy.length):
+            cumulative, options = self._options(position, state)
+            last = state[1]
+            group, repeat, state = options[bisect_right(cumulative, rng.randbelow(cumulative[-1]))]
+            members = self.groups[group].chars
+            if repeat:
+                chars.append(chars[-1])
+            elif repeat is False and group == last:
+                # Any member except the previous character
+                index = rng.randbelow(len(members) - 1)
+                previous = members.index(chars[-1])
+                chars.append(members[index + (index >= previous)])
+            else:
+                chars.append(rng.choice(members))
+        return "".join(chars)
+
+
+def policy_digest(policy: PasswordPolicy, charsets: Optional[Tuple[Tuple[str, str], ...]] = None) -> str:
+    """Content hash identifying a compiled policy (rules, character sets and format)."""
+    content = json.dumps(
+        {"format": CACHE_FORMAT, "policy": policy.to_dict(), "charsets": charsets},
+        sort_keys=True
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class PolicyCache:
+    """Compiled policies on disk, one file per content hash."""
+
+    def __init__(self, directory: Path):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Folder holding the cache files (created on first store)
+        """
+        self.directory = Path(directory)
+
+    def path(self, policy: PasswordPolicy, charsets: Optional[Tuple[Tuple[str, str], ...]] = None) -> Path:
+        return self.directory / f"{policy_digest(policy, charsets)}.policy"
+
+    def load(self, policy: PasswordPolicy, charsets: Optional[Tuple[Tuple[str, str], ...]] = None) -> Optional[CompiledPolicy]:
+        """Return the cached automaton, or None if missing or unreadable."""
+        try:
+            data = self.path(policy, charsets).read_bytes()
+            return CompiledPolicy.loads(policy, data)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, compiled: CompiledPolicy, charsets: Optional[Tuple[Tuple[str, str], ...]] = None) -> bool:
+        """
+        Write an automaton to the cache (atomically; failures are ignored).
+
+        Returns:
+            True if the file was written
+        """
+        target = self.path(compiled.policy, charsets)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(compiled.dumps())
+                os.replace(tmp_path, target)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            return False
+        return True
+
+
+def get_policy_cache() -> Optional[PolicyCache]:
+    """
+    Resolve the disk cache from PASSFORGE_POLICY_CACHE, the config file, or ~/.passforge.
+
+    Returns:
+        PolicyCache, or None if disabled (``policy.disk_cache`` false or the
+        environment variable set to "off")
+    """
+    path = os.getenv("PASSFORGE_POLICY_CACHE")
+    if path is None:
+        from ..config.loader import get_config
+        config = get_config()
+        if not config.get("policy", "disk_cache", True):
+            return None
+        path = config.get("policy", "cache_dir")
+    elif path.lower() == "off":
+        return None
+    return PolicyCache(Path(path).expanduser() if path else DEFAULT_CACHE_DIR)
+
+
+@lru_cache(maxsize=64)
+def compile_policy(policy: PasswordPolicy, charsets: Optional[Tuple[Tuple[str, str], ...]] = None) -> CompiledPolicy:
+    """Shared CompiledPolicy for a policy (loaded from the disk cache, or compiled on first use)."""
+    cache = get_policy_cache()
+    compiled = cache.load(policy, charsets) if cache else None
+    if compiled is None:
+        started = time.perf_counter()
+        compiled = CompiledPolicy.compile(policy, dict(charsets) if charsets else None)
+        if cache and time.perf_counter() - started >= MIN_PERSIST_SECONDS:
+            cache.store(compiled, charsets)
+    return compiled
+
+
+@register_model("policy")
+def _policy_entropy(policy: PasswordPolicy, charsets: Optional[Tuple[Tuple[str, str], ...]] = None) -> float:
+    return compile_policy(policy, charsets).entropy_bits
+
+
+class PolicyGenerator(BaseGenerator):
+    """Generate passwords that satisfy a PasswordPolicy, uniformly and in one pass."""
+
+    @property
+    def generator_type(self) -> str:
+        return "policy"
+
+    def _charsets(self, policy: PasswordPolicy) -> Optional[Tuple[Tuple[str, str], ...]]:
+        """Per-class characters after easy-read/easy-say filtering (None if unchanged)."""
+        if not (self.easy_read or self.easy_say):
+            return None
+        return tuple((name, self.filter_charset(getattr(policy, name))) for name in CLASS_NAMES)
+
+    def generate(self, policy: Optional[PasswordPolicy] = None, **rules) -> GeneratorResult:
+        """
+        Generate a policy-compliant password.
+
+        Args:
+            policy: Compiled rules; built from ``rules`` if omitted
+            **rules: PasswordPolicy fields (e.g. length=12, max_repeat=2)
+
+        Returns:
+            GeneratorResult with the exact entropy of the policy
+        """
+        if policy is None:
+            policy = PasswordPolicy.from_dict(rules)
+        charsets = self._charsets(policy)
+        compiled = compile_policy(policy, charsets)
+        password = compiled.sample(self.rng)
+
+        parameters = policy.to_dict()
+        parameters["pool_size"] = compiled.count
+        parameters["easy_read"] = self.easy_read
+        parameters["easy_say"] = self.easy_say
+
+        return GeneratorResult(
+            password=password,
+            entropy_bits=entropy_for(self.generator_type, policy=policy, charsets=charsets),
+            generator_type=self.generator_type,
+            parameters=parameters
+        )
@@ -2,8 +2,8 @@
 Pronounceable Password Generator - Easy to speak and remember passwords.
 """
 
-import secrets
 from .base import BaseGenerator, GeneratorResult
+from .entropy_model import entropy_for
 
 
 # Syllable components for pronounceable passwords
@@ -27,14 +27,14 @@ class PronounceableGenerator(BaseGenerator):
     
     def generate_syllable(self) -> str:
         """Generate a single pronounceable syllable."""
-        pattern = secrets.choice(SYLLABLE_PATTERNS)
+        pattern = self.rng.choice(SYLLABLE_PATTERNS)
         syllable = []
         
         for char in pattern:
             if char == 'c':
-                syllable.append(secrets.choice(CONSONANTS))
+                syllable.append(self.rng.choice(CONSONANTS))
             else:  # char == 'v'
-                syllable.append(secrets.choice(VOWELS))
+                syllable.append(self.rng.choice(VOWELS))
         
         return "".join(syllable)
     
@@ -76,14 +76,10 @@ class PronounceableGenerator(BaseGenerator):
             result = result.capitalize()
         
         if add_number:
-            result = result[:-1] + secrets.choice("0123456789")
+            result = result[:-1] + self.rng.choice("0123456789")
         
-        # Calculate entropy
-        # Average syllable has ~2.5 characters, pool size depends on pattern
-        # Conservative estimate: 21 consonants * 5 vowels per syllable
-        avg_syllable_entropy = 21 * 5  # ~105 combinations per syllable
-        num_syllables = len(password)
-        entropy_bits = self.calculate_entropy(avg_syllable_entropy, num_syllables)
+        # Exact per-position letter entropy for this length (see entropy_model)
+        entropy_bits = entropy_for(self.generator_type, length=length, add_number=add_number)
         
         parameters = {
             "length": len(result),
@@ -91,7 +87,7 @@ class PronounceableGenerator(BaseGenerator):
             "capitalize_first": capitalize_first,
             "add_number": add_number,
             "syllables": password,
-            "pool_size": avg_syllable_entropy
+            "pool_size": len(CONSONANTS) + len(VOWELS) + (10 if add_number else 0)
         }
         
         return GeneratorResult(
@@ -2,10 +2,11 @@
 Random Password Generator - Core alphanumeric + symbols password generation.
 """
 
-import secrets
-import math
 from typing import Optional, Set
 from .base import BaseGenerator, GeneratorResult
+from .entropy_model import entropy_for
+from .sampling import sample_unique, weighted_table
+from .drbg import HmacDrbg
 
 
 class RandomPasswordGenerator(BaseGenerator):
@@ -57,6 +58,8 @@ class RandomPasswordGenerator(BaseGenerator):
             min_digits: Minimum digits required
             min_symbols: Minimum symbols required
             balanced: Enable balanced ratio (60% letters, 20% digits, 20% symbols)
+            custom_seed: Paranoid mode seed (e.g. keyboard jitter), mixed with
+                system entropy into an HMAC-DRBG that makes every draw
             
         Returns:
             GeneratorResult with password and metadata
@@ -65,6 +68,8 @@ class RandomPasswordGenerator(BaseGenerator):
             raise ValueError("Password length must be at least 4")
         if length > 1024:
             raise ValueError("Password length must be at most 1024")
+        
+        rng = HmacDrbg.from_system(custom_seed.encode()) if custom_seed else self.rng
 
         # Build character pool
         charset = ""
@@ -108,7 +113,10 @@ class RandomPasswordGenerator(BaseGenerator):
         # Generate password with minimum requirements
         password_chars = []
         
-        def pick_from_pool(source_charset):
+        # Characters already placed (for no_repeats)
+        used: Set[str] = set()
+        
+        def pick_from_pool(source_charset, count):
             available = self.filter_charset(source_charset)
             available = "".join(c for c in available if c not in exclude_chars)
             
@@ -116,31 +124,27 @@ class RandomPasswordGenerator(BaseGenerator):
                 raise ValueError("No available characters after filtering exclude_chars")
                 
             if no_repeats:
-                # Filter out already used characters
-                remaining_available = [c for c in available if c not in password_chars]
-                if not remaining_available:
+                # Filter out already used characters, then draw without replacement
+                remaining_available = [c for c in available if c not in used]
+                if len(remaining_available) < count:
                     raise ValueError("Pool exhausted for unique character requirement")
-                char = secrets.choice(remaining_available)
-            else:
-                char = secrets.choice(available)
-            return char
+                chosen = sample_unique(remaining_available, count, rng)
+                used.update(chosen)
+                return chosen
+            return [rng.choice(available) for _ in range(count)]
 
         # Add required characters first
         if min_uppercase > 0:
-            for _ in range(min_uppercase):
-                password_chars.append(pick_from_pool(self.UPPERCASE))
+            password_chars.extend(pick_from_pool(self.UPPERCASE, min_uppercase))
         
         if min_lowercase > 0:
-            for _ in range(min_lowercase):
-                password_chars.append(pick_from_pool(self.LOWERCASE))
+            password_chars.extend(pick_from_pool(self.LOWERCASE, min_lowercase))
         
         if min_digits > 0:
-            for _ in range(min_digits):
-                password_chars.append(pick_from_pool(self.DIGITS))
+            password_chars.extend(pick_from_pool(self.DIGITS, min_digits))
         
         if min_symbols > 0:
-            for _ in range(min_symbols):
-                password_chars.append(pick_from_pool(self.SYMBOLS))
+            password_chars.extend(pick_from_pool(self.SYMBOLS, min_symbols))
         
         # Fill remaining length
         remaining = length - len(password_chars)
@@ -155,33 +159,30 @@ class RandomPasswordGenerator(BaseGenerator):
                 letter_pool = self.filter_charset(letter_pool)
                 letter_pool = "".join(c for c in letter_pool if c not in exclude_chars)
                 
-                digit_pool = self.filter_charset(self.DIGITS)
+                digit_pool = self.filter_charset(self.DIGITS) if digits else ""
                 digit_pool = "".join(c for c in digit_pool if c not in exclude_chars)
                 
-                symbol_pool = self.filter_charset(self.SYMBOLS)
+                symbol_pool = self.filter_charset(self.SYMBOLS) if symbols else ""
                 symbol_pool = "".join(c for c in symbol_pool if c not in exclude_chars)
 
-                for _ in range(remaining):
-                    # Randomly choose which pool based on weights
-                    # Weighting: 60 Letter, 20 Digit, 20 Symbol
-                    # Adjust if some pools are empty
-                    weights = []
-                    pools = []
-                    if letter_pool: 
-                        pools.append(letter_pool)
-                        weights.append(60)
-                    if digit_pool: 
-                        pools.append(digit_pool)
-                        weights.append(20)
-                    if symbol_pool: 
-                        pools.append(symbol_pool)
-                        weights.append(20)
-                    
-                    if not pools:
-                        # Fallback to general charset if specific pools are empty
-                        password_chars.append(secrets.choice(charset))
-                        continue
-
+                # Weighting: 60 Letter, 20 Digit, 20 Symbol
+                # Adjust if some pools are empty
+                weights = []
+                pools = []
+                if letter_pool:
+                    pools.append(letter_pool)
+                    weights.append(60)
+                if digit_pool:
+                    pools.append(digit_pool)
+                    weights.append(20)
+                if symbol_pool:
+                    pools.append(symbol_pool)
+                    weights.append(20)
+                
+                if not pools:
+                    # Fallback to general charset if specific pools are empty
+                    password_chars.extend(rng.choice(charset) for _ in range(remaining))
+                else:
                     # Redistribute weights if some pools are missing
                     # If symbols are missing, give 10 to letters and 10 to digits
                     # If digits are missing, give 10 to letters and 10 to symbols
@@ -189,67 +190,43 @@ class RandomPasswordGenerator(BaseGenerator):
                         total_missing_weight = 100 - sum(weights)
                         if letter_pool:
                             # Letters take the lion's share of missing weights
-                            idx = [i for i, p in enumerate(pools) if p == letter_pool][0]
-                            weights[idx] += total_missing_weight
+                            weights[0] += total_missing_weight
                         else:
                             # Divide equally among remaining
                             extra = total_missing_weight // len(weights)
                             for i in range(len(weights)):
                                 weights[i] += extra
-
-                    # Manual weighted choice (secrets.choice doesn't support weights directly)
-                    total_weight = sum(weights)
-                    r = secrets.randbelow(total_weight)
-                    upto = 0
-                    for pool, weight in zip(pools, weights):
-                        if upto + weight > r:
-                            password_chars.append(secrets.choice(pool))
-                            break
-                        upto += weight
+                    
+                    # The per-character distribution is fixed for this configuration:
+                    # sample it from a cached cumulative table fed by bulk random bytes
+                    table = weighted_table(tuple(zip(pools, weights)))
+                    password_chars.extend(table.sample(remaining, rng))
             elif no_repeats:
-                # Use proper unique selection - remove used chars and sample
-                available = [c for c in charset if c not in password_chars]
-                # Sample unique characters one by one
-                for _ in range(remaining):
-                    if available:
-                        idx = secrets.randbelow(len(available))
-                        chosen = available.pop(idx)
-                        password_chars.append(chosen)
-                    else:
-                        raise ValueError("Pool exhausted for unique remaining characters")
+                # Partial Fisher-Yates over the unused characters: O(remaining) draws
+                available = [c for c in charset if c not in used]
+                if len(available) < remaining:
+                    raise ValueError("Pool exhausted for unique remaining characters")
+                password_chars.extend(sample_unique(available, remaining, rng))
             else:
                 # Allow repeats (standard mode)
                 password_chars.extend(
-                    secrets.choice(charset) for _ in range(remaining)
+                    rng.choice(charset) for _ in range(remaining)
                 )
         
         # Shuffle to randomize position of required chars
-        shuffled = list(password_chars)
-        
-        if custom_seed:
-            # PARANOID MODE: Use custom seed for an extra shuffle layer
-            import random
-            rng = random.Random(custom_seed)
-            rng.shuffle(shuffled)
-        else:
-            # Standard secure shuffle using secrets
-            for i in range(len(shuffled) - 1, 0, -1):
-                j = secrets.randbelow(i + 1)
-                shuffled[i], shuffled[j] = shuffled[j], shuffled[i]
+        # (Fisher-Yates fed by bulk random bytes)
+        shuffled = sample_unique(password_chars, len(password_chars), rng)
         
         password = "".join(shuffled)
         
         # Calculate entropy
         pool_size = len(charset)
-        if no_repeats:
-            # For sampling without replacement, the number of possibilities is
-            # permutations P(pool_size, length) = pool_size! / (pool_size - length)!
-            # entropy = log2(P(pool_size, length))
-            # We use lgamma for stable computation of log2(n!): log2(n!) = lgamma(n+1) / log(2)
-            entropy_bits = (math.lgamma(pool_size + 1) - math.lgamma(pool_size - length + 1)) / math.log(2)
-        else:
-            # Standard entropy for sampling with replacement
-            entropy_bits = self.calculate_entropy(pool_size, length)
+        # For sampling without replacement, the number of possibilities is
+        # permutations P(pool_size, length) = pool_size! / (pool_size - length)!,
+        # counted exactly as an integer before taking log2
+        entropy_bits = entropy_for(
+            self.generator_type, pool_size=pool_size, length=length, no_repeats=no_repeats
+        )
         
         # Store parameters for logging
         parameters = {
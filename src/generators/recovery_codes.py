@@ -1,13 +1,26 @@
 """
 Recovery Codes Generator - 2FA backup recovery codes.
+
+Codes in one set never repeat. Large runs (``generate_batch``) stream
+millions of distinct codes in constant memory, optionally continuing an
+issued-set file so no code is ever handed out twice (see code_batch).
 """
 
-import secrets
-from typing import List
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
 from .base import BaseGenerator, GeneratorResult
+from .code_batch import digits_of, draw_codes
+from .entropy_model import entropy_for
 from .passphrase import DEFAULT_WORDLIST
 
 
+@lru_cache(maxsize=None)
+def recovery_wordlist() -> Tuple[str, ...]:
+    """Short words (up to 6 letters) used for word-based codes."""
+    return tuple(w for w in DEFAULT_WORDLIST if len(w) <= 6)
+
+
 class RecoveryCodesGenerator(BaseGenerator):
     """Generate 2FA recovery/backup codes."""
     
@@ -17,14 +30,67 @@ class RecoveryCodesGenerator(BaseGenerator):
     
     def generate_numeric_code(self, digits: int = 8) -> str:
         """Generate a numeric recovery code."""
-        return "".join(secrets.choice(self.DIGITS) for _ in range(digits))
+        return "".join(self.rng.choice(self.DIGITS) for _ in range(digits))
     
     def generate_word_code(self, words: int = 3) -> str:
         """Generate a word-based recovery code."""
-        short_words = [w for w in DEFAULT_WORDLIST if len(w) <= 6]
-        selected = [secrets.choice(short_words) for _ in range(words)]
+        short_words = recovery_wordlist()
+        selected = [self.rng.choice(short_words) for _ in range(words)]
         return "-".join(selected)
     
+    @staticmethod
+    def _validate_code(use_words: bool, digits: int, words_per_code: int) -> None:
+        if not use_words:
+            if digits < 4 or digits > 32:
+                raise ValueError("Digits per code must be between 4 and 32")
+        else:
+            if words_per_code < 2 or words_per_code > 12:
+                raise ValueError("Words per code must be between 2 and 12")
+    
+    def _codes(
+        self,
+        count: int,
+        use_words: bool,
+        digits: int,
+        words_per_code: int,
+        issued_path: Optional[Path] = None
+    ) -> Iterator[str]:
+        """Distinct codes, drawn as numbers from the code space and formatted."""
+        if use_words:
+            words = recovery_wordlist()
+            values = draw_codes(len(words), words_per_code, count, self.rng, issued_path)
+            return ("-".join(words[d] for d in digits_of(v, len(words), words_per_code)) for v in values)
+        values = draw_codes(10, digits, count, self.rng, issued_path)
+        return (f"{v:0{digits}d}" for v in values)
+    
+    def generate_batch(
+        self,
+        count: int,
+        use_words: bool = False,
+        digits: int = 8,
+        words_per_code: int = 3,
+        issued_path: Optional[Path] = None
+    ) -> Iterator[str]:
+        """
+        Stream ``count`` distinct codes (no upper limit, constant memory).
+        
+        Args:
+            count: Number of codes
+            use_words: Use word-based codes instead of numeric
+            digits: Digits per numeric code (4-32)
+            words_per_code: Words per word-based code (2-12)
+            issued_path: Issued-set file; codes are then also distinct from
+                every earlier batch drawn from it
+            
+        Raises:
+            ValueError: On invalid settings, or more codes than the space
+                (or the issued-set) has left
+        """
+        if count < 1:
+            raise ValueError("Must generate at least 1 code")
+        self._validate_code(use_words, digits, words_per_code)
+        return self._codes(count, use_words, digits, words_per_code, issued_path)
+    
     def generate(
         self,
         count: int = 10,
@@ -49,44 +115,32 @@ class RecoveryCodesGenerator(BaseGenerator):
         if count > 100:
             raise ValueError("Must generate at most 100 codes")
         
-        if not use_words:
-            if digits < 4 or digits > 32:
-                raise ValueError("Digits per code must be between 4 and 32")
-        else:
-            if words_per_code < 2 or words_per_code > 12:
-                raise ValueError("Words per code must be between 2 and 12")
-        
-        codes: List[str] = []
+        self._validate_code(use_words, digits, words_per_code)
         
-        for _ in range(count):
-            if use_words:
-                code = self.generate_word_code(words_per_code)
-            else:
-                code = self.generate_numeric_code(digits)
-            codes.append(code)
+        # Distinct within the set
+        codes: List[str] = list(self._codes(count, use_words, digits, words_per_code))
         
         # Format as newline-separated list
         password = "\n".join(codes)
         
-        # Calculate entropy per code
-        if use_words:
-            short_words = [w for w in DEFAULT_WORDLIST if len(w) <= 6]
-            pool_size = len(short_words)
-            entropy_per_code = self.calculate_entropy(pool_size, words_per_code)
-        else:
-            entropy_per_code = self.calculate_entropy(10, digits)
+        # Codes are distinct, so the set is one of P(space, count) sequences
+        entropy_bits = entropy_for(
+            self.generator_type, count=count, use_words=use_words,
+            digits=digits, words_per_code=words_per_code
+        )
+        entropy_per_code = entropy_bits / count
         
         parameters = {
             "count": count,
             "use_words": use_words,
             "entropy_per_code": round(entropy_per_code, 2),
             "codes": codes,
-            "pool_size": len(short_words) if use_words else 10
+            "pool_size": len(recovery_wordlist()) if use_words else 10
         }
         
         return GeneratorResult(
             password=password,
-            entropy_bits=entropy_per_code,  # Per individual code
+            entropy_bits=entropy_bits,
             generator_type=self.generator_type,
             parameters=parameters
         )
@@ -0,0 +1,151 @@
+"""
+Sampling - Unbiased selection primitives shared by the generators.
+
+``uniform_indices`` turns one bulk CSPRNG read into many uniform integers by
+rejection sampling (no modulo bias), instead of one system call per draw.
+``WeightedTable`` makes exact weighted choices from a cumulative integer
+table. It is built once per configuration, so weighted generation costs one
+uniform draw and one C-level bisection per character.
+
+Every function draws from a RandomSource (the system CSPRNG by default), so
+a generator's deterministic source reaches its bulk draws too.
+"""
+
+import math
+from bisect import bisect_right
+from fractions import Fraction
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+from .drbg import SYSTEM_RANDOM, RandomSource
+
+# Unsigned memoryview formats by sample width in bytes
+_WIDTH_FORMATS = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+# Range of the 64-bit words used by sample_unique
+_WORD_SPAN = 1 << 64
+
+
+def uniform_indices(bound: int, count: int, rng: RandomSource = SYSTEM_RANDOM) -> List[int]:
+    """
+    Draw uniform integers in ``[0, bound)`` from bulk CSPRNG bytes.
+
+    Samples are read as 1, 2, 4 or 8-byte words; words at or above the largest
+    multiple of ``bound`` are rejected, so every value is equally likely.
+
+    Args:
+        bound: Exclusive upper bound (at least 1)
+        count: Number of integers to draw
+        rng: Random source
+
+    Returns:
+        List of ``count`` integers
+    """
+    if bound < 1:
+        raise ValueError("bound must be at least 1")
+    if bound == 1:
+        return [0] * count
+    needed_bytes = ((bound - 1).bit_length() + 7) // 8
+    width = next((w for w in _WIDTH_FORMATS if w >= needed_bytes), None)
+    if width is None:
+        return [rng.randbelow(bound) for _ in range(count)]
+
+    span = 1 << (8 * width)
+    limit = span - span % bound
+    values: List[int] = []
+    while len(values) < count:
+        needed = count - len(values)
+        # Over-draw by the expected rejection rate so one read usually suffices
+        draws = needed + needed * (span - limit) // limit + 4
+        words = memoryview(rng.token_bytes(draws * width)).cast(_WIDTH_FORMATS[width])
+        values.extend(word % bound for word in words if word < limit)
+    del values[count:]
+    return values
+
+
+def sample_unique(pool: Sequence[str], count: int, rng: RandomSource = SYSTEM_RANDOM) -> List[str]:
+    """
+    Draw ``count`` distinct items with a partial Fisher-Yates shuffle.
+
+    Swaps are recorded in a dictionary instead of copying the pool, so the
+    cost is O(count) whatever the pool size, and every ordered selection is
+    equally likely. ``sample_unique(items, len(items))`` is a full shuffle.
+
+    Args:
+        pool: Items to draw from (not modified)
+        count: Number of items (at most len(pool))
+        rng: Random source
+
+    Returns:
+        The selected items, in draw order
+    """
+    size = len(pool)
+    if count > size:
+        raise ValueError(f"Cannot draw {count} unique items from a pool of {size}")
+    swapped = {}
+    selected = []
+    # One 64-bit word per step, read in bulk. A word in the biased tail
+    # (probability below size / 2**64) is replaced by a fresh draw.
+    words = memoryview(rng.token_bytes(8 * count)).cast("Q")
+    for i, word in enumerate(words):
+        bound = size - i
+        if word >= _WORD_SPAN - _WORD_SPAN % bound:
+            word = rng.randbelow(bound)
+        j = i + word % bound
+        selected.append(pool[swapped.get(j, j)])
+        swapped[j] = swapped.get(i, i)
+    return selected
+
+
+class WeightedTable:
+    """Exact weighted choice over symbols through a cumulative integer table."""
+
+    def __init__(self, groups: Sequence[Tuple[str, int]]):
+        """
+        Build the table.
+
+        Each group's weight is shared equally by its symbols. Shares are
+        scaled to integers (by the least common multiple of the group sizes),
+        so sampling is exact.
+
+        Args:
+            groups: (symbols, weight) pairs; empty groups are skipped
+        """
+        groups = [(symbols, weight) for symbols, weight in groups if symbols and weight > 0]
+        if not groups:
+            raise ValueError("No symbols with a positive weight")
+        common = math.lcm(*(len(symbols) for symbols, _ in groups))
+        shares = [weight * (common // len(symbols)) for symbols, weight in groups]
+        divisor = math.gcd(*shares)
+
+        self.symbols: List[str] = []
+        self.cumulative: List[int] = []
+        total = 0
+        for (symbols, _), share in zip(groups, shares):
+            for symbol in symbols:
+                total += share // divisor
+                self.symbols.append(symbol)
+                self.cumulative.append(total)
+        self.total = total
+
+    def probability(self, symbol: str) -> Fraction:
+        """Exact probability of drawing ``symbol``."""
+        weight = 0
+        previous = 0
+        for candidate, upto in zip(self.symbols, self.cumulative):
+            if candidate == symbol:
+                weight += upto - previous
+            previous = upto
+        return Fraction(weight, self.total)
+
+    def sample(self, count: int, rng: RandomSource = SYSTEM_RANDOM) -> List[str]:
+        """Draw ``count`` symbols independently."""
+        symbols = self.symbols
+        cumulative = self.cumulative
+        return [symbols[bisect_right(cumulative, r)] for r in uniform_indices(self.total, count, rng)]
+
+
+@lru_cache(maxsize=64)
+def weighted_table(groups: Tuple[Tuple[str, int], ...]) -> WeightedTable:
+    """Shared WeightedTable for a configuration (built on first use)."""
+    return WeightedTable(groups)
@@ -2,11 +2,11 @@
 UUID Token Generator - RFC 4122/9562 UUIDs (v1, v4, v7).
 """
 
-import secrets
 import time
 import string
 from typing import Optional
 from .base import BaseGenerator, GeneratorResult
+from .entropy_model import UUID_RANDOM_BITS, entropy_for
 
 
 class UuidGenerator(BaseGenerator):
@@ -40,7 +40,7 @@ class UuidGenerator(BaseGenerator):
         timestamp_bytes = ms.to_bytes(6, byteorder='big')
         
         # 10 random bytes for the rest (80 bits)
-        rand_bytes = bytearray(secrets.token_bytes(10))
+        rand_bytes = bytearray(self.rng.token_bytes(10))
         
         # Set version 7: 0x70 in high nibble of byte 6 (relative to start of 16-byte UUID)
         # Note: timestamp is 6 bytes, so byte 6 is the one after timestamp
@@ -54,7 +54,7 @@ class UuidGenerator(BaseGenerator):
 
     def _generate_v4(self) -> bytes:
         """Generate a UUID v4 (Random)."""
-        random_bytes = bytearray(secrets.token_bytes(16))
+        random_bytes = bytearray(self.rng.token_bytes(16))
         
         # Version 4
         random_bytes[6] = (random_bytes[6] & 0x0f) | 0x40
@@ -87,15 +87,13 @@ class UuidGenerator(BaseGenerator):
             GeneratorResult with UUID
         """
         if version == 1:
-            raw_bytes = self._generate_v1()
-            entropy_bits = 60.0 # Time-based, roughly
+            raw_bytes = self._generate_v1()  # Time-based, roughly 60 bits
         elif version == 7:
-            raw_bytes = self._generate_v7()
-            entropy_bits = 74.0 # 12 + 62 random bits
+            raw_bytes = self._generate_v7()  # 12 + 62 random bits
         else: # Default v4
             raw_bytes = self._generate_v4()
-            entropy_bits = 122.0
             version = 4
+        entropy_bits = entropy_for(self.generator_type, version=version)
 
         if short:
             # Base58 encoding of the 128-bit integer
@@ -113,7 +111,7 @@ class UuidGenerator(BaseGenerator):
             "version": version,
             "format": "base58" if short else "hex",
             "uppercase": uppercase if not short else None,
-            "pool_size": 2**entropy_bits
+            "pool_size": 1 << UUID_RANDOM_BITS[version]
         }
         
         return GeneratorResult(
@@ -0,0 +1,290 @@
+"""
+Voucher Codes - Keyed, format-preserving numbering of voucher and gift-card codes.
+
+A campaign is a secret key plus a code format (an alphabet and a segment
+layout, license-key style by default). Voucher number ``i`` is the code
+spelling ``permute(i)``, where ``permute`` is a keyed FF1-style Feistel
+permutation of the whole code space (see code_batch). Codes are distinct by
+construction: any range of numbers gives distinct codes with no dedupe and
+constant memory, and disjoint ranges can be issued by separate processes or
+machines that share the campaign file. ``index_of`` maps a code back to its
+number.
+
+Without the key the codes look random. The chance of guessing a valid code
+is the number of codes issued divided by the size of the code space, so
+keep campaigns well below the space (4x4 license-style codes hold 2^80).
+"""
+
+import json
+import multiprocessing
+import os
+import tempfile
+from collections import deque
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from ..output.history_store import file_lock
+from .code_batch import FeistelPermutation
+from .drbg import SYSTEM_RANDOM, RandomSource
+from .license_key import LICENSE_CHARS, LicenseKeyGenerator, damm_valid
+
+CAMPAIGN_FORMAT = 1
+
+# Default location of the campaign file
+DEFAULT_CAMPAIGN_PATH = Path.home() / ".passforge" / "voucher-campaign.json"
+
+# Codes sent to a worker per task
+CHUNK_SIZE = 1 << 14
+
+# Chunks queued per worker before the caller waits
+CHUNKS_IN_FLIGHT_PER_WORKER = 4
+
+# Largest alphabet given a two-character lookup table
+_MAX_PAIR_RADIX = 256
+
+
+class VoucherCampaign:
+    """A voucher format and the keyed permutation that numbers its codes."""
+
+    def __init__(
+        self,
+        key: bytes,
+        segments: int = 4,
+        segment_length: int = 4,
+        alphabet: str = LICENSE_CHARS,
+        add_checksum: bool = False
+    ):
+        """
+        Args:
+            key: Campaign key (32 bytes)
+            segments: Segments per code (1-64)
+            segment_length: Characters per segment (1-32)
+            alphabet: Code characters (at least 2, distinct, no dashes)
+            add_checksum: Append a Damm check character (license alphabet only)
+
+        Raises:
+            ValueError: On an invalid format
+        """
+        if not 1 <= segments <= 64:
+            raise ValueError("Segments must be between 1 and 64")
+        if not 1 <= segment_length <= 32:
+            raise ValueError("Segment length must be between 1 and 32")
+        if len(alphabet) < 2 or len(set(alphabet)) != len(alphabet) or "-" in alphabet:
+            raise ValueError("Alphabet must have at least 2 distinct characters and no dashes")
+        if add_checksum and alphabet != LICENSE_CHARS:
+            raise ValueError("Check characters need the license key alphabet")
+        self.segments = segments
+        self.segment_length = segment_length
+        self.alphabet = alphabet
+        self.add_checksum = add_checksum
+        self.permutation = FeistelPermutation(key, len(alphabet), segments * segment_length)
+        self._values = {c: i for i, c in enumerate(alphabet)}
+        radix = len(alphabet)
+        if radix <= _MAX_PAIR_RADIX:
+            self._chunk, self._chunk_radix = [a + b for a in alphabet for b in alphabet], radix * radix
+        else:
+            self._chunk, self._chunk_radix = list(alphabet), radix
+
+    @property
+    def key(self) -> bytes:
+        return self.permutation.key
+
+    @property
+    def code_length(self) -> int:
+        """Characters per code (without dashes or check character)."""
+        return self.segments * self.segment_length
+
+    @property
+    def size(self) -> int:
+        """Number of codes in the campaign's code space."""
+        return self.permutation.size
+
+    def code(self, index: int) -> str:
+        """
+        The code of voucher number ``index``.
+
+        Raises:
+            ValueError: If ``index`` is outside the code space
+        """
+        return self._spell(self.permutation.permute(index))
+
+    def _spell(self, value: int) -> str:
+        """The code characters of a point in the code space, with dashes (and check character)."""
+        chunk, chunk_radix = self._chunk, self._chunk_radix
+        parts = []
+        while value:
+            value, digit = divmod(value, chunk_radix)
+            parts.append(chunk[digit])
+        # A two-character table can overshoot an odd length by one padding character
+        text = "".join(reversed(parts)).rjust(self.code_length, self.alphabet[0])[-self.code_length:]
+        return LicenseKeyGenerator.format_key(text, self.segment_length, self.add_checksum)
+
+    def codes(self, start: int, count: int) -> Iterator[str]:
+        """
+        The codes of voucher numbers ``start`` to ``start + count - 1``, in order.
+
+        Raises:
+            ValueError: If the range leaves the code space
+        """
+        self._check_range(start, count)
+        permute, spell = self.permutation.permute, self._spell
+        return (spell(permute(i)) for i in range(start, start + count))
+
+    def issue(self, start: int, count: int, workers: int = 1) -> Iterator[str]:
+        """
+        Like codes(), spread over worker processes in chunks of CHUNK_SIZE.
+
+        Results come back in order, with a bounded number of chunks in
+        flight, so memory stays flat for any count.
+
+        Args:
+            start: First voucher number
+            count: Number of codes
+            workers: Worker processes (1 computes in-process)
+        """
+        self._check_range(start, count)
+        if workers <= 1 or count <= CHUNK_SIZE:
+            return self.codes(start, count)
+        return self._issue_parallel(start, count, workers)
+
+    def _issue_parallel(self, start: int, count: int, workers: int) -> Iterator[str]:
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(self.to_dict(),)) as pool:
+            pending: deque = deque()
+            limit = workers * CHUNKS_IN_FLIGHT_PER_WORKER
+            for offset in range(start, start + count, CHUNK_SIZE):
+                size = min(CHUNK_SIZE, start + count - offset)
+                pending.append(pool.apply_async(_issue_chunk, (offset, size)))
+                if len(pending) >= limit:
+                    yield from pending.popleft().get()
+            while pending:
+                yield from pending.popleft().get()
+
+    def _check_range(self, start: int, count: int) -> None:
+        if start < 0 or count < 0:
+            raise ValueError("Voucher numbers must not be negative")
+        if start + count > self.size:
+            raise ValueError(f"Voucher numbers must stay below the code space size ({self.size:,})")
+
+    def index_of(self, code: str) -> Optional[int]:
+        """The voucher number of a code, or None if it does not fit the campaign's format."""
+        code = code.strip()
+        if self.alphabet == self.alphabet.upper():
+            code = code.upper()
+        parts = code.split("-")
+        expected = self.segments + (1 if self.add_checksum else 0)
+        if len(parts) != expected or any(len(p) != self.segment_length for p in parts[:self.segments]):
+            return None
+        if self.add_checksum and (len(parts[-1]) != 1 or not damm_valid(code)):
+            return None
+        value, radix, values = 0, len(self.alphabet), self._values
+        try:
+            for c in "".join(parts[:self.segments]):
+                value = value * radix + values[c]
+        except KeyError:
+            return None
+        return self.permutation.invert(value)
+
+    def to_dict(self) -> dict:
+        return {
+            "format": CAMPAIGN_FORMAT,
+            "alphabet": self.alphabet,
+            "segments": self.segments,
+            "segment_length": self.segment_length,
+            "checksum": self.add_checksum,
+            "key": self.key.hex(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "VoucherCampaign":
+        """
+        Raises:
+            ValueError: On a malformed or unsupported campaign
+        """
+        try:
+            if data["format"] != CAMPAIGN_FORMAT:
+                raise ValueError(f"Unsupported voucher campaign format: {data['format']}")
+            return cls(
+                bytes.fromhex(data["key"]),
+                segments=int(data["segments"]),
+                segment_length=int(data["segment_length"]),
+                alphabet=str(data["alphabet"]),
+                add_checksum=bool(data["checksum"])
+            )
+        except (KeyError, TypeError) as e:
+            raise ValueError("Malformed voucher campaign") from e
+
+    @classmethod
+    def load(cls, path: Path) -> "VoucherCampaign":
+        """
+        Read a campaign file.
+
+        Raises:
+            ValueError: If the file is not a voucher campaign
+        """
+        path = Path(path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            return cls.from_dict(data)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Not a voucher campaign file: {path} ({e})") from e
+
+    @classmethod
+    def open(
+        cls,
+        path: Path,
+        segments: int = 4,
+        segment_length: int = 4,
+        alphabet: str = LICENSE_CHARS,
+        add_checksum: bool = False,
+        rng: RandomSource = SYSTEM_RANDOM
+    ) -> "VoucherCampaign":
+        """
+        Load a campaign file, or create it with a fresh key and the given format.
+
+        An existing file's format wins over the format arguments. The file
+        is created under ``path`` + ``.lock``, so concurrent first runs
+        agree on one key.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(path.with_name(path.name + ".lock")):
+            if path.exists():
+                return cls.load(path)
+            campaign = cls(rng.token_bytes(32), segments, segment_length, alphabet, add_checksum)
+            campaign.save(path)
+            return campaign
+
+    def save(self, path: Path) -> None:
+        """Write the campaign atomically, readable by the owner only (its key reproduces every code)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, indent=2)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+# Campaign of the current worker process
+_worker_campaign: Optional[VoucherCampaign] = None
+
+
+def _init_worker(data: dict) -> None:
+    global _worker_campaign
+    _worker_campaign = VoucherCampaign.from_dict(data)
+
+
+def _issue_chunk(start: int, count: int) -> List[str]:
+    return list(_worker_campaign.codes(start, count))
+
+
+def default_campaign_path() -> Path:
+    """Resolve the campaign from PASSFORGE_VOUCHER_CAMPAIGN, the config file, or ~/.passforge."""
+    path = os.getenv("PASSFORGE_VOUCHER_CAMPAIGN")
+    if not path:
+        from ..config.loader import get_config
+        path = get_config().get("voucher", "campaign")
+    return Path(path).expanduser() if path else DEFAULT_CAMPAIGN_PATH
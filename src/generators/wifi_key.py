@@ -2,8 +2,8 @@
 WiFi Key Generator - WPA2/WPA3 compatible keys.
 """
 
-import secrets
 from .base import BaseGenerator, GeneratorResult
+from .entropy_model import entropy_for
 
 
 class WifiKeyGenerator(BaseGenerator):
@@ -42,10 +42,10 @@ class WifiKeyGenerator(BaseGenerator):
         # Apply easy_read filter if set
         charset = self.filter_charset(charset)
         
-        key = "".join(secrets.choice(charset) for _ in range(length))
+        key = "".join(self.rng.choice(charset) for _ in range(length))
         
         pool_size = len(charset)
-        entropy_bits = self.calculate_entropy(pool_size, length)
+        entropy_bits = entropy_for(self.generator_type, pool_size=pool_size, length=length)
         
         parameters = {
             "length": length,
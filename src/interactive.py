@@ -31,6 +31,7 @@ class InteractiveMenu:
         ("15", "NATO Phonetic Alphabet", "phonetic"),
         ("16", "Analyze Password", "analyze"),
         ("17", "View History", "history"),
+        ("P", "Paranoid Mode (toggle)", "paranoid"),
         ("0", "Exit", "exit"),
     ]
     
@@ -38,6 +39,7 @@ class InteractiveMenu:
         from .output.logger import PasswordLogger
         from .security.vault import Vault
         self.running = True
+        self.paranoid = False
         self.logger = PasswordLogger()
         self.vault = Vault()
     
@@ -59,6 +61,8 @@ class InteractiveMenu:
             print(f"  {Fore.GREEN}● Secure History Active (AES-256 derived){Style.RESET_ALL}")
         else:
             print(f"  {Fore.YELLOW}○ History Disabled (No Encryption Key){Style.RESET_ALL}")
+        if self.paranoid:
+            print(f"  {Fore.GREEN}● Paranoid Mode Active (keyboard jitter mixed into every generator){Style.RESET_ALL}")
         
         print(f"{Style.BRIGHT}{Fore.CYAN}{'═' * 50}{Style.RESET_ALL}")
     
@@ -468,7 +472,7 @@ class InteractiveMenu:
     def handle_analyze(self):
         """Handle analysis of an existing password."""
         from .security.entropy import EntropyCalculator
-        from .security.strength_checker import check_strength as zxcvbn_check, format_strength_report, is_available
+        from .security.strength_checker import check_strength as zxcvbn_check, format_strength_report
         from .output.formatter import colorize_password
         
         print(f"\n{Style.BRIGHT}{Fore.CYAN}=== Analyze Password ==={Style.RESET_ALL}")
@@ -485,14 +489,27 @@ class InteractiveMenu:
         report = calc.format_entropy_report(password, bits, pool_size=p_size, colorized_password=colorize_password(password))
         print(report)
         
-        # zxcvbn
-        if is_available():
-            strength = zxcvbn_check(password)
-            if strength:
-                print(format_strength_report(strength))
-        else:
-            print(f"\n{Fore.YELLOW}Note: Install 'zxcvbn' for pattern analysis.{Style.RESET_ALL}")
+        # zxcvbn (or the built-in analyzer when it is missing)
+        strength = zxcvbn_check(password, engine="auto")
+        if strength:
+            print(format_strength_report(strength))
 
+    def handle_paranoid(self):
+        """Toggle Paranoid Mode for the rest of the session."""
+        from .generators.drbg import set_default_random
+        from .security.jitter import paranoid_random
+        
+        if self.paranoid:
+            set_default_random(None)
+            self.paranoid = False
+            print(f"\n{Fore.YELLOW}Paranoid Mode off: generators use the system CSPRNG.{Style.RESET_ALL}")
+            return
+        
+        # Jitter is collected once per session; turning the mode back on reuses it
+        set_default_random(paranoid_random())
+        self.paranoid = True
+        print(f"\n{Fore.GREEN}Paranoid Mode on for every generator until you exit.{Style.RESET_ALL}")
+    
     def handle_history(self):
         """Handle history viewing with privacy masking."""
         from .output.logger import PasswordLogger
@@ -554,6 +571,7 @@ class InteractiveMenu:
             "phonetic": self.handle_phonetic,
             "analyze": self.handle_analyze,
             "history": self.handle_history,
+            "paranoid": self.handle_paranoid,
         }
         
         while self.running:
@@ -563,7 +581,7 @@ class InteractiveMenu:
             # Find the handler
             handler = None
             for key, name, cmd in self.MENU_OPTIONS:
-                if choice == key:
+                if choice.upper() == key:
                     if cmd == "exit":
                         print(f"\n{Fore.YELLOW}Goodbye! 👋{Style.RESET_ALL}\n")
                         self.running = False
@@ -0,0 +1,338 @@
+"""
+SQLite History Store - Indexed history backend for PasswordLogger.
+
+Entries live in a WAL-mode database next to the JSON Lines log
+(``~/.passforge/pass_history.db``). ``timestamp`` and ``generator_type`` are
+indexed so date-range, type and entropy filters are answered without a full
+scan, and the (already encrypted) password is kept in a BLOB column.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import sqlite3
+    SQLITE_AVAILABLE = True
+except ImportError:
+    SQLITE_AVAILABLE = False
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    generator_type TEXT NOT NULL,
+    entropy_bits REAL,
+    password BLOB,
+    parameters TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_history_timestamp ON history (timestamp);
+CREATE INDEX IF NOT EXISTS idx_history_generator_type ON history (generator_type, id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_COLUMNS = "id, timestamp, generator_type, entropy_bits, password, parameters"
+
+_INSERT = (
+    "INSERT INTO history (timestamp, generator_type, entropy_bits, password, parameters) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+
+# Meta key set once a JSON Lines history has been imported
+JSONL_MIGRATED = "jsonl_migrated"
+
+
+class SqliteHistoryStore:
+    """History store backed by SQLite in WAL mode."""
+
+    # Rows fetched per keyset page while iterating
+    PAGE_SIZE = 256
+
+    def __init__(self, path: Path):
+        """
+        Initialize the store, creating the schema if needed.
+
+        Args:
+            path: Location of the SQLite database file
+        """
+        if not SQLITE_AVAILABLE:
+            raise RuntimeError("SQLite history backend requires the sqlite3 module")
+        self.path = Path(path)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> "sqlite3.Connection":
+        """Return this thread's connection (recreated after fork)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(str(self.path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def exists(self) -> bool:
+        """Check whether the database file exists."""
+        return self.path.exists()
+
+    def change_token(self) -> Optional[Tuple[int, ...]]:
+        """Cheap fingerprint that changes whenever any process commits."""
+        token = []
+        for p in (self.path, self.path.with_name(self.path.name + "-wal")):
+            try:
+                st = p.stat()
+                token.extend((st.st_size, st.st_mtime_ns))
+            except OSError:
+                token.extend((0, 0))
+        return tuple(token)
+
+    def append(self, entry: Dict[str, Any]) -> bool:
+        """
+        Insert one entry.
+
+        Returns:
+            True if the entry was written, False on database failure
+        """
+        try:
+            with self._connect() as conn:
+                conn.execute(_INSERT, self._to_row(entry))
+            return True
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to write history entry: {e}")
+            return False
+
+    def append_many(self, entries: List[Dict[str, Any]]) -> int:
+        """Insert a batch of entries in one transaction."""
+        with self._connect() as conn:
+            conn.executemany(_INSERT, [self._to_row(e) for e in entries])
+        return len(entries)
+
+    def import_entries(
+        self,
+        entries: Iterable[Dict[str, Any]],
+        marker: str,
+        batch_size: int = 1000
+    ) -> Optional[int]:
+        """
+        Insert entries and set a meta marker in a single transaction.
+
+        The write lock is taken before the marker is checked, so when several
+        processes import at once exactly one of them does the work, and an
+        interrupted import leaves neither rows nor the marker behind.
+
+        Args:
+            entries: Entries to insert, oldest first (consumed lazily)
+            marker: Meta key recording that the import happened
+            batch_size: Rows per executemany() call
+
+        Returns:
+            Number of imported entries, or None if the marker was already set
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM meta WHERE key = ?", (marker,)).fetchone():
+                conn.rollback()
+                return None
+            imported = 0
+            entries = iter(entries)
+            while True:
+                batch = [self._to_row(e) for e in islice(entries, batch_size)]
+                if not batch:
+                    break
+                conn.executemany(_INSERT, batch)
+                imported += len(batch)
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (marker, datetime.now().isoformat())
+            )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        return imported
+
+    def clear(self) -> None:
+        """Remove all entries (row ids are never reused)."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM history")
+
+    def epoch(self) -> str:
+        """Identify the current generation (row ids are never reused after a clear)."""
+        row = self._connect().execute("SELECT MIN(id) FROM history").fetchone()
+        return "" if row[0] is None else str(row[0])
+
+    def count(self) -> int:
+        """Number of stored entries."""
+        return self._connect().execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+    def get_meta(self, key: str) -> Optional[str]:
+        """Read a value from the meta table."""
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        """Write a value to the meta table."""
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """Yield stored entries oldest first."""
+        for _, entry in self.iter_forward():
+            yield entry
+
+    def iter_forward(
+        self,
+        after: Optional[int] = None,
+        **filters: Any
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yield ``(row id, entry)`` pairs oldest first.
+
+        Args:
+            after: Only rows with a larger id
+            **filters: generator_type, since, until, min_entropy, max_entropy
+        """
+        return self._iter_keyset("id > ?", "ASC", after or 0, filters)
+
+    def iter_reverse(
+        self,
+        before: Optional[int] = None,
+        **filters: Any
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yield ``(row id, entry)`` pairs newest first.
+
+        Args:
+            before: Only rows with a smaller id
+            **filters: generator_type, since, until, min_entropy, max_entropy
+        """
+        return self._iter_keyset("id < ?", "DESC", 2 ** 63 - 1 if before is None else before, filters)
+
+    def iter_recent(
+        self,
+        generator_type: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        min_entropy: Optional[float] = None,
+        max_entropy: Optional[float] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield stored entries newest first using indexed keyset pages.
+
+        Args:
+            generator_type: Only entries of this generator type
+            since: ISO timestamp/date, inclusive lower bound
+            until: ISO timestamp/date, exclusive upper bound
+            min_entropy: Minimum entropy in bits
+            max_entropy: Maximum entropy in bits
+        """
+        recent = self.iter_reverse(
+            generator_type=generator_type,
+            since=since,
+            until=until,
+            min_entropy=min_entropy,
+            max_entropy=max_entropy
+        )
+        for _, entry in recent:
+            yield entry
+
+    def _iter_keyset(
+        self,
+        keyset: str,
+        order: str,
+        start: int,
+        filters: Dict[str, Any]
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Page through matching rows in id order, PAGE_SIZE rows per query."""
+        clauses = [keyset]
+        params: List[Any] = []
+        if filters.get("generator_type"):
+            clauses.append("generator_type = ?")
+            params.append(filters["generator_type"])
+        if filters.get("since"):
+            clauses.append("timestamp >= ?")
+            params.append(filters["since"])
+        if filters.get("until"):
+            clauses.append("timestamp < ?")
+            params.append(filters["until"])
+        if filters.get("min_entropy") is not None:
+            clauses.append("entropy_bits >= ?")
+            params.append(filters["min_entropy"])
+        if filters.get("max_entropy") is not None:
+            clauses.append("entropy_bits <= ?")
+            params.append(filters["max_entropy"])
+        sql = f"SELECT {_COLUMNS} FROM history WHERE {' AND '.join(clauses)} ORDER BY id {order} LIMIT ?"
+
+        last_id = start
+        conn = self._connect()
+        while True:
+            rows = conn.execute(sql, (last_id, *params, self.PAGE_SIZE)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row[0], self._from_row(row)
+            last_id = rows[-1][0]
+
+    @staticmethod
+    def _to_row(entry: Dict[str, Any]) -> Tuple[Any, ...]:
+        password = entry.get("password")
+        return (
+            entry.get("timestamp", ""),
+            entry.get("generator_type", ""),
+            entry.get("entropy_bits"),
+            password.encode("utf-8") if isinstance(password, str) else password,
+            json.dumps(entry.get("parameters", {}))
+        )
+
+    @staticmethod
+    def _from_row(row: Tuple[Any, ...]) -> Dict[str, Any]:
+        _, timestamp, generator_type, entropy_bits, password, parameters = row
+        if isinstance(password, bytes):
+            password = password.decode("utf-8")
+        return {
+            "timestamp": timestamp,
+            "password": password,
+            "generator_type": generator_type,
+            "entropy_bits": entropy_bits,
+            "parameters": json.loads(parameters) if parameters else {}
+        }
+
+
+def migrate_jsonl_to_sqlite(
+    source: Any,
+    target: SqliteHistoryStore,
+    batch_size: int = 1000,
+    marker: str = JSONL_MIGRATED
+) -> Optional[int]:
+    """
+    Stream every entry of a JSON Lines store into SQLite, exactly once.
+
+    Entries are read lazily and inserted in batches, so memory stays bounded
+    regardless of the size of ``pass_history.log``. The whole import and its
+    ``marker`` commit as one transaction (see import_entries()): a crash
+    mid-way imports nothing, and a retry or a concurrent process never
+    duplicates rows.
+
+    Args:
+        source: Store exposing iter_entries() (e.g. JsonlHistoryStore)
+        target: Destination SQLite store
+        batch_size: Rows per executemany() call
+        marker: Meta key recording the import
+
+    Returns:
+        Number of migrated entries, or None if the import already happened
+    """
+    return target.import_entries(source.iter_entries(), marker, batch_size)
@@ -0,0 +1,355 @@
+"""
+History Store - Crash-safe JSON Lines storage shared by several processes.
+
+Writers (CLI, interactive menu, every PWA worker) serialize through an
+exclusive lock on a sidecar ``.lock`` file and append each entry with a single
+``write`` on an ``O_APPEND`` descriptor, so lines can never interleave.
+Readers take no lock at all: they only trust newline-terminated lines, so an
+append that is still in flight (or was torn by a crash) is simply not visible.
+The next writer repairs a torn tail before appending.
+"""
+
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Key that starts every entry written by PasswordLogger; used to salvage
+# entries that were glued onto a torn fragment by pre-locking versions.
+_ENTRY_MARKER = b'{"timestamp"'
+
+# Avoid newline translation on Windows
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+
+def entry_matches(
+    entry: Dict[str, Any],
+    generator_type: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    min_entropy: Optional[float] = None,
+    max_entropy: Optional[float] = None
+) -> bool:
+    """Check an entry against metadata filters (since inclusive, until exclusive)."""
+    if generator_type and entry.get("generator_type") != generator_type:
+        return False
+    timestamp = entry.get("timestamp", "")
+    if since and timestamp < since:
+        return False
+    if until and timestamp >= until:
+        return False
+    entropy = entry.get("entropy_bits") or 0
+    if min_entropy is not None and entropy < min_entropy:
+        return False
+    if max_entropy is not None and entropy > max_entropy:
+        return False
+    return True
+
+
+def _read_at(fd: int, size: int, offset: int) -> bytes:
+    """Portable positional read (``os.pread`` is POSIX only)."""
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, size)
+
+
+@contextmanager
+def file_lock(lock_path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive, cross-process lock on ``lock_path`` for the block.
+
+    Uses ``fcntl.flock`` on POSIX and ``msvcrt.locking`` on Windows. The lock
+    is released automatically by the OS if the holder crashes.
+    """
+    fd = os.open(str(lock_path), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.005)
+        yield
+    finally:
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+
+class JsonlHistoryStore:
+    """Append-only JSON Lines file with locked writers and lock-free readers."""
+
+    # Bytes read per step when scanning backwards
+    CHUNK_SIZE = 65536
+
+    def __init__(self, path: Path):
+        """
+        Initialize the store.
+
+        Args:
+            path: Location of the JSON Lines history file
+        """
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+
+    def exists(self) -> bool:
+        """Check whether the history file exists."""
+        return self.path.exists()
+
+    def change_token(self) -> Optional[Tuple[int, int]]:
+        """Cheap fingerprint (size, mtime) that changes whenever any process writes."""
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return (st.st_size, st.st_mtime_ns)
+
+    def epoch(self) -> str:
+        """
+        Identify the current generation of the log.
+
+        Offsets only grow until the log is cleared, so the timestamp of the
+        first entry tells a reader whether its positions are still meaningful.
+        """
+        for _, entry in self.iter_forward():
+            return str(entry.get("timestamp", ""))
+        return ""
+
+    def append(self, entry: Dict[str, Any]) -> bool:
+        """
+        Append one entry as a single complete line.
+
+        Returns:
+            True if the entry was written, False on I/O failure
+        """
+        data = (json.dumps(entry) + "\n").encode("utf-8")
+        try:
+            with file_lock(self.lock_path):
+                fd = os.open(str(self.path), os.O_RDWR | os.O_APPEND | os.O_CREAT | _O_BINARY, 0o600)
+                try:
+                    self._repair_tail(fd)
+                    view = memoryview(data)
+                    while view:
+                        written = os.write(fd, view)
+                        view = view[written:]
+                finally:
+                    os.close(fd)
+            return True
+        except (IOError, OSError):
+            return False
+
+    def recover(self) -> int:
+        """
+        Repair a torn trailing line left by a crashed writer.
+
+        Returns:
+            Number of bytes discarded
+        """
+        if not self.path.exists():
+            return 0
+        with file_lock(self.lock_path):
+            fd = os.open(str(self.path), os.O_RDWR | _O_BINARY)
+            try:
+                return self._repair_tail(fd)
+            finally:
+                os.close(fd)
+
+    def clear(self) -> None:
+        """Remove all entries (the file is truncated in place, under the lock)."""
+        if not self.path.exists():
+            return
+        with file_lock(self.lock_path):
+            os.truncate(str(self.path), 0)
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield stored entries oldest first without taking the lock.
+
+        A trailing line without a newline is an append in progress (or a torn
+        write) and is ignored; malformed lines are skipped with a warning.
+        """
+        for _, entry in self.iter_forward():
+            yield entry
+
+    def iter_forward(
+        self,
+        after: Optional[int] = None,
+        **filters: Any
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yield ``(offset, entry)`` pairs oldest first.
+
+        Offsets are the byte position where each line starts; they never
+        change for a complete line, so they double as pagination cursors.
+
+        Args:
+            after: Only entries whose line starts after this offset
+            **filters: Metadata filters understood by entry_matches()
+        """
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as f:
+            offset = 0
+            if after is not None:
+                # Skip the cursor line itself
+                f.seek(after)
+                offset = after + len(f.readline())
+            while True:
+                raw = f.readline()
+                if not raw.endswith(b"\n"):
+                    break
+                start = offset
+                offset += len(raw)
+                entry = self._decode(raw)
+                if entry is not None and entry_matches(entry, **filters):
+                    yield start, entry
+
+    def iter_reverse(
+        self,
+        before: Optional[int] = None,
+        **filters: Any
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yield ``(offset, entry)`` pairs newest first by reading backwards.
+
+        Only the chunks holding the requested lines are read, so a page near
+        either end of the file costs the same regardless of its size.
+
+        Args:
+            before: Only entries whose line starts before this offset
+            **filters: Metadata filters understood by entry_matches()
+        """
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as f:
+            pos = os.fstat(f.fileno()).st_size
+            if before is not None:
+                pos = min(pos, before)
+            tail = b""
+            # Whether ``tail`` is followed by a newline (i.e. complete)
+            terminated = False
+            while pos > 0:
+                start = max(0, pos - self.CHUNK_SIZE)
+                f.seek(start)
+                buf = f.read(pos - start) + tail
+                pos = start
+                lines = buf.split(b"\n")
+                if len(lines) == 1:
+                    tail = buf
+                    continue
+                line_end = start + len(buf)
+                for i in range(len(lines) - 1, 0, -1):
+                    line_start = line_end - len(lines[i])
+                    if i < len(lines) - 1 or terminated:
+                        entry = self._decode(lines[i])
+                        if entry is not None and entry_matches(entry, **filters):
+                            yield line_start, entry
+                    line_end = line_start - 1
+                tail = lines[0]
+                terminated = True
+            if terminated:
+                entry = self._decode(tail)
+                if entry is not None and entry_matches(entry, **filters):
+                    yield 0, entry
+
+    def iter_recent(
+        self,
+        generator_type: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        min_entropy: Optional[float] = None,
+        max_entropy: Optional[float] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield stored entries newest first, applying metadata filters.
+
+        The JSON Lines format has no index, so filtered queries scan
+        backwards until enough matches are found; see the SQLite backend
+        for indexed queries.
+        """
+        recent = self.iter_reverse(
+            generator_type=generator_type,
+            since=since,
+            until=until,
+            min_entropy=min_entropy,
+            max_entropy=max_entropy
+        )
+        for _, entry in recent:
+            yield entry
+
+    def _decode(self, raw: bytes) -> Optional[Dict[str, Any]]:
+        """Parse one raw line, ignoring blank ones."""
+        raw = raw.strip()
+        if not raw:
+            return None
+        return self._parse_line(raw)
+
+    @staticmethod
+    def _parse_line(raw: bytes) -> Optional[Dict[str, Any]]:
+        """Decode one line, salvaging an entry glued onto a torn fragment."""
+        try:
+            return json.loads(raw)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            start = raw.rfind(_ENTRY_MARKER)
+            if start > 0:
+                try:
+                    return json.loads(raw[start:])
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    pass
+            logger.warning(f"Skipping malformed JSON line in history: {e}")
+            return None
+
+    @staticmethod
+    def _repair_tail(fd: int) -> int:
+        """
+        Truncate an unterminated final line (caller must hold the lock).
+
+        Returns:
+            Number of bytes discarded
+        """
+        size = os.fstat(fd).st_size
+        if size == 0:
+            return 0
+        if _read_at(fd, 1, size - 1) == b"\n":
+            return 0
+
+        # Walk backwards to the last complete line
+        chunk_size = 4096
+        end = size
+        while end > 0:
+            start = max(0, end - chunk_size)
+            chunk = _read_at(fd, end - start, start)
+            idx = chunk.rfind(b"\n")
+            if idx != -1:
+                keep = start + idx + 1
+                break
+            end = start
+        else:
+            keep = 0
+
+        os.ftruncate(fd, keep)
+        logger.warning(f"Discarded {size - keep} bytes of a torn history entry")
+        return size - keep
@@ -2,21 +2,38 @@
 Password Logger - Log generated passwords with history viewer.
 """
 
+import base64
+import binascii
 import json
 import os
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from .history_store import JsonlHistoryStore
 
 # Setup logger
 logger = logging.getLogger(__name__)
 
 
+# Supported storage backends
+BACKENDS = ("jsonl", "sqlite")
+
+
+def _default_backend() -> str:
+    """Resolve the backend from PASSFORGE_HISTORY_BACKEND or the config file."""
+    backend = os.getenv("PASSFORGE_HISTORY_BACKEND")
+    if not backend:
+        from ..config.loader import get_config
+        backend = get_config().get("history", "backend", "jsonl")
+    return backend
+
+
 class PasswordLogger:
-    """Log generated passwords to a JSON Lines file."""
+    """Log generated passwords to a JSON Lines file or an SQLite database."""
     
-    def __init__(self, log_dir: Optional[str] = None):
+    def __init__(self, log_dir: Optional[str] = None, backend: Optional[str] = None):
         """
         Initialize the logger.
         
@@ -24,6 +41,8 @@ class PasswordLogger:
             log_dir: Directory for log files (default: ~/.passforge/). 
                     Passwords are stored encrypted with Fernet/AES-128 if the vault is active, 
                     or hashed with SHA-256 as a fallback to prevent plaintext exposure.
+            backend: 'jsonl' (pass_history.log) or 'sqlite' (pass_history.db).
+                    Defaults to PASSFORGE_HISTORY_BACKEND, then the 'history.backend' config key.
         """
         if log_dir:
             self.log_dir = Path(log_dir)
@@ -32,6 +51,21 @@ class PasswordLogger:
         
         self.log_dir.mkdir(parents=True, exist_ok=True)
         self.log_file = self.log_dir / "pass_history.log"
+        self.backend = (backend or _default_backend()).lower()
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown history backend '{self.backend}' (choose from {', '.join(BACKENDS)})")
+        
+        if self.backend == "sqlite":
+            from .history_sqlite import JSONL_MIGRATED, SqliteHistoryStore, migrate_jsonl_to_sqlite
+            self.db_file = self.log_dir / "pass_history.db"
+            self.store = SqliteHistoryStore(self.db_file)
+            # One-shot, all-or-nothing import of an existing JSON Lines history
+            if self.log_file.exists() and not self.store.get_meta(JSONL_MIGRATED):
+                migrated = migrate_jsonl_to_sqlite(JsonlHistoryStore(self.log_file), self.store)
+                if migrated is not None:
+                    logger.info(f"Migrated {migrated} history entries from {self.log_file}")
+        else:
+            self.store = JsonlHistoryStore(self.log_file)
         
         try:
             from ..security.vault import Vault
@@ -39,9 +73,9 @@ class PasswordLogger:
         except ImportError:
             self.vault = None
     
-    def log(self, result: Any, redact: bool = False) -> None:
+    def build_entry(self, result: Any, redact: bool = False) -> Dict[str, Any]:
         """
-        Log a generator result with security considerations.
+        Build the on-disk history entry for a generator result.
         
         Passwords are encrypted using the Vault (Fernet/AES-128).
         If the vault is not active, passwords will be hashed (SHA-256) 
@@ -50,6 +84,9 @@ class PasswordLogger:
         Args:
             result: GeneratorResult object to log
             redact: If True, replace password with <REDACTED> entirely
+            
+        Returns:
+            Entry dictionary exactly as it will be written to the log
         """
         import hashlib
         
@@ -63,28 +100,59 @@ class PasswordLogger:
             # Fallback to hash if encryption is unavailable - never store plaintext
             stored_password = f"hash:{hashlib.sha256(raw_password.encode()).hexdigest()}"
 
-        entry = {
+        return {
             "timestamp": datetime.now().isoformat(),
             "password": stored_password,
             "generator_type": result.generator_type,
             "entropy_bits": round(result.entropy_bits, 2),
             "parameters": result.parameters
         }
+    
+    def append_entry(self, entry: Dict[str, Any]) -> bool:
+        """
+        Append a prepared entry to the history log.
         
-        try:
-            # Append to log file (JSON Lines format)
-            # Location: ~/.passforge/pass_history.log
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(entry) + "\n")
-        except (IOError, OSError):
-            # Fail silently to avoid interrupting user flow
-            pass
+        The store serializes writers across processes, so the CLI, the
+        interactive menu and several PWA workers can log concurrently.
+        
+        Returns:
+            True if the entry was written, False on I/O failure
+        """
+        # Append to log file (JSON Lines format)
+        # Location: ~/.passforge/pass_history.log
+        # Failures return False silently to avoid interrupting user flow
+        return self.store.append(entry)
+    
+    def log(self, result: Any, redact: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Log a generator result with security considerations.
+        
+        Args:
+            result: GeneratorResult object to log
+            redact: If True, replace password with <REDACTED> entirely
+            
+        Returns:
+            The stored (encrypted) entry, or None if it could not be written
+        """
+        entry = self.build_entry(result, redact=redact)
+        return entry if self.append_entry(entry) else None
+    
+    def decrypt_entry(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of a stored entry with its password decrypted for viewing."""
+        clean_entry = dict(entry)
+        if 'password' in clean_entry and self.vault:
+            clean_entry['password'] = self.vault.decrypt(clean_entry['password'])
+        return clean_entry
     
     def get_history(
         self,
         limit: Optional[int] = 10,
         search: Optional[str] = None,
-        generator_type: Optional[str] = None
+        generator_type: Optional[str] = None,
+        decrypt: bool = True,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        min_entropy: Optional[float] = None
     ) -> List[Dict[str, Any]]:
         """
         Get password generation history.
@@ -93,55 +161,225 @@ class PasswordLogger:
             limit: Maximum entries to return (set to None for all)
             search: Search term to filter results
             generator_type: Filter by generator type
+            decrypt: Decrypt passwords (False returns entries as stored on disk)
+            since: ISO date/timestamp, inclusive lower bound
+            until: ISO date/timestamp, exclusive upper bound
+            min_entropy: Minimum entropy in bits
             
         Returns:
-            List of log entries
+            List of log entries, most recent first
         """
-        if not self.log_file.exists():
+        if not self.store.exists():
             return []
         
         entries = []
         
-        with open(self.log_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    entry = json.loads(line)
-                    
-                    # Decrypt password for viewing/searching
-                    if 'password' in entry and self.vault:
-                        entry['password'] = self.vault.decrypt(entry['password'])
-                    
-                    # Apply filters
-                    if search and search.lower() not in json.dumps(entry).lower():
-                        continue
-                    if generator_type and entry.get('generator_type') != generator_type:
-                        continue
-                    
-                    entries.append(entry)
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Skipping malformed JSON line in history: {e}")
-                    continue
-                except (KeyError, AttributeError) as e:
-                    logger.warning(f"Skipping history entry due to malformed data or missing vault: {e}")
-                    continue
-                except Exception as e:
-                    logger.error(f"Unexpected error processing history entry: {e}", exc_info=True)
-                    continue
-        
-        # Return most recent first
-        entries.reverse()
-        
-        if limit is None:
-            return entries
-        return entries[:limit]
+        # Metadata filters are pushed down to the store (indexed with SQLite);
+        # reads are lock-free, so torn or in-flight lines are never yielded
+        recent = self.store.iter_recent(
+            generator_type=generator_type,
+            since=since,
+            until=until,
+            min_entropy=min_entropy
+        )
+        for entry in recent:
+            if limit is not None and len(entries) >= limit:
+                break
+            entry = self._prepare_entry(entry, decrypt, search)
+            if entry is not None:
+                entries.append(entry)
+        
+        return entries
+    
+    def get_history_page(
+        self,
+        limit: int = 50,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        search: Optional[str] = None,
+        generator_type: Optional[str] = None,
+        decrypt: bool = True,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        min_entropy: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Get one page of history using opaque cursors.
+        
+        Pages are read from the cursor position (a byte offset for JSON Lines,
+        a row id for SQLite), so every page costs the same no matter how deep
+        into the history it is.
+        
+        Args:
+            limit: Maximum entries in the page
+            before: Cursor; return entries older than it (next page)
+            after: Cursor; return entries newer than it (previous page / new entries)
+            search, generator_type, decrypt, since, until, min_entropy: As in get_history
+            
+        Returns:
+            Dict with 'entries' (most recent first), 'next_cursor' (pass as
+            `before` for older entries, None at the end) and 'prev_cursor'
+            (pass as `after` for newer entries)
+        
+        Raises:
+            ValueError: If a cursor is malformed or both cursors are given
+        """
+        if before and after:
+            raise ValueError("Use either 'before' or 'after', not both")
+        if limit < 0:
+            raise ValueError("limit must be non-negative")
+        
+        filters = {
+            "generator_type": generator_type,
+            "since": since,
+            "until": until,
+            "min_entropy": min_entropy
+        }
+        if after:
+            rows = self.store.iter_forward(after=self.parse_cursor(after), **filters)
+        else:
+            start = self.parse_cursor(before) if before else None
+            rows = self.store.iter_reverse(before=start, **filters)
+        
+        page = []
+        has_more = False
+        for position, entry in rows:
+            entry = self._prepare_entry(entry, decrypt, search)
+            if entry is None:
+                continue
+            if len(page) >= limit:
+                has_more = True
+                break
+            page.append((position, entry))
+        
+        if after:
+            # Forward reads are oldest first; pages are always newest first
+            page.reverse()
+            prev_cursor = self.make_cursor(page[0][0]) if page else after
+            next_cursor = self.make_cursor(page[-1][0]) if page else None
+        else:
+            prev_cursor = self.make_cursor(page[0][0]) if page else before
+            next_cursor = self.make_cursor(page[-1][0]) if page and has_more else None
+        
+        return {
+            "entries": [entry for _, entry in page],
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor
+        }
+    
+    def history_version(self) -> Tuple[str, int]:
+        """
+        Return the current (epoch, seq) of the history.
+        
+        `seq` is one past the position of the newest entry (0 when empty) and
+        only grows while `epoch` is unchanged; `epoch` changes when the
+        history is cleared and positions start over.
+        """
+        for position, _ in self.store.iter_reverse():
+            return self.store.epoch(), position + 1
+        return "", 0
+    
+    def get_history_since(
+        self,
+        seq: int,
+        epoch: Optional[str] = None,
+        limit: int = 100,
+        decrypt: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Get the entries added after a known (epoch, seq).
+        
+        Args:
+            seq: Sequence number previously returned by history_version()
+            epoch: Epoch that seq belongs to (recommended; detects clears)
+            limit: Maximum entries to return
+            decrypt: Decrypt passwords
+            
+        Returns:
+            Dict with 'entries' (most recent first), 'seq' and 'epoch' to use
+            for the next call, 'has_more' when limit cut the delta short, and
+            'reset' when the client's copy is stale and 'entries' is instead
+            the newest page
+        """
+        if seq < 0:
+            raise ValueError("seq must be non-negative")
+        if limit < 0:
+            raise ValueError("limit must be non-negative")
+        
+        current_epoch, current_seq = self.history_version()
+        if (epoch is not None and epoch != current_epoch) or seq > current_seq:
+            return {
+                "entries": self.get_history(limit=limit, decrypt=decrypt),
+                "seq": current_seq,
+                "epoch": current_epoch,
+                "has_more": False,
+                "reset": True
+            }
+        
+        rows = self.store.iter_forward(after=seq - 1 if seq > 0 else None)
+        page = []
+        has_more = False
+        next_seq = seq
+        for position, entry in rows:
+            if len(page) >= limit:
+                has_more = True
+                break
+            next_seq = position + 1
+            entry = self._prepare_entry(entry, decrypt, None)
+            if entry is not None:
+                page.append(entry)
+        page.reverse()
+        
+        return {
+            "entries": page,
+            "seq": next_seq,
+            "epoch": current_epoch,
+            "has_more": has_more,
+            "reset": False
+        }
+    
+    def make_cursor(self, position: int) -> str:
+        """Encode a store position as an opaque, URL-safe cursor."""
+        raw = f"{self.backend}:{position}".encode("ascii")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+    
+    def parse_cursor(self, cursor: str) -> int:
+        """
+        Decode a cursor produced by make_cursor().
+        
+        Raises:
+            ValueError: If the cursor is malformed or belongs to another backend
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            backend, _, position = base64.urlsafe_b64decode(padded).decode("ascii").partition(":")
+            value = int(position)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise ValueError(f"Invalid history cursor: {cursor!r}")
+        if backend != self.backend or value < 0:
+            raise ValueError(f"Invalid history cursor: {cursor!r}")
+        return value
+    
+    def _prepare_entry(self, entry: Dict[str, Any], decrypt: bool, search: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Decrypt an entry if requested and apply the search filter."""
+        try:
+            # Decrypt password for viewing/searching
+            if decrypt:
+                entry = self.decrypt_entry(entry)
+            
+            if search and search.lower() not in json.dumps(entry).lower():
+                return None
+            return entry
+        except (KeyError, AttributeError) as e:
+            logger.warning(f"Skipping history entry due to malformed data or missing vault: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error processing history entry: {e}", exc_info=True)
+            return None
     
     def clear_history(self) -> None:
         """Clear all password history."""
-        if self.log_file.exists():
-            self.log_file.unlink()
+        self.store.clear()
     
     def export_history(self, output_path: str, format: str = "json", redact_passwords: bool = True) -> None:
         """
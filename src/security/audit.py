@@ -0,0 +1,299 @@
+"""
+Password Audit - Batch strength and breach screening for password lists.
+
+Candidates are streamed in batches to a pool of worker processes. Each one
+computes the composition entropy, a pattern analysis (zxcvbn or the native
+analyzer) and a breach-filter check. Only a bounded number of batches is in
+flight, so memory stays flat for million-row exports. Results come back in
+input order, and an AuditSummary aggregates them as they stream past.
+"""
+
+import csv
+import heapq
+import json
+import math
+import multiprocessing
+import os
+import re
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from .entropy import EntropyCalculator
+from .strength_checker import check_strength
+
+# Candidates sent to a worker per task
+BATCH_SIZE = 256
+
+# Batches queued per worker before the reader waits
+BATCHES_IN_FLIGHT_PER_WORKER = 4
+
+# Columns written to CSV (and keys of each JSONL row)
+FIELDS = [
+    "line", "password", "length", "entropy_bits", "score", "guesses_log10",
+    "crack_time", "warning", "patterns", "breached",
+]
+
+# The matched token and anything after it in a pattern description
+# ("Dictionary word 'hunter2' (passwords)")
+_PATTERN_TOKEN = re.compile(r" '.*$", re.DOTALL)
+
+
+def pattern_kind(pattern: str) -> str:
+    """A pattern description without the matched text, e.g. "Dictionary word"."""
+    return _PATTERN_TOKEN.sub("", pattern)
+
+
+@dataclass
+class AuditRecord:
+    """Audit result for one candidate."""
+    line: int
+    password: str
+    length: int
+    entropy_bits: float
+    score: Optional[int]
+    guesses_log10: Optional[float]
+    crack_time: str
+    warning: str
+    patterns: List[str]
+    breached: Optional[bool]
+
+    def to_dict(self, include_password: bool = False) -> Dict[str, Any]:
+        """
+        Convert to a row. Unless requested, the password is left out and
+        patterns are reduced to their kind, since they quote the matched text.
+        """
+        row = asdict(self)
+        row["entropy_bits"] = round(self.entropy_bits, 2)
+        if self.guesses_log10 is not None:
+            row["guesses_log10"] = round(self.guesses_log10, 2)
+        if not include_password:
+            del row["password"]
+            row["patterns"] = [pattern_kind(p) for p in self.patterns]
+        return row
+
+    def weakness(self) -> Tuple[bool, int, float]:
+        """Sort key: breached first, then by score and estimated guesses."""
+        guesses = self.guesses_log10
+        if guesses is None:
+            guesses = self.entropy_bits * math.log10(2)
+        score = self.score if self.score is not None else 4
+        return (not self.breached, score, guesses)
+
+
+def audit_password(password: str, line: int = 0, engine: str = "auto", breach: bool = True) -> AuditRecord:
+    """
+    Audit a single password.
+
+    Args:
+        password: Candidate to audit
+        line: Its position in the input (for reports)
+        engine: Strength engine passed to check_strength()
+        breach: Screen against the breach filter if one is set up
+
+    Returns:
+        AuditRecord
+    """
+    entropy_bits, _ = EntropyCalculator.calculate_from_password(password)
+    strength = check_strength(password, use_cache=False, engine=engine)
+    breached = None
+    if breach:
+        from .breach import check_breached
+        breached = check_breached(password)
+    return AuditRecord(
+        line=line,
+        password=password,
+        length=len(password),
+        entropy_bits=entropy_bits,
+        score=strength.score if strength else None,
+        guesses_log10=strength.guesses_log10 if strength else None,
+        crack_time=strength.crack_time_display if strength else "",
+        warning=strength.feedback_warning if strength else "",
+        patterns=strength.patterns_found if strength else [],
+        breached=breached
+    )
+
+
+# Settings of the current worker process (set by _init_worker)
+_worker_options: Dict[str, Any] = {"engine": "auto", "breach": True}
+
+
+def _init_worker(engine: str, breach: bool) -> None:
+    _worker_options["engine"] = engine
+    _worker_options["breach"] = breach
+
+
+def _audit_batch(batch: List[Tuple[int, str]]) -> List[AuditRecord]:
+    return [audit_password(password, line, **_worker_options) for line, password in batch]
+
+
+def _batches(candidates: Iterable[Tuple[int, str]], size: int) -> Iterator[List[Tuple[int, str]]]:
+    batch = []
+    for item in candidates:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def audit_passwords(
+    candidates: Iterable[Tuple[int, str]],
+    workers: Optional[int] = None,
+    engine: str = "auto",
+    breach: bool = True,
+    batch_size: int = BATCH_SIZE
+) -> Iterator[AuditRecord]:
+    """
+    Audit a stream of candidates, yielding records in input order.
+
+    Args:
+        candidates: (line number, password) pairs, consumed lazily
+        workers: Worker processes (default: CPU count; 1 audits in-process)
+        engine: Strength engine ("auto", "zxcvbn" or "native")
+        breach: Screen against the breach filter if one is set up
+        batch_size: Candidates per worker task
+
+    Yields:
+        AuditRecord for every candidate
+    """
+    workers = workers or os.cpu_count() or 1
+    batches = _batches(candidates, batch_size)
+    if workers == 1:
+        _init_worker(engine, breach)
+        for batch in batches:
+            yield from _audit_batch(batch)
+        return
+
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(engine, breach)) as pool:
+        pending: deque = deque()
+        limit = workers * BATCHES_IN_FLIGHT_PER_WORKER
+        for batch in batches:
+            pending.append(pool.apply_async(_audit_batch, (batch,)))
+            if len(pending) >= limit:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+
+def read_candidates(stream: TextIO, column: Optional[str] = None) -> Iterator[Tuple[int, str]]:
+    """
+    Read candidates from a text stream.
+
+    Args:
+        stream: One password per line, or CSV when ``column`` is given
+        column: CSV column holding the password (header name or 0-based index)
+
+    Yields:
+        (line number, password); blank entries are skipped
+    """
+    if column is None:
+        for number, line in enumerate(stream, 1):
+            password = line.rstrip("\r\n")
+            if password:
+                yield number, password
+        return
+
+    reader = csv.reader(stream)
+    if column.isdigit():
+        # A numeric column means the file has no header row
+        index = int(column)
+        rows = enumerate(reader, 1)
+    else:
+        header = next(reader, None)
+        if header is None:
+            return
+        if column not in header:
+            raise ValueError(f"Column '{column}' not found in CSV header")
+        index = header.index(column)
+        rows = enumerate(reader, 2)
+    for number, row in rows:
+        if index < len(row) and row[index]:
+            yield number, row[index]
+
+
+class AuditSummary:
+    """Streaming aggregates over audit records (constant memory)."""
+
+    def __init__(self, weakest: int = 10):
+        """
+        Initialize the summary.
+
+        Args:
+            weakest: How many of the weakest records to keep
+        """
+        self.weakest_count = weakest
+        self.total = 0
+        self.breached = 0
+        self.unscored = 0
+        self.entropy_total = 0.0
+        self.score_histogram = {score: 0 for score in range(5)}
+        # Max-heap (by negated weakness) of the weakest records seen so far
+        self._weakest: List[Tuple[Any, int, AuditRecord]] = []
+
+    def add(self, record: AuditRecord) -> None:
+        """Fold one record into the aggregates."""
+        self.total += 1
+        self.entropy_total += record.entropy_bits
+        if record.breached:
+            self.breached += 1
+        if record.score is None:
+            self.unscored += 1
+        else:
+            self.score_histogram[record.score] += 1
+        if self.weakest_count <= 0:
+            return
+        breached_last, score, guesses = record.weakness()
+        item = ((not breached_last, -score, -guesses), -record.line, record)
+        if len(self._weakest) < self.weakest_count:
+            heapq.heappush(self._weakest, item)
+        elif item[:2] > self._weakest[0][:2]:
+            heapq.heapreplace(self._weakest, item)
+
+    def weakest(self) -> List[AuditRecord]:
+        """The weakest records, weakest first."""
+        return [item[2] for item in sorted(self._weakest, key=lambda item: item[:2], reverse=True)]
+
+    def to_dict(self, include_passwords: bool = False) -> Dict[str, Any]:
+        """Aggregates as a JSON-serializable dictionary."""
+        return {
+            "total": self.total,
+            "breached": self.breached,
+            "unscored": self.unscored,
+            "mean_entropy_bits": round(self.entropy_total / self.total, 2) if self.total else 0.0,
+            "score_histogram": {str(score): count for score, count in self.score_histogram.items()},
+            "weakest": [r.to_dict(include_passwords) for r in self.weakest()],
+        }
+
+
+class AuditWriter:
+    """Writes audit records as JSON Lines or CSV."""
+
+    def __init__(self, stream: TextIO, format: str = "jsonl", include_passwords: bool = False):
+        """
+        Initialize the writer.
+
+        Args:
+            stream: Destination text stream
+            format: "jsonl" or "csv"
+            include_passwords: Write plaintext passwords (off by default)
+        """
+        if format not in ("jsonl", "csv"):
+            raise ValueError(f"Unsupported audit format: {format}")
+        self.stream = stream
+        self.format = format
+        self.include_passwords = include_passwords
+        self._csv = None
+        if format == "csv":
+            fields = FIELDS if include_passwords else [f for f in FIELDS if f != "password"]
+            self._csv = csv.DictWriter(stream, fieldnames=fields)
+            self._csv.writeheader()
+
+    def write(self, record: AuditRecord) -> None:
+        row = record.to_dict(self.include_passwords)
+        if self._csv is not None:
+            row["patterns"] = "; ".join(row["patterns"])
+            self._csv.writerow(row)
+        else:
+            self.stream.write(json.dumps(row) + "\n")
@@ -0,0 +1,286 @@
+"""
+Breach Screening - Offline known-breached password checks with a Bloom filter.
+
+A filter is built once from a user-supplied corpus, typically the Have I Been
+Pwned SHA-1 dump (``HEX:COUNT`` per line), and stored as a flat file that is
+memory-mapped for queries. Membership costs ``k`` bit probes regardless of the
+corpus size, nothing is sent over the network, and only the pages touched by
+those probes are read from disk.
+
+Sizing follows the textbook formulas: ``m = -n ln(p) / ln(2)^2`` bits and
+``k = (m / n) ln(2)`` probes, about 9.6 bits (1.2 bytes) per entry at a 1%
+false-positive rate, so a billion-entry corpus fits in roughly 1.2 GB (1.8 GB
+at 0.1%). SHA-1 digests are already uniform, so the probe positions come
+straight from the digest by double hashing; no further hashing is needed.
+
+A positive answer means "probably breached" (false positives at the
+configured rate); a negative answer is definite.
+"""
+
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# File layout: fixed header, then the bit array
+MAGIC = b"PFBLOOM1"
+VERSION = 1
+HEADER_SIZE = 64
+_HEADER = struct.Struct("<8sHHIQQd")  # magic, version, reserved, k, m bits, count, fp rate
+
+# Default false-positive rate for new filters
+DEFAULT_FP_RATE = 0.001
+
+# Default location of the filter
+DEFAULT_FILTER_PATH = Path.home() / ".passforge" / "breach.bloom"
+
+# Corpus lines processed between progress callbacks
+PROGRESS_INTERVAL = 1_000_000
+
+
+def optimal_parameters(expected: int, fp_rate: float) -> Tuple[int, int]:
+    """
+    Size a Bloom filter.
+
+    Args:
+        expected: Number of entries that will be inserted
+        fp_rate: Target false-positive probability (0 < fp_rate < 1)
+
+    Returns:
+        (number of bits, rounded up to whole bytes; number of probes)
+    """
+    if not 0 < fp_rate < 1:
+        raise ValueError("fp_rate must be between 0 and 1")
+    expected = max(1, expected)
+    bits = math.ceil(-expected * math.log(fp_rate) / (math.log(2) ** 2))
+    bits = max(64, (bits + 7) // 8 * 8)
+    probes = max(1, round(bits / expected * math.log(2)))
+    return bits, probes
+
+
+def _digest_halves(digest: bytes) -> Tuple[int, int]:
+    """Split a digest into the two double-hashing seeds (the step is odd)."""
+    return int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:16], "big") | 1
+
+
+def _iter_seeds(path: Path, plaintext: bool) -> Iterator[Tuple[int, int]]:
+    """
+    Yield the double-hashing seeds of every corpus entry.
+
+    Hash corpora accept ``HEX`` or ``HEX:COUNT`` lines (HIBP format, any case,
+    CRLF tolerated); lines that are not a 40-digit hex digest are skipped.
+    The seeds are parsed straight from the hex digits. Plaintext corpora hold
+    one password per line.
+    """
+    with open(path, "rb", buffering=1 << 20) as f:
+        if plaintext:
+            for line in f:
+                line = line.rstrip(b"\r\n")
+                if line:
+                    yield _digest_halves(hashlib.sha1(line).digest())
+            return
+        for line in f:
+            if len(line) < 40 or (len(line) > 40 and line[40] not in b":\r\n"):
+                continue
+            try:
+                yield int(line[:16], 16), int(line[16:32], 16) | 1
+            except ValueError:
+                continue
+
+
+def _count_lines(path: Path) -> int:
+    """Count newline-terminated lines (plus a final unterminated one) quickly."""
+    count = 0
+    last = b"\n"
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(1 << 20)
+            if not chunk:
+                break
+            count += chunk.count(b"\n")
+            last = chunk[-1:]
+    return count + (last != b"\n")
+
+
+class BreachFilter:
+    """Read-only, memory-mapped Bloom filter of breached password hashes."""
+
+    def __init__(self, path: Path):
+        """
+        Open an existing filter file.
+
+        Args:
+            path: Filter file written by BreachFilter.build()
+
+        Raises:
+            ValueError: If the file is not a PassForge breach filter
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+            if len(header) < HEADER_SIZE:
+                raise ValueError(f"Not a breach filter: {self.path}")
+            magic, version, _, probes, bits, count, fp_rate = _HEADER.unpack_from(header)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Not a breach filter: {self.path}")
+            if os.fstat(f.fileno()).st_size < HEADER_SIZE + bits // 8:
+                raise ValueError(f"Truncated breach filter: {self.path}")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.num_hashes = probes
+        self.num_bits = bits
+        self.count = count
+        self.fp_rate = fp_rate
+
+    @classmethod
+    def build(
+        cls,
+        corpus_path: Path,
+        filter_path: Path,
+        fp_rate: float = DEFAULT_FP_RATE,
+        expected: Optional[int] = None,
+        plaintext: bool = False,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> "BreachFilter":
+        """
+        Build a filter file from a corpus.
+
+        The bit array is written through a memory map of a sparse file, so
+        memory use stays flat whatever the corpus size. The file is built
+        next to ``filter_path`` and renamed into place when complete.
+
+        Args:
+            corpus_path: HIBP-style SHA-1 dump, or passwords if ``plaintext``
+            filter_path: Where to write the filter
+            fp_rate: Target false-positive rate
+            expected: Number of entries (counted from the corpus if omitted)
+            plaintext: The corpus holds passwords rather than SHA-1 hashes
+            progress: Called with the number of entries inserted so far
+
+        Returns:
+            The opened filter
+        """
+        corpus_path = Path(corpus_path)
+        filter_path = Path(filter_path)
+        if expected is None:
+            expected = _count_lines(corpus_path)
+        bits, probes = optimal_parameters(expected, fp_rate)
+
+        filter_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = filter_path.with_name(filter_path.name + ".tmp")
+        count = 0
+        with open(tmp_path, "w+b") as f:
+            f.truncate(HEADER_SIZE + bits // 8)
+            mm = mmap.mmap(f.fileno(), 0)
+            try:
+                steps = range(probes)
+                for h1, h2 in _iter_seeds(corpus_path, plaintext):
+                    for i in steps:
+                        bit = (h1 + i * h2) % bits
+                        mm[HEADER_SIZE + (bit >> 3)] |= 1 << (bit & 7)
+                    count += 1
+                    if count % PROGRESS_INTERVAL == 0 and progress is not None:
+                        progress(count)
+                mm[:HEADER_SIZE] = _HEADER.pack(MAGIC, VERSION, 0, probes, bits, count, fp_rate).ljust(HEADER_SIZE, b"\0")
+                mm.flush()
+            finally:
+                mm.close()
+        os.replace(tmp_path, filter_path)
+        return cls(filter_path)
+
+    def contains_digest(self, digest: bytes) -> bool:
+        """Check a raw SHA-1 digest (O(k) bit probes)."""
+        h1, h2 = _digest_halves(digest)
+        bits = self.num_bits
+        mm = self._mmap
+        for i in range(self.num_hashes):
+            bit = (h1 + i * h2) % bits
+            if not mm[HEADER_SIZE + (bit >> 3)] & (1 << (bit & 7)):
+                return False
+        return True
+
+    def is_breached(self, password: str) -> bool:
+        """Check whether a password is (probably) in the breach corpus."""
+        return self.contains_digest(hashlib.sha1(password.encode("utf-8")).digest())
+
+    def __contains__(self, password: str) -> bool:
+        return self.is_breached(password)
+
+    def estimated_fp_rate(self) -> float:
+        """False-positive rate implied by the actual fill: (1 - e^(-kn/m))^k."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    @property
+    def size_bytes(self) -> int:
+        return HEADER_SIZE + self.num_bits // 8
+
+    def close(self) -> None:
+        """Unmap the filter."""
+        self._mmap.close()
+
+    def __enter__(self) -> "BreachFilter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def default_filter_path() -> Path:
+    """Resolve the filter from PASSFORGE_BREACH_FILTER, the config file, or ~/.passforge."""
+    path = os.getenv("PASSFORGE_BREACH_FILTER")
+    if not path:
+        from ..config.loader import get_config
+        path = get_config().get("breach", "filter")
+    return Path(path).expanduser() if path else DEFAULT_FILTER_PATH
+
+
+# Open filters (None for an unreadable file), reused until the file is rebuilt
+_filters: Dict[Path, Tuple[int, Optional[BreachFilter]]] = {}
+_filters_lock = threading.Lock()
+
+
+def get_breach_filter(path: Optional[Path] = None) -> Optional[BreachFilter]:
+    """
+    Return the shared filter, or None if none has been built.
+
+    The mapping is opened once per process and reopened when the file is
+    replaced by a rebuild. A corrupt or truncated file is logged once and
+    treated as missing.
+    """
+    path = Path(path) if path else default_filter_path()
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return None
+    with _filters_lock:
+        cached = _filters.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            breach_filter = BreachFilter(path)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unusable breach filter: %s", e)
+            breach_filter = None
+        _filters[path] = (mtime, breach_filter)
+        # The old mapping is left to the garbage collector: other threads
+        # may still be probing it
+        return breach_filter
+
+
+def check_breached(password: str) -> Optional[bool]:
+    """
+    Screen a password against the configured filter.
+
+    Returns:
+        True if probably breached, False if not, None if no filter is set up
+    """
+    breach_filter = get_breach_filter()
+    if breach_filter is None:
+        return None
+    return breach_filter.is_breached(password)
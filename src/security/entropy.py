@@ -3,9 +3,48 @@ Entropy Calculator - Calculate and display password entropy.
 """
 
 import math
-from typing import Optional
+from typing import List, Optional, Tuple
 from ..generators.base import BaseGenerator
 
+# Extended pool for unknown printable characters
+ASCII_EXTENDED_POOL = 95
+
+# Character class bits used by calculate_from_password
+_LOWER, _UPPER, _DIGIT, _SYMBOL, _OTHER = 1, 2, 4, 8, 16
+
+_CLASS_POOLS = (
+    (_LOWER, BaseGenerator.LOWERCASE),
+    (_UPPER, BaseGenerator.UPPERCASE),
+    (_DIGIT, BaseGenerator.DIGITS),
+    (_SYMBOL, BaseGenerator.SYMBOLS),
+)
+
+
+def _build_class_table() -> bytes:
+    """Map every byte value to its class bit (bytes outside the pools are "other")."""
+    table = bytearray([_OTHER]) * 256
+    for bit, chars in _CLASS_POOLS:
+        for char in chars:
+            table[ord(char)] = bit
+    return bytes(table)
+
+
+def _build_pool_sizes() -> List[int]:
+    """Pool size for every combination of class bits."""
+    sizes = []
+    for mask in range(_OTHER * 2):
+        size = sum(len(chars) for bit, chars in _CLASS_POOLS if mask & bit)
+        if mask & _OTHER:
+            # If characters outside standard pools are used,
+            # assume at least the full printable ASCII range (95)
+            size = max(size, ASCII_EXTENDED_POOL)
+        sizes.append(size)
+    return sizes
+
+
+_CLASS_TABLE = _build_class_table()
+_POOL_SIZES = _build_pool_sizes()
+
 
 class EntropyCalculator:
     """Calculate password entropy and strength metrics."""
@@ -21,7 +60,7 @@ class EntropyCalculator:
     }
     
     # Extended pool for unknown printable characters
-    ASCII_EXTENDED_POOL = 95
+    ASCII_EXTENDED_POOL = ASCII_EXTENDED_POOL
     
     @staticmethod
     def calculate_from_pool(pool_size: int, length: int) -> float:
@@ -40,57 +79,33 @@ class EntropyCalculator:
         return length * math.log2(pool_size)
     
     @staticmethod
-    def calculate_from_password(password: str) -> float:
+    def calculate_from_password(password: str) -> Tuple[float, int]:
         """
         Estimate entropy from an existing password by analyzing its composition.
         
         Note: This is an upper-bound estimate assuming uniform random selection.
         Real-world passwords may have lower effective entropy due to patterns.
         
+        The password is classified in one pass at C speed: its ASCII bytes are
+        mapped to class bits through a 256-entry table with bytes.translate(),
+        and the distinct bits are OR-ed into a mask that indexes a precomputed
+        pool size. Non-ASCII characters always count as "other".
+        
         Args:
             password: The password to analyze
             
         Returns:
-            Estimated entropy in bits
+            (estimated entropy in bits, character pool size); (0.0, 0) if empty
         """
         if not password:
-            return 0.0
+            return 0.0, 0
         
-        pool_size = 0
-        has_lower = False
-        has_upper = False
-        has_digit = False
-        has_symbol = False
-        others = 0
-        
-        # Single-pass analysis for improved efficiency
-        for char in password:
-            if char in BaseGenerator.LOWERCASE:
-                has_lower = True
-            elif char in BaseGenerator.UPPERCASE:
-                has_upper = True
-            elif char in BaseGenerator.DIGITS:
-                has_digit = True
-            elif char in BaseGenerator.SYMBOLS:
-                has_symbol = True
-            else:
-                others += 1
-        
-        if has_lower:
-            pool_size += len(BaseGenerator.LOWERCASE)
-        if has_upper:
-            pool_size += len(BaseGenerator.UPPERCASE)
-        if has_digit:
-            pool_size += len(BaseGenerator.DIGITS)
-        if has_symbol:
-            pool_size += len(BaseGenerator.SYMBOLS)
-        
-        if others > 0:
-            # If characters outside standard pools are used, 
-            # assume at least the full printable ASCII range (95)
-            # but don't double count if we already calculated more.
-            pool_size = max(pool_size, EntropyCalculator.ASCII_EXTENDED_POOL)
-            
+        data = password.encode("ascii", "ignore")
+        mask = _OTHER if len(data) != len(password) else 0
+        for bit in set(data.translate(_CLASS_TABLE)):
+            mask |= bit
+        
+        pool_size = _POOL_SIZES[mask]
         entropy = EntropyCalculator.calculate_from_pool(pool_size, len(password))
         return entropy, pool_size
     
@@ -193,7 +208,14 @@ class EntropyCalculator:
         ]
         
         if pool_size:
-            lines.append(f"| Pool Size:     {pool_size:>{width-18}} |")
+            pool_display = str(pool_size)
+            if len(pool_display) > width - 18 and isinstance(pool_size, int):
+                # Whole-secret pools (UUIDs, keys) are exact integers: show the power
+                if pool_size & (pool_size - 1) == 0:
+                    pool_display = f"2^{pool_size.bit_length() - 1}"
+                else:
+                    pool_display = f"~10^{len(pool_display) - 1}"
+            lines.append(f"| Pool Size:     {pool_display:>{width-18}} |")
         
         lines.append(f"+{'-' * width}+")
         
@@ -1,11 +1,24 @@
 """
 Jitter Entropy Collector - Collects entropy from human timing variability.
+
+Keystrokes are read one at a time (termios cbreak mode with ``select`` on
+Linux/macOS, console wait handles with ``msvcrt`` on Windows), so the loop
+sleeps until a key arrives instead of polling. Each key's ``perf_counter_ns``
+timestamp goes into a JitterPool: the delta to the previous key is stored in a
+preallocated array and checked by the SP 800-90B continuous health tests, and
+the raw timestamp and key bytes are hashed into the pool's SHA-256 digest and
+added as events to the session's EntropyAccumulator (see paranoid_random()).
 """
 
-import time
 import hashlib
+import math
+import os
 import sys
-from typing import Optional
+import time
+from array import array
+from typing import Any, Optional
+
+from ..generators.accumulator import SOURCE_JITTER, get_accumulator, get_seed_file
 
 try:
     import colorama
@@ -16,13 +29,192 @@ except ImportError:
     class Fore: RED = ""; GREEN = ""; YELLOW = ""; RESET = ""; CYAN = ""; MAGENTA = ""
     class Style: BRIGHT = ""; RESET_ALL = ""
 
-def collect_jitter(duration: int = 5) -> str:
+# Min-entropy assumed per keystroke delta, in bits (deliberately conservative)
+ASSUMED_ENTROPY = 1.0
+
+# False-positive probability of the health tests (SP 800-90B recommends 2^-20 to 2^-40)
+HEALTH_ALPHA_LOG2 = 20
+
+# Repetition Count Test cutoff: C = 1 + ceil(-log2(alpha) / H)
+REPETITION_CUTOFF = 1 + math.ceil(HEALTH_ALPHA_LOG2 / ASSUMED_ENTROPY)
+
+# Adaptive Proportion Test window and cutoff (SP 800-90B table 2, H = 1, W = 512)
+PROPORTION_WINDOW = 512
+PROPORTION_CUTOFF = 410
+
+# Low bits of each delta seen by the health tests (where the jitter lives)
+HEALTH_MASK = 0xFF
+
+# Expected upper bound on keystrokes per second, used to size the sample array
+MAX_KEYS_PER_SECOND = 64
+
+
+class JitterPool:
+    """Keystroke timing samples, their health tests and the entropy accumulator."""
+
+    def __init__(self, capacity: int = 1024, accumulator: Optional[Any] = None):
+        """
+        Args:
+            capacity: Deltas kept in the preallocated array (later samples
+                are still tested and hashed, just not stored)
+            accumulator: EntropyAccumulator that also receives every key
+                as an event
+        """
+        self.accumulator = accumulator
+        self.deltas = array("q", bytes(8 * capacity))
+        self.keys = 0
+        self.count = 0
+        self.failures = 0
+        self._hash = hashlib.sha256(b"passforge-jitter")
+        self._last: Optional[int] = None
+        # Repetition Count Test state
+        self._repeat_value = -1
+        self._repeat_run = 0
+        # Adaptive Proportion Test state
+        self._window_value = -1
+        self._window_seen = 0
+        self._window_matches = 0
+
+    def add(self, timestamp_ns: int, data: bytes = b"") -> None:
+        """Record one keystroke read at ``timestamp_ns``."""
+        self._hash.update(timestamp_ns.to_bytes(8, "big") + len(data).to_bytes(2, "big") + data[:0xFFFF])
+        if self.accumulator is not None:
+            self.accumulator.add_event(SOURCE_JITTER, timestamp_ns.to_bytes(8, "big") + data[:24])
+        self.keys += 1
+        last, self._last = self._last, timestamp_ns
+        if last is None:
+            return
+        delta = timestamp_ns - last
+        if self.count < len(self.deltas):
+            self.deltas[self.count] = delta
+        self.count += 1
+        self._health_test(delta & HEALTH_MASK)
+
+    def _health_test(self, sample: int) -> None:
+        """SP 800-90B 4.4 Repetition Count and Adaptive Proportion tests."""
+        if sample == self._repeat_value:
+            self._repeat_run += 1
+            if self._repeat_run >= REPETITION_CUTOFF:
+                self.failures += 1
+                self._repeat_run = 1
+        else:
+            self._repeat_value = sample
+            self._repeat_run = 1
+
+        if self._window_seen == 0:
+            self._window_value = sample
+            self._window_matches = 1
+        elif sample == self._window_value:
+            self._window_matches += 1
+            if self._window_matches >= PROPORTION_CUTOFF:
+                self.failures += 1
+                self._window_matches = 0
+        self._window_seen = (self._window_seen + 1) % PROPORTION_WINDOW
+
+    @property
+    def healthy(self) -> bool:
+        """Whether the samples passed every health test."""
+        return self.failures == 0
+
+    @property
+    def entropy_bits(self) -> float:
+        """Min-entropy credited to the pool (none once a health test failed)."""
+        return self.count * ASSUMED_ENTROPY if self.healthy else 0.0
+
+    def digest(self) -> bytes:
+        """SHA-256 of everything added so far."""
+        return self._hash.copy().digest()
+
+
+class _Progress:
+    """Progress bar that redraws only when its position changes."""
+
+    WIDTH = 20
+
+    def __init__(self, duration: float):
+        self.duration = duration
+        self.start = time.monotonic()
+        self.shown = -1
+
+    def update(self) -> None:
+        fraction = min(1.0, (time.monotonic() - self.start) / self.duration) if self.duration > 0 else 1.0
+        percent = int(fraction * 100)
+        if percent // 5 == self.shown:
+            return
+        self.shown = percent // 5
+        bar = "█" * int(fraction * self.WIDTH)
+        print(f"[{Fore.GREEN}{bar:<{self.WIDTH}}{Style.RESET_ALL}] {percent}%", end="\r", flush=True)
+
+
+def _collect_posix(fd: int, duration: float, pool: JitterPool, progress: Optional[_Progress] = None) -> None:
+    """Read keys from a terminal in cbreak mode, sleeping in select() between them."""
+    import select
+    import termios
+    import tty
+
+    saved = termios.tcgetattr(fd)
+    try:
+        # cbreak: one key at a time, no echo, Ctrl-C still interrupts
+        tty.setcbreak(fd, termios.TCSANOW)
+        deadline = time.monotonic() + duration
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            ready, _, _ = select.select([fd], [], [], min(remaining, 0.25))
+            if ready:
+                timestamp = time.perf_counter_ns()
+                data = os.read(fd, 64)
+                if not data:
+                    break
+                pool.add(timestamp, data)
+            if progress:
+                progress.update()
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+
+def _collect_windows(duration: float, pool: JitterPool, progress: Optional[_Progress] = None) -> None:
+    """Read keys from the Windows console, waiting on the input handle between them."""
+    import msvcrt
+
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-10)  # STD_INPUT_HANDLE
+
+        def wait(seconds: float) -> bool:
+            return kernel32.WaitForSingleObject(handle, int(seconds * 1000)) == 0  # WAIT_OBJECT_0
+    except (ImportError, AttributeError, OSError):
+        def wait(seconds: float) -> bool:
+            time.sleep(min(seconds, 0.01))
+            return False
+
+    deadline = time.monotonic() + duration
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        if msvcrt.kbhit():
+            timestamp = time.perf_counter_ns()
+            pool.add(timestamp, msvcrt.getch())
+        elif wait(min(remaining, 0.25)) and not msvcrt.kbhit():
+            # Signalled without a key: focus and mouse events stay queued,
+            # so back off instead of spinning on them
+            time.sleep(0.005)
+        if progress:
+            progress.update()
+
+
+def collect_jitter(duration: int = 5, accumulator: Optional[Any] = None) -> str:
     """
     Collect entropy from the timing of keyboard presses.
-    
+
     Args:
         duration: Time in seconds to collect data
-        
+        accumulator: EntropyAccumulator fed with every key and credited with
+            the health-tested entropy
+
     Returns:
         A SHA-256 hex digest of the collected timing data
     """
@@ -31,65 +223,61 @@ def collect_jitter(duration: int = 5) -> str:
     print(f"To generate extra entropy, please {Style.BRIGHT}bash your keyboard randomly{Style.RESET_ALL}.")
     print(f"We are measuring the micro-timing (nanoseconds) between your keys.")
     print(f"{Fore.YELLOW}--------------------------------------------------{Style.RESET_ALL}\n")
-    
-    # Try to use msvcrt for non-blocking input on Windows
-    # or termios on Linux
+
+    pool = JitterPool(capacity=duration * MAX_KEYS_PER_SECOND, accumulator=accumulator)
+    progress = _Progress(duration)
+    progress.update()
+
     try:
-        import msvcrt
-        platform = "win"
-    except ImportError:
-        try:
-            import tty
-            import termios
-            platform = "linux"
-        except ImportError:
-            platform = "fallback"
-
-    timing_data = []
-    start_time = time.time()
-    next_milestone = 1
-    
-    print(f"[{Fore.GREEN}{' ' * 20}{Style.RESET_ALL}] 0%", end="\r")
-    
-    # Simple input collection loop
-    # We want to catch characters as they come
-    
-    if platform == "win":
-        while time.time() - start_time < duration:
-            if msvcrt.kbhit():
-                # Get the key
-                key = msvcrt.getch()
-                # Record current precise time
-                t = time.perf_counter_ns()
-                timing_data.append(str(t) + str(key))
-            
-            # Update progress bar
-            elapsed = time.time() - start_time
-            progress = int((elapsed / duration) * 20)
-            percent = int((elapsed / duration) * 100)
-            
-            bar = "█" * progress + " " * (20 - progress)
-            print(f"[{Fore.GREEN}{bar}{Style.RESET_ALL}] {percent}%", end="\r")
-            time.sleep(0.01) # Small sleep to prevent CPU spike
-            
-    elif platform == "linux":
-        # Linux implementation would go here (omitted for brevity in this specific windows-focused session but structure is here)
-        # Using a simple fallback for now if tty/termios is tricky to handle in one shot
+        if sys.platform == "win32":
+            _collect_windows(duration, pool, progress)
+        elif sys.stdin.isatty():
+            _collect_posix(sys.stdin.fileno(), duration, pool, progress)
+    except (ImportError, OSError):
+        # No usable terminal: fall through to line input
         pass
-    
-    if not timing_data or platform == "fallback":
-        # Standard input fallback if specialized modules aren't available
-        # Ask for a random string
+
+    if pool.keys == 0:
+        # Standard input fallback if no keys could be read one at a time
         print(f"{Fore.MAGENTA}Specialized input handler unavailable. Fallback enabled.{Style.RESET_ALL}")
         print("Please type a long string of random characters and press Enter:")
         user_input = input("> ")
-        timing_data.append(user_input + str(time.perf_counter_ns()))
-    
-    print(f"\n\n{Fore.GREEN}✅ Entropy collection complete! {len(timing_data)} samples gathered.{Style.RESET_ALL}")
-    
-    # Hash the data
-    seed = hashlib.sha256("".join(timing_data).encode()).hexdigest()
-    return seed
+        pool.add(time.perf_counter_ns(), user_input.encode("utf-8"))
+
+    print(f"\n\n{Fore.GREEN}✅ Entropy collection complete! {pool.keys} samples gathered, "
+          f"~{pool.entropy_bits:.0f} bits credited.{Style.RESET_ALL}")
+    if not pool.healthy:
+        print(f"{Fore.YELLOW}⚠️ Key timings failed the health tests (held key or scripted input?); "
+              f"no entropy was credited to them.{Style.RESET_ALL}")
+
+    if accumulator is not None:
+        accumulator.credit(pool.entropy_bits)
+        accumulator.reseed_now()
+    return pool.digest().hex()
+
+
+def paranoid_random(duration: int = 5) -> Any:
+    """
+    The session's entropy accumulator, with keyboard jitter mixed in.
+
+    Jitter is collected at most once per session. A recent seed file (see
+    get_seed_file()) stands in for it, so later runs skip the collection too.
+
+    Returns:
+        The shared EntropyAccumulator
+    """
+    from ..config.loader import get_config
+
+    accumulator = get_accumulator()
+    seed_file = get_seed_file()
+    if not accumulator.credited_bits and seed_file is not None:
+        max_age = get_config().get("paranoid", "seed_max_age_hours", 24) * 3600
+        accumulator.load_seed_file(seed_file, max_age)
+    if not accumulator.credited_bits:
+        collect_jitter(duration, accumulator)
+        if seed_file is not None:
+            accumulator.write_seed_file(seed_file)
+    return accumulator
 
 def mix_entropy(base_bytes: bytes, custom_seed: str) -> bytes:
     """
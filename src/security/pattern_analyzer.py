@@ -0,0 +1,1022 @@
+"""
+Pattern Analyzer - Native, linear-time password guess estimation.
+
+A dependency-free alternative to zxcvbn that follows the same model: the
+password is covered by dictionary, l33t, reversed, keyboard, sequence, repeat
+and date matches, and the cheapest cover gives the guess estimate.
+
+Unlike zxcvbn, every detector only looks at a bounded window around each
+position and the cover is chosen with a two-state dynamic program, so the
+cost grows linearly with the length of the input:
+
+- Dictionaries are merged into one sorted-array trie: each prefix is a
+  ``[lo, hi)`` range of the sorted keys, narrowed by bisection per character,
+  so no per-node objects are allocated and a walk stops as soon as no word
+  continues the prefix (at most ``max_length`` characters).
+- Keyboard graphs are generated from layout rows (QWERTY and keypad).
+- Sequences, repeated runs and blocks, dates and recent years are found by
+  single scans or bounded windows.
+
+The frequency-ranked lists shipped with zxcvbn are used when it is installed;
+otherwise a built-in list of common passwords, the default passphrase
+wordlist and the themed lists in ``data/wordlists`` are ranked instead.
+"""
+
+import bisect
+import math
+import os
+import re
+import threading
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .strength_checker import StrengthResult, _to_strength_result
+
+# Reuse zxcvbn's frequency lists when available
+try:
+    from zxcvbn.frequency_lists import FREQUENCY_LISTS
+    FREQUENCY_LISTS_AVAILABLE = True
+except ImportError:
+    FREQUENCY_LISTS_AVAILABLE = False
+
+# Most common passwords, most frequent first (used without zxcvbn)
+COMMON_PASSWORDS = [
+    "123456", "password", "12345678", "qwerty", "123456789", "12345", "1234",
+    "111111", "1234567", "dragon", "123123", "baseball", "abc123", "football",
+    "monkey", "letmein", "shadow", "master", "666666", "qwertyuiop", "123321",
+    "mustang", "1234567890", "michael", "654321", "superman", "1qaz2wsx",
+    "7777777", "121212", "000000", "qazwsx", "123qwe", "killer", "trustno1",
+    "jordan", "jennifer", "zxcvbnm", "asdfgh", "hunter", "buster", "soccer",
+    "harley", "batman", "andrew", "tigger", "sunshine", "iloveyou", "2000",
+    "charlie", "robert", "thomas", "hockey", "ranger", "daniel", "starwars",
+    "klaster", "112233", "george", "computer", "michelle", "jessica", "pepper",
+    "1111", "zxcvbn", "555555", "11111111", "131313", "freedom", "777777",
+    "pass", "maggie", "159753", "aaaaaa", "ginger", "princess", "joshua",
+    "cheese", "amanda", "summer", "love", "ashley", "nicole", "chelsea",
+    "matthew", "access", "yankees", "987654321", "dallas", "austin", "thunder",
+    "taylor", "matrix", "william", "corvette", "hello", "martin", "heather",
+    "secret", "merlin", "diamond", "1234qwer", "gfhjkm", "hammer", "silver",
+    "222222", "88888888", "anthony", "justin", "test", "bailey", "q1w2e3r4t5",
+    "patrick", "internet", "scooter", "orange", "11111", "golfer", "cookie",
+    "richard", "samantha", "bigdog", "guitar", "jackson", "whatever", "mickey",
+    "chicken", "sparky", "snoopy", "maverick", "phoenix", "camaro", "peanut",
+    "morgan", "welcome", "falcon", "cowboy", "ferrari", "samsung", "andrea",
+    "smokey", "steelers", "joseph", "mercedes", "dakota", "arsenal", "eagles",
+    "melissa", "boomer", "booboo", "spider", "nascar", "monster", "tigers",
+    "yellow", "xxxxxx", "123123123", "gateway", "marina", "diablo", "bulldog",
+    "qwer1234", "compaq", "purple", "banana", "junior", "hannah", "123654",
+    "porsche", "lakers", "iceman", "money", "cowboys", "987654", "london",
+    "tennis", "999999", "ncc1701", "coffee", "scooby", "0000", "miller",
+    "boston", "q1w2e3r4", "brandon", "yamaha", "chester", "mother", "forever",
+    "johnny", "edward", "333333", "oliver", "redsox", "player", "nikita",
+    "knight", "fender", "barney", "midnight", "please", "brandy", "chicago",
+    "badboy", "slayer", "rangers", "charles", "angel", "flower", "bigdaddy",
+    "rabbit", "wizard", "jasper", "enter", "rachel", "chris", "steven",
+    "winner", "adidas", "victoria", "natasha", "1q2w3e4r", "jasmine", "winter",
+    "prince", "marine", "ghbdtn", "fishing", "cocacola", "casper", "james",
+    "232323", "raiders", "888888", "marlboro", "gandalf", "asdfasdf",
+    "crystal", "87654321", "12344321", "golden", "8675309", "panther",
+    "lauren", "angela", "spanky", "thx1138", "angels", "madison", "winston",
+    "shannon", "mike", "toyota", "jordan23", "canada", "sophie", "apples",
+    "tiger", "razz", "123abc", "pokemon", "qazxsw", "55555", "qwaszx",
+    "muffin", "johnson", "murphy", "cooper", "jonathan", "liverpoo", "david",
+    "danielle", "159357", "jackie", "1990", "123456a", "789456", "turtle",
+    "abcd1234", "scorpion", "qazwsxedc", "101010", "butter", "carlos",
+    "password1", "dennis", "slipknot", "qwerty123", "booger", "asdf", "1991",
+    "black", "startrek", "12341234", "cameron", "newyork", "rainbow", "nathan",
+    "john", "1992", "rocket", "viking", "redskins", "asdfghjkl", "1212",
+    "sierra", "peaches", "gemini", "doctor", "wilson", "sandra", "helpme",
+    "qwertyui", "victor", "florida", "dolphin", "pookie", "captain", "tucker",
+    "blue", "liverpool", "theman", "bandit", "dolphins", "maddog", "packers",
+    "jaguar", "nicholas", "united", "tiffany", "maxwell", "zzzzzz", "nirvana",
+    "jeremy", "monica", "elephant", "giants", "hotdog", "rosebud", "success",
+    "debbie", "mountain", "444444", "xxxxxxxx", "warrior", "1q2w3e4r5t",
+    "q1w2e3", "123456q", "albert", "metallic", "lucky", "azerty", "7777",
+    "alex", "bond007", "alexis", "1111111", "samson", "5150", "willie",
+    "scorpio", "bonnie", "gators", "benjamin", "voodoo", "driver", "dexter",
+    "2112", "jason", "calvin", "freddy", "212121", "creative", "12345a",
+    "sydney", "rush2112", "1989", "asdfghjk", "red123", "bubba", "4815162342",
+    "passw0rd", "trouble", "gunner", "happy", "gordon", "legend", "jessie",
+    "stella", "qwert", "eminem", "arthur", "apple", "nissan", "bear",
+    "america", "1qazxsw2", "nothing", "parker", "4444", "rebecca", "qweqwe",
+    "garfield", "01012011", "beavis", "jack", "asdasd", "december", "2222",
+    "102030", "252525", "11223344", "magic", "apollo", "skippy", "315475",
+    "kitten", "golf", "copper", "braves", "shelby", "godzilla", "beaver",
+    "fred", "tomcat", "august", "buddy", "airborne", "1993", "1988",
+    "lifehack", "qqqqqq", "brooklyn", "animal", "platinum", "phantom",
+    "online", "xavier", "darkness", "blink182", "power", "fish", "green",
+    "789789", "voyager", "police", "travis", "12qwaszx", "heaven", "snowball",
+    "lover", "abcdef", "00000", "pakistan", "007007", "walter", "blazer",
+    "cricket", "sniper", "donkey", "willow", "loveme", "saturn", "therock",
+    "redwings", "bigboy", "pumpkin", "trinity", "williams", "nintendo",
+    "digital", "destiny", "topgun", "runner", "marvin", "guinness", "chance",
+    "bubbles", "testing", "fire", "november", "minecraft", "asdf1234",
+    "lasvegas", "sergey", "broncos", "cartman", "private", "celtic", "birdie",
+    "little", "cassie", "babygirl", "donald", "beatles", "1313", "family",
+    "12121212", "school", "louise", "gabriel", "eclipse", "fluffy",
+    "147258369", "lol123", "explorer", "beer", "nelson", "flyers", "spencer",
+    "scott", "lovely", "gibson", "doggie", "cherry", "andrey", "snickers",
+    "buffalo", "pantera", "metallica", "member", "carter", "qwertyu", "peter",
+    "alexande", "steve", "bronco", "paradise", "goober", "5555", "samuel",
+    "montana", "mexico", "dreams", "michigan", "carolina", "friends", "magnum",
+    "surfer", "maximus", "genius", "cool", "vampire", "lacrosse", "asd123",
+    "aaaa", "christin", "kimberly", "speedy", "sharon", "carmen", "111222",
+    "kristina", "sammy", "racing", "ou812", "sabrina", "horses", "0987654321",
+    "qwerty1", "baby", "stalker", "enigma", "147147", "star", "poohbear",
+    "147258", "simple", "12345q", "marcus", "brian", "1987", "qweasdzxc",
+    "drowssap", "hahaha", "caroline", "barbara", "dave", "viper", "drummer",
+    "action", "einstein", "genesis", "hello1", "scotty", "friend", "forest",
+    "010203", "hotrod", "google", "vanessa", "spitfire", "badger", "maryjane",
+    "friday", "alaska", "1232323q", "tester", "jester", "jake", "champion",
+    "billy", "147852", "rock", "hawaii", "chevy", "420420", "walker",
+    "stephen", "eagle1", "bill", "1986", "october", "gregory", "svetlana",
+    "pamela", "1984", "music", "shorty", "westside", "stanley", "diesel",
+    "courtney", "242424", "kevin", "hitman", "mark", "12345qwert", "reddog",
+    "frank", "qwe123", "popcorn", "patricia", "aaaaaaaa", "1969", "teresa",
+    "mozart", "buddha", "anderson", "paul", "melanie", "abcdefg", "security",
+    "lucky1", "lizard", "denise", "3333", "a12345", "123789", "ruslan",
+    "stargate", "simpsons", "scarface", "eagle", "123456789a", "thumper",
+    "olivia", "naruto", "1234554321", "general", "cherokee", "a123456",
+    "vincent", "spooky", "qweasd", "free", "frankie", "douglas", "death",
+    "1980", "loveyou", "kitty", "kelly", "veronica", "suzuki", "semperfi",
+    "penguin", "mercury", "liberty", "spirit", "scotland", "natalie", "marley",
+    "vikings", "system", "sucker", "king", "allison", "marshall", "1979",
+    "098765", "qwerty12", "hummer", "adrian", "1985", "vfhbyf", "sandman",
+    "rocky", "leslie", "antonio", "98765432", "4321", "softball", "passion",
+    "mnbvcxz", "passport", "rascal", "howard", "franklin", "bigred",
+    "alexander", "homer", "redrum", "jupiter", "claudia", "55555555", "141414",
+    "zaq12wsx", "patches", "raider", "infinity", "andre", "54321", "galore",
+    "college", "russia", "kawasaki", "bishop", "77777777", "vladimir",
+    "money1", "freeuser", "wildcats", "francis", "disney", "budlight",
+    "brittany", "1994", "00000000", "sweet", "oksana", "honda", "domino",
+    "bulldogs", "brutus", "swordfis", "norman", "monday", "jimmy", "ironman",
+    "ford", "fantasy", "9999", "7654321", "duncan", "cougar", "1977",
+    "jeffrey", "house", "dancer", "brooke", "timothy", "super", "marines",
+    "justice", "digger", "connor", "patriots", "karina", "202020", "molly",
+    "everton", "tinker", "alicia", "rasdzv3", "poop", "pearljam", "stinky",
+    "naughty", "colorado", "123123a", "water", "test123", "ncc1701d",
+    "motorola", "ireland", "asdfg", "matt", "houston", "boogie", "zombie",
+    "accord", "vision", "bradley", "reggie", "kermit", "froggy", "ducati",
+    "avalon", "6666", "9379992", "sarah", "saints", "logitech", "chopper",
+    "852456", "simpson", "madonna", "juventus", "claire", "159951", "zachary",
+    "yfnfif", "wolverin", "warcraft", "hello123", "extreme", "peekaboo",
+    "fireman", "eugene", "brenda", "123654789", "russell", "panthers",
+    "georgia", "smith", "skyline", "jesus", "elizabet", "spiderma", "smooth",
+    "pirate", "empire", "bullet", "8888", "virginia", "valentin", "psycho",
+    "predator", "arizona", "134679", "mitchell", "alyssa", "vegeta", "titanic",
+    "christ", "goblue", "fylhtq", "wolf", "mmmmmm", "kirill", "indian",
+    "hiphop", "baxter", "awesome", "people", "danger", "roland", "mookie",
+    "741852963", "1111111111", "dreamer", "bambam", "arnold", "1981",
+    "skipper", "serega", "rolltide", "elvis", "changeme", "simon", "1q2w3e",
+    "lovelove", "fktrcfylh", "denver", "tommy", "mine", "loverboy", "hobbes",
+    "happy1", "alison", "nemesis", "chevelle", "cardinal", "burton", "picard",
+    "151515", "tweety", "michael1", "147852369", "12312", "xxxx", "windows",
+    "turkey", "456789", "1974", "vfrcbv", "sublime", "1975", "galina", "bobby",
+    "newport", "manutd", "daddy", "american", "alexandr", "1966", "victory",
+    "rooster", "qqq111", "madmax", "electric", "a1b2c3", "wolfpack", "spring",
+    "phpbb", "lalala", "spiderman", "eric", "darkside", "classic", "raptor",
+    "123456789q", "hendrix", "1982", "wombat", "avatar", "alpha", "zxc123",
+    "crazy", "hard", "england", "brazil", "1978", "01011980", "wildcat",
+    "polina", "freepass",
+]
+
+# Unambiguous l33t substitutions (zxcvbn's table, inverted)
+L33T_TABLE = {
+    "a": "4@", "b": "8", "c": "({[<", "e": "3", "g": "69", "i": "1!|",
+    "l": "1|7", "o": "0", "s": "$5", "t": "+7", "x": "%", "z": "2",
+}
+_L33T_LETTERS: Dict[str, str] = {}
+for _letter, _subs in L33T_TABLE.items():
+    for _sub in _subs:
+        _L33T_LETTERS[_sub] = _L33T_LETTERS.get(_sub, "") + _letter
+
+# Keyboard layouts as rows of (unshifted, shifted) key pairs
+QWERTY_ROWS = [
+    ["`~", "1!", "2@", "3#", "4$", "5%", "6^", "7&", "8*", "9(", "0)", "-_", "=+"],
+    ["qQ", "wW", "eE", "rR", "tT", "yY", "uU", "iI", "oO", "pP", "[{", "]}", "\\|"],
+    ["aA", "sS", "dD", "fF", "gG", "hH", "jJ", "kK", "lL", ";:", "'\""],
+    ["zZ", "xX", "cC", "vV", "bB", "nN", "mM", ",<", ".>", "/?"],
+]
+KEYPAD_ROWS = [
+    [None, "/", "*", "-"],
+    ["7", "8", "9", "+"],
+    ["4", "5", "6", None],
+    ["1", "2", "3", None],
+    [None, "0", ".", None],
+]
+
+# zxcvbn scoring constants
+BRUTEFORCE_CARDINALITY = 10
+MIN_SUBMATCH_GUESSES_SINGLE_CHAR = 10
+MIN_SUBMATCH_GUESSES_MULTI_CHAR = 50
+MIN_YEAR_SPACE = 20
+REFERENCE_YEAR = date.today().year
+
+# Longest block considered for "abcabc"-style repeats, and longest date token
+MAX_REPEAT_BLOCK = 8
+MAX_DATE_LENGTH = 10
+
+# zxcvbn's splits of separator-less dates (token length -> split points)
+DATE_SPLITS = {
+    4: [(1, 2), (2, 3)],
+    5: [(1, 3), (2, 3)],
+    6: [(1, 2), (2, 4), (4, 5)],
+    7: [(1, 3), (2, 3), (4, 5), (4, 6)],
+    8: [(2, 4), (4, 6)],
+}
+_DATE_WITH_SEPARATOR = re.compile(r"^(\d{1,4})([\s/\\_.-])(\d{1,2})\2(\d{1,4})$")
+
+_LOG10_2 = math.log10(2)
+
+
+def _log10_add(a: float, b: float) -> float:
+    """Return log10(10**a + 10**b) without overflowing."""
+    if a < b:
+        a, b = b, a
+    return a + math.log10(1 + 10 ** (b - a))
+
+
+def _log10_factorial(n: int) -> float:
+    return math.lgamma(n + 1) / math.log(10)
+
+
+def _log10_comb(n: int, k: int) -> float:
+    """log10 of C(n, k), from log-gamma (no big integers)."""
+    return (math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)) / math.log(10)
+
+
+def _log10_binomial_sum(n: int, k_max: int) -> float:
+    """log10 of sum(C(n, i) for i in 1..k_max), summed in log space."""
+    total = _log10_comb(n, 1)
+    for i in range(2, k_max + 1):
+        total = _log10_add(total, _log10_comb(n, i))
+    return total
+
+
+class RankedTrie:
+    """
+    Compact trie over frequency-ranked words.
+
+    The keys are kept in one sorted list; the words sharing a prefix form a
+    contiguous ``[lo, hi)`` slice that is narrowed by bisection for each
+    further character.
+    """
+
+    def __init__(self, ranked: Dict[str, Tuple[int, str]]):
+        """
+        Build the trie.
+
+        Args:
+            ranked: Lowercase word -> (rank, dictionary name)
+        """
+        self._keys = sorted(ranked)
+        self._values = [ranked[k] for k in self._keys]
+        self.max_length = max((len(k) for k in self._keys), default=0)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def walk(
+        self,
+        text: str,
+        start: int,
+        l33t: bool = False
+    ) -> Iterable[Tuple[int, str, int, str, Dict[str, str]]]:
+        """
+        Yield every word that begins at ``text[start]``.
+
+        Args:
+            text: Lowercased password
+            start: Index to match from
+            l33t: Also follow l33t substitutions (each substituted character
+                  is read consistently as one letter within a word)
+
+        Yields:
+            (end index, word, rank, dictionary name, substitutions used)
+        """
+        keys = self._keys
+        limit = min(len(text), start + self.max_length)
+        stack = [(start, 0, len(keys), "", {})]
+        while stack:
+            pos, lo, hi, prefix, subs = stack.pop()
+            if pos >= limit:
+                continue
+            ch = text[pos]
+            options = [(ch, subs)]
+            if l33t and ch in _L33T_LETTERS:
+                if ch in subs:
+                    options = [(subs[ch], subs)]
+                else:
+                    # Reading the character literally is recorded as well
+                    options = [(letter, {**subs, ch: letter}) for letter in ch + _L33T_LETTERS[ch]]
+            for letter, used in options:
+                word = prefix + letter
+                new_lo = bisect.bisect_left(keys, word, lo, hi)
+                new_hi = bisect.bisect_left(keys, prefix + chr(ord(letter) + 1), new_lo, hi)
+                if new_lo == new_hi:
+                    continue
+                if keys[new_lo] == word:
+                    rank, name = self._values[new_lo]
+                    yield pos, word, rank, name, used
+                stack.append((pos + 1, new_lo, new_hi, word, used))
+
+
+def _build_graph(rows: List[List[Optional[str]]], slanted: bool) -> Dict[str, Tuple[int, int, bool]]:
+    """
+    Map every character of a layout to (x, y, shifted).
+
+    Slanted layouts (QWERTY) offset each row by half a key, so x is measured
+    in half-keys and neighbours are the keys at distance (+-2, 0) or (+-1, +-1).
+    Aligned layouts (keypads) use a plain grid with diagonals.
+    """
+    positions: Dict[str, Tuple[int, int, bool]] = {}
+    for y, row in enumerate(rows):
+        for k, key in enumerate(row):
+            if not key:
+                continue
+            x = 2 * k + y + (2 if y > 0 else 0) if slanted else k
+            for i, ch in enumerate(key):
+                positions.setdefault(ch, (x, y, i == 1))
+    return positions
+
+
+def _graph_stats(positions: Dict[str, Tuple[int, int, bool]], slanted: bool) -> Tuple[int, float]:
+    """Return (number of keys, average degree) used by the spatial guess model."""
+    coords = {(x, y) for x, y, _ in positions.values()}
+    steps = _SLANTED_STEPS if slanted else _ALIGNED_STEPS
+    degrees = [sum((x + dx, y + dy) in coords for dx, dy in steps) for x, y in coords]
+    return len(coords), sum(degrees) / len(degrees)
+
+
+_SLANTED_STEPS = [(-2, 0), (2, 0), (-1, -1), (1, -1), (-1, 1), (1, 1)]
+_ALIGNED_STEPS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+
+KEYBOARD_GRAPHS = {
+    "qwerty": (_build_graph(QWERTY_ROWS, True), set(_SLANTED_STEPS)),
+    "keypad": (_build_graph(KEYPAD_ROWS, False), set(_ALIGNED_STEPS)),
+}
+KEYBOARD_STATS = {
+    "qwerty": _graph_stats(KEYBOARD_GRAPHS["qwerty"][0], True),
+    "keypad": _graph_stats(KEYBOARD_GRAPHS["keypad"][0], False),
+}
+
+
+def _wordlist_dir() -> str:
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "wordlists")
+
+
+def load_default_dictionaries() -> Dict[str, Tuple[int, str]]:
+    """
+    Collect the ranked dictionaries used by the default analyzer.
+
+    Returns:
+        Lowercase word -> (best rank, dictionary name)
+    """
+    sources: List[Tuple[str, Sequence[str], bool]] = []
+    if FREQUENCY_LISTS_AVAILABLE:
+        sources.extend((name, words, True) for name, words in FREQUENCY_LISTS.items())
+    else:
+        from ..generators.passphrase import DEFAULT_WORDLIST
+        sources.append(("passwords", COMMON_PASSWORDS, True))
+        sources.append(("english", DEFAULT_WORDLIST, False))
+        wordlist_dir = _wordlist_dir()
+        if os.path.isdir(wordlist_dir):
+            for filename in sorted(os.listdir(wordlist_dir)):
+                if not filename.endswith(".txt"):
+                    continue
+                with open(os.path.join(wordlist_dir, filename), encoding="utf-8") as f:
+                    words = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+                sources.append(("wordlists", words, False))
+
+    ranked: Dict[str, Tuple[int, str]] = {}
+    for name, words, by_frequency in sources:
+        for index, word in enumerate(words, 1):
+            word = word.lower()
+            # Unordered lists give every word the same rank (the list size)
+            rank = index if by_frequency else len(words)
+            if word and (word not in ranked or rank < ranked[word][0]):
+                ranked[word] = (rank, name)
+    return ranked
+
+
+# ---------------------------------------------------------------------------
+# Guess estimation (zxcvbn's formulas)
+# ---------------------------------------------------------------------------
+
+def _uppercase_variations(token: str) -> float:
+    """log10 of the capitalisations an attacker tries for a word."""
+    if token == token.lower():
+        return 0.0
+    if token == token.upper() or token[1:] == token[1:].lower() or token[:-1] == token[:-1].lower():
+        return _LOG10_2
+    upper = sum(1 for c in token if c.isupper())
+    lower = sum(1 for c in token if c.islower())
+    return _log10_binomial_sum(upper + lower, min(upper, lower))
+
+
+def _l33t_variations(token: str, subs: Dict[str, str]) -> float:
+    """log10 of the substitution variants for a l33t word."""
+    total = 0.0
+    lowered = token.lower()
+    for sub, letter in subs.items():
+        substituted = lowered.count(sub)
+        unsubstituted = lowered.count(letter)
+        if substituted == 0 or unsubstituted == 0:
+            total += _LOG10_2
+        else:
+            total += _log10_binomial_sum(substituted + unsubstituted, min(substituted, unsubstituted))
+    return total
+
+
+def _spatial_guesses(graph: str, length: int, turns: int, shifted: int) -> float:
+    """
+    log10 guesses for a keyboard walk.
+
+    zxcvbn sums keys * degree^j * C(i - 1, j - 1) over walk lengths i <= length
+    and turns j <= min(turns, i - 1). Summing over i first (hockey-stick
+    identity) leaves one term per j, keys * degree^j * (C(length, j) - 1), so
+    the cost is linear in the number of turns rather than quadratic in length.
+    """
+    keys, degree = KEYBOARD_STATS[graph]
+    log_keys, log_degree = math.log10(keys), math.log10(degree)
+    total = None
+    for j in range(1, min(turns, length - 1) + 1):
+        log_comb = _log10_comb(length, j)
+        term = log_comb + math.log10(1 - 10 ** -log_comb) + log_keys + j * log_degree
+        total = term if total is None else _log10_add(total, term)
+    total = total or 0.0
+    if shifted:
+        unshifted = length - shifted
+        if unshifted == 0:
+            total += _LOG10_2
+        else:
+            total += _log10_binomial_sum(shifted + unshifted, min(shifted, unshifted))
+    return total
+
+
+def _sequence_guesses(token: str, ascending: bool) -> float:
+    first = token[0]
+    if first in "aAzZ019":
+        base = 4
+    elif first.isdigit():
+        base = 10
+    else:
+        base = 26
+    if not ascending:
+        base *= 2
+    return math.log10(base * len(token))
+
+
+def _year_guesses(year: int) -> float:
+    return math.log10(max(abs(year - REFERENCE_YEAR), MIN_YEAR_SPACE))
+
+
+def _date_guesses(year: int, separator: str) -> float:
+    guesses = math.log10(365) + _year_guesses(year)
+    return guesses + math.log10(4) if separator else guesses
+
+
+def _to_four_digit_year(year: int) -> int:
+    if year > 99:
+        return year
+    return year + (1900 if year > 50 else 2000)
+
+
+def _map_ints_to_date(parts: Tuple[int, int, int]) -> Optional[Tuple[int, int, int]]:
+    """Interpret three integers as (year, month, day), zxcvbn-style."""
+    if parts[1] > 31 or parts[1] <= 0:
+        return None
+    over_12 = over_31 = under_1 = 0
+    for value in parts:
+        if 99 < value < 1000 or value > 2050:
+            return None
+        over_12 += value > 12
+        over_31 += value > 31
+        under_1 += value <= 0
+    if over_31 >= 2 or over_12 == 3 or under_1 >= 2:
+        return None
+    candidates = []
+    for year, rest in ((parts[2], parts[:2]), (parts[0], parts[1:])):
+        for day, month in (rest, rest[::-1]):
+            if 1 <= day <= 31 and 1 <= month <= 12:
+                if 1000 <= year <= 2050 or year <= 99:
+                    candidates.append((_to_four_digit_year(year), month, day))
+    if not candidates:
+        return None
+    return min(candidates, key=lambda c: abs(c[0] - REFERENCE_YEAR))
+
+
+# ---------------------------------------------------------------------------
+# Analyzer
+# ---------------------------------------------------------------------------
+
+class PatternAnalyzer:
+    """Linear-time zxcvbn-style guess estimator."""
+
+    def __init__(self, dictionaries: Optional[Dict[str, Tuple[int, str]]] = None):
+        """
+        Initialize the analyzer.
+
+        Args:
+            dictionaries: Lowercase word -> (rank, dictionary name); defaults
+                          to load_default_dictionaries()
+        """
+        self.trie = RankedTrie(dictionaries if dictionaries is not None else load_default_dictionaries())
+
+    def analyze(self, password: str, user_inputs: Optional[List[str]] = None) -> Optional[StrengthResult]:
+        """
+        Estimate how many guesses a pattern-aware attacker needs.
+
+        Args:
+            password: The password to analyze
+            user_inputs: Words specific to the user (username, site name...)
+
+        Returns:
+            StrengthResult, or None for an empty password
+        """
+        if not password:
+            return None
+        return _to_strength_result(self.analyze_dict(password, user_inputs), engine="native")
+
+    def analyze_dict(self, password: str, user_inputs: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Same as analyze() but returns a zxcvbn-shaped result dictionary."""
+        matches = self.find_matches(password, user_inputs)
+        log_guesses, sequence = self._minimum_guesses(password, matches)
+        # Very long inputs exceed the float range
+        guesses = 10 ** log_guesses if log_guesses < 308 else math.inf
+        score = _guesses_to_score(guesses)
+        seconds = guesses / 1e4
+        return {
+            "password": password,
+            "guesses": guesses,
+            "guesses_log10": log_guesses,
+            "sequence": sequence,
+            "score": score,
+            "crack_times_seconds": {"offline_slow_hashing_1e4_per_second": seconds},
+            "crack_times_display": {"offline_slow_hashing_1e4_per_second": display_time(seconds)},
+            "feedback": _feedback(score, sequence),
+        }
+
+    def find_matches(
+        self,
+        password: str,
+        user_inputs: Optional[List[str]] = None,
+        repeats: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Run every detector.
+
+        Each detector inspects at most a bounded window per position, so the
+        number of matches and the work are linear in ``len(password)``.
+
+        Args:
+            password: The password to analyze
+            user_inputs: Words specific to the user
+            repeats: Also look for repeats (off when scoring a repeat's block)
+        """
+        lowered = password.lower()
+        matches: List[Dict[str, Any]] = []
+        tries = [self.trie]
+        if user_inputs:
+            ranked = {}
+            for rank, word in enumerate(user_inputs, 1):
+                word = str(word).lower()
+                if word and word not in ranked:
+                    ranked[word] = (rank, "user_inputs")
+            tries.append(RankedTrie(ranked))
+        for trie in tries:
+            matches.extend(_dictionary_matches(trie, password, lowered))
+            matches.extend(_reverse_dictionary_matches(trie, password, lowered))
+        matches.extend(_spatial_matches(password))
+        matches.extend(_sequence_matches(password))
+        if repeats:
+            matches.extend(self._repeat_matches(password, user_inputs))
+        matches.extend(_date_matches(password))
+        return matches
+
+    def _repeat_matches(self, password: str, user_inputs: Optional[List[str]]) -> List[Dict[str, Any]]:
+        """Runs of one character and of blocks up to MAX_REPEAT_BLOCK long."""
+        matches = []
+        n = len(password)
+        for block in range(1, MAX_REPEAT_BLOCK + 1):
+            i = block
+            while i < n:
+                if password[i] != password[i - block]:
+                    i += 1
+                    continue
+                start = i - block
+                while i < n and password[i] == password[i - block]:
+                    i += 1
+                repeats = (i - start) // block
+                if repeats < 2 or (block == 1 and repeats < 3):
+                    continue
+                end = start + repeats * block
+                base = password[start:start + block]
+                # A block that is itself a repeat is covered by a shorter block
+                if block > 1 and len(set(base)) == 1:
+                    continue
+                # Blocks are at most MAX_REPEAT_BLOCK long, so this is bounded
+                base_guesses = self._minimum_guesses(base, self.find_matches(base, user_inputs, repeats=False))[0]
+                matches.append({
+                    "pattern": "repeat",
+                    "i": start,
+                    "j": end - 1,
+                    "token": password[start:end],
+                    "base_token": base,
+                    "repeat_count": repeats,
+                    "log_guesses": base_guesses + math.log10(repeats),
+                })
+        return matches
+
+    def _minimum_guesses(self, password: str, matches: List[Dict[str, Any]]) -> Tuple[float, List[Dict[str, Any]]]:
+        """
+        Choose the cheapest cover of the password.
+
+        zxcvbn minimises ``l! * prod(guesses) + 10000**(l - 1)`` over covers of
+        ``l`` matches. Keeping only the best cover ending in a match and the
+        best ending in a bruteforce run at each position makes this a single
+        left-to-right pass.
+
+        Returns:
+            (log10 guesses, sequence of matches including bruteforce spans)
+        """
+        n = len(password)
+        by_end: List[List[Dict[str, Any]]] = [[] for _ in range(n)]
+        for match in matches:
+            by_end[match["j"]].append(match)
+
+        def objective(log_product: float, count: int) -> float:
+            return _log10_add(_log10_factorial(count) + log_product, 4 * (count - 1))
+
+        # State: (objective, log product, match count, back pointer)
+        ending_match: List[Optional[Tuple[float, float, int, Any]]] = [None] * n
+        ending_brute: List[Optional[Tuple[float, float, int, Any]]] = [None] * n
+        log_brute = math.log10(BRUTEFORCE_CARDINALITY)
+
+        def best_before(i: int) -> Tuple[float, int, Any]:
+            if i == 0:
+                return 0.0, 0, None
+            options = [s for s in (ending_match[i - 1], ending_brute[i - 1]) if s is not None]
+            state = min(options, key=lambda s: s[0])
+            kind = "match" if state is ending_match[i - 1] else "brute"
+            return state[1], state[2], (kind, i - 1)
+
+        for k in range(n):
+            for match in by_end[k]:
+                i = match["i"]
+                log_guesses = match["log_guesses"]
+                if k - i + 1 < n:
+                    floor = MIN_SUBMATCH_GUESSES_SINGLE_CHAR if i == k else MIN_SUBMATCH_GUESSES_MULTI_CHAR
+                    log_guesses = max(log_guesses, math.log10(floor))
+                log_product, count, back = best_before(i)
+                state = (objective(log_product + log_guesses, count + 1), log_product + log_guesses, count + 1, (back, match, log_guesses))
+                if ending_match[k] is None or state[0] < ending_match[k][0]:
+                    ending_match[k] = state
+
+            # Extend the bruteforce run ending at k - 1, or start a new one at k
+            candidates = []
+            if k > 0 and ending_brute[k - 1] is not None:
+                previous = ending_brute[k - 1]
+                start = previous[3][1]
+                candidates.append((objective(previous[1] + log_brute, previous[2]), previous[1] + log_brute, previous[2], (previous[3][0], start)))
+            if k == 0:
+                candidates.append((objective(log_brute, 1), log_brute, 1, (None, 0)))
+            elif ending_match[k - 1] is not None:
+                # Two bruteforce runs are never adjacent
+                previous = ending_match[k - 1]
+                log_product, count = previous[1] + log_brute, previous[2] + 1
+                candidates.append((objective(log_product, count), log_product, count, (("match", k - 1), k)))
+            ending_brute[k] = min(candidates, key=lambda s: s[0])
+
+        final = min((s for s in (ending_match[n - 1], ending_brute[n - 1]) if s is not None), key=lambda s: s[0])
+        kind = "match" if final is ending_match[n - 1] else "brute"
+
+        # Walk the back pointers to recover the chosen matches
+        sequence = []
+        position = n - 1
+        while True:
+            if kind == "match":
+                back, match, log_guesses = ending_match[position][3]
+                sequence.append({**match, "guesses_log10": log_guesses})
+            else:
+                back, start = ending_brute[position][3]
+                sequence.append({
+                    "pattern": "bruteforce",
+                    "i": start,
+                    "j": position,
+                    "token": password[start:position + 1],
+                    "guesses_log10": (position - start + 1) * log_brute,
+                })
+            if back is None:
+                break
+            kind, position = back
+        sequence.reverse()
+        return final[0], sequence
+
+
+def _dictionary_matches(trie: RankedTrie, password: str, lowered: str) -> List[Dict[str, Any]]:
+    matches = []
+    for start in range(len(password)):
+        for end, word, rank, name, subs in trie.walk(lowered, start, l33t=True):
+            token = password[start:end + 1]
+            log_guesses = math.log10(rank) + _uppercase_variations(token)
+            # Characters read literally are not substitutions
+            subs = {sub: letter for sub, letter in subs.items() if sub != letter}
+            if subs:
+                if len(word) == 1:
+                    continue
+                log_guesses += _l33t_variations(token, subs)
+            matches.append({
+                "pattern": "dictionary",
+                "i": start,
+                "j": end,
+                "token": token,
+                "matched_word": word,
+                "rank": rank,
+                "dictionary_name": name,
+                "reversed": False,
+                "l33t": bool(subs),
+                "sub": subs,
+                "log_guesses": log_guesses,
+            })
+    return matches
+
+
+def _reverse_dictionary_matches(trie: RankedTrie, password: str, lowered: str) -> List[Dict[str, Any]]:
+    n = len(password)
+    reversed_lower = lowered[::-1]
+    matches = []
+    for start in range(n):
+        for end, word, rank, name, _ in trie.walk(reversed_lower, start):
+            if len(word) < 3:
+                continue
+            i, j = n - 1 - end, n - 1 - start
+            token = password[i:j + 1]
+            if token.lower() == word:
+                # Palindromes are already found forwards
+                continue
+            matches.append({
+                "pattern": "dictionary",
+                "i": i,
+                "j": j,
+                "token": token,
+                "matched_word": word,
+                "rank": rank,
+                "dictionary_name": name,
+                "reversed": True,
+                "l33t": False,
+                "log_guesses": math.log10(rank) + _uppercase_variations(token) + _LOG10_2,
+            })
+    return matches
+
+
+def _spatial_matches(password: str) -> List[Dict[str, Any]]:
+    """Maximal runs of adjacent keys (three or more) on each layout."""
+    matches = []
+    n = len(password)
+    for graph, (positions, steps) in KEYBOARD_GRAPHS.items():
+        i = 0
+        while i < n - 1:
+            j = i + 1
+            turns = 0
+            direction = None
+            shifted = 1 if graph == "qwerty" and positions.get(password[i], (0, 0, False))[2] else 0
+            while j < n:
+                prev, cur = positions.get(password[j - 1]), positions.get(password[j])
+                if prev is None or cur is None:
+                    break
+                step = (cur[0] - prev[0], cur[1] - prev[1])
+                if step not in steps:
+                    break
+                if step != direction:
+                    turns += 1
+                    direction = step
+                if graph == "qwerty" and cur[2]:
+                    shifted += 1
+                j += 1
+            if j - i > 2:
+                matches.append({
+                    "pattern": "spatial",
+                    "i": i,
+                    "j": j - 1,
+                    "token": password[i:j],
+                    "graph": graph,
+                    "turns": turns,
+                    "shifted_count": shifted,
+                    "log_guesses": _spatial_guesses(graph, j - i, turns, shifted),
+                })
+            i = j
+    return matches
+
+
+def _char_class(ch: str) -> str:
+    if "a" <= ch <= "z":
+        return "lower"
+    if "A" <= ch <= "Z":
+        return "upper"
+    if "0" <= ch <= "9":
+        return "digits"
+    return "other"
+
+
+def _sequence_matches(password: str) -> List[Dict[str, Any]]:
+    """Runs of three or more characters with a constant step of at most 5."""
+    matches = []
+    n = len(password)
+    i = 0
+    while i < n - 2:
+        delta = ord(password[i + 1]) - ord(password[i])
+        cls = _char_class(password[i])
+        j = i + 1
+        while (
+            j < n and 0 < abs(delta) <= 5
+            and ord(password[j]) - ord(password[j - 1]) == delta
+            and _char_class(password[j]) == cls
+        ):
+            j += 1
+        if j - i >= 3:
+            token = password[i:j]
+            matches.append({
+                "pattern": "sequence",
+                "i": i,
+                "j": j - 1,
+                "token": token,
+                "ascending": delta > 0,
+                "log_guesses": _sequence_guesses(token, delta > 0),
+            })
+            # The last character may start the next sequence
+            i = j - 1
+        else:
+            i += 1
+    return matches
+
+
+def _date_matches(password: str) -> List[Dict[str, Any]]:
+    """Dates (with or without separators) and recent years in digit windows."""
+    matches = []
+    n = len(password)
+    for i in range(n):
+        if not password[i].isdigit():
+            continue
+        for length in range(4, MAX_DATE_LENGTH + 1):
+            if i + length > n:
+                break
+            token = password[i:i + length]
+            if token.isdigit():
+                if length == 4 and token[:2] in ("19", "20"):
+                    matches.append({
+                        "pattern": "regex",
+                        "regex_name": "recent_year",
+                        "i": i,
+                        "j": i + 3,
+                        "token": token,
+                        "log_guesses": _year_guesses(int(token)),
+                    })
+                best = None
+                for k, l in DATE_SPLITS.get(length, []):
+                    found = _map_ints_to_date((int(token[:k]), int(token[k:l]), int(token[l:])))
+                    if found and (best is None or abs(found[0] - REFERENCE_YEAR) < abs(best[0] - REFERENCE_YEAR)):
+                        best = found
+                if best:
+                    matches.append(_date_match(i, token, best, ""))
+            elif length >= 6:
+                parsed = _DATE_WITH_SEPARATOR.match(token)
+                if parsed:
+                    found = _map_ints_to_date((int(parsed.group(1)), int(parsed.group(3)), int(parsed.group(4))))
+                    if found:
+                        matches.append(_date_match(i, token, found, parsed.group(2)))
+    return matches
+
+
+def _date_match(i: int, token: str, ymd: Tuple[int, int, int], separator: str) -> Dict[str, Any]:
+    year, month, day = ymd
+    return {
+        "pattern": "date",
+        "i": i,
+        "j": i + len(token) - 1,
+        "token": token,
+        "separator": separator,
+        "year": year,
+        "month": month,
+        "day": day,
+        "log_guesses": _date_guesses(year, separator),
+    }
+
+
+def _guesses_to_score(guesses: float) -> int:
+    delta = 5
+    if guesses < 1e3 + delta:
+        return 0
+    if guesses < 1e6 + delta:
+        return 1
+    if guesses < 1e8 + delta:
+        return 2
+    if guesses < 1e10 + delta:
+        return 3
+    return 4
+
+
+def display_time(seconds: float) -> str:
+    """Human-readable crack time, matching zxcvbn's wording."""
+    minute, hour, day = 60, 3600, 86400
+    month, year = day * 31, day * 365
+    century = year * 100
+    for limit, unit, size in (
+        (minute, "second", 1),
+        (hour, "minute", minute),
+        (day, "hour", hour),
+        (month, "day", day),
+        (year, "month", month),
+        (century, "year", year),
+    ):
+        if seconds < limit:
+            if seconds < 1:
+                return "less than a second"
+            value = round(seconds / size)
+            return f"{value} {unit}{'s' if value != 1 else ''}"
+    return "centuries"
+
+
+def _feedback(score: int, sequence: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """zxcvbn-style warning and suggestions for the weakest part."""
+    if score > 2:
+        return {"warning": "", "suggestions": []}
+    longest = max(sequence, key=lambda m: len(m["token"]))
+    warning = ""
+    suggestions = []
+    pattern = longest["pattern"]
+    if pattern == "dictionary":
+        sole = len(sequence) == 1
+        name = longest["dictionary_name"]
+        if name == "passwords":
+            if sole and not longest["l33t"] and not longest["reversed"]:
+                if longest["rank"] <= 10:
+                    warning = "This is a top-10 common password."
+                elif longest["rank"] <= 100:
+                    warning = "This is a top-100 common password."
+                else:
+                    warning = "This is a very common password."
+            elif longest["guesses_log10"] <= 4:
+                warning = "This is similar to a commonly used password."
+        elif name in ("english", "english_wikipedia"):
+            if sole:
+                warning = "A word by itself is easy to guess."
+        elif name in ("surnames", "male_names", "female_names"):
+            warning = "Names and surnames by themselves are easy to guess." if sole else "Common names and surnames are easy to guess."
+        token = longest["token"]
+        if token[0].isupper() and token[1:] == token[1:].lower():
+            suggestions.append("Capitalization doesn't help very much.")
+        elif token.isupper() and token.lower() != token:
+            suggestions.append("All-uppercase is almost as easy to guess as all-lowercase.")
+        if longest["reversed"] and len(token) >= 4:
+            suggestions.append("Reversed words aren't much harder to guess.")
+        if longest["l33t"]:
+            suggestions.append("Predictable substitutions like '@' instead of 'a' don't help very much.")
+    elif pattern == "spatial":
+        warning = "Straight rows of keys are easy to guess." if longest["turns"] == 1 else "Short keyboard patterns are easy to guess."
+        suggestions.append("Use a longer keyboard pattern with more turns.")
+    elif pattern == "repeat":
+        if len(longest["base_token"]) == 1:
+            warning = 'Repeats like "aaa" are easy to guess.'
+        else:
+            warning = 'Repeats like "abcabcabc" are only slightly harder to guess than "abc".'
+        suggestions.append("Avoid repeated words and characters.")
+    elif pattern == "sequence":
+        warning = "Sequences like abc or 6543 are easy to guess."
+        suggestions.append("Avoid sequences.")
+    elif pattern == "regex":
+        warning = "Recent years are easy to guess."
+        suggestions.extend(["Avoid recent years.", "Avoid years that are associated with you."])
+    elif pattern == "date":
+        warning = "Dates are often easy to guess."
+        suggestions.append("Avoid dates and years that are associated with you.")
+    suggestions.insert(0, "Add another word or two. Uncommon words are better.")
+    return {"warning": warning, "suggestions": suggestions}
+
+
+_default_analyzer: Optional[PatternAnalyzer] = None
+_default_lock = threading.Lock()
+
+
+def get_analyzer() -> PatternAnalyzer:
+    """Return the shared analyzer, building its trie on first use."""
+    global _default_analyzer
+    if _default_analyzer is None:
+        with _default_lock:
+            if _default_analyzer is None:
+                _default_analyzer = PatternAnalyzer()
+    return _default_analyzer
+
+
+def analyze_patterns(password: str, user_inputs: Optional[List[str]] = None) -> Optional[StrengthResult]:
+    """
+    Analyze a password with the native pattern analyzer.
+
+    Args:
+        password: The password to analyze
+        user_inputs: Optional user-specific words to penalize
+
+    Returns:
+        StrengthResult, or None for an empty password
+    """
+    return get_analyzer().analyze(password, user_inputs)
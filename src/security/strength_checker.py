@@ -1,17 +1,42 @@
 """
 Strength Checker Module - Pattern-based password strength analysis using zxcvbn.
+
+The native analyzer in ``pattern_analyzer`` is a linear-time alternative that
+needs no extra packages; ``engine="auto"`` uses zxcvbn when it is installed and
+the input is within its length limit, and the native analyzer otherwise.
+
+Results are memoized in a small in-process cache so the same candidate is not
+re-analysed by --check-strength, the analyze command and the PWA. Cache keys
+are HMAC-SHA256 digests under a random per-process key, so plaintext passwords
+are never used as dictionary keys.
 """
 
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, Any, Optional, Tuple, List
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 # Try to import zxcvbn
 try:
     from zxcvbn import zxcvbn
+    from zxcvbn import feedback as zxcvbn_feedback
+    from zxcvbn import matching as zxcvbn_matching
+    from zxcvbn import scoring as zxcvbn_scoring
+    from zxcvbn import time_estimates as zxcvbn_time_estimates
     ZXCVBN_AVAILABLE = True
 except ImportError:
     ZXCVBN_AVAILABLE = False
 
+# zxcvbn refuses longer inputs
+ZXCVBN_MAX_LENGTH = 72
+
+# Analysis engines accepted by check_strength()
+ENGINES = ("zxcvbn", "native", "auto")
+
 
 @dataclass
 class StrengthResult:
@@ -24,6 +49,102 @@ class StrengthResult:
     patterns_found: List[str]  # Detected weak patterns
     guesses: float  # Number of guesses needed
     guesses_log10: float  # Log10 of guesses
+    engine: str = "zxcvbn"  # Analyzer that produced the result ("zxcvbn" or "native")
+
+
+class StrengthCache:
+    """
+    Bounded LRU + TTL cache of StrengthResults keyed by a keyed hash.
+    
+    Callers always receive a copy; the cached copy is scrubbed when it is
+    evicted, expires or the cache is cleared. Python strings are immutable, so
+    scrubbing drops every reference the cache holds to text derived from the
+    password (matched tokens, warnings) rather than overwriting memory in place.
+    """
+    
+    def __init__(self, max_size: int = 256, ttl: float = 300.0):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of cached results.
+            ttl: Seconds a result stays valid.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._key = bytearray(secrets.token_bytes(32))
+        self._entries: "OrderedDict[bytes, Tuple[float, StrengthResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def make_key(self, password: str, user_inputs: Optional[List[str]] = None, engine: str = "zxcvbn") -> bytes:
+        """Derive the cache key for a password, its user inputs and the engine."""
+        message = "\x00".join([engine, password] + list(user_inputs or [])).encode("utf-8")
+        return hmac.new(bytes(self._key), message, hashlib.sha256).digest()
+    
+    def get(self, key: bytes) -> Optional[StrengthResult]:
+        """Return a copy of a live cached result, or None."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires, result = item
+            if expires <= time.monotonic():
+                del self._entries[key]
+                _scrub(result)
+                return None
+            self._entries.move_to_end(key)
+            return _copy_result(result)
+    
+    def put(self, key: bytes, result: StrengthResult) -> None:
+        """Store a copy of a result, evicting the least recently used entries."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                _scrub(old[1])
+            self._entries[key] = (time.monotonic() + self.ttl, _copy_result(result))
+            while len(self._entries) > self.max_size:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                _scrub(evicted)
+    
+    def clear(self) -> None:
+        """Scrub and drop every entry, and rotate the hashing key."""
+        with self._lock:
+            for _, result in self._entries.values():
+                _scrub(result)
+            self._entries.clear()
+            for i in range(len(self._key)):
+                self._key[i] = 0
+            self._key = bytearray(secrets.token_bytes(32))
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _copy_result(result: StrengthResult) -> StrengthResult:
+    """Copy a result including its lists, so scrubbing never affects callers."""
+    return replace(
+        result,
+        feedback_suggestions=list(result.feedback_suggestions),
+        patterns_found=list(result.patterns_found)
+    )
+
+
+def _scrub(result: StrengthResult) -> None:
+    """Drop password-derived data held by a cached result."""
+    result.patterns_found.clear()
+    result.feedback_suggestions.clear()
+    result.feedback_warning = ""
+    result.crack_time_display = ""
+    result.score = 0
+    result.crack_time_seconds = 0
+    result.guesses = 0
+    result.guesses_log10 = 0
+
+
+# Shared by the CLI, interactive mode and the PWA server
+_cache = StrengthCache()
 
 
 def is_available() -> bool:
@@ -31,7 +152,17 @@ def is_available() -> bool:
     return ZXCVBN_AVAILABLE
 
 
-def check_strength(password: str, user_inputs: Optional[List[str]] = None) -> Optional[StrengthResult]:
+def clear_strength_cache() -> None:
+    """Discard all memoized strength results."""
+    _cache.clear()
+
+
+def check_strength(
+    password: str,
+    user_inputs: Optional[List[str]] = None,
+    use_cache: bool = True,
+    engine: str = "zxcvbn"
+) -> Optional[StrengthResult]:
     """
     Analyze password strength using zxcvbn pattern matching.
     
@@ -39,54 +170,251 @@ def check_strength(password: str, user_inputs: Optional[List[str]] = None) -> Op
         password: The password to analyze.
         user_inputs: Optional list of user-specific words to penalize
                      (e.g., username, email, site name).
+        use_cache: Reuse a memoized result for the same password and inputs.
+        engine: "zxcvbn", "native" (built-in linear-time analyzer) or "auto"
+                (zxcvbn when installed and the input is short enough).
                      
     Returns:
-        StrengthResult object or None if zxcvbn is unavailable.
+        StrengthResult object or None if the engine is unavailable.
     """
-    if not ZXCVBN_AVAILABLE:
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown strength engine: {engine}")
+    if engine == "auto":
+        engine = "zxcvbn" if ZXCVBN_AVAILABLE and len(password) <= ZXCVBN_MAX_LENGTH else "native"
+    if engine == "zxcvbn" and not ZXCVBN_AVAILABLE:
         return None
-        
+    
+    key = _cache.make_key(password, user_inputs, engine) if use_cache else None
+    if key is not None:
+        cached = _cache.get(key)
+        if cached is not None:
+            return cached
+    
+    if engine == "native":
+        from .pattern_analyzer import analyze_patterns
+        result = analyze_patterns(password, user_inputs)
+    else:
+        result = _analyze(password, user_inputs)
+    if key is not None and result is not None:
+        _cache.put(key, result)
+    return result
+
+
+def _analyze(password: str, user_inputs: Optional[List[str]]) -> Optional[StrengthResult]:
+    """Run zxcvbn and convert its output to a StrengthResult."""
     try:
-        result = zxcvbn(password, user_inputs or [])
+        return _to_strength_result(zxcvbn(password, user_inputs or []))
+    except Exception:
+        return None
+
+
+def _to_strength_result(result: Dict[str, Any], engine: str = "zxcvbn") -> StrengthResult:
+    """Convert a zxcvbn(-shaped) result dict to a StrengthResult."""
+    # Extract patterns found
+    patterns = []
+    for match in result.get('sequence', []):
+        pattern_type = match.get('pattern', 'unknown')
+        token = match.get('token', '')
+        
+        if pattern_type == 'dictionary':
+            dict_name = match.get('dictionary_name', 'dictionary')
+            patterns.append(f"Dictionary word '{token}' ({dict_name})")
+        elif pattern_type == 'sequence':
+            patterns.append(f"Sequence '{token}'")
+        elif pattern_type == 'repeat':
+            patterns.append(f"Repeated pattern '{token}'")
+        elif pattern_type == 'regex':
+            patterns.append(f"Common pattern '{token}'")
+        elif pattern_type == 'date':
+            patterns.append(f"Date pattern '{token}'")
+        elif pattern_type == 'spatial':
+            patterns.append(f"Keyboard pattern '{token}'")
+    
+    # Get crack time (offline, slow hashing scenario)
+    crack_times = result.get('crack_times_display', {})
+    crack_seconds = result.get('crack_times_seconds', {})
+    
+    return StrengthResult(
+        score=result.get('score', 0),
+        crack_time_display=crack_times.get('offline_slow_hashing_1e4_per_second', 'unknown'),
+        crack_time_seconds=crack_seconds.get('offline_slow_hashing_1e4_per_second', 0),
+        feedback_warning=result.get('feedback', {}).get('warning', ''),
+        feedback_suggestions=result.get('feedback', {}).get('suggestions', []),
+        patterns_found=patterns,
+        guesses=result.get('guesses', 0),
+        guesses_log10=result.get('guesses_log10', 0),
+        engine=engine
+    )
+
+
+
+class IncrementalStrengthAnalyzer:
+    """
+    zxcvbn analysis that reuses work between successive edits of one password.
+    
+    Dictionary, reversed-dictionary and l33t matching account for most of
+    zxcvbn's matching time, and a match from those matchers depends only on the
+    substring it covers. They are therefore stored per prefix: appending a
+    character only examines substrings that end at it, and deleting
+    characters just drops prefix states. The cheap matchers whose results can
+    change as the password grows (spatial, repeat, sequence, regex, date) and
+    the scoring pass run on every update, so results are identical to
+    check_strength().
+    """
+    
+    def __init__(self, user_inputs: Optional[List[str]] = None):
+        """
+        Initialize the analyzer.
         
-        # Extract patterns found
-        patterns = []
-        for match in result.get('sequence', []):
-            pattern_type = match.get('pattern', 'unknown')
-            token = match.get('token', '')
+        Args:
+            user_inputs: Optional list of user-specific words to penalize.
+        """
+        self._user_inputs = [str(word).lower() for word in (user_inputs or [])]
+        self._password = ""
+        # _states[k] holds the matches ending at index k of the current password
+        self._states: List[Dict[str, Any]] = []
+    
+    @property
+    def user_inputs(self) -> List[str]:
+        """The user-specific words this analyzer penalizes (lowercased)."""
+        return list(self._user_inputs)
+    
+    def reset(self) -> None:
+        """Forget the current password and every cached prefix."""
+        self._password = ""
+        self._states = []
+    
+    def update(self, password: str) -> Optional[StrengthResult]:
+        """
+        Analyze a new version of the password, reusing its longest common prefix.
+        
+        Args:
+            password: The full current password.
             
-            if pattern_type == 'dictionary':
-                dict_name = match.get('dictionary_name', 'dictionary')
-                patterns.append(f"Dictionary word '{token}' ({dict_name})")
-            elif pattern_type == 'sequence':
-                patterns.append(f"Sequence '{token}'")
-            elif pattern_type == 'repeat':
-                patterns.append(f"Repeated pattern '{token}'")
-            elif pattern_type == 'regex':
-                patterns.append(f"Common pattern '{token}'")
-            elif pattern_type == 'date':
-                patterns.append(f"Date pattern '{token}'")
-            elif pattern_type == 'spatial':
-                patterns.append(f"Keyboard pattern '{token}'")
+        Returns:
+            StrengthResult object or None if zxcvbn is unavailable.
+        """
+        if not ZXCVBN_AVAILABLE or not password or len(password) > ZXCVBN_MAX_LENGTH:
+            self.reset()
+            return None
+        
+        try:
+            dictionaries = self._dictionaries()
+            common = 0
+            limit = min(len(password), len(self._password))
+            while common < limit and password[common] == self._password[common]:
+                common += 1
+            del self._states[common:]
+            for k in range(common, len(password)):
+                self._states.append(self._extend(password, k, dictionaries))
+            self._password = password
+            return _to_strength_result(self._score(password, dictionaries))
+        except Exception:
+            self.reset()
+            return None
+    
+    def _dictionaries(self) -> Dict[str, Dict[str, int]]:
+        """Ranked dictionaries including user inputs (shared with zxcvbn, as zxcvbn() does)."""
+        dictionaries = zxcvbn_matching.RANKED_DICTIONARIES
+        dictionaries['user_inputs'] = zxcvbn_matching.build_ranked_dict(self._user_inputs)
+        return dictionaries
+    
+    def _extend(self, password: str, j: int, dictionaries: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
+        """Compute the per-prefix state for password[:j + 1]."""
+        prefix = password[:j + 1]
+        lower = prefix.lower()
         
-        # Get crack time (offline, slow hashing scenario)
-        crack_times = result.get('crack_times_display', {})
-        crack_seconds = result.get('crack_times_seconds', {})
+        forward = []
+        backward = []
+        for dictionary_name, ranked_dict in dictionaries.items():
+            for i in range(j + 1):
+                word = lower[i:]
+                if word in ranked_dict:
+                    forward.append(self._dictionary_match(prefix, i, j, word, ranked_dict[word], dictionary_name))
+                reversed_word = word[::-1]
+                if reversed_word in ranked_dict:
+                    match = self._dictionary_match(prefix, i, j, reversed_word, ranked_dict[reversed_word], dictionary_name)
+                    match['reversed'] = True
+                    backward.append(match)
+        forward.sort(key=lambda m: m['i'])
+        backward.sort(key=lambda m: m['i'])
         
-        return StrengthResult(
-            score=result.get('score', 0),
-            crack_time_display=crack_times.get('offline_slow_hashing_1e4_per_second', 'unknown'),
-            crack_time_seconds=crack_seconds.get('offline_slow_hashing_1e4_per_second', 0),
-            feedback_warning=result.get('feedback', {}).get('warning', ''),
-            feedback_suggestions=result.get('feedback', {}).get('suggestions', []),
-            patterns_found=patterns,
-            guesses=result.get('guesses', 0),
-            guesses_log10=result.get('guesses_log10', 0)
+        # l33t matches depend on which substitution characters occur anywhere in
+        # the password; when that set changes the l33t matches are rebuilt
+        subtable = zxcvbn_matching.relevant_l33t_subtable(prefix, zxcvbn_matching.L33T_TABLE)
+        if j == 0 or subtable != self._states[j - 1]['subtable']:
+            return {
+                'dictionary': forward,
+                'reversed': backward,
+                'subtable': subtable,
+                'l33t': zxcvbn_matching.l33t_match(prefix, dictionaries, zxcvbn_matching.L33T_TABLE),
+                'l33t_rebuilt': True
+            }
+        
+        l33t = []
+        for sub in zxcvbn_matching.enumerate_l33t_subs(subtable):
+            if not len(sub):
+                break
+            subbed = zxcvbn_matching.translate(prefix, sub).lower()
+            for dictionary_name, ranked_dict in dictionaries.items():
+                for i in range(j):
+                    word = subbed[i:]
+                    token = prefix[i:]
+                    if word not in ranked_dict or token.lower() == word:
+                        continue
+                    match_sub = {subbed_chr: chr for subbed_chr, chr in sub.items() if subbed_chr in token}
+                    match = self._dictionary_match(prefix, i, j, word, ranked_dict[word], dictionary_name)
+                    match['l33t'] = True
+                    match['sub'] = match_sub
+                    match['sub_display'] = ', '.join(["%s -> %s" % (k, v) for k, v in match_sub.items()])
+                    l33t.append(match)
+        l33t.sort(key=lambda m: m['i'])
+        return {
+            'dictionary': forward,
+            'reversed': backward,
+            'subtable': subtable,
+            'l33t': l33t,
+            'l33t_rebuilt': False
+        }
+    
+    @staticmethod
+    def _dictionary_match(prefix: str, i: int, j: int, word: str, rank: int, dictionary_name: str) -> Dict[str, Any]:
+        """Build a match dict shaped like zxcvbn's dictionary matcher output."""
+        return {
+            'pattern': 'dictionary',
+            'i': i,
+            'j': j,
+            'token': prefix[i:j + 1],
+            'matched_word': word,
+            'rank': rank,
+            'dictionary_name': dictionary_name,
+            'reversed': False,
+            'l33t': False,
+        }
+    
+    def _score(self, password: str, dictionaries: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
+        """Assemble all matches and run zxcvbn's scoring and feedback."""
+        def ordered(matches):
+            # Copies: zxcvbn's scorer caches guesses inside each match dict
+            return sorted((dict(m) for m in matches), key=lambda m: (m['i'], m['j']))
+        
+        l33t_start = max(k for k, state in enumerate(self._states) if state['l33t_rebuilt'])
+        matches = (
+            ordered(m for state in self._states for m in state['dictionary'])
+            + ordered(m for state in self._states for m in state['reversed'])
+            + ordered(m for state in self._states[l33t_start:] for m in state['l33t'])
+            + zxcvbn_matching.spatial_match(password, _ranked_dictionaries=dictionaries)
+            + zxcvbn_matching.repeat_match(password, _ranked_dictionaries=dictionaries)
+            + zxcvbn_matching.sequence_match(password, _ranked_dictionaries=dictionaries)
+            + zxcvbn_matching.regex_match(password, _ranked_dictionaries=dictionaries)
+            + zxcvbn_matching.date_match(password, _ranked_dictionaries=dictionaries)
         )
+        matches.sort(key=lambda m: (m['i'], m['j']))
         
-    except Exception:
-        return None
-
+        result = zxcvbn_scoring.most_guessable_match_sequence(password, matches)
+        result.update(zxcvbn_time_estimates.estimate_attack_times(result['guesses']))
+        result['feedback'] = zxcvbn_feedback.get_feedback(result['score'], result['sequence'])
+        return result
 
 def get_strength_label(score: int) -> Tuple[str, str]:
     """
@@ -126,9 +454,10 @@ def format_strength_report(result: StrengthResult, no_color: bool = False) -> st
         color = ""
         reset = ""
     
+    title = f"Pattern Analysis ({result.engine})"
     lines = [
         "+--------------------------------------------------+",
-        "|              Pattern Analysis (zxcvbn)           |",
+        f"|              {title:<36}|",
         "+--------------------------------------------------+",
         f"| Score:                          {color}{label:>14}{reset} |",
         f"| Crack Time:            {result.crack_time_display:>23} |",
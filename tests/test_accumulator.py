@@ -0,0 +1,125 @@
+"""
+Unit tests for the Fortuna-style entropy accumulator and Paranoid Mode sessions.
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.generators import accumulator as accumulator_module
+from src.generators.accumulator import MIN_POOL_SIZE, NUM_POOLS, SOURCE_JITTER, EntropyAccumulator
+from src.generators.drbg import SYSTEM_RANDOM, set_default_random
+from src.generators.pin import PinGenerator
+from src.security import jitter
+
+EMPTY_POOL = hashlib.sha256().digest()
+
+
+class TestEntropyAccumulator(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.seed_file = Path(self.tmp.name) / "entropy.seed"
+
+    def test_events_spread_over_pools(self):
+        acc = EntropyAccumulator()
+        for i in range(NUM_POOLS):
+            acc.add_event(SOURCE_JITTER, i.to_bytes(8, "big"))
+        self.assertTrue(all(pool.digest() != EMPTY_POOL for pool in acc._pools))
+        for bad in ((256, b"x"), (0, b"")):
+            with self.assertRaises(ValueError):
+                acc.add_event(*bad)
+
+    def test_reseed_schedule(self):
+        """Pool i joins every 2^i-th reseed and is emptied when it does."""
+        acc = EntropyAccumulator()
+        for i in range(4 * NUM_POOLS):
+            acc.add_event(SOURCE_JITTER, i.to_bytes(8, "big"))
+        acc.reseed_now()
+        self.assertEqual(acc._pools[0].digest(), EMPTY_POOL)
+        self.assertNotEqual(acc._pools[1].digest(), EMPTY_POOL)
+        acc.reseed_now()
+        self.assertEqual(acc._pools[1].digest(), EMPTY_POOL)
+        self.assertNotEqual(acc._pools[2].digest(), EMPTY_POOL)
+
+    def test_reseed_waits_for_pool_and_spacing(self):
+        acc = EntropyAccumulator()
+        acc.token_bytes(16)
+        self.assertEqual(acc.reseeds, 0)
+        for i in range(NUM_POOLS * MIN_POOL_SIZE // 8):
+            acc.add_event(SOURCE_JITTER, i.to_bytes(8, "big"))
+        acc.token_bytes(16)
+        self.assertEqual(acc.reseeds, 1)
+        for i in range(NUM_POOLS * MIN_POOL_SIZE // 8):
+            acc.add_event(SOURCE_JITTER, i.to_bytes(8, "big"))
+        acc.token_bytes(16)
+        self.assertEqual(acc.reseeds, 1)
+        with mock.patch.object(accumulator_module.time, "monotonic", return_value=time.monotonic() + 1):
+            acc.token_bytes(16)
+        self.assertEqual(acc.reseeds, 2)
+
+    def test_seed_file_round_trip(self):
+        acc = EntropyAccumulator()
+        acc.credit(128)
+        self.assertTrue(acc.write_seed_file(self.seed_file))
+        first = self.seed_file.read_bytes()
+
+        restored = EntropyAccumulator()
+        self.assertTrue(restored.load_seed_file(self.seed_file, max_age=60))
+        self.assertEqual(restored.credited_bits, 128)
+        # The seed is replaced as soon as it is used
+        self.assertNotEqual(self.seed_file.read_bytes(), first)
+
+        expired = EntropyAccumulator()
+        with mock.patch.object(accumulator_module.time, "time", return_value=time.time() + 120):
+            self.assertTrue(expired.load_seed_file(self.seed_file, max_age=60))
+        self.assertEqual(expired.credited_bits, 0)
+
+        self.seed_file.write_bytes(b"garbage")
+        self.assertFalse(EntropyAccumulator().load_seed_file(self.seed_file))
+
+    def test_default_random(self):
+        acc = EntropyAccumulator()
+        set_default_random(acc)
+        self.addCleanup(set_default_random, None)
+        generator = PinGenerator()
+        self.assertIs(generator.rng, acc)
+        self.assertRegex(generator.generate(length=8).password, r"^\d{8}$")
+        set_default_random(None)
+        self.assertIs(PinGenerator().rng, SYSTEM_RANDOM)
+
+    def test_paranoid_session(self):
+        """Jitter is collected once, and a recent seed file stands in for it in the next session."""
+        def fake_collect(duration, accumulator):
+            accumulator.add_event(SOURCE_JITTER, b"keys")
+            accumulator.credit(40)
+            return ""
+
+        patches = [
+            mock.patch.dict(os.environ, {"PASSFORGE_SEED_FILE": str(self.seed_file)}),
+            mock.patch.object(accumulator_module, "_accumulator", None),
+            mock.patch.object(jitter, "collect_jitter", side_effect=fake_collect),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        session = jitter.paranoid_random()
+        self.assertIs(jitter.paranoid_random(), session)
+        self.assertEqual(jitter.collect_jitter.call_count, 1)
+        self.assertTrue(self.seed_file.exists())
+
+        accumulator_module._accumulator = None
+        next_session = jitter.paranoid_random()
+        self.assertIsNot(next_session, session)
+        self.assertEqual(next_session.credited_bits, 40)
+        self.assertEqual(jitter.collect_jitter.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Unit tests for the PWA live-typing analysis sessions.
+"""
+
+import unittest
+from unittest import mock
+
+from pwa.analysis_sessions import AnalysisSessions
+from src.security import strength_checker
+from src.security.strength_checker import ZXCVBN_MAX_LENGTH, is_available
+
+
+@unittest.skipUnless(is_available(), "zxcvbn not installed")
+class TestAnalysisSessions(unittest.TestCase):
+
+    def test_session_round_trip(self):
+        """A session analyzes successive edits and can be closed."""
+        sessions = AnalysisSessions()
+        token = sessions.create()
+        weak = sessions.analyze(token, "passw")
+        strong = sessions.analyze(token, "passw-Quartz-Lantern-91-Ember")
+        self.assertLess(weak.score, strong.score)
+        self.assertTrue(sessions.close(token))
+        with self.assertRaises(KeyError):
+            sessions.analyze(token, "x")
+
+    def test_bounds_evict_and_expire(self):
+        """Oldest sessions are evicted and idle ones expire."""
+        sessions = AnalysisSessions(max_sessions=2)
+        first = sessions.create()
+        sessions.create()
+        sessions.create()
+        self.assertEqual(len(sessions), 2)
+        with self.assertRaises(KeyError):
+            sessions.analyze(first, "abc")
+
+        sessions.ttl = 0
+        token = sessions.create()
+        with self.assertRaises(KeyError):
+            sessions.analyze(token, "abc")
+
+
+class TestAnalysisSessionFallback(unittest.TestCase):
+
+    def test_long_password_is_analyzed(self):
+        """Inputs past zxcvbn's limit fall back to the native analyzer."""
+        sessions = AnalysisSessions()
+        token = sessions.create()
+        password = "Quartz-Lantern-91-Ember-" * 4
+        self.assertGreater(len(password), ZXCVBN_MAX_LENGTH)
+        result = sessions.analyze(token, password)
+        self.assertIsNotNone(result)
+        self.assertEqual(result.score, 4)
+
+    def test_rejects_overlong_password(self):
+        """Inputs past max_length are refused and leave the session usable."""
+        sessions = AnalysisSessions(max_length=64)
+        token = sessions.create()
+        with self.assertRaises(ValueError):
+            sessions.analyze(token, "as" * 33)
+        self.assertIsNotNone(sessions.analyze(token, "as" * 32))
+
+    def test_without_zxcvbn(self):
+        """A missing zxcvbn still yields an analysis."""
+        sessions = AnalysisSessions()
+        token = sessions.create()
+        with mock.patch.object(strength_checker, "ZXCVBN_AVAILABLE", False):
+            weak = sessions.analyze(token, "password")
+            strong = sessions.analyze(token, "passw-Quartz-Lantern-91-Ember")
+        self.assertIsNotNone(weak)
+        self.assertLess(weak.score, strong.score)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Unit tests for the batch password audit.
+"""
+
+import csv
+import io
+import json
+import unittest
+
+from src.security.audit import AuditSummary, AuditWriter, audit_passwords, read_candidates
+
+PASSWORDS = ["password", "x7#Kq9!mZp2$", "", "qwerty123", "correcthorsebatterystaple", "aaaaaaa"]
+
+
+class TestAudit(unittest.TestCase):
+
+    def _candidates(self):
+        return read_candidates(io.StringIO("\n".join(PASSWORDS) + "\n"))
+
+    def test_read_candidates(self):
+        """Blank lines are skipped; CSV columns are picked by name or index."""
+        self.assertEqual([n for n, _ in self._candidates()], [1, 2, 4, 5, 6])
+        export = "user,password\nalice,hunter2\nbob,\ncarol,\"pa,ss\"\n"
+        self.assertEqual(list(read_candidates(io.StringIO(export), "password")), [(2, "hunter2"), (4, "pa,ss")])
+        self.assertEqual(list(read_candidates(io.StringIO("alice,hunter2\n"), "1")), [(1, "hunter2")])
+        with self.assertRaises(ValueError):
+            list(read_candidates(io.StringIO(export), "secret"))
+
+    def test_pool_preserves_order(self):
+        """A worker pool returns the same records, in input order, as in-process auditing."""
+        candidates = [(n, f"summer{n}") for n in range(1, 301)]
+        inline = list(audit_passwords(candidates, workers=1, engine="native", breach=False, batch_size=16))
+        pooled = list(audit_passwords(iter(candidates), workers=2, engine="native", breach=False, batch_size=16))
+        self.assertEqual([r.line for r in pooled], list(range(1, 301)))
+        self.assertEqual([r.guesses_log10 for r in pooled], [r.guesses_log10 for r in inline])
+
+    def test_summary_aggregates(self):
+        summary = AuditSummary(weakest=2)
+        for record in audit_passwords(self._candidates(), workers=1, engine="native", breach=False):
+            summary.add(record)
+        report = summary.to_dict()
+        self.assertEqual(report["total"], 5)
+        self.assertEqual(sum(report["score_histogram"].values()), 5)
+        self.assertEqual(report["score_histogram"]["4"], 2)
+        # "password" (rank 2) is weaker than "aaaaaaa" and "qwerty123"
+        self.assertEqual([r["line"] for r in report["weakest"]], [1, 6])
+        self.assertNotIn("password", report["weakest"][0])
+
+    def test_writers_redact_by_default(self):
+        records = list(audit_passwords(self._candidates(), workers=1, engine="native", breach=False))
+        out = io.StringIO()
+        writer = AuditWriter(out, format="csv")
+        for record in records:
+            writer.write(record)
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        self.assertEqual(len(rows), 5)
+        self.assertNotIn("password", rows[0])
+
+        out = io.StringIO()
+        writer = AuditWriter(out, format="jsonl", include_passwords=True)
+        writer.write(records[0])
+        self.assertEqual(json.loads(out.getvalue())["password"], "password")
+
+    def test_redacted_rows_quote_nothing(self):
+        """Pattern descriptions keep their kind but not the matched text."""
+        records = list(audit_passwords(self._candidates(), workers=1, engine="native", breach=False))
+        self.assertIn("Dictionary word 'password' (passwords)", records[0].patterns)
+        for record in records:
+            row = record.to_dict()
+            self.assertEqual(len(row["patterns"]), len(record.patterns))
+            # Warnings are fixed texts, not taken from the candidate
+            del row["warning"]
+            text = json.dumps(row)
+            tokens = [p.split("'")[1] for p in record.patterns]
+            for secret in [record.password] + tokens:
+                self.assertNotIn(secret, text)
+        self.assertEqual(records[0].to_dict()["patterns"], ["Dictionary word"])
+
+
+if __name__ == '__main__':
+    unittest.main()
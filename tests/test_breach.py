@@ -0,0 +1,97 @@
+"""
+Unit tests for offline breach screening (memory-mapped Bloom filter).
+"""
+
+import hashlib
+import secrets
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.generators.pin import PinGenerator
+from src.security.breach import BreachFilter, get_breach_filter, optimal_parameters
+
+
+class TestBreachFilter(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.filter_path = self.test_dir / "breach.bloom"
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _hibp_corpus(self, passwords):
+        """Write an HIBP-style dump: upper-case SHA-1, count suffix, CRLF."""
+        path = self.test_dir / "pwned.txt"
+        with open(path, "wb") as f:
+            f.write(b"not a hash line\r\n")
+            for i, password in enumerate(passwords):
+                digest = hashlib.sha1(password.encode()).hexdigest().upper()
+                f.write(f"{digest}:{i + 1}\r\n".encode())
+        return path
+
+    def test_sizing(self):
+        bits, probes = optimal_parameters(1_000_000_000, 0.01)
+        self.assertAlmostEqual(bits / 8 / 2**30, 1.12, places=2)  # ~1.2 GB for a billion entries
+        self.assertEqual(probes, 7)
+        with self.assertRaises(ValueError):
+            optimal_parameters(10, 1.5)
+
+    def test_no_false_negatives(self):
+        """Every corpus entry is reported as breached."""
+        passwords = [f"password{i}" for i in range(2000)]
+        corpus = self._hibp_corpus(passwords)
+        with BreachFilter.build(corpus, self.filter_path, fp_rate=0.01) as bloom:
+            self.assertEqual(bloom.count, 2000)
+            self.assertTrue(all(p in bloom for p in passwords))
+
+    def test_false_positive_rate(self):
+        """Unrelated passwords are rejected at about the configured rate."""
+        corpus = self._hibp_corpus([f"pw-{i}" for i in range(5000)])
+        with BreachFilter.build(corpus, self.filter_path, fp_rate=0.01) as bloom:
+            trials = 20000
+            false_positives = sum(bloom.is_breached(secrets.token_hex(8)) for _ in range(trials))
+            self.assertLess(false_positives / trials, 0.02)
+            self.assertAlmostEqual(bloom.estimated_fp_rate(), 0.01, delta=0.005)
+
+    def test_plaintext_corpus_and_reopen(self):
+        corpus = self.test_dir / "common.txt"
+        corpus.write_text("123456\npassword\nqwerty\n")
+        BreachFilter.build(corpus, self.filter_path, plaintext=True).close()
+        bloom = get_breach_filter(self.filter_path)
+        self.assertIs(get_breach_filter(self.filter_path), bloom)
+        self.assertTrue(bloom.is_breached("qwerty"))
+        self.assertFalse(bloom.is_breached("correct horse battery staple"))
+        self.assertIsNone(get_breach_filter(self.test_dir / "missing.bloom"))
+
+    def test_rejects_foreign_file(self):
+        self.filter_path.write_bytes(b"x" * 100)
+        with self.assertRaises(ValueError):
+            BreachFilter(self.filter_path)
+
+    def test_corrupt_filter_is_skipped(self):
+        """A truncated filter is logged and reported as missing, not raised."""
+        corpus = self.test_dir / "common.txt"
+        corpus.write_text("123456\npassword\n")
+        BreachFilter.build(corpus, self.filter_path, plaintext=True).close()
+        with open(self.filter_path, "r+b") as f:
+            f.truncate(70)
+        with self.assertLogs("src.security.breach", "WARNING"):
+            self.assertIsNone(get_breach_filter(self.filter_path))
+        self.assertIsNone(get_breach_filter(self.filter_path))
+
+    def test_generate_screened_regenerates(self):
+        """Generators retry breached candidates and give up after max_attempts."""
+        corpus = self.test_dir / "pins.txt"
+        corpus.write_text("\n".join(f"{n:04d}" for n in range(10000) if n != 1234))
+        with BreachFilter.build(corpus, self.filter_path, plaintext=True, fp_rate=1e-6) as bloom:
+            with self.assertRaises(ValueError):
+                PinGenerator().generate_screened(lambda pin: True, max_attempts=3, length=4)
+            result = PinGenerator().generate_screened(bloom.is_breached, max_attempts=100000, length=4)
+            self.assertEqual(result.password, "1234")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+Unit tests for collision-free code batches (PINs and recovery codes).
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.generators.code_batch import CodeSequence, FeistelPermutation, unique_values
+from src.generators.drbg import HmacDrbg
+from src.generators.pin import PinGenerator
+from src.generators.recovery_codes import RecoveryCodesGenerator, recovery_wordlist
+
+
+def _take_in_rounds(path, rounds=20, size=25):
+    """Draw ``rounds`` batches from a sequence file (run in a worker process)."""
+    codes = []
+    for _ in range(rounds):
+        codes.extend(CodeSequence(path, 10, 6).take(size))
+    return codes
+
+
+class TestFeistelPermutation(unittest.TestCase):
+
+    def test_is_permutation(self):
+        for radix, length in ((10, 4), (10, 5), (2, 2), (3, 7), (26, 3)):
+            with self.subTest(radix=radix, length=length):
+                permutation = FeistelPermutation(b"k" * 32, radix, length)
+                images = [permutation.permute(x) for x in range(permutation.size)]
+                self.assertEqual(sorted(images), list(range(permutation.size)))
+                self.assertNotEqual(images, list(range(permutation.size)))
+
+    def test_invert(self):
+        for radix, length in ((10, 8), (10, 64), (7776, 3)):
+            permutation = FeistelPermutation(b"k" * 32, radix, length)
+            for x in (0, 1, permutation.size // 3, permutation.size - 1):
+                self.assertEqual(permutation.invert(permutation.permute(x)), x)
+        other = FeistelPermutation(b"j" * 32, 10, 8)
+        self.assertNotEqual([other.permute(x) for x in range(5)], [permutation.permute(x) for x in range(5)])
+
+    def test_invalid(self):
+        for args in ((b"", 10, 4), (b"k" * 65, 10, 4), (b"k", 1, 4), (b"k", 10, 1), (b"k", 10 ** 60, 4)):
+            with self.subTest(args=args), self.assertRaises(ValueError):
+                FeistelPermutation(*args)
+        with self.assertRaises(ValueError):
+            FeistelPermutation(b"k", 10, 4).permute(10 ** 4)
+
+
+class TestUniqueValues(unittest.TestCase):
+
+    def test_both_strategies_distinct(self):
+        rng = HmacDrbg(b"codes" * 8)
+        for count in (100, 2500, 10 ** 4):
+            with self.subTest(count=count):
+                values = list(unique_values(10, 4, count, rng))
+                self.assertEqual(len(set(values)), count)
+                self.assertTrue(all(0 <= v < 10 ** 4 for v in values))
+        with self.assertRaises(ValueError):
+            unique_values(10, 4, 10 ** 4 + 1)
+
+
+class TestCodeSequence(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / "issued.json"
+
+    def test_batches_never_repeat(self):
+        first = list(CodeSequence(self.path, 10, 4).take(600))
+        sequence = CodeSequence(self.path, 10, 4)
+        second = list(sequence.take(400))
+        self.assertEqual(len(set(first + second)), 1000)
+        self.assertTrue(all(sequence.was_issued(code) for code in first[:20] + second[:20]))
+        fresh = next(c for c in range(10 ** 4) if c not in set(first + second))
+        self.assertFalse(sequence.was_issued(fresh))
+        self.assertEqual(CodeSequence(self.path, 10, 4).remaining, 9000)
+        if sys.platform != "win32":
+            self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+
+    def test_concurrent_processes_never_share_codes(self):
+        with multiprocessing.Pool(2) as pool:
+            results = pool.map(_take_in_rounds, [self.path, self.path])
+        codes = results[0] + results[1]
+        self.assertEqual(len(codes), 1000)
+        self.assertEqual(len(set(codes)), 1000)
+        self.assertEqual(CodeSequence(self.path, 10, 6).issued, 1000)
+
+    def test_errors(self):
+        CodeSequence(self.path, 10, 4).take(1)
+        with self.assertRaises(ValueError):
+            CodeSequence(self.path, 10, 6)
+        with self.assertRaises(ValueError):
+            CodeSequence(self.path, 10, 4).take(10 ** 4)
+        self.path.write_text("{", encoding="utf-8")
+        with self.assertRaises(ValueError):
+            CodeSequence(self.path, 10, 4)
+
+
+class TestGeneratorBatches(unittest.TestCase):
+
+    def test_recovery_set_has_no_repeats(self):
+        codes = RecoveryCodesGenerator().generate(count=100, digits=4).parameters["codes"]
+        self.assertEqual(len(set(codes)), 100)
+
+    def test_recovery_batch(self):
+        generator = RecoveryCodesGenerator(rng=HmacDrbg(b"batch" * 8))
+        codes = list(generator.generate_batch(5000, digits=4))
+        self.assertEqual(len(set(codes)), 5000)
+        self.assertTrue(all(len(c) == 4 and c.isdigit() for c in codes))
+        words = list(generator.generate_batch(300, use_words=True, words_per_code=2))
+        self.assertEqual(len(set(words)), 300)
+        self.assertTrue(all(w in recovery_wordlist() for code in words for w in code.split("-")))
+        with self.assertRaises(ValueError):
+            generator.generate_batch(10, digits=3)
+
+    def test_pin_batch_covers_space(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "pins.json"
+            generator = PinGenerator()
+            pins = list(generator.generate_batch(6000, 4, path)) + list(generator.generate_batch(4000, 4, path))
+            self.assertEqual(sorted(pins), [f"{i:04d}" for i in range(10 ** 4)])
+            with self.assertRaises(ValueError):
+                generator.generate_batch(1, 4, path)
+
+
+if __name__ == '__main__':
+    unittest.main()
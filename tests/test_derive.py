@@ -0,0 +1,83 @@
+"""
+Unit tests for derived (stateless) site passwords.
+"""
+
+import argparse
+import unittest
+from unittest import mock
+
+from src.command_handler import generates, handle_derive
+from src.generators import derive
+from src.generators.derive import DerivedPasswordGenerator, clear_session, normalize_site, site_key
+
+MASTER = "correct horse"
+
+
+class TestDerive(unittest.TestCase):
+
+    def setUp(self):
+        self.generator = DerivedPasswordGenerator()
+
+    def _derive(self, site="github.com", **kwargs):
+        kwargs.setdefault("login", "me")
+        return self.generator.generate(master=MASTER, site=site, **kwargs)
+
+    def test_known_answer(self):
+        """Pins the derivation scheme: any change here breaks every stored site."""
+        result = self._derive()
+        self.assertEqual(result.password, "#o$^BKlL4A>.$mZ?")
+        self.assertEqual(result.generator_type, "derive")
+        self.assertEqual(result.parameters["site"], "github.com")
+        self.assertNotIn(MASTER, str(result.to_dict()))
+
+    def test_inputs_separate_passwords(self):
+        base = self._derive().password
+        self.assertEqual(self._derive().password, base)
+        self.assertEqual(self._derive("https://GitHub.com/login").password, base)
+        for variant in (self._derive("gitlab.com"), self._derive(login="you"), self._derive(counter=2),
+                        DerivedPasswordGenerator().generate(master="correct horse!", site="github.com", login="me")):
+            self.assertNotEqual(variant.password, base)
+
+    def test_rules_honored(self):
+        result = self._derive(length=24, symbols=False, min_digits=5, min_uppercase=3)
+        password = result.password
+        self.assertEqual(len(password), 24)
+        self.assertTrue(password.isalnum())
+        self.assertGreaterEqual(sum(c.isdigit() for c in password), 5)
+        self.assertGreaterEqual(sum(c.isupper() for c in password), 3)
+
+    def test_master_stretched_once(self):
+        self._derive()
+        stretched = len(derive._session)
+        key = site_key(MASTER, "example.org")
+        self.assertEqual(len(derive._session), stretched)
+        self.assertEqual(len(key), 32)
+        clear_session()
+        self.assertEqual(len(derive._session), 0)
+        self.assertEqual(site_key(MASTER, "example.org"), key)
+
+    def test_invalid_input(self):
+        self.assertEqual(normalize_site(" Example.ORG/ "), "example.org")
+        for site in ("github.com/login", "GitHub.com/login?next=/", "github.com:443", "https://me@github.com:443/x"):
+            with self.subTest(site=site):
+                self.assertEqual(normalize_site(site), "github.com")
+        for kwargs in ({"site": ""}, {"site": "https://"}, {"counter": 0}, {"custom_seed": "x"}):
+            with self.subTest(kwargs=kwargs), self.assertRaises(ValueError):
+                self._derive(**kwargs)
+        with self.assertRaises(ValueError):
+            self.generator.generate(master="", site="github.com")
+
+    def test_cli_rejects_random_source_options(self):
+        """--reject-breached, --paranoid and --drbg-key fail before any prompt."""
+        base = {"command": "derive", "reject_breached": False, "paranoid": False, "drbg_key": None}
+        for option in ({"reject_breached": True}, {"paranoid": True}, {"drbg_key": "k"}):
+            args = argparse.Namespace(**{**base, **option})
+            self.assertFalse(generates(args))
+            with self.subTest(option=option), mock.patch("getpass.getpass") as prompt:
+                with self.assertRaises(ValueError):
+                    handle_derive(args)
+                prompt.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+Unit tests for the shared random sources and the deterministic HMAC-DRBG.
+"""
+
+import argparse
+import hashlib
+import unittest
+
+from src.command_handler import generates
+from src.generators.base64_secret import Base64SecretGenerator
+from src.generators.drbg import SYSTEM_RANDOM, HmacDrbg, KeyedRandom, derive_key
+from src.generators.leetspeak import LeetspeakGenerator
+from src.generators.license_key import LicenseKeyGenerator
+from src.generators.passphrase import PassphraseGenerator
+from src.generators.pattern import PatternGenerator
+from src.generators.phonetic import PhoneticGenerator
+from src.generators.pin import PinGenerator
+from src.generators.policy import PasswordPolicy, PolicyGenerator
+from src.generators.pronounceable import PronounceableGenerator
+from src.generators.random_password import RandomPasswordGenerator
+from src.generators.recovery_codes import RecoveryCodesGenerator
+from src.generators.uuid_token import UuidGenerator
+from src.generators.wifi_key import WifiKeyGenerator
+
+# Stretched once: derive_key() costs about half a second
+FIXTURE_KEY = derive_key("fixture")
+
+# NIST CAVP HMAC_DRBG SHA-256 test vector (no reseed, no additional input, COUNT 0)
+NIST_ENTROPY = "ca851911349384bffe89de1cbdc46e6831e44d34a4fb935ee285dd14b71a7488"
+NIST_NONCE = "659ba96c601dc69fc902940805ec0ca8"
+NIST_RETURNED = (
+    "e528e9abf2dece54d47c7e75e5fe302149f817ea9fb4bee6f4199697d04d5b89"
+    "d54fbb978a15b5c443c9ec21036d2460b6f73ebad0dc2aba6e624abf07745bc1"
+    "07694bb7547bb0995f70de25d6b29e2d3011bb19d27676c07162c8b5ccde0668"
+    "961df86803482cb37ed6d5c0bb8d50cf1f50d476aa0458bdaba806f48be9dcb8"
+)
+
+# (generator, generate() arguments) covering every generator that draws randomness
+GENERATORS = [
+    (RandomPasswordGenerator, {"length": 24, "min_digits": 3}),
+    (RandomPasswordGenerator, {"length": 24, "balanced": True}),
+    (RandomPasswordGenerator, {"length": 24, "no_repeats": True}),
+    (PolicyGenerator, {"policy": PasswordPolicy(length=10, min_classes=3, max_repeat=1)}),
+    (PassphraseGenerator, {"word_count": 5}),
+    (LeetspeakGenerator, {"word_count": 3}),
+    (PinGenerator, {"length": 8}),
+    (PronounceableGenerator, {"length": 14, "add_number": True}),
+    (PhoneticGenerator, {"length": 8}),
+    (UuidGenerator, {"version": 4}),
+    (Base64SecretGenerator, {"byte_length": 24}),
+    (WifiKeyGenerator, {"length": 20}),
+    (LicenseKeyGenerator, {"segments": 4}),
+    (RecoveryCodesGenerator, {"count": 5}),
+    (RecoveryCodesGenerator, {"count": 5, "use_words": True}),
+    (PatternGenerator, {"grid_size": 4, "path_length": 6}),
+]
+
+
+class TestDrbg(unittest.TestCase):
+
+    def test_nist_vector(self):
+        drbg = HmacDrbg(bytes.fromhex(NIST_ENTROPY), bytes.fromhex(NIST_NONCE))
+        drbg.generate(128)
+        self.assertEqual(drbg.generate(128).hex(), NIST_RETURNED)
+
+    def test_buffered_reads_are_deterministic(self):
+        a, b = HmacDrbg(b"k" * 32), HmacDrbg(b"k" * 32)
+        self.assertEqual(a.token_bytes(5) + a.token_bytes(600) + a.token_bytes(3), b.token_bytes(608))
+        self.assertNotEqual(HmacDrbg(b"k" * 32, b"1").token_bytes(16), HmacDrbg(b"k" * 32, b"2").token_bytes(16))
+
+    def test_randbelow_range(self):
+        drbg = HmacDrbg(b"r" * 32)
+        for bound in (1, 2, 3, 10, 255, 256, 257, 10 ** 30):
+            values = [drbg.randbelow(bound) for _ in range(200)]
+            self.assertTrue(all(0 <= v < bound for v in values))
+        counts = [0] * 6
+        for _ in range(6000):
+            counts[drbg.randbelow(6)] += 1
+        self.assertTrue(all(850 < c < 1150 for c in counts))
+
+    def test_fast_forward(self):
+        """Stream k is the same whether reached in sequence or directly."""
+        keyed = KeyedRandom(FIXTURE_KEY)
+        sequential = [s.token_bytes(32) for s in keyed.streams(0, 5)]
+        self.assertEqual(keyed.stream(3).token_bytes(32), sequential[3])
+        self.assertEqual(len(set(sequential)), 5)
+        self.assertNotEqual(KeyedRandom(derive_key("other")).stream(3).token_bytes(32), sequential[3])
+
+    def test_key_text_is_stretched(self):
+        self.assertEqual(len(FIXTURE_KEY), 32)
+        self.assertNotEqual(FIXTURE_KEY, hashlib.sha256(b"passforge-drbg-key" + b"fixture").digest())
+        with self.assertRaises(ValueError):
+            derive_key("")
+
+    def test_streams_only_for_generating_commands(self):
+        """--drbg-key/--paranoid never prompt for commands that only check."""
+        def args(command, **extra):
+            return argparse.Namespace(command=command, **extra)
+        self.assertTrue(generates(args("random")))
+        self.assertTrue(generates(args("otp", otp_action=None)))
+        for checking in (args("analyze"), args("audit"), args("history"), args("breach"),
+                         args("otp", otp_action="verify"), args("license", verify="AAAA-BBBB"),
+                         args("voucher", lookup="AAAA"), args("random", list_presets=True)):
+            with self.subTest(command=checking.command):
+                self.assertFalse(generates(checking))
+
+    def test_every_generator_reproducible(self):
+        keyed = KeyedRandom(FIXTURE_KEY)
+        for cls, kwargs in GENERATORS:
+            with self.subTest(generator=cls.__name__, **{k: str(v) for k, v in kwargs.items()}):
+                first = cls(rng=keyed.stream(7)).generate(**kwargs).password
+                again = cls(rng=keyed.stream(7)).generate(**kwargs).password
+                other = cls(rng=keyed.stream(8)).generate(**kwargs).password
+                self.assertEqual(first, again)
+                self.assertNotEqual(first, other)
+
+    def test_system_default(self):
+        self.assertIs(PinGenerator().rng, SYSTEM_RANDOM)
+        result = RandomPasswordGenerator().generate(length=12, custom_seed="jitter")
+        self.assertEqual(len(result.password), 12)
+        self.assertTrue(result.parameters["paranoid"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@
 Unit tests for PassForge password generators.
 """
 
+import math
 import unittest
 import re
 from src.generators.random_password import RandomPasswordGenerator
@@ -17,6 +18,7 @@ from src.generators.license_key import LicenseKeyGenerator
 from src.generators.recovery_codes import RecoveryCodesGenerator
 from src.generators.otp import OtpGenerator
 from src.generators.pattern import PatternGenerator
+from src.generators.entropy_model import entropy_for
 from src.security.entropy import EntropyCalculator
 
 
@@ -445,6 +447,56 @@ class TestPatternGenerator(unittest.TestCase):
         self.assertEqual(len(path), len(set(path)))
 
 
+class TestEntropyModel(unittest.TestCase):
+    """Tests for the shared entropy models."""
+    
+    def test_exact_counts(self):
+        """Uniform models count outputs exactly before taking log2."""
+        self.assertEqual(entropy_for("pin", length=6), 6 * math.log2(10))
+        self.assertEqual(entropy_for("random", pool_size=62, length=20, no_repeats=True),
+                         math.log2(math.perm(62, 20)))
+        self.assertEqual(entropy_for("pattern", grid_size=3, path_length=9), math.log2(math.factorial(9)))
+        with self.assertRaises(ValueError):
+            entropy_for("unknown")
+    
+    def test_memoized(self):
+        entropy_for.cache_clear()
+        for _ in range(5):
+            PinGenerator().generate(length=8)
+        info = entropy_for.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 4))
+    
+    def test_pronounceable_matches_enumeration(self):
+        """Expected letter entropy equals a brute-force walk over syllable choices."""
+        from src.generators.pronounceable import SYLLABLE_PATTERNS
+        bits = {"c": math.log2(21), "v": math.log2(5)}
+        length = 7
+        
+        def walk(layout, probability):
+            if len(layout) >= length:
+                return probability * sum(bits[kind] for kind in layout[:length])
+            share = probability / len(SYLLABLE_PATTERNS)
+            return sum(walk(layout + pattern, share) for pattern in SYLLABLE_PATTERNS)
+        
+        self.assertAlmostEqual(entropy_for("pronounceable", length=length), walk("", 1.0))
+    
+    def test_generators_report_exact_models(self):
+        recovery = RecoveryCodesGenerator().generate(count=10, digits=8)
+        self.assertAlmostEqual(recovery.entropy_bits, math.log2(math.perm(10 ** 8, 10)))
+        self.assertLess(recovery.entropy_bits, 10 * 8 * math.log2(10))
+        self.assertAlmostEqual(recovery.parameters["entropy_per_code"], 26.58, places=2)
+        uuid = UuidGenerator().generate(version=4)
+        self.assertEqual(uuid.parameters["pool_size"], 2 ** 122)
+        self.assertIsInstance(uuid.parameters["pool_size"], int)
+        # Substitution flips add entropy on top of the word choice
+        leet = LeetspeakGenerator().generate(word_count=3)
+        self.assertGreater(leet.entropy_bits, 3 * math.log2(leet.parameters["pool_size"]))
+        # Pronounceable entropy depends on the configuration, not the syllables drawn
+        first = PronounceableGenerator().generate(length=16)
+        second = PronounceableGenerator().generate(length=16)
+        self.assertEqual(first.entropy_bits, second.entropy_bits)
+
+
 class TestEntropyCalculator(unittest.TestCase):
     """Tests for EntropyCalculator."""
     
@@ -454,6 +506,19 @@ class TestEntropyCalculator(unittest.TestCase):
         entropy = EntropyCalculator.calculate_from_pool(26, 8)
         self.assertAlmostEqual(entropy, 37.6, delta=0.1)
     
+    def test_entropy_from_password(self):
+        """Test composition classification and pool sizes."""
+        self.assertEqual(EntropyCalculator.calculate_from_password(""), (0.0, 0))
+        self.assertEqual(EntropyCalculator.calculate_from_password("abc")[1], 26)
+        self.assertEqual(EntropyCalculator.calculate_from_password("aB3")[1], 62)
+        self.assertEqual(EntropyCalculator.calculate_from_password("aB3!")[1], 92)
+        # Space, quote and backslash are outside the symbol pool; so is non-ASCII
+        for password in ("a b", 'say "x"', "C:\\", "pässword", "\U0001F511key"):
+            self.assertEqual(EntropyCalculator.calculate_from_password(password)[1], 95)
+        self.assertEqual(EntropyCalculator.calculate_from_password("aB3! é")[1], 95)
+        entropy, _ = EntropyCalculator.calculate_from_password("Tr0ub4dor&3")
+        self.assertAlmostEqual(entropy, 11 * math.log2(92))
+    
     def test_strength_labels(self):
         """Test strength label thresholds."""
         self.assertIn('Weak', EntropyCalculator.get_strength_label(30))
@@ -0,0 +1,205 @@
+"""
+Unit tests for the PWA async history service.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from src.generators.base import GeneratorResult
+from src.output.logger import PasswordLogger
+from pwa.history_service import HistoryService
+
+
+def make_result(i: int) -> GeneratorResult:
+    # The entropy identifies the entry: stored passwords depend on the vault
+    return GeneratorResult(
+        password=f"pw-{i}",
+        entropy_bits=float(i),
+        generator_type="pin",
+        parameters={"length": 6, "pool_size": 10}
+    )
+
+
+class TestHistoryService(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.factory = lambda: PasswordLogger(self.test_dir)
+        # A fixed vault key, whatever the environment holds
+        patcher = mock.patch.dict(os.environ, {"PASSFORGE_API_KEY": "history-service-test"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_concurrent_submits_write_whole_lines(self):
+        """Many concurrent submits produce one complete JSON line each."""
+        async def scenario():
+            service = HistoryService(self.factory, cache_size=10)
+            await service.start()
+            await asyncio.gather(*(service.submit(make_result(i)) for i in range(200)))
+            await service.stop()
+            return service
+
+        service = asyncio.run(scenario())
+        with open(service.pwd_logger.log_file, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 200)
+        for line in lines:
+            json.loads(line)
+
+    def test_tail_cache_serves_latest(self):
+        """Recent entries come back newest first from the cache."""
+        async def scenario():
+            service = HistoryService(self.factory, cache_size=5)
+            await service.start()
+            for i in range(8):
+                await service.submit(make_result(i))
+            await service.flush()
+            latest = await service.get_history(limit=3)
+            await service.stop()
+            return latest
+
+        latest = asyncio.run(scenario())
+        self.assertEqual(len(latest), 3)
+        self.assertEqual(latest[0]["generator_type"], "pin")
+
+    def test_external_writes_refresh_cache(self):
+        """Entries written by another process are picked up on the next read."""
+        async def scenario():
+            service = HistoryService(self.factory, cache_size=5)
+            await service.start()
+            PasswordLogger(self.test_dir).log(make_result(1))
+            entries = await service.get_history(limit=5)
+            await service.stop()
+            return entries
+
+        self.assertEqual(len(asyncio.run(scenario())), 1)
+
+    def test_clear_after_pending_writes(self):
+        """Clear is ordered after queued writes and empties the cache."""
+        async def scenario():
+            service = HistoryService(self.factory)
+            await service.start()
+            for i in range(5):
+                await service.submit(make_result(i))
+            await service.clear()
+            entries = await service.get_history(limit=10)
+            await service.stop()
+            return entries
+
+        self.assertEqual(asyncio.run(scenario()), [])
+
+    def test_cached_first_page_has_cursor(self):
+        """The first page comes from the cache and its cursor reaches older entries."""
+        async def scenario():
+            service = HistoryService(self.factory, cache_size=5)
+            await service.start()
+            for i in range(12):
+                await service.submit(make_result(i))
+            await service.flush()
+            first = await service.get_page(limit=5)
+            second = await service.get_page(limit=5, before=first["next_cursor"])
+            await service.stop()
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        self.assertEqual([e["entropy_bits"] for e in first["entries"]], [float(i) for i in range(11, 6, -1)])
+        self.assertEqual([e["entropy_bits"] for e in second["entries"]], [float(i) for i in range(6, 1, -1)])
+
+    def test_full_cache_without_older_entries_has_no_cursor(self):
+        """A history exactly the size of the cache ends on the first page."""
+        async def scenario():
+            service = HistoryService(self.factory, cache_size=5)
+            await service.start()
+            for i in range(5):
+                await service.submit(make_result(i))
+            await service.flush()
+            warm = await service.get_page(limit=5)
+            await service.stop()
+
+            reloaded = HistoryService(self.factory, cache_size=5)
+            await reloaded.start()
+            cold = await reloaded.get_page(limit=5)
+            await reloaded.submit(make_result(5))
+            await reloaded.flush()
+            grown = await reloaded.get_page(limit=5)
+            await reloaded.stop()
+            return warm, cold, grown
+
+        warm, cold, grown = asyncio.run(scenario())
+        self.assertEqual(len(warm["entries"]), 5)
+        self.assertIsNone(warm["next_cursor"])
+        self.assertIsNone(cold["next_cursor"])
+        self.assertIsNotNone(grown["next_cursor"])
+
+    def test_version_and_delta(self):
+        """The version tracks writes and deltas return only the new entries."""
+        async def scenario():
+            service = HistoryService(self.factory, cache_size=5)
+            await service.start()
+            empty = await service.version()
+            await service.submit(make_result(1))
+            await service.flush()
+            epoch, seq = await service.version()
+            await service.submit(make_result(2))
+            await service.flush()
+            delta = await service.get_since(seq, epoch)
+            current = await service.version()
+            unchanged = await service.get_since(current[1], current[0])
+            await service.stop()
+            return empty, seq, delta, current, unchanged
+
+        empty, seq, delta, current, unchanged = asyncio.run(scenario())
+        self.assertEqual(empty, ("", 0))
+        self.assertEqual([e["entropy_bits"] for e in delta["entries"]], [2.0])
+        self.assertEqual(delta["seq"], current[1])
+        self.assertGreater(current[1], seq)
+        self.assertEqual(unchanged["entries"], [])
+
+    def test_subscribers_receive_redacted_events(self):
+        """New entries are pushed as metadata only; clear sends a reset."""
+        async def scenario():
+            service = HistoryService(self.factory, cache_size=5)
+            await service.start()
+            queue = service.subscribe()
+            await service.submit(make_result(1))
+            await service.flush()
+            await service.clear()
+            events = [queue.get_nowait() for _ in range(queue.qsize())]
+            service.unsubscribe(queue)
+            await service.stop()
+            return events
+
+        events = asyncio.run(scenario())
+        self.assertEqual([e["event"] for e in events], ["entry", "reset"])
+        self.assertEqual(events[0]["data"]["generator_type"], "pin")
+        self.assertNotIn("password", events[0]["data"])
+        self.assertNotIn("parameters", events[0]["data"])
+
+    def test_slow_subscriber_gets_resync(self):
+        """A full per-client queue collapses into a single resync event."""
+        async def scenario():
+            service = HistoryService(self.factory, cache_size=50, subscriber_queue_size=3)
+            await service.start()
+            queue = service.subscribe()
+            for i in range(10):
+                await service.submit(make_result(i))
+            await service.flush()
+            events = [queue.get_nowait() for _ in range(queue.qsize())]
+            await service.stop()
+            return events
+
+        events = asyncio.run(scenario())
+        self.assertLessEqual(len(events), 3)
+        self.assertIn("resync", [e["event"] for e in events])
+
+
+if __name__ == '__main__':
+    unittest.main()
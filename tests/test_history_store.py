@@ -0,0 +1,258 @@
+"""
+Unit tests for the multi-process safe history store.
+"""
+
+import json
+import multiprocessing
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.output.history_store import JsonlHistoryStore
+from src.output.history_sqlite import JSONL_MIGRATED, SqliteHistoryStore, migrate_jsonl_to_sqlite
+from src.output.logger import PasswordLogger
+
+WRITERS = 8
+ENTRIES_PER_WRITER = 150
+
+
+def _writer(path: str, writer_id: int, count: int) -> None:
+    """Append entries from a separate process (padding exceeds PIPE_BUF)."""
+    store = JsonlHistoryStore(Path(path))
+    for i in range(count):
+        store.append({
+            "timestamp": "2026-01-01T00:00:00",
+            "writer": writer_id,
+            "n": i,
+            "padding": "x" * 8192
+        })
+
+
+class TestJsonlHistoryStore(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = Path(self.test_dir) / "pass_history.log"
+        self.store = JsonlHistoryStore(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_concurrent_writers_lose_nothing(self):
+        """Stress: many processes appending at once, every entry survives intact."""
+        procs = [
+            multiprocessing.Process(target=_writer, args=(str(self.path), w, ENTRIES_PER_WRITER))
+            for w in range(WRITERS)
+        ]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(timeout=120)
+            self.assertEqual(p.exitcode, 0)
+
+        seen = {(e["writer"], e["n"]) for e in self.store.iter_entries()}
+        expected = {(w, n) for w in range(WRITERS) for n in range(ENTRIES_PER_WRITER)}
+        self.assertEqual(seen, expected)
+
+        with open(self.path, "rb") as f:
+            lines = f.read().split(b"\n")
+        self.assertEqual(lines[-1], b"")
+        self.assertEqual(len(lines) - 1, WRITERS * ENTRIES_PER_WRITER)
+
+    def test_reader_ignores_inflight_line(self):
+        """An unterminated trailing line is invisible to readers."""
+        self.store.append({"timestamp": "a", "n": 1})
+        with open(self.path, "ab") as f:
+            f.write(b'{"timestamp": "b", "n"')
+        self.assertEqual([e["n"] for e in self.store.iter_entries()], [1])
+
+    def test_torn_tail_repaired_on_append(self):
+        """A crashed writer's fragment is discarded before the next append."""
+        self.store.append({"timestamp": "a", "n": 1})
+        with open(self.path, "ab") as f:
+            f.write(b'{"timestamp": "b", "n": 2, "pass')
+        self.store.append({"timestamp": "c", "n": 3})
+        self.assertEqual([e["n"] for e in self.store.iter_entries()], [1, 3])
+        for line in self.path.read_bytes().splitlines():
+            json.loads(line)
+
+    def test_salvage_glued_entry(self):
+        """Legacy files with a fragment glued to a valid entry keep the entry."""
+        self.path.write_bytes(b'{"timestamp": "a", "pa{"timestamp": "b", "n": 2}\n')
+        self.assertEqual([e["n"] for e in self.store.iter_entries()], [2])
+
+    def test_reverse_matches_forward(self):
+        """Backward chunked reads see the same lines and offsets as forward reads."""
+        self.store.CHUNK_SIZE = 64
+        for n in range(40):
+            self.store.append({"timestamp": "a", "n": n, "pad": "y" * (n * 7 % 90)})
+        with open(self.path, "ab") as f:
+            f.write(b'{"timestamp": "in-flight"')
+        forward = list(self.store.iter_forward())
+        self.assertEqual(list(self.store.iter_reverse()), forward[::-1])
+        # Cursors resume exactly after/before the given line
+        offset = forward[10][0]
+        self.assertEqual([e["n"] for _, e in self.store.iter_reverse(before=offset)], list(range(9, -1, -1)))
+        self.assertEqual([e["n"] for _, e in self.store.iter_forward(after=offset)], list(range(11, 40)))
+
+    def test_clear_truncates(self):
+        """Clear removes entries and later appends still work."""
+        self.store.append({"timestamp": "a", "n": 1})
+        self.store.clear()
+        self.assertEqual(list(self.store.iter_entries()), [])
+        self.store.append({"timestamp": "b", "n": 2})
+        self.assertEqual([e["n"] for e in self.store.iter_entries()], [2])
+
+
+class TestSqliteHistoryStore(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.store = SqliteHistoryStore(Path(self.test_dir) / "pass_history.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _entry(self, n, generator_type="random", day="2026-01-01", entropy=50.0):
+        return {
+            "timestamp": f"{day}T00:00:{n:02d}",
+            "password": f"pw-{n}",
+            "generator_type": generator_type,
+            "entropy_bits": entropy,
+            "parameters": {"n": n}
+        }
+
+    def test_round_trip_and_order(self):
+        """Entries survive the BLOB/JSON columns and come back newest first."""
+        for n in range(5):
+            self.store.append(self._entry(n))
+        self.assertEqual([e["parameters"]["n"] for e in self.store.iter_recent()], [4, 3, 2, 1, 0])
+        self.assertEqual([e["password"] for e in self.store.iter_entries()][0], "pw-0")
+
+    def test_filters_use_index_columns(self):
+        """Type, date range and entropy filters are applied in SQL."""
+        self.store.append(self._entry(1, "pin", "2026-01-01", 13.0))
+        self.store.append(self._entry(2, "random", "2026-02-01", 80.0))
+        self.store.append(self._entry(3, "random", "2026-03-01", 40.0))
+        self.assertEqual([e["parameters"]["n"] for e in self.store.iter_recent(generator_type="random")], [3, 2])
+        self.assertEqual([e["parameters"]["n"] for e in self.store.iter_recent(since="2026-02-01", until="2026-03-01")], [2])
+        self.assertEqual([e["parameters"]["n"] for e in self.store.iter_recent(min_entropy=40)], [3, 2])
+
+    def test_paging_crosses_page_boundary(self):
+        """Keyset paging returns every row exactly once."""
+        self.store.PAGE_SIZE = 7
+        self.store.append_many([self._entry(n % 60) for n in range(50)])
+        self.assertEqual(len(list(self.store.iter_recent())), 50)
+        self.assertEqual(len(list(self.store.iter_entries())), 50)
+
+    def test_migrate_from_jsonl(self):
+        """Streaming migration copies every JSON Lines entry in order."""
+        jsonl = JsonlHistoryStore(Path(self.test_dir) / "pass_history.log")
+        for n in range(25):
+            jsonl.append(self._entry(n))
+        self.assertEqual(migrate_jsonl_to_sqlite(jsonl, self.store, batch_size=10), 25)
+        self.assertEqual(self.store.count(), 25)
+        self.assertEqual([e["parameters"]["n"] for e in self.store.iter_entries()], list(range(25)))
+
+    def test_interrupted_migration_imports_nothing(self):
+        """A failed migration rolls back entirely; the retry imports once."""
+        jsonl = JsonlHistoryStore(Path(self.test_dir) / "pass_history.log")
+        for n in range(25):
+            jsonl.append(self._entry(n))
+
+        entries = jsonl.iter_entries
+
+        def failing():
+            for n, entry in enumerate(entries()):
+                if n == 15:
+                    raise OSError("disk went away")
+                yield entry
+
+        with mock.patch.object(jsonl, "iter_entries", failing):
+            with self.assertRaises(OSError):
+                migrate_jsonl_to_sqlite(jsonl, self.store, batch_size=10)
+        self.assertEqual(self.store.count(), 0)
+        self.assertIsNone(self.store.get_meta(JSONL_MIGRATED))
+
+        self.assertEqual(migrate_jsonl_to_sqlite(jsonl, self.store, batch_size=10), 25)
+        self.assertIsNone(migrate_jsonl_to_sqlite(jsonl, self.store, batch_size=10))
+        self.assertEqual(self.store.count(), 25)
+
+    def test_logger_sqlite_backend(self):
+        """PasswordLogger migrates an existing log once and filters via SQLite."""
+        log_dir = Path(self.test_dir) / "logger"
+        log_dir.mkdir()
+        JsonlHistoryStore(log_dir / "pass_history.log").append(self._entry(1, "pin"))
+
+        pwd_logger = PasswordLogger(str(log_dir), backend="sqlite")
+        self.assertEqual(pwd_logger.store.count(), 1)
+        # Re-opening must not import the same entries twice
+        pwd_logger = PasswordLogger(str(log_dir), backend="sqlite")
+        self.assertEqual(pwd_logger.store.count(), 1)
+
+        pwd_logger.store.append(self._entry(2, "random"))
+        entries = pwd_logger.get_history(limit=None, generator_type="random", decrypt=False)
+        self.assertEqual([e["parameters"]["n"] for e in entries], [2])
+
+        pwd_logger.clear_history()
+        self.assertEqual(pwd_logger.get_history(decrypt=False), [])
+
+    def test_cursor_pages_cover_history(self):
+        """Walking next/prev cursors visits every entry once on both backends."""
+        for backend in ("jsonl", "sqlite"):
+            log_dir = Path(self.test_dir) / backend
+            pwd_logger = PasswordLogger(str(log_dir), backend=backend)
+            for n in range(23):
+                pwd_logger.append_entry(self._entry(n))
+
+            seen = []
+            page = pwd_logger.get_history_page(limit=5, decrypt=False)
+            newest = page["prev_cursor"]
+            while True:
+                seen.extend(e["parameters"]["n"] for e in page["entries"])
+                if not page["next_cursor"]:
+                    break
+                page = pwd_logger.get_history_page(limit=5, before=page["next_cursor"], decrypt=False)
+            self.assertEqual(seen, list(range(22, -1, -1)), backend)
+
+            pwd_logger.append_entry(self._entry(23))
+            pwd_logger.append_entry(self._entry(24))
+            page = pwd_logger.get_history_page(limit=5, after=newest, decrypt=False)
+            self.assertEqual([e["parameters"]["n"] for e in page["entries"]], [24, 23], backend)
+
+            with self.assertRaises(ValueError):
+                pwd_logger.get_history_page(before="not-a-cursor")
+
+    def test_delta_since_seq(self):
+        """Deltas return only new rows and a clear forces a reset on both backends."""
+        for backend in ("jsonl", "sqlite"):
+            pwd_logger = PasswordLogger(str(Path(self.test_dir) / f"delta-{backend}"), backend=backend)
+            self.assertEqual(pwd_logger.history_version(), ("", 0))
+            pwd_logger.append_entry(self._entry(1))
+            epoch, seq = pwd_logger.history_version()
+
+            self.assertEqual(pwd_logger.get_history_since(seq, epoch, decrypt=False)["entries"], [])
+            pwd_logger.append_entry(self._entry(2))
+            pwd_logger.append_entry(self._entry(3))
+            delta = pwd_logger.get_history_since(seq, epoch, limit=1, decrypt=False)
+            self.assertEqual([e["parameters"]["n"] for e in delta["entries"]], [2])
+            self.assertTrue(delta["has_more"])
+            delta = pwd_logger.get_history_since(delta["seq"], epoch, decrypt=False)
+            self.assertEqual([e["parameters"]["n"] for e in delta["entries"]], [3])
+            self.assertGreater(delta["seq"], seq)
+
+            pwd_logger.clear_history()
+            pwd_logger.append_entry(self._entry(4))
+            delta = pwd_logger.get_history_since(delta["seq"], epoch, decrypt=False)
+            self.assertTrue(delta["reset"], backend)
+            self.assertEqual([e["parameters"]["n"] for e in delta["entries"]], [4])
+
+    def test_unknown_backend_rejected(self):
+        with self.assertRaises(ValueError):
+            PasswordLogger(self.test_dir, backend="csv")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Unit tests for keystroke jitter collection and its health tests.
+"""
+
+import os
+import sys
+import unittest
+
+from src.security.jitter import (
+    PROPORTION_CUTOFF,
+    PROPORTION_WINDOW,
+    REPETITION_CUTOFF,
+    JitterPool,
+    _collect_posix,
+)
+
+
+def feed(pool, deltas, start=10 ** 12):
+    t = start
+    pool.add(t, b"k")
+    for delta in deltas:
+        t += delta
+        pool.add(t, b"k")
+
+
+class TestJitterPool(unittest.TestCase):
+
+    def test_samples_recorded(self):
+        pool = JitterPool(capacity=4)
+        feed(pool, [1_000_003, 2_000_117, 1_500_042, 900_001, 1_234_567, 7_654_321])
+        self.assertEqual(pool.keys, 7)
+        self.assertEqual(pool.count, 6)
+        self.assertEqual(list(pool.deltas), [1_000_003, 2_000_117, 1_500_042, 900_001])
+        self.assertTrue(pool.healthy)
+        self.assertEqual(pool.entropy_bits, 6)
+
+    def test_digest_covers_timing_and_keys(self):
+        a, b, c = JitterPool(), JitterPool(), JitterPool()
+        feed(a, [1000, 2001])
+        feed(b, [1000, 2001])
+        feed(c, [1000, 2002])
+        self.assertEqual(a.digest(), b.digest())
+        self.assertNotEqual(a.digest(), c.digest())
+        b.add(10 ** 13, b"x")
+        self.assertNotEqual(a.digest(), b.digest())
+
+    def test_repetition_count(self):
+        """A held key (identical low bits) trips the repetition test."""
+        pool = JitterPool()
+        feed(pool, [33_000_000] * (REPETITION_CUTOFF - 1))
+        self.assertTrue(pool.healthy)
+        feed(pool, [33_000_000] * REPETITION_CUTOFF, start=10 ** 13)
+        self.assertFalse(pool.healthy)
+        self.assertEqual(pool.entropy_bits, 0)
+
+    def test_adaptive_proportion(self):
+        """One value dominating a window trips the proportion test, even without runs."""
+        deltas = []
+        for i in range(PROPORTION_WINDOW):
+            deltas.append(256_000 if i % 8 != 7 else 256_000 + 1 + i % 250)
+        pool = JitterPool()
+        feed(pool, deltas)
+        self.assertGreater(deltas.count(256_000), PROPORTION_CUTOFF)
+        self.assertFalse(pool.healthy)
+
+    @unittest.skipUnless(hasattr(os, "openpty") and sys.platform != "win32", "requires a POSIX pty")
+    def test_posix_collector(self):
+        import termios
+        master, slave = os.openpty()
+        self.addCleanup(os.close, master)
+        self.addCleanup(os.close, slave)
+        before = termios.tcgetattr(slave)
+        os.write(master, b"qwerty")
+        pool = JitterPool()
+        _collect_posix(slave, 0.2, pool)
+        self.assertGreaterEqual(pool.keys, 1)
+        self.assertEqual(termios.tcgetattr(slave), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
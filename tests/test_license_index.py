@@ -0,0 +1,132 @@
+"""
+Unit tests for license key check symbols and the bulk-issuing license index.
+"""
+
+import multiprocessing
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.generators import license_index
+from src.generators.drbg import HmacDrbg, RandomSource
+from src.generators.license_index import HEADER_SIZE, LicenseIndex
+from src.generators.license_key import (
+    LICENSE_CHARS,
+    LicenseKeyGenerator,
+    bytes_from_symbols,
+    damm_check,
+    damm_valid,
+    record_size,
+    symbols_from_bytes,
+)
+
+
+def _issue_in_rounds(path, rounds=10, size=50):
+    """Issue ``rounds`` batches into an index (run in a worker process)."""
+    keys = []
+    for _ in range(rounds):
+        LicenseIndex.issue(path, size, keys.append).close()
+    return keys
+
+
+class RepeatingRandom(RandomSource):
+    """Fills every request with copies of one record, forcing duplicates."""
+
+    def __init__(self, width):
+        self.width = width
+        self.drbg = HmacDrbg(b"repeat" * 8)
+
+    def token_bytes(self, n):
+        return self.drbg.token_bytes(self.width) * (n // self.width)
+
+
+class TestCheckSymbol(unittest.TestCase):
+
+    def test_detects_typos_and_swaps(self):
+        drbg = HmacDrbg(b"damm" * 8)
+        for _ in range(200):
+            body = symbols_from_bytes(drbg.token_bytes(5), 8)
+            key = body + damm_check(body)
+            self.assertTrue(damm_valid(key))
+            for i in range(len(key)):
+                for c in LICENSE_CHARS.replace(key[i], ""):
+                    self.assertFalse(damm_valid(key[:i] + c + key[i + 1:]))
+                if i + 1 < len(key) and key[i] != key[i + 1]:
+                    self.assertFalse(damm_valid(key[:i] + key[i + 1] + key[i] + key[i + 2:]))
+
+    def test_generated_checksum(self):
+        key = LicenseKeyGenerator().generate(segments=5, segment_length=5, add_checksum=True).password
+        self.assertRegex(key, r"^([A-Z2-9]{5}-){5}[A-Z2-9]$")
+        self.assertTrue(damm_valid(key))
+        self.assertFalse(damm_valid(key.replace("-", "0", 1)))
+
+    def test_symbol_packing(self):
+        drbg = HmacDrbg(b"pack" * 8)
+        for length in range(1, 40):
+            symbols = symbols_from_bytes(drbg.token_bytes(record_size(length)), length)
+            self.assertEqual(len(symbols), length)
+            self.assertEqual(symbols_from_bytes(bytes_from_symbols(symbols), length), symbols)
+        with self.assertRaises(ValueError):
+            bytes_from_symbols("AB0")
+
+
+class TestLicenseIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / "licenses.idx"
+
+    def test_issue_and_verify(self):
+        first, second = [], []
+        with LicenseIndex.issue(self.path, 500, first.append):
+            pass
+        with LicenseIndex.issue(self.path, 300, second.append, segments=9) as index:
+            self.assertEqual((index.segments, index.segment_length, index.count), (4, 4, 800))
+            self.assertEqual(len(set(first + second)), 800)
+            self.assertEqual(sorted(index), sorted(first + second))
+            for key in first[:50] + second[:50]:
+                self.assertTrue(index.verify(key))
+                self.assertTrue(index.verify(" " + key.lower()))
+            # Keys come out sorted, so the first ones often start with repeats
+            key = next(k for k in first if k[1] != k[2])
+            swapped = key[:1] + key[2] + key[1] + key[3:]
+            for bad in (swapped, key[:-2], key + "-A", "AAAA-AAAA-AAAA-AAAA-" + damm_check("A" * 16)):
+                self.assertFalse(index.verify(bad))
+        self.assertEqual(self.path.stat().st_size, HEADER_SIZE + 800 * 10)
+
+    def test_duplicates_replaced(self):
+        """Batches full of repeats still yield the requested number of unique keys."""
+        keys = []
+        rng = RepeatingRandom(record_size(6))
+        with mock.patch.object(license_index, "BATCH_SIZE", 4):
+            with LicenseIndex.issue(self.path, 3, keys.append, segments=2, segment_length=3,
+                                    add_checksum=False, rng=rng) as index:
+                self.assertEqual(index.count, 3)
+        self.assertEqual(len(set(keys)), 3)
+        self.assertTrue(all(len(k) == 7 and k[3] == "-" for k in keys))
+
+    def test_concurrent_issues_keep_every_key(self):
+        with multiprocessing.Pool(2) as pool:
+            results = pool.map(_issue_in_rounds, [self.path, self.path])
+        keys = results[0] + results[1]
+        self.assertEqual(len(set(keys)), 1000)
+        with LicenseIndex(self.path) as index:
+            self.assertEqual(index.count, 1000)
+            self.assertTrue(all(index.verify(key) for key in keys))
+
+    def test_rejects_bad_input(self):
+        with self.assertRaises(ValueError):
+            LicenseIndex.issue(self.path, 2 ** 19 + 1, lambda key: None, segments=2, segment_length=2)
+        with self.assertRaises(ValueError):
+            LicenseIndex.issue(self.path, 0, lambda key: None)
+        with self.assertRaises(ValueError):
+            LicenseIndex.issue(self.path, 1, lambda key: None, segment_length=1)
+        self.path.write_bytes(b"not an index")
+        with self.assertRaises(ValueError):
+            LicenseIndex(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Unit tests for the HOTP/TOTP engine and OTP verification.
+"""
+
+import base64
+import io
+import unittest
+from unittest import mock
+
+from src.command_handler import verify_otp_stream
+from src.generators.otp import OtpKey, ReplayGuard, decode_secret, otp_key, totp_codes
+
+# RFC 4226 / RFC 6238 test secrets
+SECRET_SHA1 = b"12345678901234567890"
+SECRET_SHA256 = b"12345678901234567890123456789012"
+SECRET_SHA512 = b"1234567890" * 6 + b"1234"
+SECRET_B32 = base64.b32encode(SECRET_SHA1).decode("ascii")
+
+
+class TestOtpKey(unittest.TestCase):
+
+    def test_rfc4226_hotp(self):
+        expected = ["755224", "287082", "359152", "969429", "338314",
+                    "254676", "287922", "162583", "399871", "520489"]
+        self.assertEqual(OtpKey(SECRET_SHA1).codes(0, 10), expected)
+
+    def test_rfc6238_totp(self):
+        cases = [
+            (59, "94287082", "46119246", "90693936"),
+            (1111111109, "07081804", "68084774", "25091201"),
+            (2000000000, "69279037", "90698825", "38618901"),
+        ]
+        keys = [OtpKey(SECRET_SHA1, 8), OtpKey(SECRET_SHA256, 8, algorithm="SHA256"),
+                OtpKey(SECRET_SHA512, 8, algorithm="SHA512")]
+        for timestamp, *codes in cases:
+            with self.subTest(timestamp=timestamp):
+                self.assertEqual(totp_codes(keys, timestamp), codes)
+
+    def test_long_secret_hashed_first(self):
+        """Secrets longer than the hash block are hashed, as HMAC requires."""
+        import hashlib
+        import hmac
+        secret = b"x" * 200
+        mac = hmac.new(secret, (7).to_bytes(8, "big"), hashlib.sha256).digest()
+        offset = mac[-1] & 0x0F
+        code = (int.from_bytes(mac[offset:offset + 4], "big") & 0x7FFFFFFF) % 10 ** 6
+        self.assertEqual(OtpKey(secret, algorithm="SHA256").hotp(7), f"{code:06d}")
+
+    def test_verify_window(self):
+        key = OtpKey(SECRET_SHA1, 8)
+        self.assertEqual(key.verify("94287082", timestamp=59), 1)
+        self.assertEqual(key.verify("94287082", timestamp=89), 1)
+        self.assertIsNone(key.verify("94287082", timestamp=89, window=0))
+        self.assertIsNone(key.verify("94287082", timestamp=150))
+        self.assertEqual(key.verify("9428 7082", timestamp=120, window=3), 1)
+        # A step already accepted is refused
+        self.assertIsNone(key.verify("94287082", timestamp=59, after=1))
+        for malformed in ("9428708é", "９４２８７０８２", "9428708", "942870820", "9428708x"):
+            with self.subTest(code=malformed):
+                self.assertIsNone(key.verify(malformed, timestamp=59))
+        with self.assertRaises(ValueError):
+            key.verify("94287082", window=-1)
+
+    def test_verify_reads_clock_once(self):
+        """A step boundary passing mid-check does not skew the window."""
+        key = OtpKey(SECRET_SHA1, 8)
+        with mock.patch("src.generators.otp.time.time", side_effect=[89.9, 90.0]) as clock:
+            self.assertEqual(key.verify(key.hotp(1), window=1), 1)
+        self.assertEqual(clock.call_count, 1)
+
+    def test_verify_hotp(self):
+        key = OtpKey(SECRET_SHA1)
+        self.assertEqual(key.verify_hotp("969429", 0, look_ahead=5), 3)
+        self.assertIsNone(key.verify_hotp("969429", 0, look_ahead=2))
+        self.assertIsNone(key.verify_hotp("969429", 4))
+
+    def test_invalid(self):
+        for kwargs in ({"digits": 5}, {"digits": 9}, {"period": 0}, {"algorithm": "MD5"}):
+            with self.subTest(kwargs=kwargs), self.assertRaises(ValueError):
+                OtpKey(SECRET_SHA1, **kwargs)
+        with self.assertRaises(ValueError):
+            OtpKey(b"")
+
+
+class TestSecrets(unittest.TestCase):
+
+    def test_decode_secret(self):
+        spaced = " ".join(SECRET_B32[i:i + 4] for i in range(0, len(SECRET_B32), 4)).lower()
+        self.assertEqual(decode_secret(spaced), SECRET_SHA1)
+        self.assertEqual(decode_secret("MZXW6"), b"foo")
+        for bad in ("", "  ", "ABC1", "!!!!"):
+            with self.subTest(secret=bad), self.assertRaises(ValueError):
+                decode_secret(bad)
+
+    def test_key_cache(self):
+        self.assertIs(otp_key(SECRET_B32), otp_key(SECRET_B32))
+        self.assertIsNot(otp_key(SECRET_B32, digits=8), otp_key(SECRET_B32))
+
+
+class TestVerifyStream(unittest.TestCase):
+
+    def test_stream(self):
+        lines = [
+            f"{SECRET_B32} 94287082",
+            f"{SECRET_B32} 94287082",
+            "NOTBASE32! 12345678",
+            f"{SECRET_B32} 1234567é",
+            "just-one-field",
+            f"{SECRET_B32} 00000000",
+        ]
+        out = io.StringIO()
+        verify_otp_stream(io.StringIO("\n".join(lines) + "\n"), out, 1, 59,
+                          {"digits": 8, "period": 30, "algorithm": "SHA1"})
+        self.assertEqual(out.getvalue().splitlines(), ["OK 1", "FAIL", "FAIL", "FAIL", "FAIL", "FAIL"])
+
+    def test_replay_refused_for_any_spelling(self):
+        padded = base64.b32encode(b"12345678901").decode("ascii")
+        self.assertTrue(padded.endswith("=="))
+        spellings = [padded.rstrip("="), padded.rstrip("=").lower(), padded, padded.lower()]
+        code = OtpKey(b"12345678901").totp(59)
+        out = io.StringIO()
+        verify_otp_stream(io.StringIO("".join(f"{s} {code}\n" for s in spellings)), out, 1, 59,
+                          {"digits": 6, "period": 30, "algorithm": "SHA1"})
+        self.assertEqual(out.getvalue().splitlines(), ["OK 1", "FAIL", "FAIL", "FAIL"])
+
+    def test_replay_guard_is_bounded(self):
+        guard = ReplayGuard(size=3)
+        keys = [OtpKey(bytes([i]) * 20) for i in range(5)]
+        for key in keys:
+            self.assertEqual(guard.verify(key, key.totp(59), timestamp=59), 1)
+        self.assertEqual(len(guard), 3)
+        self.assertIsNone(guard.verify(keys[-1], keys[-1].totp(59), timestamp=59))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Unit tests for the policy-compliant password generator.
+"""
+
+import itertools
+import math
+import os
+import re
+import tempfile
+import unittest
+from collections import Counter
+from unittest import mock
+
+from src.generators.policy import (
+    CLASS_NAMES, CompiledPolicy, PasswordPolicy, PolicyCache, PolicyGenerator, compile_policy
+)
+
+
+def setUpModule():
+    # Keep compiled policies out of the user's cache
+    patcher = mock.patch.dict(os.environ, {"PASSFORGE_POLICY_CACHE": "off"})
+    patcher.start()
+    unittest.addModuleCleanup(patcher.stop)
+
+
+def class_of(policy, char):
+    return next(name for name in CLASS_NAMES if char in getattr(policy, name))
+
+
+def complies(policy, password):
+    """Check a password against a policy directly from the rules."""
+    if len(password) != policy.length:
+        return False
+    folded = password.lower() if policy.case_insensitive else password
+    if any((p.lower() if policy.case_insensitive else p) in folded for p in policy.forbidden):
+        return False
+    if policy.max_repeat and re.search(r"(.)\1{%d}" % policy.max_repeat, password):
+        return False
+    classes = [class_of(policy, c) for c in password]
+    if policy.max_class_run and max(len(list(run)) for _, run in itertools.groupby(classes)) > policy.max_class_run:
+        return False
+    if classes[0] in policy.first_not or classes[-1] in policy.last_not:
+        return False
+    counts = Counter(classes)
+    if any(counts[name] < getattr(policy, f"min_{name}") for name in CLASS_NAMES):
+        return False
+    return len(counts) >= policy.min_classes
+
+
+class TestPolicyGenerator(unittest.TestCase):
+
+    def test_count_matches_brute_force(self):
+        policy = PasswordPolicy(
+            length=5, lowercase="abc", uppercase="AB", digits="12", symbols="!",
+            min_digits=1, min_classes=3, max_repeat=2, max_class_run=3,
+            first_not=("digits",), last_not=("symbols",), forbidden=("ab", "2!")
+        )
+        alphabet = "abcAB12!"
+        expected = sum(complies(policy, "".join(p)) for p in itertools.product(alphabet, repeat=5))
+        compiled = compile_policy(policy)
+        self.assertEqual(compiled.count, expected)
+        self.assertAlmostEqual(compiled.entropy_bits, math.log2(expected))
+
+    def test_satisfied_progress_shares_one_state(self):
+        """Once the minimums are met, class progress no longer splits states."""
+        policy = PasswordPolicy(length=12, min_classes=2)
+        compiled = compile_policy(policy)
+        sizes = [len(getattr(policy, name)) for name in CLASS_NAMES]
+        self.assertEqual(compiled.count, sum(sizes) ** 12 - sum(size ** 12 for size in sizes))
+        final = compiled._counts[-1]
+        self.assertEqual({state[5] for state, total in final.items() if total}, {compiled._caps})
+        # Start, one class so far, or satisfied
+        self.assertEqual(len({state[5] for layer in compiled._counts for state in layer}), 1 + 4 + 1)
+
+    def test_slow_compile_warns(self):
+        """Compiles past SLOW_COMPILE_STEPS say so before counting."""
+        policy = PasswordPolicy(length=8, min_digits=2, max_repeat=1)
+        with mock.patch("src.generators.policy.SLOW_COMPILE_STEPS", 10), \
+                self.assertLogs("src.generators.policy", "WARNING"):
+            CompiledPolicy.compile(policy)
+
+    def test_samples_comply(self):
+        policy = PasswordPolicy(
+            length=14, min_uppercase=2, min_digits=2, min_symbols=1, max_repeat=1,
+            max_class_run=2, first_not=("digits", "symbols"), last_not=("symbols",),
+            forbidden=("password", "admin", "2024")
+        )
+        generator = PolicyGenerator()
+        for _ in range(300):
+            result = generator.generate(policy=policy)
+            self.assertTrue(complies(policy, result.password), result.password)
+        self.assertEqual(result.generator_type, "policy")
+        self.assertAlmostEqual(result.entropy_bits, math.log2(result.parameters["pool_size"]))
+
+    def test_uniform_over_compliant_passwords(self):
+        """Every compliant password is equally likely (chi-square, p = 1e-4)."""
+        policy = PasswordPolicy(length=3, lowercase="ab", uppercase="", digits="1", symbols="",
+                                min_digits=1, max_repeat=1, forbidden=("b1",))
+        outcomes = ["".join(p) for p in itertools.product("ab1", repeat=3) if complies(policy, "".join(p))]
+        self.assertEqual(compile_policy(policy).count, len(outcomes))
+        trials = 200 * len(outcomes)
+        counts = Counter(PolicyGenerator().generate(policy=policy).password for _ in range(trials))
+        self.assertEqual(set(counts), set(outcomes))
+        chi2 = sum((counts[o] - 200) ** 2 / 200 for o in outcomes)
+        self.assertLess(chi2, 25.7)  # 6 outcomes: 5 degrees of freedom
+
+    def test_rules_from_dict_and_validation(self):
+        policy = PasswordPolicy.from_dict({"length": 10, "forbidden": "acme", "first_not": ["digits"]})
+        self.assertEqual(policy.forbidden, ("acme",))
+        self.assertEqual(PasswordPolicy.from_dict(policy.to_dict()), policy)
+        with self.assertRaises(ValueError):
+            PasswordPolicy.from_dict({"lenght": 10})
+        with self.assertRaises(ValueError):
+            PasswordPolicy(length=8, first_not=("emoji",))
+        with self.assertRaises(ValueError):
+            PolicyGenerator().generate(length=2, lowercase="a", uppercase="", digits="", symbols="", max_repeat=1)
+
+    def test_easy_read_filters_classes(self):
+        password = PolicyGenerator(easy_read=True).generate(length=64, min_digits=8).password
+        self.assertFalse(set(password) & set("0O1lI|"))
+
+
+    def test_disk_cache_round_trip(self):
+        """A cached automaton counts and samples exactly like a fresh compile."""
+        policy = PasswordPolicy.from_dict({
+            "length": 6, "lowercase": "ab", "uppercase": "AB", "digits": "12", "symbols": "",
+            "min_classes": 2, "max_repeat": 1, "forbidden": ["ab"],
+        })
+        compiled = CompiledPolicy.compile(policy)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = PolicyCache(tmp)
+            self.assertIsNone(cache.load(policy))
+            self.assertTrue(cache.store(compiled))
+            restored = cache.load(policy)
+            self.assertEqual(restored.count, compiled.count)
+            self.assertEqual(restored.entropy_bits, compiled.entropy_bits)
+            for _ in range(50):
+                self.assertTrue(complies(policy, restored.sample()))
+            # Another policy hashes to another file
+            self.assertIsNone(cache.load(PasswordPolicy.from_dict({"length": 7, "symbols": ""})))
+            # Corrupt files are ignored
+            cache.path(policy).write_bytes(b"PFPOLICY garbage")
+            self.assertIsNone(cache.load(policy))
+
+
+if __name__ == '__main__':
+    unittest.main()
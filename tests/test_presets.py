@@ -0,0 +1,119 @@
+"""
+Unit tests for preset files and compiled preset plans.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.config import presets
+from src.config.presets import PresetPlan, get_preset, get_presets, load_preset, resolve_preset
+from src.generators.policy import PasswordPolicy
+
+BUILTIN = ["corporate", "dev", "key", "memorable", "pin", "strong", "web", "wifi"]
+
+
+def setUpModule():
+    # Keep compiled policies out of the user's cache
+    patcher = mock.patch.dict(os.environ, {"PASSFORGE_POLICY_CACHE": "off"})
+    patcher.start()
+    unittest.addModuleCleanup(patcher.stop)
+
+
+class TestPresets(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.user_dir = Path(self.tmp.name)
+        patcher = mock.patch.object(presets, "USER_PRESET_DIR", self.user_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _write(self, name, data):
+        path = self.user_dir / name
+        path.write_text(json.dumps(data), encoding="utf-8")
+        return path
+
+    def test_builtin_presets_run(self):
+        plans = get_presets()
+        self.assertEqual(sorted(plans), BUILTIN)
+        self.assertEqual(len(plans["strong"].run().password), 32)
+        self.assertRegex(plans["pin"].run().password, r"^\d{6}$")
+        self.assertEqual(plans["key"].run().password.count("-"), 4)
+        dev = plans["dev"].run().password
+        self.assertEqual(len(set(dev)), 40)
+        self.assertTrue(dev.isalnum())
+        corporate = plans["corporate"].run()
+        self.assertEqual(corporate.generator_type, "policy")
+        self.assertNotIn("password", corporate.password.lower())
+
+    def test_invalid_file_does_not_hide_others(self):
+        self._write("broken.json", {"generator": "nonexistent"})
+        (self.user_dir / "garbled.json").write_text("{", encoding="utf-8")
+        with self.assertLogs(presets.logger, "WARNING") as logs:
+            plans = get_presets()
+        self.assertEqual(sorted(plans), BUILTIN)
+        self.assertEqual(len(logs.records), 2)
+        self.assertEqual(len(get_preset("strong").run().password), 32)
+        with self.assertRaises(ValueError):
+            get_preset("broken")
+
+    def test_plans_compiled_once(self):
+        """Plans are reused until the file changes."""
+        path = self._write("team.json", {"generator": "pin", "options": {"length": 8}})
+        plan = get_preset("team")
+        self.assertIs(get_preset("team"), plan)
+        self.assertIs(plan.generator_for(), plan.generator_for())
+        self.assertIsInstance(plan.kwargs, dict)
+
+        path.write_text(json.dumps({"generator": "pin", "options": {"length": 10}}), encoding="utf-8")
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+        self.assertEqual(len(get_preset("team").run().password), 10)
+
+    def test_user_presets_override_builtins(self):
+        self._write("pin.json", {"description": "Bank PIN", "generator": "pin", "options": {"length": 4}})
+        plan = get_preset("pin")
+        self.assertEqual(plan.description, "Bank PIN")
+        self.assertEqual(len(plan.run().password), 4)
+
+    def test_policy_preset(self):
+        path = self._write("legacy.json", {
+            "generator": "policy",
+            "options": {"length": 8, "symbols": "", "min_digits": 2, "forbidden": "1234"},
+        })
+        plan = resolve_preset(str(path))
+        self.assertEqual(plan.kwargs["policy"], PasswordPolicy.from_dict(plan.options))
+        for result in plan.run_batch(20):
+            self.assertEqual(len(result.password), 8)
+            self.assertGreaterEqual(sum(c.isdigit() for c in result.password), 2)
+            self.assertNotIn("1234", result.password)
+
+    def test_validation(self):
+        cases = [
+            {"generator": "nope"},
+            {"options": {"length": 8}},
+            {"generator": "pin", "options": {"digits": 8}},
+            {"generator": "pin", "options": {"length": "8"}},
+            {"generator": "random", "options": {"symbols": 0}},
+            {"generator": "pin", "extra": 1},
+            {"generator": "policy", "options": {"length": 4, "min_digits": 5}},
+            {"generator": "policy", "options": {"length": 2, "digits": "", "symbols": "", "forbidden": ["a", "b"],
+                                                "lowercase": "ab", "uppercase": ""}},
+        ]
+        for data in cases:
+            with self.subTest(data=data), self.assertRaises(ValueError):
+                PresetPlan.from_dict("bad", data)
+        with self.assertRaises(ValueError):
+            get_preset("missing")
+        bad = self.user_dir / "broken.json"
+        bad.write_text("{", encoding="utf-8")
+        with self.assertRaises(ValueError):
+            load_preset(bad)
+
+
+if __name__ == '__main__':
+    unittest.main()
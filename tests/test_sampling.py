@@ -0,0 +1,112 @@
+"""
+Unit tests for the shared sampling primitives.
+"""
+
+import itertools
+import unittest
+from collections import Counter
+from fractions import Fraction
+
+from src.generators.base import BaseGenerator
+from src.generators.random_password import RandomPasswordGenerator
+from src.generators.sampling import WeightedTable, sample_unique, uniform_indices, weighted_table
+
+# Chi-square critical value for 23 degrees of freedom (24 outcomes) at p = 1e-4
+CHI2_CRITICAL_23 = 57.0
+
+
+def chi_square(counts, outcomes, trials):
+    expected = trials / len(outcomes)
+    return sum((counts[outcome] - expected) ** 2 / expected for outcome in outcomes)
+
+
+class TestUniformIndices(unittest.TestCase):
+
+    def test_range_and_count(self):
+        for bound in (1, 2, 7, 255, 256, 257, 70000, 2**40 + 3, 2**70):
+            values = uniform_indices(bound, 500)
+            self.assertEqual(len(values), 500)
+            self.assertTrue(all(0 <= v < bound for v in values))
+
+    def test_no_modulo_bias(self):
+        """A bound just above half the word range would skew a plain modulo."""
+        counts = Counter(v < 42 for v in uniform_indices(171, 60000))
+        # P(v < 42) = 42/171 ~ 0.246; modulo of a byte would give 84/256 ~ 0.328
+        self.assertAlmostEqual(counts[True] / 60000, 42 / 171, delta=0.015)
+
+
+class TestSampleUnique(unittest.TestCase):
+
+    def test_partial_selection_uniform(self):
+        """All 24 ordered 3-of-4 selections are equally likely."""
+        trials = 24000
+        counts = Counter(tuple(sample_unique("abcd", 3)) for _ in range(trials))
+        outcomes = list(itertools.permutations("abcd", 3))
+        self.assertEqual(set(counts), set(outcomes))
+        self.assertLess(chi_square(counts, outcomes, trials), CHI2_CRITICAL_23)
+
+    def test_full_shuffle_uniform(self):
+        trials = 24000
+        counts = Counter(tuple(sample_unique(list("wxyz"), 4)) for _ in range(trials))
+        outcomes = list(itertools.permutations("wxyz"))
+        self.assertLess(chi_square(counts, outcomes, trials), CHI2_CRITICAL_23)
+
+    def test_no_repeats_permutations_uniform(self):
+        """no_repeats passwords over a 4-character pool are uniform permutations."""
+        generator = RandomPasswordGenerator()
+        options = dict(length=4, no_repeats=True, uppercase=False, lowercase=False,
+                       digits=False, symbols=False, include_chars="abcd")
+        trials = 4800
+        counts = Counter(generator.generate(**options).password for _ in range(trials))
+        outcomes = ["".join(p) for p in itertools.permutations("abcd")]
+        self.assertEqual(set(counts), set(outcomes))
+        self.assertLess(chi_square(counts, outcomes, trials), CHI2_CRITICAL_23)
+
+    def test_large_unicode_pool(self):
+        cjk = "".join(chr(c) for c in range(0x4E00, 0x4E00 + 3000))
+        password = RandomPasswordGenerator().generate(
+            length=1024, no_repeats=True, include_chars=cjk, min_uppercase=20, min_digits=8
+        ).password
+        self.assertEqual(len(password), 1024)
+        self.assertEqual(len(set(password)), 1024)
+        self.assertGreaterEqual(sum(c.isdigit() for c in password), 8)
+        with self.assertRaises(ValueError):
+            sample_unique("ab", 3)
+        with self.assertRaises(ValueError):
+            RandomPasswordGenerator().generate(length=12, no_repeats=True, min_digits=11)
+
+
+class TestWeightedTable(unittest.TestCase):
+
+    def test_exact_probabilities(self):
+        table = WeightedTable([("ab", 60), ("0123456789", 20), ("!@#", 20)])
+        self.assertEqual(table.probability("a"), Fraction(3, 10))
+        self.assertEqual(table.probability("7"), Fraction(1, 50))
+        self.assertEqual(table.probability("#"), Fraction(1, 15))
+        self.assertEqual(table.probability("z"), 0)
+        self.assertEqual(sum(table.probability(s) for s in table.symbols), 1)
+        with self.assertRaises(ValueError):
+            WeightedTable([("", 10)])
+
+    def test_cached_per_configuration(self):
+        groups = (("abc", 3), ("12", 1))
+        self.assertIs(weighted_table(groups), weighted_table(groups))
+
+    def test_balanced_mode_ratios(self):
+        """Balanced passwords keep the 60/20/20 letter/digit/symbol split."""
+        password = RandomPasswordGenerator().generate(length=1024, balanced=True).password
+        letters = sum(c.isalpha() for c in password) / len(password)
+        digits = sum(c.isdigit() for c in password) / len(password)
+        symbols = sum(c in BaseGenerator.SYMBOLS for c in password) / len(password)
+        self.assertAlmostEqual(letters, 0.6, delta=0.06)
+        self.assertAlmostEqual(digits, 0.2, delta=0.05)
+        self.assertAlmostEqual(symbols, 0.2, delta=0.05)
+
+    def test_balanced_mode_redistributes_missing_pools(self):
+        password = RandomPasswordGenerator().generate(length=512, balanced=True, symbols=False).password
+        self.assertAlmostEqual(sum(c.isalpha() for c in password) / 512, 0.8, delta=0.07)
+        self.assertFalse(any(c in BaseGenerator.SYMBOLS for c in password))
+
+
+if __name__ == '__main__':
+    unittest.main()
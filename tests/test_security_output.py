@@ -13,7 +13,11 @@ sys.path.append('src')
 
 from src.output.clipboard import ClipboardManager
 from src.output.qrcode_gen import generate_terminal_qr
-from src.security.strength_checker import check_strength, StrengthResult
+from src.security.strength_checker import (
+    check_strength, clear_strength_cache, format_strength_report, is_available, IncrementalStrengthAnalyzer,
+    StrengthCache, StrengthResult
+)
+from src.security.pattern_analyzer import PatternAnalyzer, RankedTrie, analyze_patterns
 
 
 class TestClipboardManager(unittest.TestCase):
@@ -88,6 +92,9 @@ class TestQRCodeGenerator(unittest.TestCase):
 
 class TestStrengthChecker(unittest.TestCase):
     
+    def setUp(self):
+        clear_strength_cache()
+    
     @patch('src.security.strength_checker.ZXCVBN_AVAILABLE', True)
     @patch('src.security.strength_checker.zxcvbn')
     def test_check_strength(self, mock_zxcvbn):
@@ -110,6 +117,53 @@ class TestStrengthChecker(unittest.TestCase):
         self.assertEqual(result.crack_time_display, 'centuries')
         self.assertEqual(result.feedback_suggestions, ['Use more words'])
 
+    @patch('src.security.strength_checker.ZXCVBN_AVAILABLE', True)
+    @patch('src.security.strength_checker.zxcvbn')
+    def test_repeated_analysis_is_cached(self, mock_zxcvbn):
+        """Same candidate is analysed once; callers get independent copies."""
+        mock_zxcvbn.return_value = {'score': 2, 'feedback': {'warning': 'w', 'suggestions': ['s']}, 'sequence': []}
+        
+        first = check_strength("Tr0ub4dor&3")
+        first.feedback_suggestions.append("mutated")
+        second = check_strength("Tr0ub4dor&3")
+        
+        self.assertEqual(mock_zxcvbn.call_count, 1)
+        self.assertEqual(second.feedback_suggestions, ['s'])
+        check_strength("Tr0ub4dor&3", user_inputs=["alice"])
+        self.assertEqual(mock_zxcvbn.call_count, 2)
+
+    def test_cache_bounds_and_scrubbing(self):
+        """Size and TTL bounds evict entries and scrub the cached copy."""
+        cache = StrengthCache(max_size=2, ttl=60)
+        result = StrengthResult(3, "days", 1.0, "warn", ["tip"], ["Dictionary word 'abc'"], 10, 1)
+        keys = [cache.make_key(pw) for pw in ("one", "two", "three")]
+        self.assertNotIn(b"one", keys[0])
+        for key in keys:
+            cache.put(key, result)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(keys[0]))
+        self.assertEqual(result.patterns_found, ["Dictionary word 'abc'"])
+        
+        cached = cache._entries[keys[1]][1]
+        cache.ttl = 0
+        cache.put(keys[1], result)
+        self.assertEqual(cached.patterns_found, [])
+        self.assertIsNone(cache.get(keys[1]))
+
+    @unittest.skipUnless(is_available(), "zxcvbn not installed")
+    def test_incremental_matches_full_analysis(self):
+        """Typing, deleting and pasting give the same result as a fresh analysis."""
+        analyzer = IncrementalStrengthAnalyzer(user_inputs=["alice"])
+        edits = ["p", "p@", "p@ss", "p@ssw0rd", "p@ssw0r", "p@ssw0rd1987", "alice-qwerty",
+                 "alice-qwerty-h0us3", "alice", "correct horse battery staple"]
+        for password in edits:
+            incremental = analyzer.update(password)
+            full = check_strength(password, user_inputs=["alice"], use_cache=False)
+            self.assertEqual(incremental.guesses, full.guesses, password)
+            self.assertEqual(incremental.score, full.score, password)
+            self.assertEqual(incremental.patterns_found, full.patterns_found, password)
+        self.assertIsNone(analyzer.update(""))
+
     @patch('src.security.strength_checker.ZXCVBN_AVAILABLE', False)
     def test_checker_unavailable(self):
         """Test behavior when zxcvbn is missing."""
@@ -117,5 +171,97 @@ class TestStrengthChecker(unittest.TestCase):
         self.assertIsNone(result)
 
 
+class TestPatternAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        clear_strength_cache()
+
+    def test_detects_each_pattern(self):
+        """Every detector recognises its pattern and scores it as weak."""
+        cases = {
+            "password": "Dictionary word 'password' (passwords)",
+            "P@ssw0rd": "Dictionary word 'P@ssw0rd' (passwords)",
+            "drowssap": "Dictionary word 'drowssap' (passwords)",
+            "abcdefgh": "Sequence 'abcdefgh'",
+            "aaaaaaaa": "Repeated pattern 'aaaaaaaa'",
+            "xyz!xyz!xyz!": "Repeated pattern 'xyz!xyz!xyz!'",
+            "12/05/1987": "Date pattern '12/05/1987'",
+            "zxcvbnm,./": "Keyboard pattern 'zxcvbnm,./'",
+        }
+        for password, pattern in cases.items():
+            result = analyze_patterns(password)
+            self.assertIn(pattern, result.patterns_found, password)
+            self.assertLessEqual(result.score, 1, password)
+            self.assertTrue(result.feedback_warning, password)
+
+    def test_random_and_passphrase_are_strong(self):
+        self.assertEqual(analyze_patterns("x7#Kq9!mZp2$").score, 4)
+        self.assertEqual(analyze_patterns("correcthorsebatterystaple").score, 4)
+        self.assertIsNone(analyze_patterns(""))
+
+    def test_user_inputs_penalized(self):
+        plain = analyze_patterns("zorblaxian2024")
+        penalized = analyze_patterns("zorblaxian2024", user_inputs=["Zorblaxian"])
+        self.assertLess(penalized.guesses_log10, plain.guesses_log10)
+
+    def test_trie_walk(self):
+        """The sorted-array trie yields every prefix word, including l33t readings."""
+        trie = RankedTrie({"pa": (5, "t"), "pass": (1, "t"), "password": (2, "t"), "past": (3, "t")})
+        self.assertEqual([(end, word) for end, word, _, _, _ in trie.walk("passwords", 0)],
+                         [(1, "pa"), (3, "pass"), (7, "password")])
+        words = {word: subs for _, word, _, _, subs in trie.walk("p4$t", 0, l33t=True)}
+        self.assertEqual(words["past"], {"4": "a", "$": "s"})
+
+    def test_long_input_is_linear(self):
+        """Inputs far beyond zxcvbn's limit are analyzed, in time proportional to length."""
+        analyzer = PatternAnalyzer({"horse": (1, "t")})
+        short, long = "horse!Q7z" * 50, "horse!Q7z" * 400
+
+        def timed(password):
+            start = time.perf_counter()
+            analyzer.analyze(password)
+            return time.perf_counter() - start
+
+        timed(short)
+        ratio = timed(long) / timed(short)
+        self.assertLess(ratio, 32)  # 8x the input; quadratic would be ~64x
+
+        # Keyboard zigzags: one long spatial match with a turn per character
+        for unit in ("as", "aS", "dfgf"):
+            with self.subTest(unit=unit):
+                short, long = unit * 100, unit * 800
+                timed(short)
+                self.assertLess(timed(long) / timed(short), 32)
+
+    @patch('src.security.strength_checker.ZXCVBN_AVAILABLE', False)
+    def test_auto_engine_falls_back(self):
+        """Without zxcvbn the auto engine still returns a result."""
+        self.assertIsNone(check_strength("password"))
+        result = check_strength("password", engine="auto")
+        self.assertEqual(result.score, 0)
+        with self.assertRaises(ValueError):
+            check_strength("password", engine="fast")
+
+    def test_report_names_engine(self):
+        """The report header names the analyzer that produced the result."""
+        report = format_strength_report(check_strength("password", engine="native"), no_color=True)
+        header = report.splitlines()[1]
+        self.assertIn("Pattern Analysis (native)", header)
+        self.assertEqual(len(header), 52)
+        if is_available():
+            zxcvbn_report = format_strength_report(check_strength("password", engine="zxcvbn"), no_color=True)
+            self.assertIn("Pattern Analysis (zxcvbn)", zxcvbn_report)
+
+    @unittest.skipUnless(is_available(), "zxcvbn not installed")
+    def test_close_to_zxcvbn(self):
+        """Native estimates stay within an order of magnitude of zxcvbn."""
+        for password in ["password", "qwerty123", "Jennifer1990", "correcthorsebatterystaple",
+                         "abcabcabc", "hello world", "7894561230", "Tr0ub4dor&3"]:
+            native = check_strength(password, engine="native")
+            reference = check_strength(password)
+            self.assertAlmostEqual(native.guesses_log10, reference.guesses_log10, delta=1, msg=password)
+            self.assertEqual(native.score, reference.score, password)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,93 @@
+"""
+Unit tests for keyed, format-preserving voucher campaigns.
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.generators import voucher
+from src.generators.drbg import HmacDrbg
+from src.generators.license_key import damm_valid
+from src.generators.voucher import VoucherCampaign
+
+
+def _open_keys(paths):
+    """Open each campaign file and return its key (run in a worker process)."""
+    return [VoucherCampaign.open(path).key.hex() for path in paths]
+
+
+class TestVoucherCampaign(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / "campaign.json"
+
+    def test_codes_cover_space(self):
+        for segments, segment_length in ((1, 3), (2, 2)):
+            with self.subTest(segments=segments, segment_length=segment_length):
+                campaign = VoucherCampaign(b"k" * 32, segments, segment_length, alphabet="0123456789")
+                codes = list(campaign.codes(0, campaign.size))
+                self.assertEqual(len(set(codes)), campaign.size)
+                self.assertTrue(all(len(code.replace("-", "")) == campaign.code_length for code in codes))
+                self.assertEqual([campaign.index_of(code) for code in codes[:50]], list(range(50)))
+
+    def test_license_style_codes(self):
+        campaign = VoucherCampaign(b"k" * 32, add_checksum=True)
+        codes = list(campaign.codes(10 ** 6, 200))
+        self.assertEqual(len(set(codes)), 200)
+        for i, code in enumerate(codes):
+            self.assertRegex(code, r"^([A-Z2-9]{4}-){4}[A-Z2-9]$")
+            self.assertTrue(damm_valid(code))
+            self.assertEqual(campaign.index_of(" " + code.lower()), 10 ** 6 + i)
+        self.assertEqual(campaign.code(10 ** 6), codes[0])
+        for bad in (codes[0][:-1] + ("A" if codes[0][-1] != "A" else "B"), codes[0][:-2], "0000-0000-0000-0000-A"):
+            self.assertIsNone(campaign.index_of(bad))
+        self.assertNotEqual(VoucherCampaign(b"j" * 32).code(0), VoucherCampaign(b"k" * 32).code(0))
+
+    def test_ranges_split_across_processes(self):
+        campaign = VoucherCampaign(b"k" * 32, segments=2, segment_length=4)
+        with mock.patch.object(voucher, "CHUNK_SIZE", 100):
+            parallel = list(campaign.issue(500, 1050, workers=2))
+        self.assertEqual(parallel, list(campaign.codes(500, 1050)))
+        self.assertEqual(list(campaign.codes(0, 300)) + list(campaign.codes(300, 300)), list(campaign.codes(0, 600)))
+
+    def test_campaign_file(self):
+        campaign = VoucherCampaign.open(self.path, segments=3, segment_length=5, add_checksum=True,
+                                        rng=HmacDrbg(b"campaign" * 4))
+        reopened = VoucherCampaign.open(self.path, segments=8)
+        self.assertEqual((reopened.segments, reopened.segment_length, reopened.add_checksum), (3, 5, True))
+        self.assertEqual(list(reopened.codes(0, 20)), list(campaign.codes(0, 20)))
+        if sys.platform != "win32":
+            self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+        self.path.write_text('{"format": 1}', encoding="utf-8")
+        with self.assertRaises(ValueError):
+            VoucherCampaign.load(self.path)
+
+    def test_concurrent_first_opens_share_one_key(self):
+        paths = [Path(self.tmp.name) / f"campaign{i}.json" for i in range(20)]
+        with multiprocessing.Pool(4) as pool:
+            results = pool.map(_open_keys, [paths] * 4)
+        for i, path in enumerate(paths):
+            self.assertEqual({keys[i] for keys in results}, {VoucherCampaign.load(path).key.hex()})
+
+    def test_invalid(self):
+        for kwargs in ({"segments": 0}, {"segment_length": 33}, {"alphabet": "A"}, {"alphabet": "AAB"},
+                       {"alphabet": "AB-"}, {"alphabet": "0123456789", "add_checksum": True},
+                       {"segments": 1, "segment_length": 1}):
+            with self.subTest(kwargs=kwargs), self.assertRaises(ValueError):
+                VoucherCampaign(b"k" * 32, **kwargs)
+        campaign = VoucherCampaign(b"k" * 32, 1, 3, alphabet="0123456789")
+        with self.assertRaises(ValueError):
+            campaign.codes(990, 11)
+        with self.assertRaises(ValueError):
+            campaign.issue(-1, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()